@@ -8,10 +8,52 @@ from .charts import (
     save_all_charts,
 )
 
+from .chart_cache import (
+    render_chart,
+    chart_key,
+    chart_cache_stats,
+    clear_chart_cache,
+)
+
+from .chart_service import (
+    ChartService,
+    ChartSpec,
+    get_chart_service,
+)
+
+from .live_charts import (
+    LiveChart,
+    ProfitVsCostLiveChart,
+    ProfitEvolutionLiveChart,
+    QuotesByStatusLiveChart,
+    live_charts_available,
+)
+
+from .engine import (
+    AnalyticsEngine,
+    engine_available,
+    get_analytics_engine,
+)
+
 __all__ = [
     'create_profit_vs_cost_chart',
     'create_profit_evolution_chart',
     'create_pie_chart',
     'create_quotes_by_status_chart',
     'save_all_charts',
+    'render_chart',
+    'chart_key',
+    'chart_cache_stats',
+    'clear_chart_cache',
+    'ChartService',
+    'ChartSpec',
+    'get_chart_service',
+    'LiveChart',
+    'ProfitVsCostLiveChart',
+    'ProfitEvolutionLiveChart',
+    'QuotesByStatusLiveChart',
+    'live_charts_available',
+    'AnalyticsEngine',
+    'engine_available',
+    'get_analytics_engine',
 ]
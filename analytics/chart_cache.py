@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Cache de Gráficos Renderizados
+Gráficos identificados por uma impressão digital dos dados + tipo + estilo +
+tamanho alvo. Dois níveis: LRU em memória com as imagens já decodificadas e
+PNGs no diretório temporário. Voltar para um período já visto não executa
+nenhum código do matplotlib.
+
+Gráficos para a tela (com tamanho em pixels) não passam pelo disco: são
+desenhados direto em um buffer RGBA no tamanho de exibição × escala do
+monitor e viram uma imagem PIL sem cópia (Image.frombuffer).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from lazy_imports import get_pil_image
+from analytics.charts import (
+    CHART_STYLE,
+    render_rgba,
+    create_pie_chart,
+    create_profit_evolution_chart,
+    create_profit_vs_cost_chart,
+    create_quotes_by_status_chart,
+)
+
+
+# Incrementar quando o visual dos gráficos mudar (invalida o cache em disco)
+CACHE_VERSION = 2
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "calhagest_charts")
+MAX_MEMORY_IMAGES = 12
+MAX_DISK_FILES = 128
+
+
+def _render_pie(data, output_path):
+    return create_pie_chart(data["labels"], data["values"], title=data["title"],
+                            output_path=output_path)
+
+
+# Tipo do gráfico -> função(dados, caminho). Os dados são estruturas simples (JSON)
+RENDERERS = {
+    "profit_vs_cost": create_profit_vs_cost_chart,
+    "profit_evolution": create_profit_evolution_chart,
+    "quotes_by_status": create_quotes_by_status_chart,
+    "pie": _render_pie,
+}
+
+
+class RenderedChart(NamedTuple):
+    """Imagem PIL do gráfico e o PNG no cache em disco (None para gráficos de tela)."""
+    key: str
+    path: str
+    image: object
+
+
+_lock = threading.Lock()
+_memory = OrderedDict()        # chave -> RenderedChart
+_stats = {"memory_hits": 0, "disk_hits": 0, "renders": 0}
+
+
+def display_size(size) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Normaliza o tamanho alvo: None (PNG para arquivo), largura ou
+    (largura, altura) em pixels lógicos; altura None mantém a proporção.
+    """
+    if size is None:
+        return None
+    if isinstance(size, (int, float)):
+        return int(size), None
+    width, height = size
+    return int(width), int(height) if height else None
+
+
+def chart_key(chart_type: str, data, size=None, style: Optional[Dict] = None,
+              dpr: float = 1.0) -> str:
+    """Impressão digital do gráfico: dados + tipo + estilo + tamanho alvo + escala."""
+    payload = json.dumps(
+        [CACHE_VERSION, chart_type, data, style or CHART_STYLE, display_size(size), dpr],
+        sort_keys=True, default=str, separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _remember(chart: RenderedChart):
+    with _lock:
+        _memory[chart.key] = chart
+        _memory.move_to_end(chart.key)
+        while len(_memory) > MAX_MEMORY_IMAGES:
+            _memory.popitem(last=False)
+
+
+def _decode(key: str, path: str) -> Optional[RenderedChart]:
+    try:
+        Image = get_pil_image()
+        with Image.open(path) as src:
+            src.load()
+            img = src.copy()
+    except Exception:
+        return None
+    chart = RenderedChart(key, path, img)
+    _remember(chart)
+    return chart
+
+
+def _prune_disk():
+    """Mantém no máximo MAX_DISK_FILES PNGs (remove os menos usados)."""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR)
+                   if e.name.endswith(".png") and not e.name.endswith(".tmp.png")]
+    except OSError:
+        return
+    if len(entries) <= MAX_DISK_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - MAX_DISK_FILES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def lookup(key: str) -> Optional[RenderedChart]:
+    """Procura o gráfico na memória e depois em disco (None se não estiver em cache)."""
+    with _lock:
+        chart = _memory.get(key)
+        if chart is not None:
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+            return chart
+
+    path = os.path.join(CACHE_DIR, f"{key}.png")
+    if os.path.exists(path):
+        chart = _decode(key, path)
+        if chart is not None:
+            _stats["disk_hits"] += 1
+            try:
+                os.utime(path)  # Marca como usado recentemente para a poda
+            except OSError:
+                pass
+            return chart
+    return None
+
+
+def _tmp_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.png")
+
+
+def _publish(key: str, tmp_path: str) -> Optional[RenderedChart]:
+    """Move o PNG temporário para o cache (leitores nunca veem PNG incompleto)."""
+    path = os.path.join(CACHE_DIR, f"{key}.png")
+    os.replace(tmp_path, path)
+    _stats["renders"] += 1
+    _prune_disk()
+    return _decode(key, path)
+
+
+def store_png(key: str, png_bytes: bytes) -> Optional[RenderedChart]:
+    """Grava no cache um PNG renderizado em outro processo."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = _tmp_path(key)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(png_bytes)
+        return _publish(key, tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_chart(chart_type: str, data, size=None) -> Optional[RenderedChart]:
+    """
+    Retorna o gráfico do cache ou o renderiza neste processo. Seguro para
+    threads de trabalho. Retorna None quando não há dados para o gráfico.
+    """
+    key = chart_key(chart_type, data, size)
+    chart = lookup(key)
+    if chart is not None:
+        return chart
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = _tmp_path(key)
+    try:
+        if RENDERERS[chart_type](data, tmp_path) is None or not os.path.exists(tmp_path):
+            return None
+        return _publish(key, tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def image_from_rgba(buffer, width: int = None, height: int = None):
+    """
+    Imagem PIL que compartilha a memória do buffer RGBA (sem cópia). Aceita o
+    memoryview do renderizador (shape altura × largura × 4) ou bytes + tamanho.
+    """
+    Image = get_pil_image()
+    if width is None:
+        height, width = buffer.shape[:2]
+    return Image.frombuffer("RGBA", (width, height), buffer, "raw", "RGBA", 0, 1)
+
+
+def render_image(chart_type: str, data, size, dpr: float = 1.0) -> Optional[RenderedChart]:
+    """
+    Retorna do cache em memória ou desenha neste processo o gráfico de tela
+    no tamanho (pixels lógicos) × dpr. Chamar com o lock de renderização do
+    serviço (pyplot não é thread-safe). None quando não há dados.
+    """
+    key = chart_key(chart_type, data, size, dpr=dpr)
+    chart = lookup(key)
+    if chart is not None:
+        return chart
+    width, height = display_size(size)
+    buffer = render_rgba(chart_type, data, width, height, dpr)
+    if buffer is None:
+        return None
+    _stats["renders"] += 1
+    chart = RenderedChart(key, None, image_from_rgba(buffer))
+    _remember(chart)
+    return chart
+
+
+def store_rgba(key: str, width: int, height: int, rgba: bytes) -> RenderedChart:
+    """Guarda em memória um gráfico de tela desenhado em outro processo."""
+    _stats["renders"] += 1
+    chart = RenderedChart(key, None, image_from_rgba(rgba, width, height))
+    _remember(chart)
+    return chart
+
+
+def cached_image(path: str):
+    """Imagem decodificada de um PNG do cache, se ainda estiver em memória."""
+    key = os.path.splitext(os.path.basename(path))[0]
+    with _lock:
+        chart = _memory.get(key)
+    return chart.image if chart is not None and chart.path == path else None
+
+
+def clear_chart_cache(disk: bool = False):
+    """Esvazia o cache em memória (e opcionalmente os PNGs em disco)."""
+    with _lock:
+        _memory.clear()
+    if disk:
+        try:
+            for entry in os.scandir(CACHE_DIR):
+                if entry.name.endswith(".png"):
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def chart_cache_stats() -> dict:
+    """Estatísticas do cache (para benchmarks e diagnóstico)."""
+    with _lock:
+        return dict(_stats, memory_entries=len(_memory))
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Serviço de Renderização de Gráficos
+Pool de processos (ProcessPoolExecutor) para gerar os gráficos em paralelo:
+o matplotlib com Agg segura o GIL durante toda a renderização, então threads
+não ajudam. Os workers são criados sob demanda e importam o matplotlib uma
+única vez; recebem specs (dados simples, não figuras) e devolvem os pixels
+RGBA já no tamanho de exibição (ou bytes PNG, para specs sem tamanho).
+"""
+
+import atexit
+import base64
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from analytics import chart_cache
+from analytics.charts import render_rgba
+
+
+def _default_workers() -> int:
+    # Um núcleo fica livre para a interface
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class ChartSpec(NamedTuple):
+    """
+    Pedido de gráfico: tipo (ver charts.FIGURES), dados, tamanho alvo em
+    pixels lógicos (largura ou (largura, altura); None gera PNG para arquivo)
+    e escala do monitor (device pixel ratio).
+    """
+    chart_type: str
+    data: object
+    size: object = None
+    dpr: float = 1.0
+
+
+def _worker_init():
+    """Pré-importa matplotlib/pyplot no worker (pago uma vez por processo)."""
+    from lazy_imports import get_pyplot
+    get_pyplot()
+
+
+def _render_spec(spec: Tuple):
+    """
+    Executado no worker. Specs com tamanho: (largura, altura, bytes RGBA);
+    sem tamanho: bytes PNG. None quando não há dados.
+    """
+    chart_type, data, size, dpr = spec
+    size = chart_cache.display_size(size)
+    if size is None:
+        encoded = chart_cache.RENDERERS[chart_type](data, None)
+        return base64.b64decode(encoded) if encoded is not None else None
+    buffer = render_rgba(chart_type, data, size[0], size[1], dpr)
+    if buffer is None:
+        return None
+    height, width = buffer.shape[:2]
+    return width, height, bytes(buffer)  # Cópia inevitável para voltar ao processo principal
+
+
+def _store(key: str, spec: ChartSpec, result):
+    """Guarda no cache o resultado de _render_spec (no processo principal)."""
+    if result is None:
+        return None
+    if spec.size is None:
+        return chart_cache.store_png(key, result)
+    width, height, rgba = result
+    return chart_cache.store_rgba(key, width, height, rgba)
+
+
+def _key(spec: ChartSpec) -> str:
+    return chart_cache.chart_key(spec.chart_type, spec.data, spec.size, dpr=spec.dpr)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ChartService:
+    """Renderização de gráficos no pool de processos, com o cache de gráficos na frente."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or _default_workers()
+        self._pool = None
+        self._lock = threading.Lock()
+        # Se o pool não puder ser usado (ex.: ambiente sem multiprocessing),
+        # renderiza no próprio processo, serializado
+        self._fallback_lock = threading.Lock()
+        self._broken = False
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._broken:
+                return None
+            if self._pool is None:
+                try:
+                    # spawn em todas as plataformas: fork de um processo com Tk e threads não é seguro
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_worker_init,
+                    )
+                except (OSError, ValueError, NotImplementedError):
+                    self._broken = True
+                    return None
+            return self._pool
+
+    def warm_up(self):
+        """Inicia os workers em segundo plano (não bloqueia)."""
+        pool = self._get_pool()
+        if pool is None:
+            return
+        try:
+            for _ in range(self.max_workers):
+                pool.submit(_ping)
+        except (BrokenProcessPool, RuntimeError):
+            self._mark_broken()
+
+    def _mark_broken(self):
+        with self._lock:
+            self._broken = True
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _render_local(self, spec: ChartSpec):
+        with self._fallback_lock:  # pyplot não é thread-safe
+            if spec.size is None:
+                return chart_cache.render_chart(spec.chart_type, spec.data)
+            return chart_cache.render_image(spec.chart_type, spec.data, spec.size, spec.dpr)
+
+    def render(self, spec: ChartSpec):
+        """
+        Retorna o gráfico (chart_cache.RenderedChart) do cache ou renderizado
+        no pool. Bloqueia a thread chamadora — chamar de uma thread de trabalho.
+        """
+        key = _key(spec)
+        chart = chart_cache.lookup(key)
+        if chart is not None:
+            return chart
+
+        pool = self._get_pool()
+        if pool is None:
+            return self._render_local(spec)
+        try:
+            result = pool.submit(_render_spec, tuple(spec)).result()
+        except (BrokenProcessPool, RuntimeError):
+            self._mark_broken()
+            return self._render_local(spec)
+        return _store(key, spec, result)
+
+    def render_many(self, specs: Iterable[ChartSpec]) -> Iterator[Tuple[int, object]]:
+        """
+        Renderiza várias specs em paralelo e entrega (índice, gráfico) na ordem
+        em que cada uma termina. Gráficos já em cache saem imediatamente.
+        """
+        pending = {}
+        pool = None
+        for index, spec in enumerate(specs):
+            key = _key(spec)
+            chart = chart_cache.lookup(key)
+            if chart is not None:
+                yield index, chart
+                continue
+            if pool is None:
+                pool = self._get_pool()
+            if pool is None:
+                yield index, self._render_local(spec)
+                continue
+            pending[pool.submit(_render_spec, tuple(spec))] = (index, key, spec)
+
+        for future in as_completed(pending):
+            index, key, spec = pending[future]
+            try:
+                result = future.result()
+            except (BrokenProcessPool, RuntimeError):
+                self._mark_broken()
+                yield index, self._render_local(spec)
+                continue
+            yield index, _store(key, spec, result)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_chart_service() -> ChartService:
+    """Instância compartilhada do serviço (o pool só é criado no primeiro uso)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ChartService()
+            atexit.register(_service.shutdown)
+        return _service
@@ -4,16 +4,26 @@ Gráficos de lucro, gastos e métricas financeiras usando Matplotlib.
 Estilo visual moderno com cores e tipografia aprimoradas.
 """
 
-import matplotlib
-matplotlib.use('Agg')  # Backend não-interativo para gerar imagens
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime
 import io
 import base64
 from typing import List, Dict
 import os
 
+from lazy_imports import get_pyplot
+from analytics.downsample import (
+    MARKERS_MAX_POINTS,
+    downsample_lines,
+    max_bars_for_width,
+    merge_bar_buckets,
+    should_annotate,
+    tick_positions,
+)
+
+
+# Largura em pixels das imagens geradas (figsize 10" a 150 dpi); guia a redução de pontos
+CHART_PIXEL_WIDTH = 1500
+
 
 # Estilo global para todos os gráficos
 CHART_STYLE = {
@@ -45,31 +55,23 @@ def _apply_chart_style(ax, fig):
     ax.set_axisbelow(True)
 
 
-def create_profit_vs_cost_chart(analytics_data: List[Dict], output_path: str = None) -> str:
-    """
-    Cria gráfico de barras comparando faturamento e custos mensais.
-    
-    Args:
-        analytics_data: Lista de dicionários com dados mensais
-        output_path: Caminho para salvar a imagem (opcional)
-    
-    Returns:
-        Caminho da imagem ou base64 da imagem
-    """
+def _figure_profit_vs_cost(analytics_data: List[Dict], pixel_width: int = CHART_PIXEL_WIDTH):
+    """Figura de barras comparando faturamento e custos por período."""
     if not analytics_data:
         return None
     
-    # Preparar dados
-    months = [d['month'] for d in analytics_data]
+    # Preparar dados (já em ordem cronológica)
+    months = [d['period'] for d in analytics_data]
     revenue = [d['revenue'] for d in analytics_data]
     cost = [d['cost'] for d in analytics_data]
     
-    # Inverter para ordem cronológica
-    months = months[::-1]
-    revenue = revenue[::-1]
-    cost = cost[::-1]
+    # Períodos longos: juntar meses/dias adjacentes para caber na largura
+    months, merged = merge_bar_buckets(months, {"revenue": revenue, "cost": cost},
+                                       max_bars_for_width(pixel_width, bars_per_group=2))
+    revenue, cost = merged["revenue"], merged["cost"]
     
     # Criar figura com estilo moderno
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=(10, 5))
     _apply_chart_style(ax, fig)
     
@@ -81,128 +83,80 @@ def create_profit_vs_cost_chart(analytics_data: List[Dict], output_path: str = N
     bars2 = ax.bar([i + width/2 for i in x], cost, width, label='Custo', 
                    color=CHART_STYLE["error"], alpha=0.85, edgecolor='white', linewidth=0.5)
     
-    ax.set_xlabel('Mês', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+    ax.set_xlabel('Período', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
     ax.set_ylabel('Valor (R$)', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
-    ax.set_title('Faturamento vs Custo por Mês', fontsize=15, fontweight='bold',
+    ax.set_title('Faturamento vs Custo por Período', fontsize=15, fontweight='bold',
                  color=CHART_STYLE["text_color"], pad=20)
-    ax.set_xticks(x)
-    ax.set_xticklabels(months, rotation=45, ha='right')
+    ticks = tick_positions(len(months))
+    ax.set_xticks(ticks)
+    ax.set_xticklabels([months[i] for i in ticks], rotation=45, ha='right')
     ax.legend(frameon=True, fancybox=True, shadow=False, edgecolor=CHART_STYLE["grid_color"],
               fontsize=10, loc='upper left')
     
-    # Adicionar valores nas barras
-    for bar in bars1:
-        height = bar.get_height()
-        if height > 0:
-            ax.annotate(f'R${height:,.0f}'.replace(',', '.'),
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3), textcoords="offset points",
-                       ha='center', va='bottom', fontsize=7)
-    
-    for bar in bars2:
-        height = bar.get_height()
-        if height > 0:
-            ax.annotate(f'R${height:,.0f}'.replace(',', '.'),
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3), textcoords="offset points",
-                       ha='center', va='bottom', fontsize=7)
+    # Adicionar valores nas barras (só quando há poucas barras)
+    if should_annotate(len(months)):
+        for bar in list(bars1) + list(bars2):
+            height = bar.get_height()
+            if height > 0:
+                ax.annotate(f'R${height:,.0f}'.replace(',', '.'),
+                           xy=(bar.get_x() + bar.get_width() / 2, height),
+                           xytext=(0, 3), textcoords="offset points",
+                           ha='center', va='bottom', fontsize=7)
     
     plt.tight_layout()
-    
-    # Salvar ou retornar
-    if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight', 
-                    facecolor='white', edgecolor='none')
-        plt.close()
-        return output_path
-    else:
-        # Retornar base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+    return fig
 
 
-def create_profit_evolution_chart(analytics_data: List[Dict], output_path: str = None) -> str:
-    """
-    Cria gráfico de linhas mostrando evolução do lucro ao longo do tempo.
-    
-    Args:
-        analytics_data: Lista de dicionários com dados mensais
-        output_path: Caminho para salvar a imagem (opcional)
-    
-    Returns:
-        Caminho da imagem ou base64 da imagem
-    """
+def _figure_profit_evolution(analytics_data: List[Dict], pixel_width: int = CHART_PIXEL_WIDTH):
+    """Figura de linhas com a evolução do faturamento e do lucro."""
     if not analytics_data:
         return None
     
-    # Preparar dados
-    months = [d['month'] for d in analytics_data]
+    # Preparar dados (já em ordem cronológica)
+    months = [d['period'] for d in analytics_data]
     profit = [d['profit'] for d in analytics_data]
     revenue = [d['revenue'] for d in analytics_data]
     
-    # Inverter para ordem cronológica
-    months = months[::-1]
-    profit = profit[::-1]
-    revenue = revenue[::-1]
+    # Séries longas: LTTB para a largura da imagem (preserva picos e vales)
+    x, months, reduced = downsample_lines(months, {"revenue": revenue, "profit": profit},
+                                          pixel_width)
+    revenue, profit = reduced["revenue"], reduced["profit"]
+    show_markers = len(x) <= MARKERS_MAX_POINTS
     
     # Criar figura
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=(10, 5))
     _apply_chart_style(ax, fig)
     
-    ax.plot(months, revenue, marker='o', linewidth=2.5, markersize=8, 
+    ax.plot(x, revenue, marker='o' if show_markers else None, linewidth=2.5, markersize=8, 
             color=CHART_STYLE["primary"], label='Faturamento', markerfacecolor='white',
             markeredgewidth=2, markeredgecolor=CHART_STYLE["primary"])
-    ax.plot(months, profit, marker='s', linewidth=2.5, markersize=8, 
+    ax.plot(x, profit, marker='s' if show_markers else None, linewidth=2.5, markersize=8, 
             color=CHART_STYLE["success"], label='Lucro', markerfacecolor='white',
             markeredgewidth=2, markeredgecolor=CHART_STYLE["success"])
     
     # Preencher área do lucro
-    ax.fill_between(months, profit, alpha=0.15, color=CHART_STYLE["success"])
-    ax.fill_between(months, revenue, alpha=0.08, color=CHART_STYLE["primary"])
+    ax.fill_between(x, profit, alpha=0.15, color=CHART_STYLE["success"])
+    ax.fill_between(x, revenue, alpha=0.08, color=CHART_STYLE["primary"])
+    
+    ticks = tick_positions(len(x))
+    ax.set_xticks([x[i] for i in ticks])
+    ax.set_xticklabels([months[i] for i in ticks])
     
-    ax.set_xlabel('Mês', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+    ax.set_xlabel('Período', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
     ax.set_ylabel('Valor (R$)', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
-    ax.set_title('Evolução Financeira Mensal', fontsize=15, fontweight='bold',
+    ax.set_title('Evolução Financeira', fontsize=15, fontweight='bold',
                  color=CHART_STYLE["text_color"], pad=20)
     ax.legend(loc='upper left', frameon=True, fancybox=True, shadow=False,
               edgecolor=CHART_STYLE["grid_color"], fontsize=10)
     
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    
-    # Salvar ou retornar
-    if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        plt.close()
-        return output_path
-    else:
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+    return fig
 
 
-def create_pie_chart(labels: List[str], values: List[float], title: str = "Distribuição",
-                     output_path: str = None) -> str:
-    """
-    Cria gráfico de pizza.
-    
-    Args:
-        labels: Rótulos das fatias
-        values: Valores correspondentes
-        title: Título do gráfico
-        output_path: Caminho para salvar a imagem (opcional)
-    
-    Returns:
-        Caminho da imagem ou base64 da imagem
-    """
+def _figure_pie(labels: List[str], values: List[float], title: str = "Distribuição"):
+    """Figura de pizza (fatias zeradas são omitidas)."""
     # Filtrar valores zerados
     filtered_data = [(l, v) for l, v in zip(labels, values) if v > 0]
     if not filtered_data:
@@ -215,6 +169,7 @@ def create_pie_chart(labels: List[str], values: List[float], title: str = "Distr
               CHART_STYLE["error"], CHART_STYLE["purple"], 
               '#ec4899', '#06b6d4', '#84cc16']
     
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=(8, 8))
     fig.set_facecolor(CHART_STYLE["bg_color"])
     
@@ -232,33 +187,11 @@ def create_pie_chart(labels: List[str], values: List[float], title: str = "Distr
         autotext.set_fontweight('bold')
     
     plt.tight_layout()
-    
-    # Salvar ou retornar
-    if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        plt.close()
-        return output_path
-    else:
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+    return fig
 
 
-def create_quotes_by_status_chart(quotes_data: Dict[str, int], output_path: str = None) -> str:
-    """
-    Cria gráfico de orçamentos por status.
-    
-    Args:
-        quotes_data: Dicionário com contagem de orçamentos por status
-        output_path: Caminho para salvar a imagem (opcional)
-    
-    Returns:
-        Caminho da imagem ou base64 da imagem
-    """
+def _figure_quotes_by_status(quotes_data: Dict[str, int]):
+    """Figura de barras com a quantidade de orçamentos por status."""
     status_labels = {
         'draft': 'Rascunho',
         'sent': 'Enviado',
@@ -277,6 +210,7 @@ def create_quotes_by_status_chart(quotes_data: Dict[str, int], output_path: str
     values = list(quotes_data.values())
     colors = [status_colors.get(k, '#6b7280') for k in quotes_data.keys()]
     
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=(8, 5))
     _apply_chart_style(ax, fig)
     
@@ -297,54 +231,171 @@ def create_quotes_by_status_chart(quotes_data: Dict[str, int], output_path: str
                    ha='center', va='bottom', fontsize=11, fontweight='bold')
     
     plt.tight_layout()
-    
-    # Salvar ou retornar
+    return fig
+
+
+def _save_figure(fig, output_path: str = None) -> str:
+    """Salva a figura em PNG (150 dpi) no caminho dado ou retorna o PNG em base64."""
+    plt = get_pyplot()
     if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight',
+        fig.savefig(output_path, dpi=150, bbox_inches='tight',
                     facecolor='white', edgecolor='none')
-        plt.close()
+        plt.close(fig)
         return output_path
-    else:
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    plt.close(fig)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+def create_profit_vs_cost_chart(analytics_data: List[Dict], output_path: str = None) -> str:
+    """
+    Cria gráfico de barras comparando faturamento e custos por período.
+    
+    Args:
+        analytics_data: Série em ordem cronológica (db.get_analytics_series)
+        output_path: Caminho para salvar a imagem (opcional)
+    
+    Returns:
+        Caminho da imagem ou base64 da imagem
+    """
+    fig = _figure_profit_vs_cost(analytics_data)
+    return _save_figure(fig, output_path) if fig is not None else None
+
+
+def create_profit_evolution_chart(analytics_data: List[Dict], output_path: str = None) -> str:
+    """
+    Cria gráfico de linhas mostrando evolução do lucro ao longo do tempo.
+    
+    Args:
+        analytics_data: Série em ordem cronológica (db.get_analytics_series)
+        output_path: Caminho para salvar a imagem (opcional)
+    
+    Returns:
+        Caminho da imagem ou base64 da imagem
+    """
+    fig = _figure_profit_evolution(analytics_data)
+    return _save_figure(fig, output_path) if fig is not None else None
+
+
+def create_pie_chart(labels: List[str], values: List[float], title: str = "Distribuição",
+                     output_path: str = None) -> str:
+    """
+    Cria gráfico de pizza.
+    
+    Args:
+        labels: Rótulos das fatias
+        values: Valores correspondentes
+        title: Título do gráfico
+        output_path: Caminho para salvar a imagem (opcional)
+    
+    Returns:
+        Caminho da imagem ou base64 da imagem
+    """
+    fig = _figure_pie(labels, values, title)
+    return _save_figure(fig, output_path) if fig is not None else None
+
+
+def create_quotes_by_status_chart(quotes_data: Dict[str, int], output_path: str = None) -> str:
+    """
+    Cria gráfico de orçamentos por status.
+    
+    Args:
+        quotes_data: Dicionário com contagem de orçamentos por status
+        output_path: Caminho para salvar a imagem (opcional)
+    
+    Returns:
+        Caminho da imagem ou base64 da imagem
+    """
+    fig = _figure_quotes_by_status(quotes_data)
+    return _save_figure(fig, output_path) if fig is not None else None
+
+
+# Proporção largura/altura natural de cada figura (figsize)
+FIGURE_ASPECT = {
+    "profit_vs_cost": 2.0,
+    "profit_evolution": 2.0,
+    "quotes_by_status": 1.6,
+    "pie": 1.0,
+}
+
+# Tipo do gráfico -> função(dados, largura em px) que monta a figura (None sem dados).
+# Os dados são estruturas simples (JSON), iguais às das specs do pool de gráficos.
+FIGURES = {
+    "profit_vs_cost": _figure_profit_vs_cost,
+    "profit_evolution": _figure_profit_evolution,
+    "quotes_by_status": lambda data, pixel_width: _figure_quotes_by_status(data),
+    "pie": lambda data, pixel_width: _figure_pie(data["labels"], data["values"], data["title"]),
+}
+
+
+def rasterize(fig, width: int, height: int = None, dpr: float = 1.0):
+    """
+    Desenha a figura direto em memória (FigureCanvasAgg) no tamanho de exibição.
+
+    A largura em polegadas é mantida, então a tipografia fica igual à do PNG;
+    só o dpi muda para chegar a width × dpr pixels. height=None mantém a
+    proporção da figura. Retorna o memoryview RGBA do renderizador (shape
+    altura × largura × 4), válido enquanto o memoryview existir.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig_w, fig_h = fig.get_size_inches()
+    if height:
+        fig.set_size_inches(fig_w, fig_w * height / width)
+    fig.set_dpi(width * dpr / fig_w)
+    canvas = FigureCanvasAgg(fig)
+    fig.tight_layout()
+    canvas.draw()
+    buffer = canvas.buffer_rgba()
+    get_pyplot().close(fig)
+    return buffer
+
+
+def render_rgba(chart_type: str, data, width: int, height: int = None, dpr: float = 1.0):
+    """Monta e desenha o gráfico em memória. Retorna o buffer RGBA ou None sem dados."""
+    fig = FIGURES[chart_type](data, int(width * dpr))
+    if fig is None:
+        return None
+    return rasterize(fig, width, height, dpr)
 
 
 def save_all_charts(analytics_data: List[Dict], quotes_by_status: Dict[str, int],
                     output_dir: str) -> Dict[str, str]:
     """
     Gera e salva todos os gráficos em um diretório.
+    Os gráficos são renderizados em paralelo no pool de processos
+    (analytics.chart_service) e reaproveitam o cache de gráficos.
     
     Args:
-        analytics_data: Dados de análise mensal
+        analytics_data: Série financeira (db.get_analytics_series)
         quotes_by_status: Contagem de orçamentos por status
         output_dir: Diretório de saída
     
     Returns:
         Dicionário com caminhos dos gráficos gerados
     """
+    import shutil
+    from analytics.chart_service import ChartSpec, get_chart_service
+
     os.makedirs(output_dir, exist_ok=True)
     
-    charts = {}
-    
+    requested = []
     if analytics_data:
-        charts['profit_vs_cost'] = create_profit_vs_cost_chart(
-            analytics_data, 
-            os.path.join(output_dir, 'profit_vs_cost.png')
-        )
-        
-        charts['profit_evolution'] = create_profit_evolution_chart(
-            analytics_data,
-            os.path.join(output_dir, 'profit_evolution.png')
-        )
-    
+        requested.append(('profit_vs_cost', ChartSpec('profit_vs_cost', analytics_data)))
+        requested.append(('profit_evolution', ChartSpec('profit_evolution', analytics_data)))
     if quotes_by_status:
-        charts['quotes_by_status'] = create_quotes_by_status_chart(
-            quotes_by_status,
-            os.path.join(output_dir, 'quotes_by_status.png')
-        )
+        requested.append(('quotes_by_status', ChartSpec('quotes_by_status', quotes_by_status)))
+    
+    charts = {}
+    specs = [spec for _, spec in requested]
+    for index, chart in get_chart_service().render_many(specs):
+        if chart is None:
+            continue
+        name = requested[index][0]
+        path = os.path.join(output_dir, f'{name}.png')
+        shutil.copyfile(chart.path, path)
+        charts[name] = path
     
     return charts
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Redução de Pontos para Gráficos
+Séries longas (diárias, vários anos) são reduzidas de acordo com a largura
+do gráfico em pixels antes de chegar ao matplotlib, para que o tempo de
+renderização fique praticamente constante independentemente do período:
+- linhas: Largest-Triangle-Three-Buckets (LTTB), preserva picos e vales;
+- barras: junção de buckets adjacentes (somando os valores).
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+
+# Pixels mínimos por ponto de linha / por grupo de barras
+LINE_PX_PER_POINT = 4
+BAR_MIN_PX = 18
+
+# Acima desta quantidade de barras os rótulos de valor deixam de ser desenhados
+ANNOTATE_MAX_BARS = 24
+
+# Quantidade máxima de rótulos no eixo X
+MAX_X_TICKS = 12
+
+# Acima desta quantidade de pontos as linhas são desenhadas sem marcadores
+MARKERS_MAX_POINTS = 60
+
+
+def max_points_for_width(width_px: int) -> int:
+    """Quantidade de pontos de linha que ainda fazem diferença visual na largura dada."""
+    return max(3, int(width_px) // LINE_PX_PER_POINT)
+
+
+def max_bars_for_width(width_px: int, bars_per_group: int = 1) -> int:
+    """Quantidade de grupos de barras que cabem na largura dada."""
+    return max(1, int(width_px) // (BAR_MIN_PX * max(1, bars_per_group)))
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Índices escolhidos pelo Largest-Triangle-Three-Buckets para uma série com
+    x igualmente espaçado. Sempre mantém o primeiro e o último ponto.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    indices = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Média do próximo bucket (terceiro vértice do triângulo)
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = (next_start + next_end - 1) / 2.0
+        avg_y = sum(values[next_start:next_end]) / count
+
+        # Ponto do bucket atual que forma o maior triângulo com a e a média
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = a, values[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        indices.append(best)
+        a = best
+
+    indices.append(n - 1)
+    return indices
+
+
+def downsample_lines(labels: Sequence[str], series: Dict[str, Sequence[float]],
+                     width_px: int) -> Tuple[List[int], List[str], Dict[str, List[float]]]:
+    """
+    Reduz várias séries que compartilham o eixo X. Os índices do LTTB de cada
+    série são unidos, então picos de qualquer uma delas são preservados.
+    Retorna (posições x, rótulos, séries reduzidas).
+    """
+    n = len(labels)
+    threshold = max_points_for_width(width_px)
+    if n <= threshold:
+        return list(range(n)), list(labels), {k: list(v) for k, v in series.items()}
+
+    per_series = max(3, threshold // max(1, len(series)))
+    keep = set()
+    for values in series.values():
+        keep.update(lttb_indices(values, per_series))
+    idx = sorted(keep)
+    return idx, [labels[i] for i in idx], {k: [v[i] for i in idx] for k, v in series.items()}
+
+
+def merge_bar_buckets(labels: Sequence[str], series: Dict[str, Sequence[float]],
+                      max_bars: int) -> Tuple[List[str], Dict[str, List[float]]]:
+    """
+    Junta barras adjacentes (somando os valores) até caberem em max_bars.
+    Buckets agrupados recebem o rótulo "primeiro–último".
+    """
+    n = len(labels)
+    if n <= max_bars:
+        return list(labels), {k: list(v) for k, v in series.items()}
+
+    group = -(-n // max_bars)  # divisão com arredondamento para cima
+    merged_labels = []
+    merged = {k: [] for k in series}
+    for start in range(0, n, group):
+        end = min(start + group, n)
+        first, last = labels[start], labels[end - 1]
+        merged_labels.append(first if first == last else f"{first}–{last}")
+        for key, values in series.items():
+            merged[key].append(sum(values[start:end]))
+    return merged_labels, merged
+
+
+def tick_positions(count: int, max_ticks: int = MAX_X_TICKS) -> List[int]:
+    """Posições dos rótulos do eixo X, espaçadas para não se sobreporem."""
+    if count <= max_ticks:
+        return list(range(count))
+    step = -(-count // max_ticks)
+    return list(range(0, count, step))
+
+
+def should_annotate(bar_count: int) -> bool:
+    """Rótulos de valor só quando as barras são poucas o suficiente para lê-los."""
+    return bar_count <= ANNOTATE_MAX_BARS
@@ -0,0 +1,698 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Motor Colunar de Analytics (NumPy)
+As colunas usadas pelos relatórios (orçamentos, itens, pagamentos, despesas,
+folha e produtos) são carregadas uma única vez em arrays NumPy. Depois disso
+o motor se mantém atualizado pelo barramento de eventos: registros criados são
+anexados (id > último id carregado) e registros alterados ou excluídos são
+relidos pelo id, sem recarregar a tabela inteira.
+
+Os relatórios são agregações vetorizadas (bincount/searchsorted), na casa dos
+milissegundos mesmo com ~1M de itens de orçamento:
+- agrupamentos por faixa de data (dia, semana ISO, mês, ano), status,
+  cliente e tipo de produto;
+- margem por tipo de produto;
+- receita por coorte de clientes;
+- envelhecimento de contas a receber;
+- simulação de reprecificação (dobra/desconto) sobre todo o histórico.
+
+NumPy é opcional: sem ele engine_available() retorna False.
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from database import db, events
+from lazy_imports import get_numpy
+
+
+# Status que geram receita e contas a receber
+BILLABLE_STATUSES = ('approved', 'completed')
+
+# Faixas de data aceitas pelos agrupamentos
+DATE_BINS = ("day", "week", "month", "year")
+
+# Limites (em dias) das faixas do envelhecimento de contas a receber
+AGING_BUCKETS = (30, 60, 90)
+
+# Tipo usado para itens sem produto cadastrado (produto excluído)
+NO_TYPE_LABEL = "Sem tipo"
+
+# Limite de parâmetros por consulta "IN (...)" do SQLite
+_SQL_CHUNK = 900
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def engine_available() -> bool:
+    """Indica se o NumPy está instalado."""
+    try:
+        get_numpy()
+        return True
+    except ImportError:
+        return False
+
+
+def _day_sql(column: str) -> str:
+    """Expressão SQL com a data da coluna em dias desde 1970-01-01."""
+    return (f"CAST(julianday(substr(COALESCE({column}, CURRENT_TIMESTAMP), 1, 10))"
+            f" - 2440587.5 AS INTEGER)")
+
+
+class _TableSpec(NamedTuple):
+    """Colunas carregadas de uma tabela (a primeira é sempre o id)."""
+    table: str
+    select: str
+    columns: Tuple[Tuple[str, str], ...]
+    categorical: Tuple[str, ...] = ()
+
+
+TABLES = {
+    "quotes": _TableSpec(
+        "quotes",
+        f"id, {_day_sql('created_at')}, COALESCE(status, 'draft'), COALESCE(client_name, ''), "
+        "COALESCE(total, 0), COALESCE(cost_total, 0), COALESCE(discount_total, 0), "
+        "CASE WHEN discount_type = 'value' THEN 1 ELSE 0 END",
+        (("id", "int64"), ("day", "int32"), ("status", "int16"), ("client", "int32"),
+         ("total", "float64"), ("cost_total", "float64"), ("discount", "float64"),
+         ("discount_is_value", "int8")),
+        categorical=("status", "client"),
+    ),
+    "quote_items": _TableSpec(
+        "quote_items",
+        "id, quote_id, COALESCE(product_id, 0), COALESCE(meters, 0), COALESCE(price_per_meter, 0), "
+        "COALESCE(discount, 0), COALESCE(total, 0), COALESCE(cost_total, 0)",
+        (("id", "int64"), ("quote_id", "int64"), ("product_id", "int64"), ("meters", "float64"),
+         ("price", "float64"), ("discount", "float64"), ("total", "float64"),
+         ("cost_total", "float64")),
+    ),
+    "payments": _TableSpec(
+        "payments",
+        f"id, quote_id, {_day_sql('payment_date')}, COALESCE(amount, 0)",
+        (("id", "int64"), ("quote_id", "int64"), ("day", "int32"), ("amount", "float64")),
+    ),
+    "expenses": _TableSpec(
+        "expenses",
+        f"id, {_day_sql('expense_date')}, COALESCE(amount, 0)",
+        (("id", "int64"), ("day", "int32"), ("amount", "float64")),
+    ),
+    "payroll": _TableSpec(
+        "payroll",
+        f"id, {_day_sql('payment_date')}, COALESCE(amount, 0)",
+        (("id", "int64"), ("day", "int32"), ("amount", "float64")),
+    ),
+    "products": _TableSpec(
+        "products",
+        "id, COALESCE(type, ''), COALESCE(has_dobra, 0)",
+        (("id", "int64"), ("type", "int32"), ("has_dobra", "int8")),
+        categorical=("type",),
+    ),
+}
+
+# Entidade do barramento -> tabela do motor
+_ENTITY_TABLES = {
+    events.QUOTE: "quotes",
+    events.QUOTE_ITEM: "quote_items",
+    events.PAYMENT: "payments",
+    events.EXPENSE: "expenses",
+    events.PAYROLL: "payroll",
+    events.EMPLOYEE: "payroll",        # excluir funcionário apaga a folha (cascade)
+    events.PRODUCT: "products",
+    events.PRODUCT_TYPE: "products",
+}
+
+
+class _Table:
+    """Uma tabela em formato colunar: nome da coluna -> array, ordenado por id."""
+
+    def __init__(self, spec: _TableSpec):
+        self.spec = spec
+        self.columns = None
+        # Colunas de texto viram códigos inteiros: valor -> código
+        self.categories = {name: {} for name in spec.categorical}
+
+    def __len__(self):
+        return 0 if self.columns is None else len(self.columns["id"])
+
+    @property
+    def max_id(self) -> int:
+        return int(self.columns["id"][-1]) if len(self) else 0
+
+    def labels(self, column: str) -> List[str]:
+        """Valores de uma coluna categórica, na ordem dos códigos."""
+        return list(self.categories[column])
+
+    def code(self, column: str, value: str) -> int:
+        """Código de um valor categórico (-1 se nunca visto)."""
+        return self.categories[column].get(value, -1)
+
+    def _query(self, conn, where: str = "", params: Sequence = ()):
+        sql = f"SELECT {self.spec.select} FROM {self.spec.table}"
+        if where:
+            sql += f" WHERE {where}"
+        return self._to_columns(conn.execute(sql + " ORDER BY id", params).fetchall())
+
+    def _to_columns(self, rows):
+        np = get_numpy()
+        if not rows:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in self.spec.columns}
+        result = {}
+        for (name, dtype), values in zip(self.spec.columns, zip(*rows)):
+            codes = self.categories.get(name)
+            if codes is not None:
+                values = [codes.setdefault(v, len(codes)) for v in values]
+            result[name] = np.array(values, dtype=dtype)
+        return result
+
+    def load(self, conn):
+        """Carga completa."""
+        for codes in self.categories.values():
+            codes.clear()
+        self.columns = self._query(conn)
+
+    def append_new(self, conn):
+        """Anexa os registros com id maior que o último carregado."""
+        new = self._query(conn, "id > ?", (self.max_id,))
+        if len(new["id"]):
+            self.columns = _concat(self.columns, new)
+
+    def refresh(self, conn, column: str, ids: Iterable[int]):
+        """Relê os registros cuja coluna está em ids (alterados ou excluídos)."""
+        np = get_numpy()
+        ids = sorted(set(ids))
+        keep = ~np.isin(self.columns[column], ids)
+        parts = [{name: values[keep] for name, values in self.columns.items()}]
+        for start in range(0, len(ids), _SQL_CHUNK):
+            chunk = ids[start:start + _SQL_CHUNK]
+            parts.append(self._query(conn, f"{column} IN ({', '.join('?' * len(chunk))})", chunk))
+        merged = _concat(*parts)
+        order = np.argsort(merged["id"], kind="stable")
+        self.columns = {name: values[order] for name, values in merged.items()}
+
+
+def _concat(*parts):
+    np = get_numpy()
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _to_day(value) -> Optional[int]:
+    """Converte date/datetime/'AAAA-MM-DD...' em dias desde 1970-01-01."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _bin_index(days, bin: str):
+    """Índice inteiro da faixa de data (dias, semanas, meses ou anos desde 1970)."""
+    if bin == "day":
+        return days.astype("int64")
+    if bin == "week":
+        # 1970-01-01 foi uma quinta-feira: semanas começam na segunda (ISO)
+        return (days.astype("int64") + 3) // 7
+    if bin == "month":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype("int64")
+    if bin == "year":
+        return days.astype("datetime64[D]").astype("datetime64[Y]").astype("int64")
+    raise ValueError(f"Faixa de data inválida: {bin!r} (use {', '.join(DATE_BINS)})")
+
+
+def _bin_label(index: int, bin: str) -> str:
+    """Rótulo de uma faixa: '2025-03-14', '2025-W11', '2025-03' ou '2025'."""
+    np = get_numpy()
+    if bin == "week":
+        monday = date.fromordinal(_EPOCH_ORDINAL + int(index) * 7 - 3)
+        year, week, _ = monday.isocalendar()
+        return f"{year}-W{week:02d}"
+    unit = {"day": "D", "month": "M", "year": "Y"}[bin]
+    return str(np.datetime64(int(index), unit))
+
+
+def _group_sum(keys, weights=None):
+    """
+    Soma weights por chave inteira. Retorna (chaves únicas, somas).
+    Chaves densas usam bincount (O(n)); esparsas caem no np.unique.
+    """
+    np = get_numpy()
+    if not len(keys):
+        return np.empty(0, dtype="int64"), np.empty(0)
+    low, high = int(keys.min()), int(keys.max())
+    span = high - low + 1
+    if span <= max(1024, 4 * len(keys)):
+        sums = np.bincount(keys - low, weights=weights, minlength=span)
+        counts = sums if weights is None else np.bincount(keys - low, minlength=span)
+        present = np.nonzero(counts)[0]
+        return present + low, sums[present].astype("float64")
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=weights, minlength=len(unique)).astype("float64")
+
+
+def _take(values, rows):
+    """values[rows], tolerando values vazio (linhas órfãs recebem zero)."""
+    np = get_numpy()
+    return values[rows] if len(values) else np.zeros(len(rows), dtype=values.dtype)
+
+
+def _lookup(sorted_ids, ids):
+    """Posição de cada id em sorted_ids e máscara dos encontrados."""
+    np = get_numpy()
+    if not len(sorted_ids):
+        return np.zeros(len(ids), dtype="int64"), np.zeros(len(ids), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+    return pos, sorted_ids[pos] == ids
+
+
+class AnalyticsEngine:
+    """
+    Armazenamento colunar + relatórios vetorizados.
+
+    Os métodos públicos podem ser chamados de threads de trabalho (ex.:
+    ProgressiveLoader); cada um sincroniza as alterações pendentes antes de
+    calcular.
+    """
+
+    def __init__(self, connect=None):
+        self._connect = connect or db.get_connection
+        self._lock = threading.RLock()
+        self._pending_lock = threading.Lock()
+        self._tables = {name: _Table(spec) for name, spec in TABLES.items()}
+        self._type_labels = {}
+        self._derived = {}
+        self._loaded = False
+        self._pending = {}
+        self._unsubscribe = events.subscribe(list(_ENTITY_TABLES), self._on_change)
+
+    # ========== Sincronização ==========
+
+    def _on_change(self, event: events.ChangeEvent):
+        """Registra a alteração; aplicada na próxima consulta (sync)."""
+        table = _ENTITY_TABLES[event.entity]
+        with self._pending_lock:
+            if not self._loaded:
+                return
+            if event.entity == events.EMPLOYEE and event.kind != events.DELETED:
+                return
+            if table == "products" or event.entity == events.EMPLOYEE or not event.ids:
+                self._mark(table, full=True)
+            elif event.kind == events.CREATED:
+                self._mark(table, append=True)
+            else:
+                self._mark(table, refresh=("id", event.ids))
+                if event.entity == events.QUOTE and event.kind == events.DELETED:
+                    # Itens e pagamentos são apagados em cascata
+                    self._mark("quote_items", refresh=("quote_id", event.ids))
+                    self._mark("payments", refresh=("quote_id", event.ids))
+
+    def _mark(self, table: str, full: bool = False, append: bool = False, refresh=None):
+        pending = self._pending.setdefault(table, {"full": False, "append": False, "refresh": {}})
+        pending["full"] |= full
+        pending["append"] |= append
+        if refresh is not None:
+            column, ids = refresh
+            pending["refresh"].setdefault(column, set()).update(ids)
+
+    def sync(self):
+        """Carrega tudo na primeira chamada; depois aplica só as alterações pendentes."""
+        with self._lock:
+            with self._pending_lock:
+                first = not self._loaded
+                self._loaded = True
+                pending, self._pending = self._pending, {}
+            if not first and not pending:
+                return
+            try:
+                conn = self._connect()
+            except Exception:
+                self._restore_pending(first, pending)
+                raise
+            conn.row_factory = None
+            try:
+                if first:
+                    for table in self._tables.values():
+                        table.load(conn)
+                    self._load_type_labels(conn)
+                else:
+                    for name, actions in pending.items():
+                        table = self._tables[name]
+                        if actions["full"]:
+                            table.load(conn)
+                            if name == "products":
+                                self._load_type_labels(conn)
+                            continue
+                        for column, ids in actions["refresh"].items():
+                            table.refresh(conn, column, ids)
+                        if actions["append"]:
+                            table.append_new(conn)
+            except Exception:
+                # Falha no meio da carga: na próxima consulta recarrega tudo
+                self._restore_pending(True, {})
+                raise
+            finally:
+                conn.close()
+                self._derived.clear()
+
+    def _restore_pending(self, reload_all: bool, pending: Dict):
+        with self._pending_lock:
+            if reload_all:
+                self._loaded = False
+                self._pending = {}
+            else:
+                for name, actions in pending.items():
+                    self._mark(name, actions["full"], actions["append"])
+                    for column, ids in actions["refresh"].items():
+                        self._mark(name, refresh=(column, ids))
+
+    def _load_type_labels(self, conn):
+        rows = conn.execute("SELECT key, label FROM product_types").fetchall()
+        self._type_labels = {key: label for key, label in rows}
+
+    def invalidate(self):
+        """Descarta tudo; a próxima consulta recarrega as tabelas."""
+        with self._lock, self._pending_lock:
+            self._loaded = False
+            self._pending = {}
+            self._derived.clear()
+
+    def close(self):
+        self._unsubscribe()
+
+    def row_counts(self) -> Dict[str, int]:
+        """Registros carregados por tabela."""
+        self.sync()
+        return {name: len(table) for name, table in self._tables.items()}
+
+    # ========== Colunas derivadas ==========
+
+    def _cached(self, key, build):
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build()
+        return value
+
+    def _item_links(self):
+        """Para cada item: linha do orçamento, se foi encontrada e o código do tipo."""
+        def build():
+            np = get_numpy()
+            quotes, items = self._tables["quotes"].columns, self._tables["quote_items"].columns
+            products = self._tables["products"].columns
+            row, found = _lookup(quotes["id"], items["quote_id"])
+
+            # Tabelas de consulta indexadas pelo id do produto
+            size = int(products["id"].max()) + 1 if len(products["id"]) else 1
+            type_by_id = np.full(size, -1, dtype="int32")
+            dobra_by_id = np.zeros(size, dtype="int8")
+            type_by_id[products["id"]] = products["type"]
+            dobra_by_id[products["id"]] = products["has_dobra"]
+            pid = items["product_id"]
+            known = (pid > 0) & (pid < size)
+            safe = np.where(known, pid, 0)
+            product_type = np.where(known, type_by_id[safe], -1)
+            has_dobra = np.where(known, dobra_by_id[safe], 0)
+            return {"row": row, "found": found, "type": product_type, "has_dobra": has_dobra}
+        return self._cached("item_links", build)
+
+    def _quote_ratio(self):
+        """Fator total líquido / soma dos itens por orçamento (rateia o desconto geral)."""
+        def build():
+            np = get_numpy()
+            quotes, items = self._tables["quotes"].columns, self._tables["quote_items"].columns
+            links = self._item_links()
+            subtotal = np.bincount(links["row"][links["found"]],
+                                   weights=items["total"][links["found"]],
+                                   minlength=len(quotes["id"]))
+            ratio = np.divide(quotes["total"], subtotal,
+                              out=np.zeros(len(subtotal)), where=subtotal > 0)
+            return ratio, subtotal
+        return self._cached("quote_ratio", build)
+
+    def _frame(self, source: str) -> Dict:
+        """Colunas alinhadas de uma fonte, com os atributos do orçamento já juntados."""
+        def build():
+            np = get_numpy()
+            quotes = self._tables["quotes"].columns
+            if source == "quotes":
+                return {"day": quotes["day"], "status": quotes["status"], "client": quotes["client"],
+                        "total": quotes["total"], "cost_total": quotes["cost_total"],
+                        "profit": quotes["total"] - quotes["cost_total"],
+                        "valid": np.ones(len(quotes["id"]), dtype=bool)}
+            if source == "items":
+                items = self._tables["quote_items"].columns
+                links = self._item_links()
+                row = links["row"]
+                ratio, _ = self._quote_ratio()
+                net = items["total"] * _take(ratio, row)
+                return {"day": _take(quotes["day"], row),
+                        "status": _take(quotes["status"], row),
+                        "client": _take(quotes["client"], row),
+                        "product_type": links["type"],
+                        "meters": items["meters"], "total": net,
+                        "cost_total": items["cost_total"], "profit": net - items["cost_total"],
+                        "valid": links["found"]}
+            if source == "payments":
+                payments = self._tables["payments"].columns
+                row, found = _lookup(quotes["id"], payments["quote_id"])
+                return {"day": payments["day"],
+                        "status": _take(quotes["status"], row),
+                        "client": _take(quotes["client"], row),
+                        "amount": payments["amount"], "valid": found}
+            if source in ("expenses", "payroll"):
+                table = self._tables[source].columns
+                return {"day": table["day"], "amount": table["amount"],
+                        "valid": np.ones(len(table["id"]), dtype=bool)}
+            raise ValueError(f"Fonte inválida: {source!r}")
+        return self._cached(("frame", source), build)
+
+    def _mask(self, frame: Dict, start=None, end=None, statuses=None):
+        """Máscara de linhas válidas dentro do intervalo [start, end] e dos status."""
+        np = get_numpy()
+        mask = frame["valid"].copy()
+        start, end = _to_day(start), _to_day(end)
+        if start is not None:
+            mask &= frame["day"] >= start
+        if end is not None:
+            mask &= frame["day"] <= end
+        if statuses is not None:
+            if "status" not in frame:
+                raise ValueError("Esta fonte não tem status")
+            codes = [self._tables["quotes"].code("status", s) for s in statuses]
+            mask &= np.isin(frame["status"], codes)
+        return mask
+
+    def _type_label(self, code: int) -> str:
+        if code < 0:
+            return NO_TYPE_LABEL
+        key = self._tables["products"].labels("type")[code]
+        return self._type_labels.get(key, key)
+
+    # ========== Agrupamentos ==========
+
+    def group_by(self, source: str, by: str = "date", value: str = "total", bin: str = "month",
+                 start=None, end=None, statuses: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Soma (ou conta, com value="count") uma coluna de uma fonte agrupando por
+        "date" (faixas de bin), "status", "client" ou "product_type".
+
+        Fontes: "quotes", "items", "payments", "expenses", "payroll".
+        Retorna [{"key": rótulo, "value": soma}], em ordem de chave.
+        """
+        with self._lock:
+            self.sync()
+            frame = self._frame(source)
+            mask = self._mask(frame, start, end, statuses)
+            weights = None if value == "count" else frame[value][mask]
+
+            if by == "date":
+                keys = _bin_index(frame["day"][mask], bin)
+                label = lambda k: _bin_label(k, bin)  # noqa: E731
+            elif by in ("status", "client"):
+                keys = frame[by][mask].astype("int64")
+                names = self._tables["quotes"].labels(by)
+                label = lambda k: names[k]  # noqa: E731
+            elif by == "product_type":
+                keys = frame["product_type"][mask].astype("int64")
+                label = self._type_label
+            else:
+                raise ValueError(f"Agrupamento inválido: {by!r}")
+
+            unique, sums = _group_sum(keys, weights)
+            return [{"key": label(int(k)), "value": float(v)} for k, v in zip(unique, sums)]
+
+    # ========== Relatórios ==========
+
+    def product_type_margin(self, start=None, end=None,
+                            statuses: Sequence[str] = BILLABLE_STATUSES) -> List[Dict]:
+        """
+        Faturamento, custo e margem por tipo de produto. O desconto geral do
+        orçamento é rateado entre os itens proporcionalmente ao valor de cada um.
+        """
+        np = get_numpy()
+        with self._lock:
+            self.sync()
+            frame = self._frame("items")
+            mask = self._mask(frame, start, end, statuses)
+            keys = frame["product_type"][mask].astype("int64") + 1  # -1 (sem tipo) vira 0
+            size = int(keys.max()) + 1 if len(keys) else 0
+            count = np.bincount(keys, minlength=size)
+            meters = np.bincount(keys, weights=frame["meters"][mask], minlength=size)
+            revenue = np.bincount(keys, weights=frame["total"][mask], minlength=size)
+            cost = np.bincount(keys, weights=frame["cost_total"][mask], minlength=size)
+
+            result = []
+            for code in np.nonzero(count)[0]:
+                profit = revenue[code] - cost[code]
+                result.append({
+                    "type": self._type_label(int(code) - 1),
+                    "items": int(count[code]),
+                    "meters": float(meters[code]),
+                    "revenue": float(revenue[code]),
+                    "cost": float(cost[code]),
+                    "profit": float(profit),
+                    "margin": float(profit / revenue[code] * 100) if revenue[code] > 0 else 0.0,
+                })
+            result.sort(key=lambda r: r["revenue"], reverse=True)
+            return result
+
+    def client_cohort_revenue(self, bin: str = "month",
+                              statuses: Sequence[str] = BILLABLE_STATUSES) -> Dict:
+        """
+        Receita por coorte de clientes. A coorte de um cliente é a faixa do seu
+        primeiro orçamento; as colunas são faixas decorridas desde a coorte.
+
+        Retorna {"cohorts": rótulos, "clients": clientes por coorte,
+                 "revenue": matriz [coorte][deslocamento], "totals": por coorte}.
+        """
+        np = get_numpy()
+        with self._lock:
+            self.sync()
+            frame = self._frame("quotes")
+            mask = self._mask(frame, statuses=statuses)
+            clients = frame["client"][mask].astype("int64")
+            bins = _bin_index(frame["day"][mask], bin)
+            revenue = frame["total"][mask]
+            if not len(clients):
+                return {"cohorts": [], "clients": [], "revenue": [], "totals": []}
+
+            first = np.full(int(clients.max()) + 1, np.iinfo("int64").max, dtype="int64")
+            np.minimum.at(first, clients, bins)
+            cohort = first[clients]
+            offset = bins - cohort
+
+            cohort_ids, cohort_idx = np.unique(cohort, return_inverse=True)
+            width = int(offset.max()) + 1
+            matrix = np.bincount(cohort_idx * width + offset, weights=revenue,
+                                 minlength=len(cohort_ids) * width).reshape(len(cohort_ids), width)
+            seen = first[first != np.iinfo("int64").max]
+            client_counts = np.bincount(np.searchsorted(cohort_ids, seen), minlength=len(cohort_ids))
+            return {
+                "cohorts": [_bin_label(int(c), bin) for c in cohort_ids],
+                "clients": client_counts.tolist(),
+                "revenue": matrix.tolist(),
+                "totals": matrix.sum(axis=1).tolist(),
+            }
+
+    def receivables_aging(self, as_of=None, buckets: Sequence[int] = AGING_BUCKETS,
+                          statuses: Sequence[str] = BILLABLE_STATUSES) -> List[Dict]:
+        """
+        Saldo a receber por idade do orçamento (dias desde a criação).
+        Retorna uma linha por faixa: {"bucket", "count", "amount"}.
+        """
+        np = get_numpy()
+        with self._lock:
+            self.sync()
+            quotes = self._frame("quotes")
+            payments = self._frame("payments")
+            n = len(quotes["total"])
+            rows, found = _lookup(self._tables["quotes"].columns["id"],
+                                  self._tables["payments"].columns["quote_id"])
+            paid = np.bincount(rows[found], weights=payments["amount"][found], minlength=n)
+            balance = quotes["total"] - paid
+
+            mask = self._mask(quotes, statuses=statuses) & (balance > 0.005)
+            today = _to_day(as_of or date.today())
+            age = today - quotes["day"][mask]
+            bucket = np.searchsorted(np.asarray(buckets), age, side="left")
+            count = np.bincount(bucket, minlength=len(buckets) + 1)
+            amount = np.bincount(bucket, weights=balance[mask], minlength=len(buckets) + 1)
+
+            labels, low = [], 0
+            for limit in buckets:
+                labels.append(f"{low}–{limit} dias")
+                low = limit + 1
+            labels.append(f"mais de {buckets[-1]} dias")
+            return [{"bucket": label, "count": int(c), "amount": float(a)}
+                    for label, c, a in zip(labels, count, amount)]
+
+    def what_if_repricing(self, dobra_delta: float = 0.0, discount_factor: float = 1.0,
+                          discount_delta: float = 0.0, start=None, end=None,
+                          statuses: Sequence[str] = BILLABLE_STATUSES,
+                          product_types: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Reaplica a precificação dos itens ao histórico com outra dobra e/ou
+        outro desconto por metro e recalcula os totais dos orçamentos (com o
+        desconto geral de cada um). O custo não muda.
+
+        dobra_delta: acréscimo por metro nos produtos com dobra (R$).
+        discount_factor/discount_delta: novo desconto = atual × fator + delta.
+        product_types: restringe a simulação a esses tipos (chaves).
+
+        Retorna {"baseline": {...}, "scenario": {...}, "delta": {...}} com
+        revenue, cost, profit e margin.
+        """
+        np = get_numpy()
+        with self._lock:
+            self.sync()
+            quotes = self._tables["quotes"].columns
+            items = self._tables["quote_items"].columns
+            links = self._item_links()
+            _, subtotal = self._quote_ratio()
+            row, found = links["row"], links["found"]
+
+            # Preço de tabela = preço gravado (já com desconto) + desconto
+            list_price = items["price"] + items["discount"]
+            new_discount = np.maximum(items["discount"] * discount_factor + discount_delta, 0)
+            new_price = np.maximum(list_price + dobra_delta * links["has_dobra"] - new_discount, 0)
+            new_total = items["meters"] * new_price
+            if product_types is not None:
+                codes = [self._tables["products"].code("type", t) for t in product_types]
+                new_total = np.where(np.isin(links["type"], codes), new_total, items["total"])
+
+            new_subtotal = np.bincount(row[found], weights=new_total[found], minlength=len(subtotal))
+            discounted = np.where(quotes["discount_is_value"] == 1,
+                                  new_subtotal - np.maximum(quotes["discount"], 0),
+                                  new_subtotal * (1 - np.maximum(quotes["discount"], 0) / 100))
+            # Orçamentos sem itens mantêm o total gravado
+            scenario_total = np.where(subtotal > 0, discounted, quotes["total"])
+
+            mask = self._mask(self._frame("quotes"), start, end, statuses)
+            cost = float(quotes["cost_total"][mask].sum())
+            baseline = _summary(float(quotes["total"][mask].sum()), cost)
+            scenario = _summary(float(scenario_total[mask].sum()), cost)
+            return {
+                "baseline": baseline,
+                "scenario": scenario,
+                "delta": {key: scenario[key] - baseline[key] for key in baseline},
+                "quotes": int(mask.sum()),
+            }
+
+
+def _summary(revenue: float, cost: float) -> Dict[str, float]:
+    profit = revenue - cost
+    return {"revenue": revenue, "cost": cost, "profit": profit,
+            "margin": profit / revenue * 100 if revenue > 0 else 0.0}
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_analytics_engine() -> AnalyticsEngine:
+    """Motor compartilhado pelo processo (carregado na primeira consulta)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AnalyticsEngine()
+        return _engine
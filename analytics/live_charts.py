@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Gráficos Embutidos (FigureCanvasTkAgg)
+Figuras e artistas criados uma única vez por aba. Mudanças de período
+atualizam os artistas existentes (alturas das barras, set_data, rótulos) e
+chamam draw_idle(), sem reconstruir a figura e sem PNG em disco.
+"Expandir" reaproveita a mesma figura em um canvas maior.
+
+Todas as classes devem ser usadas na thread do Tk.
+"""
+
+from typing import Dict, List
+
+from lazy_imports import get_tk_figure
+from analytics.charts import CHART_STYLE, _apply_chart_style
+from analytics.downsample import (
+    MARKERS_MAX_POINTS,
+    downsample_lines,
+    max_bars_for_width,
+    merge_bar_buckets,
+    should_annotate,
+    tick_positions,
+)
+
+
+DPI = 100
+
+STATUS_LABELS = {
+    'draft': 'Rascunho',
+    'sent': 'Enviado',
+    'approved': 'Aprovado',
+    'completed': 'Concluído',
+}
+
+STATUS_COLORS = {
+    'draft': '#9ca3af',
+    'sent': '#3b82f6',
+    'approved': '#22c55e',
+    'completed': '#a855f7',
+}
+
+
+def live_charts_available() -> bool:
+    """Indica se matplotlib com o backend TkAgg pode ser usado."""
+    try:
+        get_tk_figure()
+        return True
+    except ImportError:
+        return False
+
+
+def _format_brl(value: float) -> str:
+    return f'R${value:,.0f}'.replace(',', '.')
+
+
+class LiveChart:
+    """Figura matplotlib embutida em um widget Tk, atualizada no lugar."""
+
+    def __init__(self, master, width: int = 750, height: int = 375):
+        Figure, self._canvas_class = get_tk_figure()
+        self.figure = Figure(figsize=(width / DPI, height / DPI), dpi=DPI, layout="tight")
+        self.ax = self.figure.add_subplot()
+        self._size = (width, height)
+        self._setup()
+        self._home_canvas = self._canvas_class(self.figure, master=master)
+        self.canvas = self._home_canvas
+        self.widget = self._home_canvas.get_tk_widget()
+        self.widget.configure(width=width, height=height, highlightthickness=0)
+        self._expanded = None
+
+    # --- Pontos de extensão ---
+
+    def _setup(self):
+        """Cria os elementos fixos (títulos, eixos, estilo)."""
+        _apply_chart_style(self.ax, self.figure)
+
+    def _update(self, data):
+        raise NotImplementedError
+
+    # --- API ---
+
+    def update(self, data):
+        """Atualiza os artistas com novos dados e agenda o redesenho."""
+        self._update(data)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def expand(self, master):
+        """Mostra a mesma figura em outro container (ex.: janela de tela cheia)."""
+        self.restore()
+        self.canvas = self._canvas_class(self.figure, master=master)
+        self._expanded = self.canvas.get_tk_widget()
+        self._expanded.configure(highlightthickness=0)
+        self.canvas.draw_idle()
+        return self._expanded
+
+    def restore(self):
+        """Devolve a figura ao canvas original (ao fechar a janela expandida)."""
+        if self._expanded is None:
+            return
+        try:
+            self._expanded.destroy()
+        except Exception:
+            pass
+        self._expanded = None
+        self.canvas = self._home_canvas
+        self.figure.set_canvas(self._home_canvas)
+        width, height = self._size
+        self.figure.set_size_inches(width / DPI, height / DPI, forward=False)
+        if self.alive:
+            self._home_canvas.draw_idle()
+
+    @property
+    def alive(self) -> bool:
+        try:
+            return bool(self.widget.winfo_exists())
+        except Exception:
+            return False
+
+    def destroy(self):
+        self.restore()
+        try:
+            self.widget.destroy()
+        except Exception:
+            pass
+        self.figure.clear()
+
+
+class _BarAnnotations:
+    """Rótulos de valor sobre as barras, recriados a cada atualização."""
+
+    def __init__(self, ax):
+        self.ax = ax
+        self._texts = []
+
+    def set(self, rects, formatter, **kwargs):
+        for text in self._texts:
+            text.remove()
+        self._texts = []
+        for rect in rects:
+            height = rect.get_height()
+            if height <= 0:
+                continue
+            self._texts.append(self.ax.annotate(
+                formatter(height),
+                xy=(rect.get_x() + rect.get_width() / 2, height),
+                xytext=(0, 3), textcoords="offset points",
+                ha='center', va='bottom', **kwargs,
+            ))
+
+
+class ProfitVsCostLiveChart(LiveChart):
+    """Barras de faturamento vs custo por período (equivale a create_profit_vs_cost_chart)."""
+
+    WIDTH = 0.35
+
+    def _setup(self):
+        super()._setup()
+        ax = self.ax
+        ax.set_xlabel('Período', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_ylabel('Valor (R$)', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_title('Faturamento vs Custo por Período', fontsize=15, fontweight='bold',
+                     color=CHART_STYLE["text_color"], pad=20)
+        self._revenue_bars = None
+        self._cost_bars = None
+        self._labels = _BarAnnotations(ax)
+
+    def _create_bars(self, count):
+        if self._revenue_bars is not None:
+            self._revenue_bars.remove()
+            self._cost_bars.remove()
+        x = range(count)
+        w = self.WIDTH
+        zeros = [0] * count
+        self._revenue_bars = self.ax.bar([i - w / 2 for i in x], zeros, w, label='Faturamento',
+                                         color=CHART_STYLE["primary"], alpha=0.85,
+                                         edgecolor='white', linewidth=0.5)
+        self._cost_bars = self.ax.bar([i + w / 2 for i in x], zeros, w, label='Custo',
+                                      color=CHART_STYLE["error"], alpha=0.85,
+                                      edgecolor='white', linewidth=0.5)
+        self.ax.legend(frameon=True, fancybox=True, shadow=False, edgecolor=CHART_STYLE["grid_color"],
+                       fontsize=10, loc='upper left')
+
+    def _update(self, data: List[Dict]):
+        # Série em ordem cronológica; períodos longos juntam barras adjacentes
+        months, merged = merge_bar_buckets(
+            [d['period'] for d in data],
+            {"revenue": [d['revenue'] for d in data], "cost": [d['cost'] for d in data]},
+            max_bars_for_width(self._size[0], bars_per_group=2),
+        )
+        if self._revenue_bars is None or len(self._revenue_bars) != len(months):
+            # Só recria os retângulos quando a quantidade de barras muda
+            self._create_bars(len(months))
+        for rect, value in zip(self._revenue_bars, merged["revenue"]):
+            rect.set_height(value)
+        for rect, value in zip(self._cost_bars, merged["cost"]):
+            rect.set_height(value)
+        ticks = tick_positions(len(months))
+        self.ax.set_xticks(ticks)
+        self.ax.set_xticklabels([months[i] for i in ticks], rotation=45, ha='right')
+        rects = list(self._revenue_bars) + list(self._cost_bars) if should_annotate(len(months)) else []
+        self._labels.set(rects, _format_brl, fontsize=7)
+
+
+class ProfitEvolutionLiveChart(LiveChart):
+    """Linhas de faturamento e lucro (equivale a create_profit_evolution_chart)."""
+
+    def _setup(self):
+        super()._setup()
+        ax = self.ax
+        (self._revenue_line,) = ax.plot([], [], marker='o', linewidth=2.5, markersize=8,
+                                        color=CHART_STYLE["primary"], label='Faturamento',
+                                        markerfacecolor='white', markeredgewidth=2,
+                                        markeredgecolor=CHART_STYLE["primary"])
+        (self._profit_line,) = ax.plot([], [], marker='s', linewidth=2.5, markersize=8,
+                                       color=CHART_STYLE["success"], label='Lucro',
+                                       markerfacecolor='white', markeredgewidth=2,
+                                       markeredgecolor=CHART_STYLE["success"])
+        self._fills = []
+        ax.set_xlabel('Período', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_ylabel('Valor (R$)', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_title('Evolução Financeira', fontsize=15, fontweight='bold',
+                     color=CHART_STYLE["text_color"], pad=20)
+        ax.legend(loc='upper left', frameon=True, fancybox=True, shadow=False,
+                  edgecolor=CHART_STYLE["grid_color"], fontsize=10)
+
+    def _update(self, data: List[Dict]):
+        x, months, reduced = downsample_lines(
+            [d['period'] for d in data],
+            {"revenue": [d['revenue'] for d in data], "profit": [d['profit'] for d in data]},
+            self._size[0],
+        )
+        revenue, profit = reduced["revenue"], reduced["profit"]
+
+        self._revenue_line.set_data(x, revenue)
+        self._profit_line.set_data(x, profit)
+        marker_size = 8 if len(x) <= MARKERS_MAX_POINTS else 0
+        self._revenue_line.set_markersize(marker_size)
+        self._profit_line.set_markersize(marker_size)
+
+        # As áreas preenchidas não têm set_data simples: substituídas (custo baixo)
+        for fill in self._fills:
+            fill.remove()
+        self._fills = [
+            self.ax.fill_between(x, profit, alpha=0.15, color=CHART_STYLE["success"]),
+            self.ax.fill_between(x, revenue, alpha=0.08, color=CHART_STYLE["primary"]),
+        ]
+        ticks = tick_positions(len(x))
+        self.ax.set_xticks([x[i] for i in ticks])
+        self.ax.set_xticklabels([months[i] for i in ticks], rotation=45, ha='right')
+
+
+class QuotesByStatusLiveChart(LiveChart):
+    """Barras de orçamentos por status (equivale a create_quotes_by_status_chart)."""
+
+    def __init__(self, master, width: int = 750, height: int = 470):
+        super().__init__(master, width, height)
+
+    def _setup(self):
+        super()._setup()
+        ax = self.ax
+        ax.set_xlabel('Status', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_ylabel('Quantidade', fontsize=10, color=CHART_STYLE["label_color"], fontweight='medium')
+        ax.set_title('Orçamentos por Status', fontsize=15, fontweight='bold',
+                     color=CHART_STYLE["text_color"], pad=20)
+        self._bars = None
+        self._keys = None
+        self._labels = _BarAnnotations(ax)
+
+    def _update(self, quotes_data: Dict[str, int]):
+        keys = list(quotes_data.keys())
+        if keys != self._keys:
+            if self._bars is not None:
+                self._bars.remove()
+            self._bars = self.ax.bar(
+                range(len(keys)), [0] * len(keys),
+                color=[STATUS_COLORS.get(k, '#6b7280') for k in keys],
+                alpha=0.85, edgecolor='white', linewidth=0.5, width=0.6,
+            )
+            self.ax.set_xticks(range(len(keys)))
+            self.ax.set_xticklabels([STATUS_LABELS.get(k, k) for k in keys])
+            self._keys = keys
+        for rect, key in zip(self._bars, keys):
+            rect.set_height(quotes_data[key])
+        self._labels.set(self._bars, lambda h: f'{int(h)}', fontsize=11, fontweight='bold')
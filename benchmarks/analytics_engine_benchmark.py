@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark do Motor Colunar de Analytics
+Cria um banco SQLite temporário com dados sintéticos (padrão: 1M de itens de
+orçamento), mede a carga inicial das colunas em NumPy, o tempo de cada
+relatório e o custo de uma atualização incremental (itens novos e um
+orçamento alterado), que não recarrega as tabelas.
+
+Uso:
+    python benchmarks/analytics_engine_benchmark.py [--items 1000000] [--runs 5]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from database import events  # noqa: E402
+from analytics.engine import AnalyticsEngine, engine_available  # noqa: E402
+
+
+SCHEMA = """
+CREATE TABLE product_types (id INTEGER PRIMARY KEY, key TEXT, label TEXT);
+CREATE TABLE products (id INTEGER PRIMARY KEY, type TEXT, has_dobra INTEGER);
+CREATE TABLE quotes (id INTEGER PRIMARY KEY, client_name TEXT, status TEXT, total REAL,
+                     cost_total REAL, discount_total REAL, discount_type TEXT, created_at TEXT);
+CREATE TABLE quote_items (id INTEGER PRIMARY KEY, quote_id INTEGER, product_id INTEGER, meters REAL,
+                          price_per_meter REAL, discount REAL, total REAL, cost_total REAL);
+CREATE TABLE payments (id INTEGER PRIMARY KEY, quote_id INTEGER, amount REAL, payment_date TEXT);
+CREATE TABLE expenses (id INTEGER PRIMARY KEY, amount REAL, expense_date TEXT);
+CREATE TABLE payroll (id INTEGER PRIMARY KEY, amount REAL, payment_date TEXT);
+"""
+
+STATUSES = ("draft", "sent", "approved", "completed")
+
+
+def _build_database(path: str, items: int):
+    rng = random.Random(7)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO product_types (key, label) VALUES (?, ?)",
+                     [("calha", "Calha"), ("rufo", "Rufo"), ("pingadeira", "Pingadeira")])
+    conn.executemany("INSERT INTO products (id, type, has_dobra) VALUES (?, ?, ?)",
+                     [(i, rng.choice(("calha", "rufo", "pingadeira")), i % 2) for i in range(1, 61)])
+
+    quotes = max(1, items // 8)
+    first_day = date.today() - timedelta(days=5 * 365)
+    quote_rows, item_rows = [], []
+    for qid in range(1, quotes + 1):
+        created = first_day + timedelta(days=rng.randrange(5 * 365))
+        subtotal = cost = 0.0
+        for _ in range(8):
+            meters = rng.uniform(1, 30)
+            price = rng.uniform(20, 90)
+            discount = rng.choice((0, 0, 0, 2, 5))
+            total = meters * (price - discount)
+            item_cost = meters * price * rng.uniform(0.4, 0.7)
+            subtotal += total
+            cost += item_cost
+            item_rows.append((qid, rng.randrange(1, 61), meters, price - discount, discount, total, item_cost))
+        quote_rows.append((f"Cliente {rng.randrange(quotes // 3 + 1)}", rng.choice(STATUSES),
+                           subtotal, cost, 0, "percentage", created.isoformat()))
+    conn.executemany("INSERT INTO quotes (client_name, status, total, cost_total, discount_total,"
+                     " discount_type, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)", quote_rows)
+    conn.executemany("INSERT INTO quote_items (quote_id, product_id, meters, price_per_meter,"
+                     " discount, total, cost_total) VALUES (?, ?, ?, ?, ?, ?, ?)", item_rows)
+    conn.executemany("INSERT INTO payments (quote_id, amount, payment_date) VALUES (?, ?, ?)",
+                     [(rng.randrange(1, quotes + 1), rng.uniform(100, 3000),
+                       (first_day + timedelta(days=rng.randrange(5 * 365))).isoformat())
+                      for _ in range(quotes)])
+    conn.executemany("INSERT INTO expenses (amount, expense_date) VALUES (?, ?)",
+                     [(rng.uniform(50, 2000), (first_day + timedelta(days=d)).isoformat())
+                      for d in range(0, 5 * 365, 3)])
+    conn.commit()
+    conn.close()
+
+
+def _time(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000, help="itens de orçamento sintéticos")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not engine_available():
+        print("NumPy não está instalado; benchmark não executado.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        t0 = time.perf_counter()
+        _build_database(path, args.items)
+        print(f"Banco sintético ({args.items:,} itens) criado em {time.perf_counter() - t0:.1f} s\n")
+
+        engine = AnalyticsEngine(connect=lambda: sqlite3.connect(path))
+        t0 = time.perf_counter()
+        engine.sync()
+        print(f"Carga inicial das colunas:      {(time.perf_counter() - t0) * 1000:9.1f} ms (uma vez)")
+
+        reports = {
+            "Faturamento por mês": lambda: engine.group_by("quotes", "date", "total", bin="month"),
+            "Faturamento por semana (itens)": lambda: engine.group_by("items", "date", "total", bin="week"),
+            "Margem por tipo de produto": engine.product_type_margin,
+            "Receita por coorte": engine.client_cohort_revenue,
+            "Contas a receber por idade": engine.receivables_aging,
+            "Simulação (dobra +R$2/m)": lambda: engine.what_if_repricing(dobra_delta=2.0),
+        }
+        for name, report in reports.items():
+            print(f"{name + ':':31} {_time(report, args.runs):9.1f} ms (mediana)")
+
+        # Atualização incremental: 100 itens novos e um orçamento alterado
+        conn = sqlite3.connect(path)
+        cursor = conn.executemany(
+            "INSERT INTO quote_items (quote_id, product_id, meters, price_per_meter, discount, total, cost_total)"
+            " VALUES (1, 1, 2, 50, 0, 100, 60)", [()] * 100)
+        last = conn.execute("SELECT MAX(id) FROM quote_items").fetchone()[0]
+        conn.execute("UPDATE quotes SET status = 'completed' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        events.publish(events.QUOTE_ITEM, range(last - 99, last + 1), events.CREATED)
+        events.publish(events.QUOTE, 1, events.UPDATED)
+        t0 = time.perf_counter()
+        engine.sync()
+        print(f"\nAtualização incremental:        {(time.perf_counter() - t0) * 1000:9.1f} ms "
+              f"({cursor.rowcount} itens + 1 orçamento)")
+        engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
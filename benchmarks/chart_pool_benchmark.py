@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark de Renderização de Gráficos em Paralelo
+Renderiza seis gráficos (os da tela de Relatórios) em série, no mesmo processo,
+e pelo pool de processos de analytics/chart_service.py. O aquecimento do pool
+(subir os workers e importar o matplotlib) é medido à parte. O cache de
+gráficos é desativado para que as duas medições façam o trabalho completo.
+
+Uso:
+    python benchmarks/chart_pool_benchmark.py [--runs 3] [--months 24] [--workers 4] [--width 750]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _sample_specs(months: int, width: int):
+    from analytics.chart_service import ChartSpec
+
+    rng = random.Random(42)
+    analytics = []
+    for i in range(months):
+        revenue = rng.uniform(5000, 40000)
+        cost = revenue * rng.uniform(0.4, 0.8)
+        analytics.append({
+            "period": f"{2020 + i // 12}-{i % 12 + 1:02d}",
+            "revenue": revenue, "cost": cost, "profit": revenue - cost,
+        })
+    specs = [
+        ChartSpec("profit_vs_cost", analytics),
+        ChartSpec("profit_evolution", analytics),
+        ChartSpec("quotes_by_status", {"draft": 12, "sent": 7, "approved": 20, "completed": 31}),
+        ChartSpec("pie", {"labels": ["Despesas", "Folha de Pagamento"],
+                          "values": [18000.0, 42000.0], "title": "Saídas: Despesas vs Folha"}),
+        ChartSpec("pie", {"labels": ["Receita Recebida", "Despesas + Folha"],
+                          "values": [95000.0, 60000.0], "title": "Receita vs Total de Saídas"}),
+        ChartSpec("pie", {"labels": ["Material", "Transporte", "Aluguel", "Outros"],
+                          "values": [9000.0, 4000.0, 3500.0, 1500.0], "title": "Despesas por Categoria"}),
+    ]
+    # Largura 0: PNG de 150 dpi para arquivo; senão, buffer RGBA no tamanho de exibição
+    return [spec._replace(size=width or None) for spec in specs]
+
+
+def _disable_cache():
+    """Faz todo lookup falhar e não guarda nada (mede só a renderização)."""
+    from analytics import chart_cache
+    chart_cache.lookup = lambda key: None
+    chart_cache.store_png = lambda key, png: png
+    chart_cache.store_rgba = lambda key, width, height, rgba: rgba
+
+
+def _serial(specs) -> float:
+    from analytics.chart_service import _render_spec
+    t0 = time.perf_counter()
+    for spec in specs:
+        _render_spec(tuple(spec))
+    return time.perf_counter() - t0
+
+
+def _pooled(service, specs) -> float:
+    t0 = time.perf_counter()
+    for _ in service.render_many(specs):
+        pass
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--months", type=int, default=24, help="meses de dados por gráfico")
+    parser.add_argument("--workers", type=int, default=None, help="workers do pool (padrão: núcleos - 1, até 4)")
+    parser.add_argument("--width", type=int, default=750, help="largura de exibição em px (0 = PNG para arquivo)")
+    args = parser.parse_args()
+
+    try:
+        from lazy_imports import get_pyplot
+        get_pyplot()
+    except ImportError:
+        print("matplotlib não está instalado; benchmark não executado.")
+        return 1
+
+    from analytics.chart_service import ChartService
+
+    _disable_cache()
+    specs = _sample_specs(args.months, args.width)
+
+    # Aquecimento do processo atual (import do matplotlib e fontes)
+    _serial(specs[:1])
+
+    service = ChartService(max_workers=args.workers)
+    t0 = time.perf_counter()
+    service.warm_up()
+    for _ in service.render_many(specs[:service.max_workers]):
+        pass
+    warm_up = time.perf_counter() - t0
+
+    serial = [_serial(specs) for _ in range(args.runs)]
+    pooled = [_pooled(service, specs) for _ in range(args.runs)]
+    service.shutdown()
+
+    serial_ms = statistics.median(serial) * 1000
+    pooled_ms = statistics.median(pooled) * 1000
+    print(f"Gráficos: {len(specs)}  |  execuções: {args.runs}  |  workers: {service.max_workers}")
+    print(f"Aquecimento do pool:     {warm_up * 1000:8.1f} ms (uma vez por sessão)")
+    print(f"Em série (mediana):      {serial_ms:8.1f} ms")
+    print(f"Pool de processos:       {pooled_ms:8.1f} ms")
+    print(f"Aceleração:              {serial_ms / pooled_ms:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
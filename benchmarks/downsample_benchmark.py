@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark de Redução de Pontos
+Mede o tempo de renderização dos gráficos de linha e de barras conforme o
+tamanho da série cresce (12 meses até ~10 anos de dados diários). Com a
+redução por LTTB/junção de barras o tempo deve ficar praticamente constante.
+Sem o matplotlib instalado mede apenas a redução em si.
+
+Uso:
+    python benchmarks/downsample_benchmark.py [--sizes 12,365,3650]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from analytics.downsample import downsample_lines, max_bars_for_width, merge_bar_buckets  # noqa: E402
+
+
+def _series(size: int):
+    rng = random.Random(size)
+    data = []
+    for i in range(size):
+        revenue = 20000 + 8000 * math.sin(i / 30) + rng.uniform(-3000, 3000)
+        cost = revenue * rng.uniform(0.4, 0.8)
+        data.append({"period": f"d{i:05d}", "revenue": revenue, "cost": cost, "profit": revenue - cost})
+    return data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="12,365,3650", help="tamanhos das séries, separados por vírgula")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    try:
+        from lazy_imports import get_pyplot
+        get_pyplot()
+        from analytics.charts import create_profit_evolution_chart, create_profit_vs_cost_chart
+    except ImportError:
+        create_profit_evolution_chart = create_profit_vs_cost_chart = None
+        print("matplotlib não está instalado; medindo apenas a redução de pontos.\n")
+
+    print(f"{'pontos':>8} {'redução (ms)':>14} {'linhas (ms)':>12} {'barras (ms)':>12}")
+    for size in sizes:
+        data = _series(size)
+        labels = [d["period"] for d in data]
+
+        t0 = time.perf_counter()
+        downsample_lines(labels, {"revenue": [d["revenue"] for d in data],
+                                  "profit": [d["profit"] for d in data]}, 1500)
+        merge_bar_buckets(labels, {"revenue": [d["revenue"] for d in data],
+                                   "cost": [d["cost"] for d in data]}, max_bars_for_width(1500, 2))
+        reduce_ms = (time.perf_counter() - t0) * 1000
+
+        line_ms = bar_ms = float("nan")
+        if create_profit_evolution_chart is not None:
+            t0 = time.perf_counter()
+            create_profit_evolution_chart(data)
+            line_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            create_profit_vs_cost_chart(data)
+            bar_ms = (time.perf_counter() - t0) * 1000
+
+        print(f"{size:>8} {reduce_ms:>14.1f} {line_ms:>12.1f} {bar_ms:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark da Importação de Planilha
+Gera um CSV de catálogo de fornecedor (decimais no formato brasileiro, tipos
+pelo rótulo) e mede, em um banco temporário com o schema real, a leitura e
+validação em blocos com o diff (services/importer.preview_import) e a
+gravação em uma transação com um único backup (apply_import). Depois
+reimporta o arquivo com 10% dos preços alterados (caminho de atualização).
+
+Uso:
+    python benchmarks/import_benchmark.py [--rows 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _write_catalog(path: str, rows: int, bump: bool = False):
+    rng = random.Random(3)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Produto;Tipo;Largura;Preço;Custo;Dobra;Cobrança\n")
+        for i in range(rows):
+            price = rng.randrange(1_000, 250_000) / 100
+            if bump and i % 10 == 0:
+                price *= 1.1
+            price_text = f"{price:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            f.write(f"Produto {i};{rng.choice(('Calha', 'Rufo', 'Pingadeira'))};0,{rng.randrange(10, 99)};"
+                    f"{price_text};{rng.randrange(5, 80)};{rng.choice(('sim', 'não'))};metro\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    from database import db
+    from services import importer
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.init_database()
+        path = os.path.join(tmp, "catalogo.csv")
+
+        for label, bump in (("Importação inicial", False), ("Reimportação (10% alterados)", True)):
+            _write_catalog(path, args.rows, bump)
+            t0 = time.perf_counter()
+            preview = importer.preview_import(path, "products")
+            preview_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            result = importer.apply_import(preview)
+            apply_ms = (time.perf_counter() - t0) * 1000
+            print(f"{label}:")
+            print(f"  Leitura + validação + diff: {preview_ms:9.1f} ms "
+                  f"({len(preview.inserts):,} novos, {len(preview.updates):,} alterados, "
+                  f"{len(preview.errors)} erros)")
+            print(f"  Gravação (1 transação):     {apply_ms:9.1f} ms "
+                  f"({result['created']:,} criados, {result['updated']:,} atualizados)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
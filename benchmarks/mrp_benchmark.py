@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark da Previsão de Compras (MRP)
+Cria um banco temporário com o schema real, um catálogo com receitas de
+materiais (metro, cm e unidade), dezenas de milhares de orçamentos aprovados
+com parte agendada na agenda de instalações, e mede a projeção de estoque de
+todos os materiais (services/mrp): a consulta agregada e o pós-processamento
+NumPy, separadamente.
+
+Uso:
+    python benchmarks/mrp_benchmark.py [--quotes 20000] [--products 200] [--materials 60]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _build_database(db, quotes: int, products: int, materials: int, today: date):
+    rng = random.Random(11)
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO inventory (name, type, quantity, unit, min_stock) VALUES (?, 'chapa', ?, 'm', ?)",
+        [(f"Material {i}", rng.uniform(0, 20_000), rng.choice((0, 100, 500))) for i in range(1, materials + 1)])
+    conn.executemany(
+        "INSERT INTO products (name, type, measure, price_per_meter) VALUES (?, 'calha', 0.3, 50)",
+        [(f"Produto {i}",) for i in range(1, products + 1)])
+    conn.executemany(
+        "INSERT INTO product_materials (product_id, inventory_id, quantity_per_unit, unit_type) VALUES (?, ?, ?, ?)",
+        [(p, rng.randrange(1, materials + 1), rng.uniform(0.1, 2), rng.choice(("metro", "cm", "unidade")))
+         for p in range(1, products + 1) for _ in range(3)])
+    statuses = [rng.choice(("approved", "approved", "completed", "draft")) for _ in range(quotes)]
+    conn.executemany(
+        "INSERT INTO quotes (client_name, status, stock_deducted) VALUES (?, ?, ?)",
+        [(f"Cliente {q + 1}", s, int(s != "draft")) for q, s in enumerate(statuses)])
+    conn.executemany(
+        "INSERT INTO quote_items (quote_id, product_id, product_name, measure, meters, price_per_meter, total)"
+        " VALUES (?, ?, 'Produto', 0.3, ?, 50, 0)",
+        [(q, rng.randrange(1, products + 1), rng.uniform(1, 20)) for q in range(1, quotes + 1) for _ in range(4)])
+    conn.executemany(
+        "INSERT INTO installations (quote_id, client_name, address, scheduled_date, status)"
+        " VALUES (?, 'Cliente', '', ?, ?)",
+        [(q, f"{(today + timedelta(days=rng.randrange(-30, 180))).isoformat()} 08:00",
+          rng.choice(("pending", "in-progress", "completed", "cancelled")))
+         for q in range(1, quotes + 1) if rng.random() < 0.7])
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=20_000)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--materials", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from database import db
+    from lazy_imports import get_numpy
+    from services import mrp
+    get_numpy()  # aquecimento: a importação do NumPy não entra na medição
+    today = date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        _build_database(db, args.quotes, args.products, args.materials, today)
+        print(f"Banco sintético criado em {time.perf_counter() - t0:.1f} s\n")
+
+        query, total = [], []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            rows = db.get_material_demand(today)
+            query.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            plan = mrp.build_material_plan(today)
+            total.append((time.perf_counter() - t0) * 1000)
+
+        stockouts = sum(1 for r in plan.reorder if r.stockout_date)
+        print(f"Consulta agregada (material x dia): {min(query):8.1f} ms ({len(rows):,} linhas)")
+        print(f"Previsão completa (consulta+NumPy): {min(total):8.1f} ms")
+        print(f"Materiais a repor:                  {len(plan.reorder):8d} ({stockouts} com ruptura)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
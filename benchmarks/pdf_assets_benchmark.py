@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark dos Recursos Gráficos do PDF
+Mede o tempo por PDF de orçamento (logo + 5 ícones de pagamento) com o cache
+de services/pdf_assets e sem ele (variantes descartadas antes de cada PDF,
+equivalente ao comportamento antigo de redimensionar o logo e interpretar os
+SVGs em toda geração). Usa um banco temporário.
+
+Uso:
+    python benchmarks/pdf_assets_benchmark.py [--pdfs 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from database import db  # noqa: E402
+
+
+SAMPLE_QUOTE = {
+    "id": 1,
+    "client_name": "Cliente Exemplo",
+    "quote_type": "instalado",
+    "items": [
+        {"product_name": "Calha Moldura", "meters": 12.5, "price_per_meter": 48.0, "total": 600.0},
+        {"product_name": "Rufo Pingadeira", "meters": 8.0, "price_per_meter": 35.0, "total": 280.0},
+    ],
+    "total": 880.0,
+    "payment_methods": "pix,credito,debito,boleto,dinheiro,transferencia",
+    "contract_terms": "Garantia de 12 meses para a instalação. " * 4,
+    "created_at": "2026-01-15",
+}
+
+
+def _run(generate, output_dir: str, count: int, before_each=None) -> list:
+    samples = []
+    for i in range(count):
+        if before_each:
+            before_each()
+        t0 = time.perf_counter()
+        generate(SAMPLE_QUOTE, {"company_name": "Quality Calhas"}, os.path.join(output_dir, f"q{i}.pdf"))
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdfs", type=int, default=50, help="PDFs gerados em cada modo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        from services import pdf_assets
+        from services.pdf_generator import generate_quote_pdf
+
+        # Aquecimento (imports do fpdf2, fontes, schema do banco)
+        _run(generate_quote_pdf, tmp, 1)
+
+        without = _run(generate_quote_pdf, tmp, args.pdfs,
+                       before_each=lambda: pdf_assets.clear_asset_cache(disk=True))
+        pdf_assets.clear_asset_cache(disk=True)
+        first = _run(generate_quote_pdf, tmp, 1)[0]
+        cached = _run(generate_quote_pdf, tmp, args.pdfs)
+
+        print(f"{'modo':<26} {'mediana (ms)':>13} {'p95 (ms)':>10}")
+        for name, samples in (("sem cache", without), ("com cache", cached)):
+            p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+            print(f"{name:<26} {statistics.median(samples):>13.1f} {p95:>10.1f}")
+        print(f"{'primeiro PDF (preparo)':<26} {first:>13.1f}")
+        print(f"\nEstatísticas: {pdf_assets.asset_cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
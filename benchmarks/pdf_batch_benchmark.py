@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark da Exportação de PDFs em Lote
+Cria um banco temporário com orçamentos aprovados e mede a exportação com
+1, 2, 4... workers (até o número de núcleos), mais o documento único com
+marcadores. A vazão (PDFs/s) deve crescer com o número de núcleos.
+
+Uso:
+    python benchmarks/pdf_batch_benchmark.py [--quotes 200] [--items 8]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from database import db  # noqa: E402
+
+
+def _populate(path: str, quotes: int, items: int):
+    rng = random.Random(11)
+    conn = sqlite3.connect(path)
+    for qid in range(1, quotes + 1):
+        rows = []
+        for _ in range(items):
+            meters = round(rng.uniform(1, 30), 2)
+            price = round(rng.uniform(20, 90), 2)
+            rows.append((qid, rng.choice(("Calha Moldura", "Rufo", "Pingadeira")), 0.3, meters, price,
+                         round(meters * price, 2)))
+        total = sum(r[-1] for r in rows)
+        conn.execute(
+            "INSERT INTO quotes (id, client_name, client_address, total, status, payment_methods,"
+            " contract_terms, created_at) VALUES (?, ?, ?, ?, 'approved', 'pix,credito,boleto', ?, ?)",
+            (qid, f"Cliente {qid}", "Rua Exemplo, 123", total, "Garantia de 12 meses. " * 5,
+             f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"))
+        conn.executemany("INSERT INTO quote_items (quote_id, product_name, measure, meters,"
+                         " price_per_meter, total) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        if qid % 3 == 0:
+            conn.execute("INSERT INTO payments (quote_id, amount, payment_method) VALUES (?, ?, 'pix')",
+                         (qid, total / 2))
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=200)
+    parser.add_argument("--items", type=int, default=8, help="itens por orçamento")
+    args = parser.parse_args()
+
+    from services.pdf_batch import export_quotes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.ensure_database()
+        _populate(db.DB_PATH, args.quotes, args.items)
+
+        cores = os.cpu_count() or 1
+        counts = sorted({1, *[n for n in (2, 4, 8, 16) if n <= cores], cores})
+        print(f"{args.quotes} orçamentos × {args.items} itens, {cores} núcleo(s)\n")
+        print(f"{'workers':>8} {'tempo (s)':>10} {'PDFs/s':>8} {'erros':>6}")
+        for workers in counts:
+            out_dir = os.path.join(tmp, f"out{workers}")
+            result = export_quotes(out_dir, status_filter="approved", max_workers=workers)
+            print(f"{workers:>8} {result.elapsed:>10.2f} {len(result.files) / result.elapsed:>8.1f} "
+                  f"{len(result.errors):>6}")
+
+        result = export_quotes(os.path.join(tmp, "merged"), status_filter="approved", merged=True)
+        size_kb = os.path.getsize(result.merged_path) / 1024
+        print(f"\nDocumento único: {result.elapsed:.2f} s, {size_kb:.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
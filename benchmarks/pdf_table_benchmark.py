@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark da Tabela de Itens do PDF
+Gera orçamentos com 10, 100, 1.000 e 5.000 itens e mede a tabela em fluxo
+(services/pdf_table) contra o laço antigo de fpdf.cell por célula, além do
+PDF completo (em memória). O tempo por item deve ficar constante: escala
+linear com o número de itens.
+
+Uso:
+    python benchmarks/pdf_table_benchmark.py [--sizes 10 100 1000 5000] [--group]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+SETTINGS = {"company_name": "Quality Calhas", "company_cnpj": "12.345.678/0001-90"}
+NAMES = ("Calha Moldura", "Rufo de encosto", "Pingadeira", "Calha Platibanda com acabamento pintado")
+
+
+def _quote(items: int) -> dict:
+    rows = []
+    for i in range(items):
+        meters = 1.5 + i % 23
+        rows.append({"product_name": f"{NAMES[i % len(NAMES)]} {i + 1}", "meters": meters, "measure": 0.3,
+                     "price_per_meter": 48.0, "total": round(meters * 48.0, 2)})
+    return {"id": 1, "client_name": "Cliente", "items": rows, "total": sum(r["total"] for r in rows),
+            "created_at": "2026-01-15", "payment_summary": {"total_paid": 0.0, "balance": 0.0}}
+
+
+def _cell_rows(pdf, items, y_pos, new_page):
+    """Laço antigo: fontes, cores e fpdf.cell célula a célula."""
+    from services.pdf_generator import GREEN_BADGE, MARGIN, PAGE_LIMIT, TEXT_DARK, WHITE, _fmt_currency, _table_columns
+    col_product, col_qty, col_unit_price, col_subtotal = _table_columns(pdf.w - 2 * MARGIN)
+    for item in items:
+        if y_pos + 12 > PAGE_LIMIT:
+            y_pos = new_page()
+        pdf.set_font('Helvetica', '', 10)
+        pdf.set_text_color(*TEXT_DARK)
+        pdf.set_xy(MARGIN, y_pos)
+        pdf.cell(col_product, 7, f"{item['product_name']} (0.30m)")
+        pdf.set_font('Helvetica', '', 9)
+        pdf.set_xy(MARGIN + col_product, y_pos)
+        pdf.cell(col_qty, 7, f"{item['meters']:.2f}m", align='C')
+        pdf.set_xy(MARGIN + col_product + col_qty, y_pos)
+        pdf.cell(col_unit_price, 7, _fmt_currency(item['price_per_meter']), align='C')
+        badge_x = MARGIN + col_product + col_qty + col_unit_price + 2
+        pdf.set_fill_color(*GREEN_BADGE)
+        pdf.rect(badge_x, y_pos, col_subtotal - 7, 7, 'F')
+        pdf.set_font('Helvetica', 'B', 9)
+        pdf.set_text_color(*WHITE)
+        pdf.set_xy(badge_x, y_pos)
+        pdf.cell(col_subtotal - 7, 7, _fmt_currency(item['total']), align='C')
+        y_pos += 10
+    return sum(item.get('total', 0) for item in items)
+
+
+def _time_table(render, items) -> float:
+    from services.pdf_generator import QuotePDF
+
+    pdf = QuotePDF()
+    pdf.add_page()
+
+    def new_page():
+        pdf.add_page()
+        return 20
+
+    t0 = time.perf_counter()
+    render(pdf, items, 40, new_page)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--group", action="store_true", help="agrupar itens por tipo de produto")
+    args = parser.parse_args()
+
+    from services.pdf_generator import build_quote_pdf
+    from services.pdf_table import render_item_table
+
+    settings = dict(SETTINGS, pdf_group_items=1 if args.group else 0)
+    build_quote_pdf(_quote(10), settings)  # aquecimento (fpdf2, logo, modelo)
+
+    def stream(pdf, items, y_pos, new_page):
+        return render_item_table(pdf, items, y_pos, new_page, group_by_type=args.group)
+
+    print(f"{'itens':>6} {'tabela (ms)':>12} {'µs/item':>8} {'cell (ms)':>10} {'µs/item':>8} "
+          f"{'PDF (ms)':>9} {'páginas':>8}")
+    for size in args.sizes:
+        quote = _quote(size)
+        table_ms = _time_table(stream, quote["items"])
+        cell_ms = _time_table(_cell_rows, quote["items"])
+        t0 = time.perf_counter()
+        data = build_quote_pdf(quote, settings)
+        pdf_ms = (time.perf_counter() - t0) * 1000
+        pages = data.count(b"/Type /Page\n") or data.count(b"/Type /Page")
+        print(f"{size:>6} {table_ms:>12.1f} {table_ms * 1000 / size:>8.1f} {cell_ms:>10.1f} "
+              f"{cell_ms * 1000 / size:>8.1f} {pdf_ms:>9.1f} {pages:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark do Modelo Pré-compilado do PDF
+Gera 1.000 orçamentos em sequência (em memória, sem gravar arquivos) com o
+modelo das configurações reaproveitado e com o modelo descartado antes de
+cada PDF (faixa, dados da empresa, selos, contrato e assinaturas refeitos
+a cada orçamento, como antes, mais o custo de gravar os fragmentos — limite
+superior). Só a tabela de itens e os totais mudam entre os orçamentos.
+
+Uso:
+    python benchmarks/pdf_template_benchmark.py [--pdfs 1000] [--items 8]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+SETTINGS = {
+    "company_name": "Quality Calhas",
+    "company_cnpj": "12.345.678/0001-90",
+    "company_address": "Rua das Flores, 123 - Centro",
+    "company_phone": "(11) 99999-0000",
+}
+
+
+def _quote(index: int, items: int) -> dict:
+    rows = []
+    for i in range(items):
+        meters = 2.5 + (index + i) % 17
+        rows.append({"product_name": f"Calha Moldura {i + 1}", "meters": meters, "measure": 0.3,
+                     "price_per_meter": 48.0, "total": round(meters * 48.0, 2)})
+    return {
+        "id": index + 1,
+        "client_name": f"Cliente {index + 1}",
+        "quote_type": "instalado",
+        "items": rows,
+        "total": sum(r["total"] for r in rows),
+        "payment_methods": "pix,credito,debito,boleto",
+        "contract_terms": "Garantia de 12 meses para a instalação. " * 4,
+        "created_at": "2026-01-15",
+        "payment_summary": {"total_paid": 0.0, "balance": 0.0},
+    }
+
+
+def _run(build, quotes: list, before_each=None) -> list:
+    samples = []
+    for quote in quotes:
+        if before_each:
+            before_each()
+        t0 = time.perf_counter()
+        build(quote, SETTINGS)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdfs", type=int, default=1000, help="PDFs gerados em cada modo")
+    parser.add_argument("--items", type=int, default=8, help="itens por orçamento")
+    args = parser.parse_args()
+
+    from services import pdf_generator
+    quotes = [_quote(i, args.items) for i in range(args.pdfs)]
+
+    # Aquecimento (imports do fpdf2, logo e ícones)
+    _run(pdf_generator.build_quote_pdf, quotes[:1])
+
+    pdf_generator.clear_templates()
+    t0 = time.perf_counter()
+    pdf_generator.get_template(SETTINGS)
+    for method in ("pix", "credito", "debito", "boleto"):
+        pdf_generator.get_template(SETTINGS).badge(method)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    results = []
+    for name, before_each in (("modelo refeito", pdf_generator.clear_templates), ("com modelo", None)):
+        t0 = time.perf_counter()
+        samples = _run(pdf_generator.build_quote_pdf, quotes, before_each)
+        results.append((name, samples, time.perf_counter() - t0))
+
+    print(f"{args.pdfs} orçamentos × {args.items} itens\n")
+    print(f"{'modo':<15} {'total (s)':>10} {'PDFs/s':>8} {'mediana (ms)':>13} {'p95 (ms)':>10}")
+    for name, samples, total in results:
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{name:<15} {total:>10.2f} {len(samples) / total:>8.1f} "
+              f"{statistics.median(samples):>13.2f} {p95:>10.2f}")
+    print(f"\nPreparo do modelo (uma vez por versão das configurações): {build_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
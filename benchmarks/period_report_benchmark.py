@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark do Relatório Financeiro do Período
+Cria um banco temporário com o schema real (padrão: 100 mil orçamentos em
+um ano, um pagamento por orçamento e despesas diárias) e mede o relatório
+anual completo (services/report_generator): consultas agregadas, tabelas
+lidas do cursor e o PDF em memória. Sem matplotlib o relatório sai sem os
+gráficos.
+
+Uso:
+    python benchmarks/period_report_benchmark.py [--quotes 100000] [--year 2025]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+STATUSES = ("draft", "sent", "approved", "completed")
+CATEGORIES = ("geral", "material", "transporte", "aluguel", "manutencao")
+
+
+def _build_database(db, quotes: int, year: int):
+    rng = random.Random(11)
+    first = date(year, 1, 1)
+    conn = db.get_connection()
+    rows = []
+    for i in range(quotes):
+        day = first + timedelta(days=rng.randrange(365))
+        total = rng.uniform(200, 6000)
+        cost = total * rng.uniform(0.4, 0.7)
+        rows.append((f"Cliente {rng.randrange(quotes // 3 + 1)}", rng.choice(STATUSES),
+                     total, cost, total - cost, f"{day.isoformat()}T09:00:00"))
+    conn.executemany("INSERT INTO quotes (client_name, status, total, cost_total, profit, created_at)"
+                     " VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany("INSERT INTO payments (quote_id, amount, payment_method, payment_date) VALUES (?, ?, ?, ?)",
+                     [(rng.randrange(1, quotes + 1), rng.uniform(100, 4000), "pix",
+                       (first + timedelta(days=rng.randrange(365))).isoformat()) for _ in range(quotes)])
+    conn.executemany("INSERT INTO expenses (description, category, amount, expense_date) VALUES (?, ?, ?, ?)",
+                     [(f"Despesa {i + 1}", rng.choice(CATEGORIES), rng.uniform(30, 2500),
+                       (first + timedelta(days=i % 365)).isoformat()) for i in range(3 * 365)])
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=100_000, help="orçamentos sintéticos no ano")
+    parser.add_argument("--year", type=int, default=2025)
+    args = parser.parse_args()
+
+    from database import db
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        _build_database(db, args.quotes, args.year)
+        print(f"Banco sintético ({args.quotes:,} orçamentos) criado em {time.perf_counter() - t0:.1f} s\n")
+
+        from services.report_generator import build_period_report
+        start, end = date(args.year, 1, 1), date(args.year, 12, 31)
+
+        t0 = time.perf_counter()
+        overview = db.get_period_overview(start, end)
+        db.get_analytics_series("month", start, end)
+        db.get_period_expenses_by_category(start, end)
+        aggregates_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        receivables = sum(1 for _ in db.iter_receivables(end))
+        cursor_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        report = build_period_report(start, end, {"company_name": "Quality Calhas"})
+        total_s = time.perf_counter() - t0
+
+        print(f"Consultas agregadas:            {aggregates_ms:9.1f} ms")
+        print(f"Contas a receber (cursor):      {cursor_ms:9.1f} ms ({receivables:,} linhas)")
+        print(f"Relatório completo:             {total_s * 1000:9.1f} ms")
+        print(f"\n{report.pages:,} páginas, {len(report.data) / 1024 / 1024:.1f} MB, "
+              f"{overview['quote_count']:,} orçamentos no período")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark do Reajuste de Preços em Massa
+Cria um banco temporário com o schema real, um catálogo de 10 mil produtos
+(metade com dobra) e orçamentos com 100 mil itens em rascunho/enviados, e
+mede db.reprice_products: a simulação (dry-run, transação desfeita) e a
+aplicação com os itens e totais dos orçamentos abertos recalculados por
+conjunto. A aplicação inclui o único backup ao final.
+
+Uso:
+    python benchmarks/reprice_benchmark.py [--products 10000] [--items 100000] [--percent 7.5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+ITEMS_PER_QUOTE = 5
+
+
+def _build_database(db, products: int, items: int):
+    rng = random.Random(5)
+    dobra = db.get_dobra_value()
+    conn = db.get_connection()
+    catalog = [(f"Produto {i}", rng.choice(("calha", "rufo", "pingadeira")), rng.randrange(1_000, 90_000) / 100,
+                rng.randrange(2)) for i in range(products)]
+    conn.executemany(
+        "INSERT INTO products (name, type, measure, price_per_meter, cost, has_dobra) VALUES (?, ?, 0.3, ?, 10, ?)",
+        catalog)
+    quotes = items // ITEMS_PER_QUOTE
+    conn.executemany(
+        "INSERT INTO quotes (client_name, status, discount_total) VALUES (?, ?, ?)",
+        [(f"Cliente {q}", rng.choice(("draft", "sent")), rng.choice((0, 5))) for q in range(quotes)])
+    rows = []
+    for q in range(1, quotes + 1):
+        for _ in range(ITEMS_PER_QUOTE):
+            p = rng.randrange(products)
+            unit = catalog[p][2] + (dobra if catalog[p][3] else 0)
+            meters = rng.uniform(1, 20)
+            rows.append((q, p + 1, meters, unit, meters * unit, meters * 10))
+    conn.executemany(
+        "INSERT INTO quote_items (quote_id, product_id, product_name, measure, meters, price_per_meter, total,"
+        " cost_per_meter, cost_total) VALUES (?, ?, 'Produto', 0.3, ?, ?, ?, 10, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=100_000, help="itens em orçamentos abertos")
+    parser.add_argument("--percent", type=float, default=7.5)
+    args = parser.parse_args()
+
+    from database import db
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.init_database()
+        t0 = time.perf_counter()
+        _build_database(db, args.products, args.items)
+        print(f"Banco sintético criado em {time.perf_counter() - t0:.1f} s\n")
+
+        for label, dry_run in (("Simulação (dry-run)", True), ("Aplicação + backup", False)):
+            t0 = time.perf_counter()
+            report = db.reprice_products("percent", args.percent, reprice_quotes=True, dry_run=dry_run)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:<20} {elapsed:7.2f} s  ({report['products_changed']:,} produtos, "
+                  f"{report['items']:,} itens, {report['quotes']:,} orçamentos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
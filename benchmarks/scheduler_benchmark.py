@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark da Agenda de Equipes
+Cria um banco temporário com o schema real, equipes com capacidade em metros
+e em horas, anos de instalações já agendadas e milhares de orçamentos
+aprovados sem instalação. Mede a carga da agenda de 6 meses
+(services/scheduler), consultas de disponibilidade (próxima vaga livre) e o
+planejador em lote, que deve distribuir todos os pendentes em uma passada.
+
+Uso:
+    python benchmarks/scheduler_benchmark.py [--crews 4] [--pending 500] [--history 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _build_database(db, crews: int, pending: int, history: int, start: date):
+    rng = random.Random(7)
+    for i in range(crews):
+        if i % 2:
+            db.create_crew(f"Equipe {i + 1}", 8, "horas")
+        else:
+            db.create_crew(f"Equipe {i + 1}", 40, "metros")
+
+    conn = db.get_connection()
+    conn.execute("INSERT INTO products (name, type, measure, price_per_meter) VALUES ('Calha', 'calha', 0.3, 50)")
+    quotes = history + pending
+    conn.executemany("INSERT INTO quotes (client_name, status) VALUES (?, ?)",
+                     [(f"Cliente {i + 1}", "approved") for i in range(quotes)])
+    conn.executemany(
+        "INSERT INTO quote_items (quote_id, product_id, product_name, measure, meters, price_per_meter, total)"
+        " VALUES (?, 1, 'Calha', 0.3, ?, 50, 0)",
+        [(q, rng.uniform(4, 30)) for q in range(1, quotes + 1) for _ in range(2)])
+    # Histórico: anos para trás e parte do horizonte já ocupada
+    conn.executemany(
+        "INSERT INTO installations (quote_id, client_name, address, scheduled_date, status, crew_id,"
+        " load_meters, load_hours) VALUES (?, ?, '', ?, ?, ?, ?, ?)",
+        [(q, f"Cliente {q}", f"{(start + timedelta(days=rng.randrange(-1500, 30))).isoformat()} 08:00",
+          rng.choice(("pending", "completed")), rng.randrange(1, crews + 1),
+          rng.uniform(8, 20), rng.uniform(2, 5)) for q in range(1, history + 1)])
+    conn.commit()
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crews", type=int, default=4)
+    parser.add_argument("--pending", type=int, default=500, help="orçamentos aprovados sem instalação")
+    parser.add_argument("--history", type=int, default=20_000, help="instalações já agendadas")
+    parser.add_argument("--queries", type=int, default=1000, help="consultas de próxima vaga")
+    args = parser.parse_args()
+
+    from database import db
+    from lazy_imports import get_numpy
+    from services import scheduler
+    get_numpy()  # aquecimento: a importação do NumPy não entra na medição
+    start = date.today() + timedelta(days=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        _build_database(db, args.crews, args.pending, args.history, start)
+        print(f"Banco sintético criado em {time.perf_counter() - t0:.1f} s\n")
+
+        t0 = time.perf_counter()
+        schedule = scheduler.CrewSchedule.load(start)
+        load_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        jobs = [scheduler.job_from_row(row) for row in db.get_unscheduled_quote_loads()]
+        pending_ms = (time.perf_counter() - t0) * 1000
+
+        rng = random.Random(1)
+        t0 = time.perf_counter()
+        for _ in range(args.queries):
+            schedule.find_next_free_slot(rng.choice(jobs), start + timedelta(days=rng.randrange(150)))
+        query_us = (time.perf_counter() - t0) * 1e6 / args.queries
+
+        t0 = time.perf_counter()
+        plan = schedule.plan(jobs)
+        plan_ms = (time.perf_counter() - t0) * 1000
+
+        last = max((a.slot.day for a in plan.assignments), default=start)
+        print(f"Agenda de {schedule.days} dias ({args.crews} equipes): {load_ms:9.1f} ms")
+        print(f"Orçamentos pendentes + carga:      {pending_ms:9.1f} ms ({len(jobs):,})")
+        print(f"Próxima vaga livre (média):        {query_us:9.1f} µs")
+        print(f"Planejador em lote:                {plan_ms:9.1f} ms "
+              f"({len(plan.assignments):,} agendados até {last:%d/%m/%Y}, {len(plan.unplaced):,} sem vaga)")
+        print(f"Dias acima da capacidade:          {len(schedule.conflicts()):9d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
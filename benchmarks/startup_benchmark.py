@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark de Inicialização
+Mede o custo de importação (python -X importtime) e o tempo até a primeira
+pintura da janela. Sai com código 1 quando o orçamento é estourado ou quando
+algum módulo pesado (matplotlib, fpdf, PIL, tkcolorpicker) é carregado antes
+da primeira pintura — pode ser usado como verificação de regressão (as
+mesmas verificações rodam no pytest em tests/test_startup.py).
+
+Uso:
+    python benchmarks/startup_benchmark.py [--budget-ms 1500] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from lazy_imports import HEAVY_MODULES  # noqa: E402
+
+
+def measure_import_time(top: int = 15):
+    """Executa 'import main' com -X importtime e retorna (total_us, top_modulos, pesados)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=str(ROOT_DIR), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "falha ao importar main")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, self_us, cumulative_us, name = [p.strip() for p in line.replace("import time:", "").split("|")]
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+        except ValueError:
+            continue
+
+    # Módulos de nível superior (sem indentação) somam o tempo total
+    total_us = sum(c for c, _, name in rows if not name.startswith(" "))
+    heavy = sorted({name.strip().split(".")[0] for _, _, name in rows
+                    if name.strip().split(".")[0] in HEAVY_MODULES})
+    rows.sort(reverse=True)
+    return total_us, rows[:top], heavy
+
+
+def measure_first_paint(runs: int = 3):
+    """Inicia o app em modo de medição e retorna a lista de relatórios JSON."""
+    env = dict(os.environ, CALHAGEST_STARTUP_PROBE="1")
+    reports = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "main.py"], cwd=str(ROOT_DIR), env=env,
+            capture_output=True, text=True, timeout=120,
+        )
+        lines = [l for l in result.stdout.splitlines() if l.startswith("{")]
+        if result.returncode != 0 or not lines:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "app não reportou")
+        reports.append(json.loads(lines[-1]))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do CalhaGest")
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="Orçamento máximo (mediana) até a primeira pintura, em ms")
+    parser.add_argument("--runs", type=int, default=3, help="Número de execuções do app")
+    parser.add_argument("--skip-gui", action="store_true",
+                        help="Mede apenas o tempo de importação (sem abrir a janela)")
+    args = parser.parse_args()
+
+    failures = []
+
+    print("== Tempo de importação (python -X importtime -c 'import main') ==")
+    try:
+        total_us, top, heavy = measure_import_time()
+        print(f"Total: {total_us / 1000:.1f} ms")
+        for cumulative, self_us, name in top:
+            print(f"  {cumulative / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name.strip()}")
+        if heavy:
+            failures.append(f"módulos pesados importados na inicialização: {', '.join(heavy)}")
+    except RuntimeError as e:
+        failures.append(f"importação falhou: {e}")
+
+    if not args.skip_gui:
+        print(f"\n== Tempo até a primeira pintura ({args.runs} execuções) ==")
+        try:
+            reports = measure_first_paint(args.runs)
+            paints = [r["first_paint"] for r in reports]
+            ready = [r["dashboard_ready"] for r in reports]
+            median_paint = statistics.median(paints)
+            print(f"Primeira pintura: mediana {median_paint:.1f} ms  (execuções: {paints})")
+            print(f"Dashboard pronto: mediana {statistics.median(ready):.1f} ms")
+            if median_paint > args.budget_ms:
+                failures.append(f"primeira pintura {median_paint:.1f} ms > orçamento {args.budget_ms:.0f} ms")
+            for r in reports:
+                if r.get("heavy_modules_loaded"):
+                    failures.append("módulos pesados carregados antes do dashboard: "
+                                    + ", ".join(r["heavy_modules_loaded"]))
+                    break
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            failures.append(f"não foi possível medir a primeira pintura: {e}")
+
+    if failures:
+        print("\nFALHOU:")
+        for f in failures:
+            print(f"  - {f}")
+        return 1
+    print("\nOK: dentro do orçamento.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
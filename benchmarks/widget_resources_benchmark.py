@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Benchmark de Fontes e Imagens Compartilhadas
+Compara a criação de cards com um ctk.CTkFont por label (comportamento antigo)
+e com o cache de components/resources.py. Mostra tempo por card e a contagem
+de objetos Tk (fontes nomeadas, imagens e widgets).
+
+Uso:
+    python benchmarks/widget_resources_benchmark.py [--cards 200]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import customtkinter as ctk  # noqa: E402
+
+from components.resources import get_font, clear_resource_caches, resource_cache_stats  # noqa: E402
+
+
+def _count_widgets(widget) -> int:
+    return 1 + sum(_count_widgets(w) for w in widget.winfo_children())
+
+
+def _tk_counts(root) -> dict:
+    return {
+        "fonts": len(root.tk.splitlist(root.tk.call("font", "names"))),
+        "images": len(root.tk.splitlist(root.tk.call("image", "names"))),
+        "widgets": _count_widgets(root),
+    }
+
+
+def _build_card(parent, font_factory, index):
+    """Card equivalente ao de orçamentos: título, badges e linhas de valores."""
+    card = ctk.CTkFrame(parent, corner_radius=12, border_width=1)
+    card.pack(fill="x", pady=4)
+    ctk.CTkLabel(card, text=f"Cliente {index}", font=font_factory(size=15, weight="bold")).pack(anchor="w")
+    ctk.CTkLabel(card, text="Rua Exemplo, 123", font=font_factory(size=12)).pack(anchor="w")
+    ctk.CTkLabel(card, text="Aprovado", font=font_factory(size=11, weight="bold")).pack(anchor="w")
+    ctk.CTkLabel(card, text="R$ 1.234,56", font=font_factory(size=18, weight="bold")).pack(anchor="w")
+    ctk.CTkLabel(card, text="Lucro: R$ 321,00", font=font_factory(size=12)).pack(anchor="w")
+    ctk.CTkButton(card, text="Ver", font=font_factory(size=12)).pack(side="left")
+    ctk.CTkButton(card, text="PDF", font=font_factory(size=12)).pack(side="left")
+    return card
+
+
+def _run(root, font_factory, cards: int):
+    container = ctk.CTkFrame(root)
+    container.pack(fill="both", expand=True)
+    root.update_idletasks()
+    before = _tk_counts(root)
+    t0 = time.perf_counter()
+    for i in range(cards):
+        _build_card(container, font_factory, i)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - t0
+    after = _tk_counts(root)
+    container.destroy()
+    root.update_idletasks()
+    return elapsed, {k: after[k] - before[k] for k in after}
+
+
+def _new_font(size=13, weight="normal"):
+    return ctk.CTkFont(size=size, weight=weight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do cache de fontes/imagens")
+    parser.add_argument("--cards", type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        root = ctk.CTk()
+    except Exception as e:
+        print(f"Não foi possível abrir uma janela Tk: {e}")
+        return 2
+    root.withdraw()
+
+    clear_resource_caches(fonts=True)
+    results = [
+        ("CTkFont por label", *_run(root, _new_font, args.cards)),
+        ("cache get_font()", *_run(root, get_font, args.cards)),
+    ]
+    root.destroy()
+
+    print(f"{args.cards} cards")
+    print(f"{'modo':<20} {'total (ms)':>11} {'ms/card':>8} {'fontes Tk':>10} {'imagens Tk':>11} {'widgets':>8}")
+    for name, elapsed, delta in results:
+        print(f"{name:<20} {elapsed * 1000:>11.1f} {elapsed * 1000 / args.cards:>8.3f} "
+              f"{delta['fonts']:>10} {delta['images']:>11} {delta['widgets']:>8}")
+    print(f"Estatísticas do cache: {resource_cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
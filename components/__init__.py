@@ -18,10 +18,33 @@ from .dialogs import (
     parse_decimal,
 )
 
+from .import_dialog import (
+    ImportDialog,
+)
+
 from .navigation import (
     Sidebar,
 )
 
+from .pdf_preview import (
+    PdfPreviewDialog,
+)
+
+from .progressive import (
+    ProgressiveLoader,
+    Skeleton,
+)
+
+from .resources import (
+    get_font,
+    get_image,
+)
+
+from .view_cache import (
+    ViewCache,
+    estimate_view_footprint,
+)
+
 __all__ = [
     'StatCard',
     'DataCard',
@@ -35,5 +58,13 @@ __all__ = [
     'format_currency',
     'format_date',
     'parse_decimal',
+    'ImportDialog',
     'Sidebar',
+    'PdfPreviewDialog',
+    'ProgressiveLoader',
+    'Skeleton',
+    'get_font',
+    'get_image',
+    'ViewCache',
+    'estimate_view_footprint',
 ]
@@ -6,6 +6,7 @@ Cards reutilizáveis para exibição de dados.
 
 import customtkinter as ctk
 from theme import get_color, ThemeManager
+from components.resources import get_font
 
 
 class StatCard(ctk.CTkFrame):
@@ -28,13 +29,13 @@ class StatCard(ctk.CTkFrame):
         header.pack(fill="x", pady=(0, 6))
 
         ctk.CTkLabel(
-            header, text=icon, font=ctk.CTkFont(size=22)
+            header, text=icon, font=get_font(size=22)
         ).pack(side="left")
 
         ctk.CTkLabel(
             header,
             text=title,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=get_color("text_secondary"),
         ).pack(side="left", padx=8)
 
@@ -42,7 +43,7 @@ class StatCard(ctk.CTkFrame):
         ctk.CTkLabel(
             body,
             text=str(value),
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=get_font(size=24, weight="bold"),
             text_color=get_color("text"),
             anchor="w",
         ).pack(anchor="w")
@@ -78,7 +79,7 @@ class StatusBadge(ctk.CTkLabel):
         super().__init__(
             parent,
             text=f"  {text}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=color,
             text_color="white",
             corner_radius=12,
@@ -95,7 +96,7 @@ def create_search_bar(parent, placeholder="Pesquisar...", on_search=None):
         frame,
         placeholder_text=placeholder,
         height=38,
-        font=ctk.CTkFont(size=13),
+        font=get_font(size=13),
         border_color=get_color("border"),
         fg_color=get_color("card"),
         corner_radius=10,
@@ -129,7 +130,7 @@ def create_header(parent, title, subtitle=None, action_text=None, action_command
     ctk.CTkLabel(
         left,
         text=title,
-        font=ctk.CTkFont(size=24, weight="bold"),
+        font=get_font(size=24, weight="bold"),
         text_color=get_color("text"),
         anchor="w",
     ).pack(anchor="w")
@@ -138,7 +139,7 @@ def create_header(parent, title, subtitle=None, action_text=None, action_command
         ctk.CTkLabel(
             left,
             text=subtitle,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=get_color("text_secondary"),
             anchor="w",
         ).pack(anchor="w", pady=(3, 0))
@@ -147,7 +148,7 @@ def create_header(parent, title, subtitle=None, action_text=None, action_command
         ctk.CTkButton(
             frame,
             text=f"  + {action_text}  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"),
             hover_color=get_color("primary_hover"),            height=38,
             corner_radius=10,
@@ -7,6 +7,8 @@ Diálogos de confirmação, entrada e funções utilitárias de UI.
 import customtkinter as ctk
 from datetime import datetime
 from theme import get_color
+from components.resources import get_font
+from utils import parse_decimal  # noqa: F401 (reexportado para as views)
 
 
 class DateEntry(ctk.CTkFrame):
@@ -22,7 +24,7 @@ class DateEntry(ctk.CTkFrame):
             self,
             textvariable=self._var,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             placeholder_text=placeholder,
         )
         self.entry.pack(fill="x")
@@ -143,7 +145,7 @@ class TimeEntry(ctk.CTkFrame):
             self,
             textvariable=self._var,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             placeholder_text=placeholder,
         )
         self.entry.pack(fill="x")
@@ -233,14 +235,14 @@ class ConfirmDialog(ctk.CTkToplevel):
 
         # Ícone de aviso
         ctk.CTkLabel(
-            self, text="⚠️", font=ctk.CTkFont(size=32)
+            self, text="⚠️", font=get_font(size=32)
         ).pack(pady=(20, 5))
 
         # Mensagem
         ctk.CTkLabel(
             self,
             text=message,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             text_color=get_color("text"),
             wraplength=350,
         ).pack(padx=20, pady=(0, 15))
@@ -324,20 +326,20 @@ class FormDialog(ctk.CTkToplevel):
             ctk.CTkLabel(
                 scroll,
                 text=lbl_text,
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=get_font(size=12, weight="bold"),
                 text_color=get_color("text"),
                 anchor="w",
             ).pack(fill="x", pady=(8, 2))
 
             if ftype == "entry":
-                entry = ctk.CTkEntry(scroll, height=35, font=ctk.CTkFont(size=13))
+                entry = ctk.CTkEntry(scroll, height=35, font=get_font(size=13))
                 if key in initial_data and initial_data[key]:
                     entry.insert(0, str(initial_data[key]))
                 entry.pack(fill="x", pady=(0, 2))
                 self.entries[key] = entry
 
             elif ftype == "number":
-                entry = ctk.CTkEntry(scroll, height=35, font=ctk.CTkFont(size=13))
+                entry = ctk.CTkEntry(scroll, height=35, font=get_font(size=13))
                 if key in initial_data and initial_data[key] is not None:
                     entry.insert(0, str(initial_data[key]))
                 entry.pack(fill="x", pady=(0, 2))
@@ -353,13 +355,13 @@ class FormDialog(ctk.CTkToplevel):
                     values=options,
                     variable=var,
                     height=35,
-                    font=ctk.CTkFont(size=13),
+                    font=get_font(size=13),
                 )
                 menu.pack(fill="x", pady=(0, 2))
                 self.entries[key] = var
 
             elif ftype == "text":
-                text = ctk.CTkTextbox(scroll, height=80, font=ctk.CTkFont(size=13))
+                text = ctk.CTkTextbox(scroll, height=80, font=get_font(size=13))
                 if key in initial_data and initial_data[key]:
                     text.insert("1.0", str(initial_data[key]))
                 text.pack(fill="x", pady=(0, 2))
@@ -416,40 +418,6 @@ class FormDialog(ctk.CTkToplevel):
         return data
 
 
-def parse_decimal(value):
-    """
-    Converte string para float, aceitando vírgula ou ponto como separador decimal.
-    Remove pontos de milhar (formato brasileiro).
-    Exemplos: "1.250,50" -> 1250.50 | "1250.50" -> 1250.50 | "1250,50" -> 1250.50
-    """
-    if not value:
-        return 0.0
-    try:
-        # Converter para string se não for
-        value_str = str(value).strip()
-        if not value_str:
-            return 0.0
-        
-        # Contar quantidade de pontos e vírgulas
-        dot_count = value_str.count('.')
-        comma_count = value_str.count(',')
-        
-        # Se tem vírgula e ponto, assumir formato brasileiro (1.250,50)
-        if dot_count > 0 and comma_count > 0:
-            # Remover pontos (separadores de milhar) e trocar vírgula por ponto
-            value_str = value_str.replace('.', '').replace(',', '.')
-        # Se tem apenas vírgula, pode ser decimal brasileiro (1250,50)
-        elif comma_count > 0:
-            value_str = value_str.replace(',', '.')
-        # Se tem múltiplos pontos, são separadores de milhar
-        elif dot_count > 1:
-            value_str = value_str.replace('.', '')
-        
-        return float(value_str)
-    except (ValueError, TypeError, AttributeError):
-        return 0.0
-
-
 def format_currency(value):
     """Formata valor para moeda brasileira."""
     try:
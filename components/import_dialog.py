@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Importação de Planilha
+Diálogo da importação em massa (services.importer): a planilha é lida e
+validada em segundo plano e o diff (novos, alterados, erros) é mostrado
+antes de qualquer gravação. Confirmar grava tudo em uma única transação.
+"""
+
+from tkinter import filedialog
+
+import customtkinter as ctk
+
+from theme import get_color
+from components.progressive import ProgressiveLoader
+from components.resources import get_font
+
+
+PREVIEW_LIMIT = 300   # linhas de diff exibidas (o resumo conta todas)
+
+TARGET_TITLES = {"inventory": "Importar Materiais", "products": "Importar Produtos"}
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return "-" if value in (None, "") else str(value)
+
+
+def ask_import_file(parent):
+    """Escolhe a planilha (CSV ou XLSX); retorna o caminho ou ''."""
+    return filedialog.askopenfilename(
+        parent=parent,
+        title="Escolher planilha",
+        filetypes=[("Planilhas", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx"),
+                   ("Todos os arquivos", "*.*")],
+    )
+
+
+class ImportDialog(ctk.CTkToplevel):
+    """Pré-visualização e confirmação de uma importação de planilha."""
+
+    def __init__(self, parent, path: str, target: str, on_done=None):
+        super().__init__(parent)
+        self.app = parent
+        self.path = path
+        self.target = target
+        self.on_done = on_done
+        self.preview = None
+        self.title(TARGET_TITLES.get(target, "Importar Planilha"))
+        self.geometry("760x540")
+        self.grab_set()
+        self.transient(parent)
+
+        self.update_idletasks()
+        x = parent.winfo_rootx() + (parent.winfo_width() - 760) // 2
+        y = parent.winfo_rooty() + (parent.winfo_height() - 540) // 2
+        self.geometry(f"+{x}+{y}")
+
+        self._summary = ctk.CTkLabel(
+            self, text="Lendo e validando a planilha...", font=get_font(size=14, weight="bold"),
+            text_color=get_color("text"), anchor="w", justify="left",
+        )
+        self._summary.pack(fill="x", padx=20, pady=(15, 8))
+
+        self._list = ctk.CTkScrollableFrame(self, fg_color=get_color("bg"))
+        self._list.pack(fill="both", expand=True, padx=15)
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(fill="x", padx=20, pady=15)
+        ctk.CTkButton(
+            btn_frame, text="Cancelar", fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), width=120, command=self.destroy,
+        ).pack(side="left")
+        self._confirm_btn = ctk.CTkButton(
+            btn_frame, text="Importar", fg_color=get_color("primary"),
+            hover_color=get_color("primary_hover"), width=160, state="disabled",
+            command=self._apply,
+        )
+        self._confirm_btn.pack(side="right")
+
+        from services.importer import preview_import
+        self._loader = ProgressiveLoader(self)
+        self._loader.submit(preview_import, self._show_preview, path, target, on_error=self._show_error)
+
+    def _add_line(self, text: str, color: str = "text"):
+        ctk.CTkLabel(
+            self._list, text=text, font=get_font(size=12), text_color=get_color(color),
+            anchor="w", justify="left", wraplength=680,
+        ).pack(fill="x", padx=5, pady=1)
+
+    def _show_error(self, error):
+        self._summary.configure(text=f"Não foi possível ler a planilha: {error}",
+                                text_color=get_color("error"))
+
+    def _show_preview(self, preview):
+        from services.importer import FIELD_LABELS
+        self.preview = preview
+        self._summary.configure(
+            text=f"{len(preview.inserts)} novos · {len(preview.updates)} alterados · "
+                 f"{preview.unchanged} sem mudança · {len(preview.errors)} com erro"
+        )
+
+        shown = 0
+        for error in preview.errors[:PREVIEW_LIMIT]:
+            self._add_line(f"Linha {error.line}: {error.message} (ignorada)", "error")
+            shown += 1
+        for change in preview.updates:
+            if shown >= PREVIEW_LIMIT:
+                break
+            diff = "; ".join(
+                f"{FIELD_LABELS.get(col, col)}: {_format_value(change.before.get(col))} → {_format_value(val)}"
+                for col, val in change.values.items() if col not in ("measure", "length")
+            )
+            self._add_line(f"Linha {change.line} ✏️ #{change.record_id}: {diff}", "warning")
+            shown += 1
+        for change in preview.inserts:
+            if shown >= PREVIEW_LIMIT:
+                break
+            self._add_line(f"Linha {change.line} ➕ {change.values['name']}", "success")
+            shown += 1
+        total = len(preview.errors) + len(preview.updates) + len(preview.inserts)
+        if total > shown:
+            self._add_line(f"... e mais {total - shown} linhas.", "text_secondary")
+        if not total:
+            self._add_line("Nenhuma alteração: o cadastro já está igual à planilha.", "text_secondary")
+
+        if preview.has_changes:
+            self._confirm_btn.configure(
+                state="normal",
+                text=f"Importar {len(preview.inserts) + len(preview.updates)} registros",
+            )
+
+    def _apply(self):
+        from services.importer import apply_import
+        self._confirm_btn.configure(state="disabled")
+        try:
+            result = apply_import(self.preview)
+        except Exception as e:
+            self.app.show_toast(f"Erro na importação: {e}", "error")
+            self._confirm_btn.configure(state="normal")
+            return
+        self.destroy()
+        self.app.show_toast(
+            f"Importação concluída: {result['created']} novos, {result['updated']} alterados.", "success"
+        )
+        if self.on_done:
+            self.on_done()
@@ -6,6 +6,7 @@ Sidebar com botões de navegação estilizados e visual moderno.
 
 import customtkinter as ctk
 from theme import get_color
+from components.resources import get_font
 
 
 class Sidebar(ctk.CTkFrame):
@@ -42,7 +43,7 @@ class Sidebar(ctk.CTkFrame):
         self.company_label = ctk.CTkLabel(
             logo_text,
             text=company_name,
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=get_font(size=20, weight="bold"),
             text_color=get_color("text"),
         )
         self.company_label.pack(anchor="w")
@@ -50,7 +51,7 @@ class Sidebar(ctk.CTkFrame):
         ctk.CTkLabel(
             logo_text,
             text="Gestão de Calhas",
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=get_color("sidebar_text"),
         ).pack(anchor="w")
 
@@ -62,7 +63,7 @@ class Sidebar(ctk.CTkFrame):
         ctk.CTkLabel(
             self,
             text="MENU PRINCIPAL",
-            font=ctk.CTkFont(size=9, weight="bold"),
+            font=get_font(size=9, weight="bold"),
             text_color=get_color("sidebar_text"),
             anchor="w",
         ).pack(padx=25, pady=(0, 8), anchor="w")
@@ -72,7 +73,7 @@ class Sidebar(ctk.CTkFrame):
             btn = ctk.CTkButton(
                 self,
                 text=f"  {icon}  {label}",
-                font=ctk.CTkFont(size=13),
+                font=get_font(size=13),
                 fg_color="transparent",
                 text_color=get_color("sidebar_text"),
                 hover_color=get_color("sidebar_hover"),
@@ -96,7 +97,7 @@ class Sidebar(ctk.CTkFrame):
         settings_btn = ctk.CTkButton(
             self,
             text="  ⚙️  Configurações",
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             fg_color="transparent",
             text_color=get_color("sidebar_text"),
             hover_color=get_color("sidebar_hover"),
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Pré-visualização de PDF
+Diálogo que mostra um PDF em memória (services.pdf_cache.PdfBytes) sem
+gravar arquivo nem abrir programa externo. As páginas começam como
+placeholders do tamanho da página e são rasterizadas em segundo plano
+apenas quando entram na área visível. Salvar em disco é uma ação explícita.
+"""
+
+import math
+import os
+
+import customtkinter as ctk
+
+from theme import get_color
+from components.progressive import ProgressiveLoader
+from components.resources import get_font
+
+
+PAGE_WIDTH = 720     # largura lógica de cada página na pré-visualização
+VISIBILITY_MS = 150  # intervalo da verificação de páginas visíveis
+
+
+class PdfPreviewDialog(ctk.CTkToplevel):
+    """Janela de pré-visualização com renderização preguiçosa das páginas."""
+
+    def __init__(self, parent, pdf, title: str = "Pré-visualização do PDF", save_dir: str = ""):
+        super().__init__(parent)
+        self.pdf = pdf
+        self.save_dir = save_dir
+        self.title(title)
+        width = PAGE_WIDTH + 80
+        height = max(500, min(parent.winfo_screenheight() - 120, 1000))
+        self.geometry(f"{width}x{height}")
+        self.transient(parent)
+
+        self.update_idletasks()
+        x = parent.winfo_rootx() + (parent.winfo_width() - width) // 2
+        self.geometry(f"+{max(0, x)}+20")
+
+        self._loader = ProgressiveLoader(self)
+        self._images = {}      # página -> CTkImage (mantém a referência)
+        self._requested = set()
+        self._slots = []
+        self._pages = None
+
+        self._build_toolbar()
+        self._scroll = ctk.CTkScrollableFrame(self, fg_color=get_color("bg"))
+        self._scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        try:
+            from services.pdf_preview import open_pages
+            self._pages = open_pages(pdf.data)
+        except Exception as e:
+            self._show_message(f"Não foi possível abrir o PDF: {e}")
+            return
+        if self._pages is None:
+            self._show_message("Pré-visualização indisponível: instale o pacote pypdfium2.\n"
+                               "O PDF pode ser salvo normalmente.")
+            return
+
+        self._build_placeholders()
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self.bind("<Escape>", lambda e: self._close())
+        self.after(50, self._check_visible)
+
+    # --- Layout ---
+
+    def _build_toolbar(self):
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=10)
+
+        ctk.CTkLabel(
+            bar, text=f"📄 {self.pdf.filename}", font=get_font(size=13, weight="bold"),
+            text_color=get_color("text"), anchor="w",
+        ).pack(side="left", fill="x", expand=True)
+
+        ctk.CTkButton(
+            bar, text="Fechar", font=get_font(size=12),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), width=90, height=32,
+            command=self._close,
+        ).pack(side="right", padx=(6, 0))
+
+        ctk.CTkButton(
+            bar, text="💾 Salvar PDF", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("success"), hover_color=get_color("success_hover"),
+            width=120, height=32, command=self._save,
+        ).pack(side="right")
+
+    def _show_message(self, text):
+        ctk.CTkLabel(
+            self._scroll, text=text, font=get_font(size=13),
+            text_color=get_color("text_secondary"), justify="center",
+        ).pack(pady=40)
+
+    def _build_placeholders(self):
+        for index, (w_pt, h_pt) in enumerate(self._pages.sizes):
+            height = round(PAGE_WIDTH * h_pt / w_pt)
+            slot = ctk.CTkFrame(self._scroll, width=PAGE_WIDTH, height=height,
+                                fg_color="#ffffff", corner_radius=0,
+                                border_width=1, border_color=get_color("border"))
+            slot.pack(pady=(0, 12))
+            slot.pack_propagate(False)
+            label = ctk.CTkLabel(slot, text=f"Página {index + 1}...", font=get_font(size=12),
+                                 text_color="#94a3b8")
+            label.pack(expand=True, fill="both")
+            self._slots.append(label)
+
+    # --- Renderização preguiçosa ---
+
+    def _visible_pages(self):
+        """Índices das páginas na área visível (mais uma de folga)."""
+        count = len(self._slots)
+        try:
+            top, bottom = self._scroll._parent_canvas.yview()
+        except Exception:
+            top, bottom = 0.0, 1.0
+        first = max(0, math.floor(top * count))
+        last = min(count - 1, math.ceil(bottom * count))
+        return range(first, last + 1)
+
+    def _check_visible(self):
+        if not self.winfo_exists() or self._pages is None:
+            return
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        width_px = round(PAGE_WIDTH * scaling)
+        for index in self._visible_pages():
+            if index in self._requested:
+                continue
+            self._requested.add(index)
+            self._loader.submit(self._pages.render, lambda img, i=index: self._show_page(i, img, scaling),
+                                index, width_px, executor="render")
+        if len(self._requested) < len(self._slots):
+            self.after(VISIBILITY_MS, self._check_visible)
+
+    def _show_page(self, index, image, scaling):
+        if image is None:
+            return
+        ctk_img = ctk.CTkImage(image, size=(round(image.width / scaling), round(image.height / scaling)))
+        self._images[index] = ctk_img
+        self._slots[index].configure(image=ctk_img, text="")
+
+    # --- Ações ---
+
+    def _save(self):
+        from tkinter import filedialog
+        from services.pdf_cache import save_pdf
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Salvar PDF", defaultextension=".pdf",
+            initialdir=self.save_dir or None, initialfile=self.pdf.filename,
+            filetypes=[("PDF", "*.pdf")],
+        )
+        if not path:
+            return
+        try:
+            save_pdf(self.pdf, path)
+        except OSError as e:
+            self._notify(f"Erro ao salvar PDF: {e}", "error")
+            return
+        self._notify(f"PDF salvo: {os.path.basename(path)}", "success")
+
+    def _notify(self, message, kind):
+        app = self.master
+        if hasattr(app, "show_toast"):
+            app.show_toast(message, kind)
+
+    def _close(self):
+        self._loader.cancel()
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+        self.destroy()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Carregamento Progressivo
+Placeholders (skeletons) exibidos imediatamente e busca de dados / renderização
+de gráficos em threads de trabalho. Cada seção é trocada pelo conteúdo real
+assim que termina; cargas obsoletas são descartadas quando o usuário navega.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import customtkinter as ctk
+
+from theme import get_color
+
+
+# Executores compartilhados (criados sob demanda)
+_executors = {}
+_executors_lock = threading.Lock()
+
+# "io": consultas ao banco (cada chamada abre sua própria conexão SQLite)
+# "render": matplotlib/pyplot não é thread-safe, então os gráficos são serializados
+# "charts": threads que só aguardam o pool de processos de analytics.chart_service
+# "export": thread que acompanha os lotes de PDF (services.pdf_batch)
+EXECUTOR_WORKERS = {"io": 4, "render": 1, "charts": 4, "export": 1}
+
+
+def get_executor(kind: str = "io") -> ThreadPoolExecutor:
+    """Retorna o executor compartilhado do tipo pedido ("io" ou "render")."""
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=EXECUTOR_WORKERS.get(kind, 2),
+                thread_name_prefix=f"calhagest-{kind}",
+            )
+            _executors[kind] = executor
+        return executor
+
+
+class Skeleton(ctk.CTkFrame):
+    """Placeholder com barras pulsantes exibido enquanto a seção carrega."""
+
+    PULSE_MS = 600
+
+    def __init__(self, parent, lines=3, height=None, card=True, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=get_color("card") if card else "transparent",
+            corner_radius=10,
+            border_width=1 if card else 0,
+            border_color=get_color("border"),
+            **kwargs,
+        )
+        self._bars = []
+        self._phase = False
+        # Margem direita variável para simular linhas de texto de larguras diferentes
+        right_pads = [40, 220, 140, 300, 80]
+        if height:
+            # Bloco único (ex.: área de um gráfico)
+            bar = ctk.CTkFrame(self, height=height, corner_radius=8, fg_color=get_color("border"))
+            bar.pack(fill="x", padx=15, pady=15)
+            self._bars.append(bar)
+        for i in range(lines):
+            bar = ctk.CTkFrame(self, height=14, corner_radius=6, fg_color=get_color("border"))
+            bar.pack(fill="x", padx=(15, right_pads[i % len(right_pads)]),
+                     pady=(12 if i == 0 else 6, 12 if i == lines - 1 else 0))
+            self._bars.append(bar)
+        self.after(self.PULSE_MS, self._pulse)
+
+    def _pulse(self):
+        if not self.winfo_exists():
+            return
+        self._phase = not self._phase
+        color = get_color("bg") if self._phase else get_color("border")
+        for bar in self._bars:
+            try:
+                bar.configure(fg_color=color)
+            except Exception:
+                return
+        self.after(self.PULSE_MS, self._pulse)
+
+
+class ProgressiveLoader:
+    """
+    Executa funções em threads de trabalho e entrega os resultados na thread
+    do Tk (via polling com after). cancel() invalida todas as cargas pendentes:
+    resultados de uma geração antiga são descartados ao chegar.
+
+    As funções submetidas NÃO podem tocar em widgets — apenas buscar dados
+    ou gerar arquivos/bytes. Os callbacks on_done/on_error rodam na thread do Tk.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.generation = 0
+        self._results = queue.SimpleQueue()
+        self._futures = []
+        self._pending = 0
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        """Há cargas da geração atual ainda em andamento."""
+        return self._pending > 0
+
+    def submit(self, fn, on_done, *args, on_error=None, executor: str = "io"):
+        """Agenda fn(*args) em segundo plano; on_done(resultado) roda na thread do Tk."""
+        generation = self.generation
+        results = self._results
+
+        def run():
+            try:
+                results.put((generation, on_done, on_error, True, fn(*args)))
+            except Exception as e:  # entregue ao on_error na thread do Tk
+                results.put((generation, on_done, on_error, False, e))
+
+        self._pending += 1
+        self._futures.append(get_executor(executor).submit(run))
+        self._schedule_poll()
+
+    def cancel(self):
+        """Descarta todas as cargas pendentes (ex.: usuário navegou para outra view)."""
+        self.generation += 1
+        for future in self._futures:
+            future.cancel()  # só cancela as que ainda não começaram
+        self._futures = []
+        self._pending = 0
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            try:
+                self.owner.after(self.POLL_MS, self._poll)
+            except Exception:
+                self._polling = False
+
+    def _poll(self):
+        self._polling = False
+        try:
+            if not self.owner.winfo_exists():
+                self.cancel()
+                return
+        except Exception:
+            return
+
+        while True:
+            try:
+                generation, on_done, on_error, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue  # resultado obsoleto
+            self._pending = max(0, self._pending - 1)
+            try:
+                if ok:
+                    on_done(value)
+                elif on_error is not None:
+                    on_error(value)
+            except Exception:
+                pass
+
+        self._futures = [f for f in self._futures if not f.done()]
+        if self._pending > 0 or self._futures:
+            self._schedule_poll()
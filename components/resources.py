@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Cache de Recursos da Interface
+Fontes e imagens compartilhadas entre views e componentes, com LRU limitado.
+Evita criar um CTkFont por label e reabrir PNGs do disco a cada exibição.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import customtkinter as ctk
+
+from theme import ThemeManager
+from lazy_imports import get_pil_image
+
+
+MAX_FONTS = 64
+MAX_IMAGES = 32
+
+
+class _LRUCache:
+    """Dicionário LRU simples com limite de entradas."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            # Widgets que ainda usam o objeto mantêm sua própria referência
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_fonts = _LRUCache(MAX_FONTS)
+_images = _LRUCache(MAX_IMAGES)
+_source_sizes = _LRUCache(MAX_IMAGES * 4)
+
+
+def get_font(size: int = 13, weight: str = "normal", family: Optional[str] = None) -> ctk.CTkFont:
+    """Retorna um CTkFont compartilhado para (size, weight, family)."""
+    key = (size, weight, family)
+    font = _fonts.get(key)
+    if font is None:
+        if family:
+            font = ctk.CTkFont(family=family, size=size, weight=weight)
+        else:
+            font = ctk.CTkFont(size=size, weight=weight)
+        _fonts.put(key, font)
+    return font
+
+
+def _file_version(path: str) -> int:
+    """mtime do arquivo (gráficos regravados no mesmo caminho geram nova entrada)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _source_size(path: str, version: int) -> Optional[Tuple[int, int]]:
+    """Dimensões originais da imagem (lê apenas o cabeçalho, com cache)."""
+    key = (path, version)
+    size = _source_sizes.get(key)
+    if size is None:
+        try:
+            Image = get_pil_image()
+            with Image.open(path) as src:
+                size = src.size
+        except Exception:
+            return None
+        _source_sizes.put(key, size)
+    return size
+
+
+def get_image(path: str, size: Optional[Tuple[int, int]] = None, width: Optional[int] = None,
+              max_size: Optional[Tuple[int, int]] = None, source=None) -> Optional[ctk.CTkImage]:
+    """
+    Retorna um CTkImage compartilhado para (path, size, tema).
+    O tamanho pode ser explícito (size), por largura (width, mantém proporção)
+    ou caber em max_size (mantém proporção). Retorna None se o arquivo não abrir.
+    source: imagem PIL já decodificada do mesmo arquivo (evita reabrir o PNG).
+    """
+    version = _file_version(path)
+
+    if size is None:
+        src_size = source.size if source is not None else _source_size(path, version)
+        if src_size is None:
+            return None
+        src_w, src_h = src_size
+        if width:
+            size = (int(width), int(src_h * width / src_w))
+        elif max_size:
+            ratio = min(max_size[0] / src_w, max_size[1] / src_h)
+            size = (int(src_w * ratio), int(src_h * ratio))
+        else:
+            size = (src_w, src_h)
+
+    key = (path, tuple(size), ThemeManager.get_theme(), version)
+    ctk_img = _images.get(key)
+    if ctk_img is not None:
+        return ctk_img
+
+    if source is not None:
+        img = source
+    else:
+        try:
+            Image = get_pil_image()
+            with Image.open(path) as src:
+                src.load()
+                img = src.copy()
+        except Exception:
+            return None
+
+    ctk_img = ctk.CTkImage(img, size=tuple(size))
+    _images.put(key, ctk_img)
+    return ctk_img
+
+
+def clear_resource_caches(fonts: bool = False):
+    """Limpa o cache de imagens (e opcionalmente o de fontes)."""
+    _images.clear()
+    _source_sizes.clear()
+    if fonts:
+        _fonts.clear()
+
+
+def resource_cache_stats() -> dict:
+    """Estatísticas de uso dos caches (para benchmarks e diagnóstico)."""
+    return {
+        "fonts": len(_fonts),
+        "font_hits": _fonts.hits,
+        "font_misses": _fonts.misses,
+        "images": len(_images),
+        "image_hits": _images.hits,
+        "image_misses": _images.misses,
+    }
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Ciclo de Vida das Views
+Cache LRU das views construídas, limitado por quantidade e por um orçamento
+estimado de memória. Views ocultas podem liberar recursos pesados (imagens,
+cards) mantendo o estado leve (filtros, posição de rolagem).
+
+Protocolo (opcional, verificado com hasattr) que as views podem implementar:
+    on_show()                  -> view ficou visível
+    on_hide()                  -> view foi ocultada (salvar estado leve)
+    release_heavy_resources()  -> liberar imagens/cards; on_show() reconstrói
+"""
+
+from collections import OrderedDict
+
+
+# Estimativa por widget CustomTkinter (frame Tk + canvas + itens desenhados)
+WIDGET_BYTES_ESTIMATE = 6 * 1024
+
+# Imagens RGBA
+IMAGE_BYTES_PER_PIXEL = 4
+
+DEFAULT_MAX_VIEWS = 6
+DEFAULT_MEMORY_BUDGET_MB = 120
+
+
+def _image_bytes(image) -> int:
+    """Estima a memória de um CTkImage (imagens de origem + tamanho exibido)."""
+    total = 0
+    for attr in ("_light_image", "_dark_image"):
+        pil_image = getattr(image, attr, None)
+        if pil_image is not None and hasattr(pil_image, "size"):
+            w, h = pil_image.size
+            total += w * h * IMAGE_BYTES_PER_PIXEL
+    size = getattr(image, "_size", None)
+    if size:
+        total += int(size[0]) * int(size[1]) * IMAGE_BYTES_PER_PIXEL
+    return total
+
+
+def estimate_view_footprint(view) -> dict:
+    """Percorre a árvore de widgets da view e estima o uso de memória."""
+    widgets = 0
+    image_bytes = 0
+    seen_images = set()
+    stack = [view]
+    while stack:
+        widget = stack.pop()
+        widgets += 1
+        image = getattr(widget, "_image", None)
+        if image is not None and id(image) not in seen_images:
+            seen_images.add(id(image))
+            image_bytes += _image_bytes(image)
+        try:
+            stack.extend(widget.winfo_children())
+        except Exception:
+            pass
+    return {
+        "widgets": widgets,
+        "images": len(seen_images),
+        "image_bytes": image_bytes,
+        "bytes": widgets * WIDGET_BYTES_ESTIMATE + image_bytes,
+    }
+
+
+def get_scroll_position(scrollable) -> float:
+    """Retorna a posição vertical (0..1) de um CTkScrollableFrame."""
+    try:
+        return scrollable._parent_canvas.yview()[0]
+    except Exception:
+        return 0.0
+
+
+def restore_scroll_position(scrollable, position: float):
+    """Restaura a posição vertical de um CTkScrollableFrame (após o layout)."""
+    if not position:
+        return
+
+    def apply():
+        try:
+            scrollable._parent_canvas.yview_moveto(position)
+        except Exception:
+            pass
+
+    try:
+        scrollable.after_idle(apply)
+    except Exception:
+        pass
+
+
+class ViewCache:
+    """Cache LRU de views com limite de quantidade e de memória estimada."""
+
+    def __init__(self, max_views: int = DEFAULT_MAX_VIEWS,
+                 memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB):
+        self.max_views = max_views
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._views = OrderedDict()   # nome -> view (mais recente no fim)
+        self._footprints = {}         # nome -> última estimativa
+        self._released = set()        # views ocultas que liberaram recursos
+        self.evictions = 0
+        self.releases = 0
+
+    # ---- Interface tipo dict ----
+
+    def __contains__(self, name):
+        return name in self._views
+
+    def __getitem__(self, name):
+        return self._views[name]
+
+    def __setitem__(self, name, view):
+        self.put(name, view)
+
+    def __len__(self):
+        return len(self._views)
+
+    def get(self, name, default=None):
+        return self._views.get(name, default)
+
+    def names(self) -> list:
+        """Nomes das views em cache, da menos para a mais recente."""
+        return list(self._views.keys())
+
+    def put(self, name, view, recent: bool = True):
+        """
+        Adiciona uma view ao cache. Views pré-aquecidas (recent=False) entram
+        como as menos recentes, para serem as primeiras a sair.
+        """
+        self._views[name] = view
+        self._views.move_to_end(name, last=recent)
+        self._released.discard(name)
+
+    def touch(self, name):
+        """Marca a view como usada agora (ela deixa de estar liberada)."""
+        if name in self._views:
+            self._views.move_to_end(name)
+            self._released.discard(name)
+
+    # ---- Ciclo de vida ----
+
+    def hide(self, name):
+        """Oculta a view, notifica on_hide() e mede seu footprint."""
+        view = self._views.get(name)
+        if view is None:
+            return
+        view.pack_forget()
+        if hasattr(view, "on_hide"):
+            try:
+                view.on_hide()
+            except Exception:
+                pass
+        self.measure(name)
+
+    def measure(self, name) -> dict:
+        """Atualiza a estimativa de memória de uma view."""
+        view = self._views.get(name)
+        if view is None:
+            return {}
+        footprint = estimate_view_footprint(view)
+        self._footprints[name] = footprint
+        return footprint
+
+    def total_bytes(self) -> int:
+        return sum(self._footprints.get(name, {}).get("bytes", 0) for name in self._views)
+
+    def enforce(self, active_name=None):
+        """
+        Aplica os limites: primeiro libera recursos pesados das views ocultas
+        menos usadas; se ainda estiver acima do orçamento (ou do limite de
+        quantidade), destrói as views menos usadas.
+        """
+        # Limite de quantidade: destruir as mais antigas
+        for name in self.names():
+            if len(self._views) <= self.max_views:
+                break
+            if name != active_name:
+                self.evict(name)
+
+        if self.total_bytes() <= self.memory_budget:
+            return
+
+        # Nível 1: liberar recursos pesados (mantém filtros e estado leve)
+        for name in self.names():
+            if self.total_bytes() <= self.memory_budget:
+                return
+            if name == active_name or name in self._released:
+                continue
+            view = self._views[name]
+            if hasattr(view, "release_heavy_resources"):
+                try:
+                    view.release_heavy_resources()
+                    self._released.add(name)
+                    self.releases += 1
+                except Exception:
+                    pass
+                self.measure(name)
+
+        # Nível 2: destruir views inteiras
+        for name in self.names():
+            if self.total_bytes() <= self.memory_budget:
+                return
+            if name != active_name:
+                self.evict(name)
+
+    def evict(self, name):
+        """Remove e destrói uma view do cache."""
+        view = self._views.pop(name, None)
+        self._footprints.pop(name, None)
+        self._released.discard(name)
+        if view is not None:
+            self.evictions += 1
+            try:
+                view.destroy()
+            except Exception:
+                pass
+
+    def clear(self):
+        """Destrói todas as views (ex.: troca de tema)."""
+        for name in self.names():
+            self.evict(name)
+
+    # ---- Instrumentação ----
+
+    def report(self) -> list:
+        """Footprint estimado de cada view em cache (da mais recente para a mais antiga)."""
+        rows = []
+        for name in reversed(self.names()):
+            fp = self._footprints.get(name) or self.measure(name)
+            rows.append({
+                "view": name,
+                "widgets": fp.get("widgets", 0),
+                "images": fp.get("images", 0),
+                "kb": round(fp.get("bytes", 0) / 1024, 1),
+                "released": name in self._released,
+            })
+        return rows
+
+    def format_report(self) -> str:
+        """Relatório em texto do uso estimado de memória das views."""
+        lines = [f"Views em cache: {len(self._views)}/{self.max_views}  "
+                 f"total ~{self.total_bytes() / 1024 / 1024:.1f} MB "
+                 f"(orçamento {self.memory_budget / 1024 / 1024:.0f} MB, "
+                 f"liberações {self.releases}, remoções {self.evictions})"]
+        for row in self.report():
+            flag = " [liberada]" if row["released"] else ""
+            lines.append(f"  {row['view']:<14} {row['widgets']:>6} widgets  "
+                         f"{row['images']:>3} imagens  ~{row['kb']:>9.1f} KB{flag}")
+        return "\n".join(lines)
@@ -5,6 +5,8 @@ from .db import (
     get_connection,
     get_db_path,
     init_database,
+    ensure_database,
+    notify_data_reset,
     
     # Produtos
     create_product,
@@ -36,6 +38,8 @@ __all__ = [
     'get_connection',
     'get_db_path',
     'init_database',
+    'ensure_database',
+    'notify_data_reset',
     'create_product',
     'get_all_products',
     'get_product_by_id',
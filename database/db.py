@@ -3,17 +3,30 @@ CalhaGest - Banco de Dados SQLite
 Gerencia conexão e operações CRUD para todas as entidades do sistema.
 """
 
+import calendar
 import sqlite3
 import os
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Any, Iterator
+
+from database import events
 
 # Caminho do banco de dados
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "calhagest.db")
 
+# Inicialização preguiçosa: o schema é criado na primeira conexão (ou via
+# ensure_database()), e não mais ao importar o módulo
+_db_initialized = False
+_db_init_lock = threading.Lock()
+_db_init_thread = None  # Thread que está rodando init_database() (usa get_connection())
+
 
 def get_connection() -> sqlite3.Connection:
     """Retorna uma conexão com o banco de dados."""
+    if not _db_initialized and _db_init_thread != threading.get_ident():
+        ensure_database()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
@@ -25,6 +38,24 @@ def get_db_path() -> str:
     return DB_PATH
 
 
+def ensure_database():
+    """Garante que o schema foi inicializado (idempotente, executa uma vez por processo)."""
+    global _db_initialized, _db_init_thread
+    if _db_initialized:
+        return
+    # Outras threads esperam a migração terminar; a própria thread de
+    # inicialização passa direto em get_connection() (init_database() a usa)
+    with _db_init_lock:
+        if _db_initialized:
+            return
+        _db_init_thread = threading.get_ident()
+        try:
+            init_database()
+        finally:
+            _db_init_thread = None
+        _db_initialized = True
+
+
 def init_database():
     """Inicializa o banco de dados com todas as tabelas necessárias."""
     conn = get_connection()
@@ -59,6 +90,12 @@ def init_database():
     except sqlite3.OperationalError:
         pass  # Coluna já existe
 
+    # Migração: agrupar itens por tipo de produto no PDF do orçamento
+    try:
+        cursor.execute("ALTER TABLE settings ADD COLUMN pdf_group_items INTEGER DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass  # Coluna já existe
+
 
     # Tabela de Tipos de Produto (dinâmica)
     cursor.execute("""
@@ -70,6 +107,12 @@ def init_database():
         )
     """)
     
+    # Migração: horas de instalação por metro (ou unidade) de cada tipo (carga das equipes)
+    try:
+        cursor.execute("ALTER TABLE product_types ADD COLUMN install_hours_per_meter REAL DEFAULT 0.25")
+    except sqlite3.OperationalError:
+        pass  # Coluna já existe
+
     # Inserir tipos padrão se tabela estiver vazia
     cursor.execute("SELECT COUNT(*) FROM product_types")
     if cursor.fetchone()[0] == 0:
@@ -187,6 +230,15 @@ def init_database():
         cursor.execute("ALTER TABLE quotes ADD COLUMN discount_type TEXT DEFAULT 'percentage'")
     except sqlite3.OperationalError:
         pass  # Coluna já existe
+
+    # Migração: orçamento já baixou o estoque (deduct_stock_for_quote). Na criação
+    # da coluna, os aprovados/concluídos existentes são marcados: foram aprovados
+    # pela tela, que dá a baixa no mesmo momento.
+    try:
+        cursor.execute("ALTER TABLE quotes ADD COLUMN stock_deducted INTEGER DEFAULT 0")
+        cursor.execute("UPDATE quotes SET stock_deducted = 1 WHERE status IN ('approved', 'completed')")
+    except sqlite3.OperationalError:
+        pass  # Coluna já existe
     
     # Migração: remover CHECK constraint de produtos (tipo dinâmico)
     # SQLite não permite ALTER TABLE para remover constraints,
@@ -251,6 +303,19 @@ def init_database():
         )
     """)
     
+    # Baixa real de estoque por orçamento aprovado (a baixa para em zero,
+    # então pode ser menor que o consumo calculado; usada pelo MRP)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stock_deductions (
+            quote_id INTEGER NOT NULL,
+            inventory_id INTEGER NOT NULL,
+            quantity REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (quote_id, inventory_id),
+            FOREIGN KEY (quote_id) REFERENCES quotes(id) ON DELETE CASCADE,
+            FOREIGN KEY (inventory_id) REFERENCES inventory(id) ON DELETE CASCADE
+        )
+    """)
+    
     # Tabela de Instalações
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS installations (
@@ -266,6 +331,33 @@ def init_database():
             FOREIGN KEY (quote_id) REFERENCES quotes(id) ON DELETE CASCADE
         )
     """)
+
+    # Tabela de Equipes de Instalação (capacidade diária em metros ou horas)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            daily_capacity REAL NOT NULL DEFAULT 40,
+            capacity_unit TEXT NOT NULL DEFAULT 'metros' CHECK(capacity_unit IN ('metros', 'horas')),
+            active INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Migração: equipe da instalação e carga gravada no agendamento
+    try:
+        cursor.execute("ALTER TABLE installations ADD COLUMN crew_id INTEGER REFERENCES crews(id) ON DELETE SET NULL")
+    except sqlite3.OperationalError:
+        pass  # Coluna já existe
+    try:
+        cursor.execute("ALTER TABLE installations ADD COLUMN load_meters REAL DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass
+    try:
+        cursor.execute("ALTER TABLE installations ADD COLUMN load_hours REAL DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass
     
     # Tabela de Pagamentos
     cursor.execute("""
@@ -379,10 +471,48 @@ def init_database():
     except sqlite3.OperationalError:
         pass
     
+    # Índices de data usados pelas séries de analytics (get_analytics_series).
+    # Os de quotes e payments cobrem as colunas somadas por período: os
+    # agregados leem só o índice, em ordem de data, sem buscar cada linha
+    try:
+        # Substituídos pelas versões que cobrem os valores
+        cursor.execute("DROP INDEX IF EXISTS idx_quotes_created_at")
+        cursor.execute("DROP INDEX IF EXISTS idx_payments_payment_date")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_quotes_period
+            ON quotes(created_at, status, total, cost_total, profit)
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_period ON payments(payment_date, amount)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_expense_date ON expenses(expense_date)")
+    except sqlite3.OperationalError:
+        pass
+
+    # Pagamentos por orçamento, cobrindo data e valor (saldos do relatório de período e resumos)
+    try:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_quote ON payments(quote_id, payment_date, amount)")
+    except sqlite3.OperationalError:
+        pass
+
     # Índices para inventory e installations
     try:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_installations_quote_id ON installations(quote_id)")
+    except sqlite3.OperationalError:
+        pass
+
+    # Instalações por orçamento com status e data no índice (agenda do MRP sem ler as linhas)
+    try:
+        cursor.execute("DROP INDEX IF EXISTS idx_installations_quote_id")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_installations_quote ON installations("
+                       "quote_id, status, scheduled_date)")
+    except sqlite3.OperationalError:
+        pass
+
+    # Agenda: intervalo de datas do calendário (e filtro de status) sem varrer o
+    # histórico; equipe e carga no índice respondem a agenda de capacidade sem ler as linhas
+    try:
+        cursor.execute("DROP INDEX IF EXISTS idx_installations_schedule")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_installations_agenda ON installations("
+                       "scheduled_date, status, crew_id, load_meters, load_hours)")
     except sqlite3.OperationalError:
         pass
     
@@ -399,6 +529,22 @@ def _auto_backup():
         pass  # Nunca interromper operação principal por falha de backup
 
 
+def _notify(entity: str, ids=None, kind: str = events.UPDATED):
+    """Publica uma alteração no barramento de eventos (após o commit)."""
+    events.publish(entity, ids, kind)
+
+
+def notify_data_reset():
+    """Notifica que todas as tabelas podem ter mudado (restauração/limpeza em massa)."""
+    with events.batch():
+        for entity in (events.SETTINGS, events.PRODUCT_TYPE, events.PRODUCT,
+                       events.PRODUCT_MATERIAL, events.INVENTORY, events.QUOTE,
+                       events.QUOTE_ITEM, events.PAYMENT, events.INSTALLATION,
+                       events.CREW, events.EXPENSE, events.EXPENSE_CATEGORY, events.EMPLOYEE,
+                       events.PAYROLL):
+            _notify(entity, None, events.UPDATED)
+
+
 # ===== OTIMIZAÇÃO: Cache em Memória para Produtos =====
 class _ProductCache:
     """Cache simples para produtos em memória. Reduz requerys ao banco."""
@@ -454,6 +600,9 @@ class _ProductCache:
 
 _product_cache = _ProductCache()
 
+# O cache de produtos é invalidado pelo barramento de eventos
+events.subscribe([events.PRODUCT, events.PRODUCT_TYPE], lambda event: _product_cache.invalidate())
+
 
 # ============== CRUD de Produtos ==============
 
@@ -472,7 +621,7 @@ def create_product(name: str, type: str, measure: float, price_per_meter: float,
     conn.commit()
     conn.close()
     _auto_backup()
-    _product_cache.invalidate()  # Invalida cache após criar novo produto
+    _notify(events.PRODUCT, product_id, events.CREATED)
     return product_id
 
 
@@ -516,7 +665,7 @@ def update_product(product_id: int, **kwargs) -> bool:
     conn.close()
     if success:
         _auto_backup()
-        _product_cache.invalidate()  # Invalida cache após atualizar produto
+        _notify(events.PRODUCT, product_id, events.UPDATED)
     return success
 
 
@@ -530,7 +679,7 @@ def delete_product(product_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
-        _product_cache.invalidate()  # Invalida cache após deletar produto
+        _notify(events.PRODUCT, product_id, events.DELETED)
     return success
 
 
@@ -552,6 +701,7 @@ def create_quote(client_name: str, client_phone: str = "", client_address: str =
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.QUOTE, quote_id, events.CREATED)
     return quote_id
 
 
@@ -578,6 +728,15 @@ def get_all_quotes(search: str = "", status_filter: str = "") -> List[Dict]:
     return quotes
 
 
+# Itens com o tipo do produto (agrupamento no PDF); produto excluído -> tipo NULL
+_QUOTE_ITEMS_WITH_TYPE = """
+    SELECT qi.*, p.type AS product_type, pt.label AS product_type_label
+    FROM quote_items qi
+    LEFT JOIN products p ON p.id = qi.product_id
+    LEFT JOIN product_types pt ON pt.key = p.type
+"""
+
+
 def get_quote_by_id(quote_id: int) -> Optional[Dict]:
     """Retorna um orçamento pelo ID com seus itens."""
     conn = get_connection()
@@ -591,13 +750,81 @@ def get_quote_by_id(quote_id: int) -> Optional[Dict]:
     
     quote = dict(row)
     
-    cursor.execute("SELECT * FROM quote_items WHERE quote_id = ?", (quote_id,))
+    cursor.execute(f"{_QUOTE_ITEMS_WITH_TYPE} WHERE qi.quote_id = ? ORDER BY qi.id", (quote_id,))
     quote['items'] = [dict(item) for item in cursor.fetchall()]
     
     conn.close()
     return quote
 
 
+def get_quotes_for_export(status_filter: str = "", client_name: str = "",
+                          quote_ids: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Orçamentos completos para exportação em lote: cada um com 'items' e
+    'payment_summary' (mesmo formato de get_payment_summary), em uma única
+    consulta (orçamentos × itens × pagamentos agregados).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    quote_columns = [row['name'] for row in cursor.execute("PRAGMA table_info(quotes)")]
+
+    query = """
+        SELECT q.*, COALESCE(paid.total_paid, 0) AS _total_paid, qi.*,
+               p.type AS product_type, pt.label AS product_type_label
+        FROM quotes q
+        LEFT JOIN (
+            SELECT quote_id, SUM(amount) AS total_paid FROM payments GROUP BY quote_id
+        ) paid ON paid.quote_id = q.id
+        LEFT JOIN quote_items qi ON qi.quote_id = q.id
+        LEFT JOIN products p ON p.id = qi.product_id
+        LEFT JOIN product_types pt ON pt.key = p.type
+        WHERE 1=1
+    """
+    params = []
+    if status_filter:
+        query += " AND q.status = ?"
+        params.append(status_filter)
+    if client_name:
+        query += " AND q.client_name LIKE ?"
+        params.append(f"%{client_name}%")
+    if quote_ids is not None:
+        if not quote_ids:
+            conn.close()
+            return []
+        query += f" AND q.id IN ({', '.join('?' * len(quote_ids))})"
+        params.extend(quote_ids)
+    query += " ORDER BY q.created_at DESC, q.id, qi.id"
+
+    cursor.execute(query, params)
+    columns = [d[0] for d in cursor.description]
+    split = len(quote_columns)
+    id_index = quote_columns.index('id')
+    item_columns = columns[split + 1:]
+
+    quotes = []
+    current = None
+    for row in cursor:
+        if current is None or current['id'] != row[id_index]:
+            current = dict(zip(quote_columns, row[:split]))
+            total = current.get('total') or 0
+            total_paid = row[split]
+            balance = total - total_paid
+            current['payment_summary'] = {
+                'total': total,
+                'total_paid': total_paid,
+                'balance': max(0, balance),
+                'is_paid': balance <= 0,
+            }
+            current['items'] = []
+            quotes.append(current)
+        if row[split + 1] is not None:  # LEFT JOIN: orçamento sem itens
+            current['items'].append(dict(zip(item_columns, row[split + 1:])))
+
+    conn.close()
+    return quotes
+
+
 def update_quote(quote_id: int, **kwargs) -> bool:
     """Atualiza um orçamento existente."""
     conn = get_connection()
@@ -628,6 +855,7 @@ def update_quote(quote_id: int, **kwargs) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.QUOTE, quote_id, events.UPDATED)
     return success
 
 
@@ -641,6 +869,7 @@ def delete_quote(quote_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.QUOTE, quote_id, events.DELETED)
     return success
 
 
@@ -683,6 +912,7 @@ def recalculate_quote_totals(quote_id: int):
     
     conn.commit()
     conn.close()
+    _notify(events.QUOTE, quote_id, events.UPDATED)
 
 
 # ============== CRUD de Itens do Orçamento ==============
@@ -753,6 +983,7 @@ def add_quote_item(quote_id: int, product_id: int, meters: float,
     
     recalculate_quote_totals(quote_id)
     _auto_backup()
+    _notify(events.QUOTE_ITEM, item_id, events.CREATED)
     return item_id
 
 
@@ -774,6 +1005,7 @@ def remove_quote_item(item_id: int) -> bool:
     
     recalculate_quote_totals(quote_id)
     _auto_backup()
+    _notify(events.QUOTE_ITEM, item_id, events.DELETED)
     return True
 
 
@@ -816,6 +1048,7 @@ def update_quote_item(item_id: int, meters: float = None,
     
     recalculate_quote_totals(quote_id)
     _auto_backup()
+    _notify(events.QUOTE_ITEM, item_id, events.UPDATED)
     return True
 
 
@@ -834,6 +1067,7 @@ def create_inventory_item(name: str, type: str, quantity: float,
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.INVENTORY, item_id, events.CREATED)
     return item_id
 
 
@@ -894,6 +1128,7 @@ def update_inventory_quantity(item_id: int, quantity_change: float,
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.INVENTORY, item_id, events.UPDATED)
     return success
 
 
@@ -907,37 +1142,362 @@ def delete_inventory_item(item_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.INVENTORY, item_id, events.DELETED)
     return success
 
 
+# ============== Importação em Massa (Estoque e Produtos) ==============
+
+# Tabela, colunas graváveis e entidade de evento de cada destino de importação
+_IMPORT_TARGETS = {
+    "inventory": ("inventory", ("name", "type", "quantity", "unit", "min_stock"), events.INVENTORY),
+    "products": ("products", ("name", "type", "measure", "price_per_meter", "cost", "has_dobra",
+                              "description", "width", "length", "is_installed", "pricing_unit"),
+                 events.PRODUCT),
+}
+
+
+def get_import_snapshot(target: str) -> List[Dict]:
+    """Registros atuais do destino ('inventory' ou 'products') para o diff da importação."""
+    table, columns, _ = _IMPORT_TARGETS[target]
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT id, {', '.join(columns)} FROM {table} ORDER BY id")
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def import_records(target: str, inserts: List[Dict], updates: List[tuple]) -> Dict[str, List[int]]:
+    """
+    Grava uma importação em massa em uma única transação: inserts é uma lista
+    de dicts com todas as colunas do destino; updates, pares (id, {coluna: valor})
+    só com as colunas alteradas. Um backup e os eventos entregues juntos ao
+    final (o cache de produtos é invalidado pelo barramento no fim do lote,
+    não a cada linha).
+    Retorna {'created': [...], 'updated': [...]}.
+    """
+    table, columns, entity = _IMPORT_TARGETS[target]
+    now = datetime.now().isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        last_id = cursor.fetchone()[0]
+        if inserts:
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[c] for c in columns) for row in inserts],
+            )
+
+        # Um UPDATE por conjunto de colunas alteradas, cada um com executemany
+        by_columns: Dict[tuple, List[tuple]] = {}
+        for record_id, values in updates:
+            cols = tuple(c for c in columns if c in values)
+            if cols:
+                by_columns.setdefault(cols, []).append(
+                    tuple(values[c] for c in cols) + (now, record_id))
+        for cols, params in by_columns.items():
+            assignments = ", ".join(f"{c} = ?" for c in cols)
+            cursor.executemany(f"UPDATE {table} SET {assignments}, updated_at = ? WHERE id = ?", params)
+
+        cursor.execute(f"SELECT id FROM {table} WHERE id > ? ORDER BY id", (last_id,))
+        created = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    updated = [record_id for record_id, values in updates if values]
+    if created or updated:
+        _auto_backup()
+        with events.batch():
+            if created:
+                _notify(entity, created, events.CREATED)
+            if updated:
+                _notify(entity, updated, events.UPDATED)
+    return {"created": created, "updated": updated}
+
+
+# ============== Reajuste de Preços em Massa ==============
+
+REPRICE_MODES = ("percent", "absolute", "dobra")
+_OPEN_QUOTE_STATUSES = ("draft", "sent")
+_PRICE_EPS = 0.005  # Meio centavo: item ainda no preço de tabela
+_REPRICE_INVALID_LIMIT = 10  # Nomes listados no erro de preço inválido
+
+_REPRICE_NEW_PRICE = {
+    "percent": "ROUND(old_price * (1 + ? / 100.0), 2)",
+    "absolute": "ROUND(old_price + ?, 2)",
+    "dobra": "old_price",
+}
+
+
+def reprice_products(mode: str, value: float, type_filter: str = "", name_pattern: str = "",
+                     has_dobra: Optional[int] = None, reprice_quotes: bool = False,
+                     dry_run: bool = True, sample: int = 50) -> Dict:
+    """
+    Reajusta em massa o preço dos produtos selecionados (tipo, nome com
+    curinga '*' e/ou dobra) e, opcionalmente, os itens e totais dos
+    orçamentos ainda não aprovados (rascunho e enviado).
+
+    mode: 'percent' (value em %), 'absolute' (soma value ao preço) ou
+    'dobra' (novo valor da dobra nas configurações; vale para todos os
+    produtos com dobra, os filtros são ignorados).
+
+    Tudo é feito com tabelas temporárias e UPDATEs por conjunto em uma única
+    transação; com dry_run=True a transação é desfeita e só o relatório é
+    devolvido. Itens com preço customizado (diferente do preço de tabela
+    com dobra, antes do desconto) não são alterados e são contados em
+    'skipped_items'. Um reajuste que levaria algum produto selecionado a
+    preço zero ou negativo é recusado (ValueError com os produtos afetados).
+    """
+    if mode not in REPRICE_MODES:
+        raise ValueError(f"Modo de reajuste inválido: {mode}")
+    if mode == "percent" and value <= -100:
+        raise ValueError("O percentual deve ser maior que -100%")
+    if mode == "dobra" and value < 0:
+        raise ValueError("O valor da dobra não pode ser negativo")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT dobra_value FROM settings LIMIT 1")
+        row = cursor.fetchone()
+        old_dobra = float(row[0] or 5.0) if row else 5.0  # Mesma regra de get_dobra_value()
+        new_dobra = float(value) if mode == "dobra" else old_dobra
+
+        where, params = ["1=1"], []
+        if mode == "dobra":
+            where.append("has_dobra = 1")
+        else:
+            if type_filter:
+                where.append("type = ?")
+                params.append(type_filter)
+            if name_pattern:
+                # '%' e '_' digitados são literais; só '*' é curinga
+                pattern = (name_pattern.replace("\\", "\\\\").replace("%", "\\%")
+                           .replace("_", "\\_").replace("*", "%"))
+                where.append("name LIKE ? ESCAPE '\\'")
+                params.append(pattern if "*" in name_pattern else f"%{pattern}%")
+            if has_dobra is not None:
+                where.append("COALESCE(has_dobra, 0) = ?")
+                params.append(int(has_dobra))
+
+        # Produtos selecionados: preço antigo/novo e preço de tabela com dobra
+        cursor.execute("""
+            CREATE TEMP TABLE reprice_products (
+                product_id INTEGER PRIMARY KEY, name TEXT, has_dobra INTEGER,
+                old_price REAL, new_price REAL, old_unit REAL, new_unit REAL
+            )
+        """)
+        cursor.execute(f"""
+            INSERT INTO temp.reprice_products (product_id, name, has_dobra, old_price)
+            SELECT id, name, COALESCE(has_dobra, 0), price_per_meter
+            FROM products WHERE {' AND '.join(where)}
+        """, params)
+        cursor.execute(f"""
+            UPDATE temp.reprice_products
+            SET new_price = {_REPRICE_NEW_PRICE[mode]}
+        """, () if mode == "dobra" else (value,))
+        # Preço zerado ou negativo não é aceito (mesma regra do cadastro)
+        cursor.execute("""
+            SELECT name FROM temp.reprice_products
+            WHERE new_price <= 0 AND new_price != old_price
+            ORDER BY name
+        """)
+        invalid = [r[0] for r in cursor.fetchall()]
+        if invalid:
+            names = ", ".join(invalid[:_REPRICE_INVALID_LIMIT])
+            if len(invalid) > _REPRICE_INVALID_LIMIT:
+                names += f" e mais {len(invalid) - _REPRICE_INVALID_LIMIT}"
+            raise ValueError(
+                f"O reajuste deixaria {len(invalid)} produto(s) com preço zero ou "
+                f"negativo: {names}"
+            )
+        cursor.execute("""
+            UPDATE temp.reprice_products
+            SET old_unit = old_price + CASE WHEN has_dobra THEN ? ELSE 0 END,
+                new_unit = new_price + CASE WHEN has_dobra THEN ? ELSE 0 END
+        """, (old_dobra, new_dobra))
+
+        cursor.execute("""
+            CREATE TEMP TABLE reprice_items (
+                item_id INTEGER PRIMARY KEY, quote_id INTEGER, new_price REAL, new_total REAL
+            )
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE reprice_quotes (
+                quote_id INTEGER PRIMARY KEY, old_total REAL, total REAL, cost_total REAL
+            )
+        """)
+        skipped_items = 0
+        if reprice_quotes:
+            statuses = ",".join("?" * len(_OPEN_QUOTE_STATUSES))
+            # Itens ainda no preço de tabela: novo preço = tabela nova - desconto do item
+            cursor.execute(f"""
+                INSERT INTO temp.reprice_items (item_id, quote_id, new_price, new_total)
+                SELECT qi.id, qi.quote_id,
+                       MAX(t.new_unit - MAX(COALESCE(qi.discount, 0), 0), 0),
+                       qi.meters * MAX(t.new_unit - MAX(COALESCE(qi.discount, 0), 0), 0)
+                FROM quotes q
+                JOIN quote_items qi ON qi.quote_id = q.id
+                JOIN temp.reprice_products t ON t.product_id = qi.product_id
+                WHERE q.status IN ({statuses})
+                  AND t.new_unit != t.old_unit
+                  AND ABS(qi.price_per_meter + MAX(COALESCE(qi.discount, 0), 0) - t.old_unit) < ?
+            """, (*_OPEN_QUOTE_STATUSES, _PRICE_EPS))
+            cursor.execute(f"""
+                SELECT COUNT(*)
+                FROM quotes q
+                JOIN quote_items qi ON qi.quote_id = q.id
+                JOIN temp.reprice_products t ON t.product_id = qi.product_id
+                WHERE q.status IN ({statuses})
+                  AND t.new_unit != t.old_unit
+                  AND ABS(qi.price_per_meter + MAX(COALESCE(qi.discount, 0), 0) - t.old_unit) >= ?
+            """, (*_OPEN_QUOTE_STATUSES, _PRICE_EPS))
+            skipped_items = cursor.fetchone()[0]
+
+            # Totais dos orçamentos afetados (mesma regra de recalculate_quote_totals)
+            cursor.execute("""
+                INSERT INTO temp.reprice_quotes (quote_id, old_total, total, cost_total)
+                SELECT q.id, q.total,
+                       s.subtotal - CASE
+                           WHEN q.discount_type = 'value' THEN MAX(COALESCE(q.discount_total, 0), 0)
+                           ELSE s.subtotal * MAX(COALESCE(q.discount_total, 0), 0) / 100.0
+                       END,
+                       s.cost_total
+                FROM (
+                    SELECT qi.quote_id,
+                           SUM(COALESCE(ri.new_total, qi.total)) AS subtotal,
+                           SUM(qi.cost_total) AS cost_total
+                    FROM quote_items qi
+                    LEFT JOIN temp.reprice_items ri ON ri.item_id = qi.id
+                    WHERE qi.quote_id IN (SELECT quote_id FROM temp.reprice_items)
+                    GROUP BY qi.quote_id
+                ) s
+                JOIN quotes q ON q.id = s.quote_id
+            """)
+
+        cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(new_price != old_price), 0) FROM temp.reprice_products
+        """)
+        selected, changed = cursor.fetchone()
+        cursor.execute("""
+            SELECT product_id AS id, name, old_price, new_price FROM temp.reprice_products
+            ORDER BY name LIMIT ?
+        """, (sample,))
+        preview = [dict(r) for r in cursor.fetchall()]
+        cursor.execute("SELECT COUNT(*) FROM temp.reprice_items")
+        items = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(old_total), 0), COALESCE(SUM(total), 0) FROM temp.reprice_quotes
+        """)
+        quotes, total_before, total_after = cursor.fetchone()
+
+        report = {
+            "mode": mode, "value": value, "dry_run": dry_run,
+            "products": selected, "products_changed": changed,
+            "items": items, "skipped_items": skipped_items, "quotes": quotes,
+            "quotes_total_before": total_before, "quotes_total_after": total_after,
+            "dobra_before": old_dobra, "dobra_after": new_dobra,
+            "sample": preview,
+        }
+        if dry_run:
+            conn.rollback()
+            return report
+
+        now = datetime.now().isoformat()
+        cursor.execute("""
+            SELECT product_id FROM temp.reprice_products WHERE new_price != old_price
+        """)
+        product_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("""
+            UPDATE products
+            SET price_per_meter = (SELECT new_price FROM temp.reprice_products t WHERE t.product_id = products.id),
+                updated_at = ?
+            WHERE id IN (SELECT product_id FROM temp.reprice_products WHERE new_price != old_price)
+        """, (now,))
+        if mode == "dobra":
+            cursor.execute("UPDATE settings SET dobra_value = ?, updated_at = ? WHERE id = 1", (new_dobra, now))
+
+        cursor.execute("SELECT item_id FROM temp.reprice_items")
+        item_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("""
+            UPDATE quote_items
+            SET price_per_meter = (SELECT new_price FROM temp.reprice_items r WHERE r.item_id = quote_items.id),
+                total = (SELECT new_total FROM temp.reprice_items r WHERE r.item_id = quote_items.id)
+            WHERE id IN (SELECT item_id FROM temp.reprice_items)
+        """)
+        cursor.execute("SELECT quote_id FROM temp.reprice_quotes")
+        quote_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("""
+            UPDATE quotes
+            SET total = (SELECT total FROM temp.reprice_quotes r WHERE r.quote_id = quotes.id),
+                cost_total = (SELECT cost_total FROM temp.reprice_quotes r WHERE r.quote_id = quotes.id),
+                profit = (SELECT total - cost_total FROM temp.reprice_quotes r WHERE r.quote_id = quotes.id),
+                profitability = (SELECT CASE WHEN total > 0 THEN (total - cost_total) / total * 100 ELSE 0 END
+                                 FROM temp.reprice_quotes r WHERE r.quote_id = quotes.id),
+                updated_at = ?
+            WHERE id IN (SELECT quote_id FROM temp.reprice_quotes)
+        """, (now,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if product_ids or item_ids or mode == "dobra":
+        _auto_backup()
+        with events.batch():
+            if mode == "dobra":
+                _notify(events.SETTINGS, 1, events.UPDATED)
+            if product_ids:
+                _notify(events.PRODUCT, product_ids, events.UPDATED)
+            if item_ids:
+                _notify(events.QUOTE_ITEM, item_ids, events.UPDATED)
+                _notify(events.QUOTE, quote_ids, events.UPDATED)
+    return report
+
+
 # ============== CRUD de Instalações ==============
 
-def create_installation(quote_id: int, scheduled_date: str, notes: str = "") -> int:
-    """Cria uma nova instalação vinculada a um orçamento aprovado."""
+def create_installation(quote_id: int, scheduled_date: str, notes: str = "",
+                        crew_id: Optional[int] = None) -> int:
+    """
+    Cria uma nova instalação vinculada a um orçamento aprovado.
+    A carga do orçamento (metros e horas) é gravada junto para a agenda das equipes.
+    """
     conn = get_connection()
     cursor = conn.cursor()
-    
+
     # Buscar dados do orçamento
     cursor.execute("SELECT * FROM quotes WHERE id = ?", (quote_id,))
     quote = cursor.fetchone()
     if not quote:
         conn.close()
         raise ValueError("Orçamento não encontrado")
-    
+
     if quote['status'] not in ['approved', 'completed']:
         conn.close()
         raise ValueError("Orçamento precisa estar aprovado")
-    
+
+    load_meters, load_hours = _quote_loads(cursor, [quote_id]).get(quote_id, (0.0, 0.0))
     cursor.execute("""
-        INSERT INTO installations (quote_id, client_name, address, scheduled_date, notes)
-        VALUES (?, ?, ?, ?, ?)
-    """, (quote_id, quote['client_name'], quote['client_address'] or "", 
-          scheduled_date, notes))
-    
+        INSERT INTO installations (quote_id, client_name, address, scheduled_date, notes,
+                                   crew_id, load_meters, load_hours)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (quote_id, quote['client_name'], quote['client_address'] or "",
+          scheduled_date, notes, crew_id, load_meters, load_hours))
+
     installation_id = cursor.lastrowid
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.INSTALLATION, installation_id, events.CREATED)
     return installation_id
 
 
@@ -960,6 +1520,82 @@ def get_all_installations(status_filter: str = "") -> List[Dict]:
     return installations
 
 
+def get_installations_between(start, end, status_filter: str = "") -> List[Dict]:
+    """Instalações agendadas em [start, end] (datas inclusivas), em ordem de agendamento."""
+    low, high = _period_bounds(start, end)
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    query = "SELECT * FROM installations WHERE scheduled_date >= ? AND scheduled_date < ?"
+    params = [low, high]
+
+    if status_filter:
+        query += " AND status = ?"
+        params.append(status_filter)
+
+    query += " ORDER BY scheduled_date ASC, id ASC"
+    cursor.execute(query, params)
+    installations = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return installations
+
+
+class _InstallationMonthCache:
+    """
+    Índice do calendário: (ano, mês, status) -> {dia: [instalações]}.
+    Cada mês é montado uma vez a partir de get_installations_between e fica
+    em memória (LRU) até a próxima escrita em instalações ou orçamentos.
+    """
+    MAX_MONTHS = 36
+
+    def __init__(self):
+        self.months = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = 0  # Muda a cada invalidação: leituras em andamento não gravam dados velhos
+
+    def invalidate(self):
+        """Descarta todos os meses (chamado pelo barramento de eventos)."""
+        with self.lock:
+            self.months.clear()
+            self.generation += 1
+
+    def get_month(self, year: int, month: int, status_filter: str = "") -> Dict[int, List[Dict]]:
+        """Instalações do mês agrupadas por dia (dias sem instalação não aparecem)."""
+        key = (year, month, status_filter)
+        with self.lock:
+            buckets = self.months.get(key)
+            if buckets is not None:
+                self.months.move_to_end(key)
+                return buckets
+            generation = self.generation
+
+        first = date(year, month, 1)
+        last = date(year, month, calendar.monthrange(year, month)[1])
+        buckets = {}
+        for inst in get_installations_between(first, last, status_filter):
+            # scheduled_date é ISO ('AAAA-MM-DD' ou 'AAAA-MM-DD HH:MM'): o dia está fixo em [8:10]
+            buckets.setdefault(int(str(inst["scheduled_date"])[8:10]), []).append(inst)
+
+        with self.lock:
+            if generation != self.generation:
+                return buckets
+            self.months[key] = buckets
+            while len(self.months) > self.MAX_MONTHS:
+                self.months.popitem(last=False)
+        return buckets
+
+
+_installation_months = _InstallationMonthCache()
+
+# Excluir um orçamento remove suas instalações em cascata: QUOTE também invalida
+events.subscribe([events.INSTALLATION, events.QUOTE], lambda event: _installation_months.invalidate())
+
+
+def get_installations_by_day(year: int, month: int, status_filter: str = "") -> Dict[int, List[Dict]]:
+    """Instalações do mês indexadas pelo dia (cache por mês; não altere o resultado)."""
+    return _installation_months.get_month(year, month, status_filter)
+
+
 def update_installation_status(installation_id: int, status: str) -> bool:
     """Atualiza o status de uma instalação."""
     conn = get_connection()
@@ -970,19 +1606,24 @@ def update_installation_status(installation_id: int, status: str) -> bool:
     """, (status, datetime.now().isoformat(), installation_id))
     
     # Se completou a instalação, atualizar o orçamento também
+    completed_quote_id = None
     if status == "completed":
         cursor.execute("SELECT quote_id FROM installations WHERE id = ?", (installation_id,))
         row = cursor.fetchone()
         if row:
+            completed_quote_id = row['quote_id']
             cursor.execute("""
                 UPDATE quotes SET status = 'completed', updated_at = ? WHERE id = ?
-            """, (datetime.now().isoformat(), row['quote_id']))
+            """, (datetime.now().isoformat(), completed_quote_id))
     
     conn.commit()
     success = cursor.rowcount > 0
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.INSTALLATION, installation_id, events.UPDATED)
+        if completed_quote_id:
+            _notify(events.QUOTE, completed_quote_id, events.UPDATED)
     return success
 
 
@@ -996,9 +1637,207 @@ def delete_installation(installation_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.INSTALLATION, installation_id, events.DELETED)
     return success
 
 
+# ============== Equipes e Carga de Instalação ==============
+
+# Horas por metro (ou unidade) quando o produto não tem mais um tipo cadastrado
+DEFAULT_INSTALL_HOURS_PER_METER = 0.25
+
+# Carga de instalação por orçamento: metros instalados (itens vendidos por
+# metro) e horas (quantidade x horas por metro do tipo do produto). Produtos
+# marcados como não instalados (is_installed = 0) não ocupam a equipe.
+# Colunas agregadas sobre quote_items qi + _LOAD_JOINS (1 parâmetro: horas padrão).
+_LOAD_COLUMNS = """
+    COALESCE(SUM(CASE WHEN COALESCE(p.is_installed, 1) = 1
+                       AND COALESCE(qi.pricing_unit, 'metro') = 'metro'
+                      THEN qi.meters ELSE 0 END), 0) AS load_meters,
+    COALESCE(SUM(CASE WHEN COALESCE(p.is_installed, 1) = 1
+                      THEN qi.meters * COALESCE(pt.install_hours_per_meter, ?) ELSE 0 END), 0) AS load_hours
+"""
+_LOAD_JOINS = """
+    LEFT JOIN products p ON p.id = qi.product_id
+    LEFT JOIN product_types pt ON pt.key = p.type
+"""
+
+
+def _quote_loads(cursor, quote_ids: List[int]) -> Dict[int, tuple]:
+    """(metros, horas) de cada orçamento em uma única consulta agrupada."""
+    if not quote_ids:
+        return {}
+    placeholders = ",".join("?" * len(quote_ids))
+    cursor.execute(f"""
+        SELECT qi.quote_id, {_LOAD_COLUMNS}
+        FROM quote_items qi {_LOAD_JOINS}
+        WHERE qi.quote_id IN ({placeholders})
+        GROUP BY qi.quote_id
+    """, [DEFAULT_INSTALL_HOURS_PER_METER, *quote_ids])
+    return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+
+def create_crew(name: str, daily_capacity: float, capacity_unit: str = "metros") -> int:
+    """Cria uma equipe de instalação com capacidade diária em 'metros' ou 'horas'."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO crews (name, daily_capacity, capacity_unit) VALUES (?, ?, ?)
+    """, (name, daily_capacity, capacity_unit))
+    crew_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    _auto_backup()
+    _notify(events.CREW, crew_id, events.CREATED)
+    return crew_id
+
+
+def get_all_crews(active_only: bool = True) -> List[Dict]:
+    """Retorna as equipes de instalação."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    query = "SELECT * FROM crews"
+    if active_only:
+        query += " WHERE active = 1"
+    query += " ORDER BY name"
+    cursor.execute(query)
+    crews = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return crews
+
+
+def update_crew(crew_id: int, **kwargs) -> bool:
+    """Atualiza uma equipe."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    allowed = ['name', 'daily_capacity', 'capacity_unit', 'active']
+    fields = []
+    values = []
+    for k, v in kwargs.items():
+        if k in allowed:
+            fields.append(f"{k} = ?")
+            values.append(v)
+    if not fields:
+        conn.close()
+        return False
+    fields.append("updated_at = ?")
+    values.append(datetime.now().isoformat())
+    values.append(crew_id)
+    cursor.execute(f"UPDATE crews SET {', '.join(fields)} WHERE id = ?", values)
+    conn.commit()
+    success = cursor.rowcount > 0
+    conn.close()
+    if success:
+        _auto_backup()
+        _notify(events.CREW, crew_id, events.UPDATED)
+    return success
+
+
+def delete_crew(crew_id: int) -> bool:
+    """Exclui uma equipe (suas instalações ficam sem equipe)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM crews WHERE id = ?", (crew_id,))
+    conn.commit()
+    success = cursor.rowcount > 0
+    conn.close()
+    if success:
+        _auto_backup()
+        _notify(events.CREW, crew_id, events.DELETED)
+    return success
+
+
+def get_quote_load(quote_id: int) -> Dict:
+    """Carga de instalação de um orçamento: {'meters': ..., 'hours': ...}."""
+    conn = get_connection()
+    meters, hours = _quote_loads(conn.cursor(), [quote_id]).get(quote_id, (0.0, 0.0))
+    conn.close()
+    return {"meters": meters, "hours": hours}
+
+
+def get_unscheduled_quote_loads() -> List[Dict]:
+    """
+    Orçamentos aprovados do tipo instalado sem instalação ativa (qualquer
+    status exceto cancelada), com a carga de cada um, do mais antigo ao mais novo.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT q.id, q.client_name, q.client_address, q.created_at, {_LOAD_COLUMNS}
+        FROM quotes q
+        LEFT JOIN quote_items qi ON qi.quote_id = q.id {_LOAD_JOINS}
+        WHERE q.status = 'approved'
+          AND COALESCE(q.quote_type, 'instalado') = 'instalado'
+          AND NOT EXISTS (
+              SELECT 1 FROM installations i
+              WHERE i.quote_id = q.id AND i.status != 'cancelled'
+          )
+        GROUP BY q.id
+        ORDER BY q.created_at, q.id
+    """, (DEFAULT_INSTALL_HOURS_PER_METER,))
+    quotes = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return quotes
+
+
+def get_crew_daily_loads(start, end) -> List[Dict]:
+    """
+    Carga agendada por equipe e dia em [start, end] (instalações não
+    canceladas com equipe): crew_id, day (AAAA-MM-DD), meters, hours, jobs.
+    """
+    low, high = _period_bounds(start, end)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT crew_id, substr(scheduled_date, 1, 10) AS day,
+               SUM(load_meters) AS meters, SUM(load_hours) AS hours, COUNT(*) AS jobs
+        FROM installations
+        WHERE crew_id IS NOT NULL
+          AND scheduled_date >= ? AND scheduled_date < ?
+          AND status != 'cancelled'
+        GROUP BY crew_id, day
+    """, (low, high))
+    loads = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return loads
+
+
+def create_installations_bulk(bookings: List[Dict]) -> List[int]:
+    """
+    Agenda vários orçamentos de uma vez (planejador em lote): uma transação,
+    um backup e um evento. Cada agendamento traz quote_id, scheduled_date e
+    crew_id (notes é opcional); orçamentos não aprovados são ignorados.
+    """
+    if not bookings:
+        return []
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        loads = _quote_loads(cursor, [b["quote_id"] for b in bookings])
+        created = []
+        for booking in bookings:
+            load_meters, load_hours = loads.get(booking["quote_id"], (0.0, 0.0))
+            cursor.execute("""
+                INSERT INTO installations (quote_id, client_name, address, scheduled_date, notes,
+                                           crew_id, load_meters, load_hours)
+                SELECT id, client_name, COALESCE(client_address, ''), ?, ?, ?, ?, ?
+                FROM quotes WHERE id = ? AND status IN ('approved', 'completed')
+            """, (booking["scheduled_date"], booking.get("notes", ""), booking.get("crew_id"),
+                  load_meters, load_hours, booking["quote_id"]))
+            if cursor.rowcount:
+                created.append(cursor.lastrowid)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    if created:
+        _auto_backup()
+        _notify(events.INSTALLATION, created, events.CREATED)
+    return created
+
+
 # ============== Configurações ==============
 
 def get_settings() -> Dict:
@@ -1018,7 +1857,7 @@ def update_settings(**kwargs) -> bool:
     
     allowed_fields = ['company_name', 'company_phone', 'company_email',
                       'company_address', 'company_cnpj', 'company_logo',
-                      'dobra_value', 'backup_path']
+                      'dobra_value', 'backup_path', 'pdf_group_items']
 
     
     fields = []
@@ -1040,6 +1879,7 @@ def update_settings(**kwargs) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.SETTINGS, 1, events.UPDATED)
     return success
 
 
@@ -1067,6 +1907,7 @@ def create_product_type(key: str, label: str) -> int:
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.PRODUCT_TYPE, type_id, events.CREATED)
     return type_id
 
 
@@ -1080,6 +1921,7 @@ def delete_product_type(type_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.PRODUCT_TYPE, type_id, events.DELETED)
     return success
 
 
@@ -1113,6 +1955,7 @@ def add_product_material(product_id: int, inventory_id: int,
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.PRODUCT_MATERIAL, mat_id, events.CREATED)
     return mat_id
 
 
@@ -1126,6 +1969,7 @@ def remove_product_material(material_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.PRODUCT_MATERIAL, material_id, events.DELETED)
     return success
 
 
@@ -1139,6 +1983,9 @@ def deduct_stock_for_quote(quote_id: int) -> List[str]:
     conn = get_connection()
     cursor = conn.cursor()
     warnings = []
+    touched_inventory = []
+    available = {}   # saldo corrente por material (o mesmo material pode repetir)
+    deducted = {}    # quanto realmente saiu do estoque por material
     
     # Buscar itens do orçamento
     cursor.execute("SELECT * FROM quote_items WHERE quote_id = ?", (quote_id,))
@@ -1174,7 +2021,7 @@ def deduct_stock_for_quote(quote_id: int) -> List[str]:
             
             inv_id = mat["inventory_id"]
             inv_name = mat.get("inv_name", "?")
-            inv_qty = mat.get("inv_qty", 0)
+            inv_qty = available.get(inv_id, mat.get("inv_qty") or 0)
             
             if inv_qty < deduct:
                 warnings.append(
@@ -1186,13 +2033,93 @@ def deduct_stock_for_quote(quote_id: int) -> List[str]:
             cursor.execute("""
                 UPDATE inventory SET quantity = MAX(0, quantity - ?), updated_at = ? WHERE id = ?
             """, (deduct, datetime.now().isoformat(), inv_id))
-    
+            touched_inventory.append(inv_id)
+            taken = min(max(inv_qty, 0), deduct)
+            available[inv_id] = inv_qty - taken
+            deducted[inv_id] = deducted.get(inv_id, 0) + taken
+    
+    # Materiais deste orçamento já saíram do estoque (reserva usada pelo MRP):
+    # guarda o que realmente saiu, não o consumo calculado
+    cursor.executemany("""
+        INSERT INTO stock_deductions (quote_id, inventory_id, quantity) VALUES (?, ?, ?)
+        ON CONFLICT(quote_id, inventory_id) DO UPDATE SET quantity = quantity + excluded.quantity
+    """, [(quote_id, inv_id, qty) for inv_id, qty in deducted.items()])
+    cursor.execute("UPDATE quotes SET stock_deducted = 1 WHERE id = ?", (quote_id,))
     conn.commit()
     conn.close()
     _auto_backup()
+    if touched_inventory:
+        _notify(events.INVENTORY, touched_inventory, events.UPDATED)
     return warnings
 
 
+# ============== Planejamento de Materiais (MRP) ==============
+
+# Consumo de um material por item de orçamento (mesma regra de deduct_stock_for_quote)
+_MATERIAL_QTY_SQL = """
+    CASE pm.unit_type
+        WHEN 'metro' THEN qi.meters * pm.quantity_per_unit
+        WHEN 'cm' THEN qi.meters * 100 * pm.quantity_per_unit
+        ELSE pm.quantity_per_unit
+    END
+"""
+
+
+def get_material_demand(today) -> List[tuple]:
+    """
+    Explode todos os orçamentos aprovados (ainda não concluídos) em
+    product_materials numa única consulta agregada. Cada linha é
+    (inventory_id, dia, quantidade, reservado), em ordem de material e dia:
+    - dia: primeira instalação pendente/em progresso do orçamento; sem
+      agenda (ou com agenda vencida) o consumo conta para `today`;
+    - reservado: o que realmente saiu do estoque na aprovação
+      (stock_deductions). A baixa para em zero, então com estoque
+      insuficiente o reservado é menor que o consumo, e um material
+      vinculado ao produto depois da aprovação não tem reserva. Só
+      orçamentos baixados antes desse registro (stock_deducted sem nenhuma
+      linha em stock_deductions) seguem com a aproximação antiga: o
+      consumo calculado inteiro.
+    """
+    today = _as_date(today).isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        WITH scheduled AS (
+            SELECT quote_id, MIN(substr(scheduled_date, 1, 10)) AS day
+            FROM installations
+            WHERE status IN ('pending', 'in-progress')
+            GROUP BY quote_id
+        ),
+        consumption AS (
+            SELECT q.id AS quote_id, q.stock_deducted, pm.inventory_id,
+                   MAX(COALESCE(s.day, ?), ?) AS due,
+                   SUM({_MATERIAL_QTY_SQL}) AS quantity
+            FROM quotes q
+            JOIN quote_items qi ON qi.quote_id = q.id
+            JOIN product_materials pm ON pm.product_id = qi.product_id
+            LEFT JOIN scheduled s ON s.quote_id = q.id
+            WHERE q.status = 'approved'
+            GROUP BY q.id, pm.inventory_id
+        )
+        SELECT c.inventory_id, c.due, SUM(c.quantity) AS quantity,
+               SUM(CASE
+                   WHEN d.quantity IS NOT NULL THEN MIN(d.quantity, c.quantity)
+                   WHEN c.stock_deducted = 1 AND NOT EXISTS (
+                       SELECT 1 FROM stock_deductions sd WHERE sd.quote_id = c.quote_id
+                   ) THEN c.quantity
+                   ELSE 0
+               END) AS reserved
+        FROM consumption c
+        LEFT JOIN stock_deductions d
+               ON d.quote_id = c.quote_id AND d.inventory_id = c.inventory_id
+        GROUP BY c.inventory_id, c.due
+        ORDER BY c.inventory_id, c.due
+    """, (today, today))
+    rows = cursor.fetchall()
+    conn.close()
+    return [tuple(row) for row in rows]
+
+
 # ============== CRUD de Pagamentos ==============
 
 def add_payment(quote_id: int, amount: float, payment_method: str, notes: str = "", payment_date: str = None) -> int:
@@ -1212,6 +2139,7 @@ def add_payment(quote_id: int, amount: float, payment_method: str, notes: str =
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.PAYMENT, payment_id, events.CREATED)
     return payment_id
 
 
@@ -1237,6 +2165,7 @@ def delete_payment(payment_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.PAYMENT, payment_id, events.DELETED)
     return success
 
 
@@ -1296,6 +2225,33 @@ def get_all_payment_summaries() -> Dict[int, Dict]:
 
 # ============== Analytics ==============
 
+def get_quote_status_counts() -> Dict[str, int]:
+    """Quantidade de orçamentos por status (sem status conta como rascunho)."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COALESCE(status, 'draft') AS status, COUNT(*) AS total
+        FROM quotes GROUP BY COALESCE(status, 'draft')
+    """)
+    counts = {row['status']: row['total'] for row in cursor.fetchall()}
+    conn.close()
+    return counts
+
+
+def get_billable_quotes() -> List[Dict]:
+    """Orçamentos aprovados e concluídos (id, cliente, total e status), mais recentes primeiro."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, client_name, total, status FROM quotes
+        WHERE status IN ('approved', 'completed')
+        ORDER BY created_at DESC
+    """)
+    quotes = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return quotes
+
+
 def get_dashboard_stats() -> Dict:
     """Retorna estatísticas para o dashboard."""
     conn = get_connection()
@@ -1396,6 +2352,255 @@ def get_monthly_analytics() -> List[Dict]:
     return analytics
 
 
+# Granularidades de get_analytics_series: expressão SQL do início do bucket e
+# janela padrão (quantidade de buckets até hoje)
+ANALYTICS_GRANULARITIES = {
+    "day": ("date({col})", 30),
+    "week": ("date({col}, 'weekday 0', '-6 days')", 12),   # segunda-feira (ISO)
+    "month": ("strftime('%Y-%m-01', {col})", 12),
+    "year": ("strftime('%Y-01-01', {col})", 5),
+}
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    """Primeiro dia do bucket que contém a data."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_bucket(start: date, granularity: str) -> date:
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start.replace(year=start.year + 1)
+
+
+def _bucket_label(start: date, granularity: str) -> str:
+    """Rótulo do bucket: 2025-03-14, 2025-W11, 2025-03 ou 2025."""
+    if granularity == "week":
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return start.strftime("%Y-%m")
+    if granularity == "year":
+        return str(start.year)
+    return start.isoformat()
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def get_analytics_series(granularity: str = "month", start=None, end=None) -> List[Dict]:
+    """
+    Série financeira agrupada por dia, semana ISO, mês ou ano, com os buckets
+    sem movimento preenchidos com zero.
+
+    start/end (date, datetime ou 'AAAA-MM-DD', inclusivos) têm como padrão a
+    janela da granularidade terminando hoje (30 dias, 12 semanas, 12 meses ou
+    5 anos). Uma única consulta, apoiada nos índices de data de quotes,
+    payments e expenses.
+
+    Retorna em ordem cronológica: [{"period", "start", "revenue", "cost",
+    "profit", "received", "expenses", "quote_count"}]. Faturamento, custo e
+    lucro consideram orçamentos aprovados/concluídos pela data de criação.
+    """
+    if granularity not in ANALYTICS_GRANULARITIES:
+        raise ValueError(f"Granularidade inválida: {granularity!r}")
+    bucket_sql, window = ANALYTICS_GRANULARITIES[granularity]
+
+    end = _as_date(end) or date.today()
+    start = _as_date(start)
+    if start is None:
+        start = _bucket_start(end, granularity)
+        for _ in range(window - 1):
+            start = _bucket_start(start - timedelta(days=1), granularity)
+    start = _bucket_start(start, granularity)
+    if start > end:
+        return []
+
+    # Comparação de texto no intervalo [início, fim + 1 dia): usa o índice da coluna
+    low, high = start.isoformat(), (end + timedelta(days=1)).isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT bucket,
+               SUM(revenue) AS revenue, SUM(cost) AS cost, SUM(profit) AS profit,
+               SUM(received) AS received, SUM(expenses) AS expenses,
+               SUM(quote_count) AS quote_count
+        FROM (
+            SELECT {bucket_sql.format(col='created_at')} AS bucket,
+                   CASE WHEN status IN ('approved', 'completed') THEN total ELSE 0 END AS revenue,
+                   CASE WHEN status IN ('approved', 'completed') THEN cost_total ELSE 0 END AS cost,
+                   CASE WHEN status IN ('approved', 'completed') THEN profit ELSE 0 END AS profit,
+                   0 AS received, 0 AS expenses, 1 AS quote_count
+            FROM quotes WHERE created_at >= ? AND created_at < ?
+            UNION ALL
+            SELECT {bucket_sql.format(col='payment_date')}, 0, 0, 0, amount, 0, 0
+            FROM payments WHERE payment_date >= ? AND payment_date < ?
+            UNION ALL
+            SELECT {bucket_sql.format(col='expense_date')}, 0, 0, 0, 0, amount, 0
+            FROM expenses WHERE expense_date >= ? AND expense_date < ?
+        )
+        GROUP BY bucket
+    """, (low, high) * 3)
+    rows = {row['bucket']: row for row in cursor.fetchall()}
+    conn.close()
+
+    series = []
+    bucket = start
+    while bucket <= end:
+        row = rows.get(bucket.isoformat())
+        entry = {"period": _bucket_label(bucket, granularity), "start": bucket.isoformat()}
+        for key in ("revenue", "cost", "profit", "received", "expenses", "quote_count"):
+            entry[key] = (row[key] or 0) if row else 0
+        series.append(entry)
+        bucket = _next_bucket(bucket, granularity)
+    return series
+
+
+# ============== Relatório de Período ==============
+
+# Linhas buscadas por vez pelos iteradores do relatório (o cursor não é materializado)
+REPORT_FETCH_SIZE = 512
+
+
+def _period_bounds(start, end) -> tuple:
+    """Intervalo de texto [início, fim + 1 dia) para comparar colunas de data indexadas."""
+    start, end = _as_date(start), _as_date(end)
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+
+def _iter_rows(sql: str, params: tuple) -> Iterator[sqlite3.Row]:
+    """Executa a consulta e entrega as linhas em lotes; a conexão fecha ao terminar."""
+    conn = get_connection()
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(REPORT_FETCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        conn.close()
+
+
+def get_period_overview(start, end) -> Dict:
+    """
+    Totais do período [start, end] (inclusivos): orçamentos criados (e por
+    status), faturamento, custo e lucro dos aprovados/concluídos, recebimentos,
+    despesas, folha paga e contas a receber na data final (orçamentos
+    aprovados/concluídos até `end` menos os pagamentos até `end`). As somas de
+    orçamentos e pagamentos leem só os índices de período.
+    """
+    low, high = _period_bounds(start, end)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COUNT(*) AS quote_count,
+               COALESCE(SUM(status IN ('approved', 'completed')), 0) AS approved_count,
+               COALESCE(SUM(CASE WHEN status IN ('approved', 'completed') THEN total END), 0) AS revenue,
+               COALESCE(SUM(CASE WHEN status IN ('approved', 'completed') THEN cost_total END), 0) AS cost,
+               COALESCE(SUM(CASE WHEN status IN ('approved', 'completed') THEN profit END), 0) AS profit,
+               (SELECT COALESCE(SUM(amount), 0) FROM payments
+                WHERE payment_date >= :low AND payment_date < :high) AS received,
+               (SELECT COALESCE(SUM(amount), 0) FROM expenses
+                WHERE expense_date >= :low AND expense_date < :high) AS expenses,
+               (SELECT COALESCE(SUM(amount), 0) FROM payroll
+                WHERE payment_date >= :low AND payment_date < :high) AS payroll
+        FROM quotes
+        WHERE created_at >= :low AND created_at < :high
+    """, {"low": low, "high": high})
+    overview = dict(cursor.fetchone())
+
+    cursor.execute("""
+        SELECT COUNT(*) AS receivable_count, COALESCE(SUM(q.total - COALESCE(p.paid, 0)), 0) AS receivables
+        FROM quotes q
+        LEFT JOIN (SELECT quote_id, SUM(amount) AS paid FROM payments
+                   WHERE payment_date < :high GROUP BY quote_id) p ON p.quote_id = q.id
+        WHERE q.created_at < :high AND q.status IN ('approved', 'completed')
+          AND q.total - COALESCE(p.paid, 0) > 0.005
+    """, {"high": high})
+    overview.update(dict(cursor.fetchone()))
+
+    cursor.execute("""
+        SELECT status, COUNT(*) AS total FROM quotes
+        WHERE created_at >= ? AND created_at < ?
+        GROUP BY status
+    """, (low, high))
+    overview['quotes_by_status'] = {row['status']: row['total'] for row in cursor.fetchall()}
+    conn.close()
+
+    overview['outflow'] = overview['expenses'] + overview['payroll']
+    overview['balance'] = overview['received'] - overview['outflow']
+    return overview
+
+
+def get_period_expenses_by_category(start, end) -> List[Dict]:
+    """Despesas do período por categoria (rótulo cadastrado), da maior para a menor."""
+    low, high = _period_bounds(start, end)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT e.category, COALESCE(c.label, e.category) AS label,
+               COUNT(*) AS count, SUM(e.amount) AS total
+        FROM expenses e
+        LEFT JOIN expense_categories c ON c.key = e.category
+        WHERE e.expense_date >= ? AND e.expense_date < ?
+        GROUP BY e.category
+        ORDER BY total DESC
+    """, (low, high))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def iter_receivables(as_of) -> Iterator[sqlite3.Row]:
+    """
+    Contas a receber na data `as_of`, em ordem de criação: id, client_name,
+    created_at, total, total_paid e balance dos orçamentos aprovados/concluídos
+    com saldo. As linhas vêm do cursor conforme são consumidas.
+    """
+    _, high = _period_bounds(as_of, as_of)
+    return _iter_rows("""
+        SELECT q.id, q.client_name, q.created_at, q.total,
+               COALESCE(p.paid, 0) AS total_paid, q.total - COALESCE(p.paid, 0) AS balance
+        FROM quotes q
+        LEFT JOIN (SELECT quote_id, SUM(amount) AS paid FROM payments
+                   WHERE payment_date < ? GROUP BY quote_id) p ON p.quote_id = q.id
+        WHERE q.created_at < ? AND q.status IN ('approved', 'completed')
+          AND q.total - COALESCE(p.paid, 0) > 0.005
+        ORDER BY q.created_at, q.id
+    """, (high, high))
+
+
+def iter_period_expenses(start, end) -> Iterator[sqlite3.Row]:
+    """Despesas do período em ordem de data (date, description, label, amount), direto do cursor."""
+    low, high = _period_bounds(start, end)
+    return _iter_rows("""
+        SELECT substr(e.expense_date, 1, 10) AS date, e.description,
+               COALESCE(c.label, e.category) AS label, e.amount
+        FROM expenses e
+        LEFT JOIN expense_categories c ON c.key = e.category
+        WHERE e.expense_date >= ? AND e.expense_date < ?
+        ORDER BY e.expense_date, e.id
+    """, (low, high))
+
+
 # ============== CRUD de Despesas ==============
 
 def create_expense(description: str, category: str, amount: float,
@@ -1413,6 +2618,7 @@ def create_expense(description: str, category: str, amount: float,
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.EXPENSE, expense_id, events.CREATED)
     return expense_id
 
 
@@ -1457,6 +2663,7 @@ def update_expense(expense_id: int, **kwargs) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EXPENSE, expense_id, events.UPDATED)
     return success
 
 
@@ -1470,6 +2677,7 @@ def delete_expense(expense_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EXPENSE, expense_id, events.DELETED)
     return success
 
 
@@ -1538,6 +2746,7 @@ def create_expense_category(key: str, label: str, color: str = '#6b7280') -> int
         conn.commit()
         conn.close()
         _auto_backup()
+        _notify(events.EXPENSE_CATEGORY, cat_id, events.CREATED)
         return cat_id
     except sqlite3.IntegrityError:
         conn.close()
@@ -1558,6 +2767,7 @@ def update_expense_category(cat_id: int, label: str, color: str) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EXPENSE_CATEGORY, cat_id, events.UPDATED)
     return success
 
 
@@ -1587,6 +2797,7 @@ def delete_expense_category(cat_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EXPENSE_CATEGORY, cat_id, events.DELETED)
     return success
 
 
@@ -1603,6 +2814,7 @@ def create_employee(name: str, role: str = "", phone: str = "", salary: float =
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.EMPLOYEE, emp_id, events.CREATED)
     return emp_id
 
 
@@ -1642,6 +2854,7 @@ def update_employee(employee_id: int, **kwargs) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EMPLOYEE, employee_id, events.UPDATED)
     return success
 
 
@@ -1655,6 +2868,7 @@ def delete_employee(employee_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.EMPLOYEE, employee_id, events.DELETED)
     return success
 
 
@@ -1675,6 +2889,7 @@ def add_payroll(employee_id: int, amount: float, reference_month: str,
     conn.commit()
     conn.close()
     _auto_backup()
+    _notify(events.PAYROLL, pay_id, events.CREATED)
     return pay_id
 
 
@@ -1722,6 +2937,7 @@ def delete_payroll(payroll_id: int) -> bool:
     conn.close()
     if success:
         _auto_backup()
+        _notify(events.PAYROLL, payroll_id, events.DELETED)
     return success
 
 
@@ -1777,6 +2993,3 @@ def get_financial_overview() -> Dict:
         'payroll_month': payroll_summary.get('month_total', 0),
     }
 
-
-# Inicializar banco ao importar o módulo
-init_database()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Barramento de Eventos de Dados
+Publish/subscribe leve para notificações de alteração emitidas pelas escritas
+de database/db.py. As views assinam as entidades que exibem e se marcam como
+"sujas"; caches da camada de dados são invalidados pelo mesmo barramento.
+"""
+
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Entidades
+PRODUCT = "product"
+PRODUCT_TYPE = "product_type"
+PRODUCT_MATERIAL = "product_material"
+QUOTE = "quote"
+QUOTE_ITEM = "quote_item"
+PAYMENT = "payment"
+INVENTORY = "inventory"
+INSTALLATION = "installation"
+CREW = "crew"
+SETTINGS = "settings"
+EXPENSE = "expense"
+EXPENSE_CATEGORY = "expense_category"
+EMPLOYEE = "employee"
+PAYROLL = "payroll"
+
+# Assinar todas as entidades
+ALL = "*"
+
+# Tipos de alteração
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+class ChangeEvent(NamedTuple):
+    """Alteração em uma entidade do banco."""
+    entity: str
+    ids: Tuple[int, ...]
+    kind: str
+
+
+_lock = threading.RLock()
+_subscribers = {}          # entidade -> lista de callbacks
+_batch_depth = 0
+_pending: List[ChangeEvent] = []
+
+
+def subscribe(entities, callback: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+    """
+    Assina uma entidade (ou lista de entidades, ou ALL).
+    Retorna uma função que cancela a assinatura.
+
+    Os callbacks podem ser chamados de threads de trabalho: devem apenas marcar
+    estado (ex.: self._dirty = True), nunca tocar em widgets Tk diretamente.
+    """
+    if isinstance(entities, str):
+        entities = [entities]
+    entities = list(entities)
+    with _lock:
+        for entity in entities:
+            _subscribers.setdefault(entity, []).append(callback)
+
+    def unsubscribe():
+        with _lock:
+            for entity in entities:
+                callbacks = _subscribers.get(entity, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+    return unsubscribe
+
+
+def publish(entity: str, ids: Optional[Iterable[int]] = None, kind: str = UPDATED):
+    """Publica uma alteração. Dentro de batch() os eventos são acumulados."""
+    if ids is None:
+        ids = ()
+    elif isinstance(ids, int):
+        ids = (ids,)
+    event = ChangeEvent(entity, tuple(i for i in ids if i is not None), kind)
+
+    with _lock:
+        if _batch_depth > 0:
+            _pending.append(event)
+            return
+    _dispatch([event])
+
+
+def _coalesce(events: List[ChangeEvent]) -> List[ChangeEvent]:
+    """Agrupa eventos por (entidade, tipo), unindo os ids e mantendo a ordem."""
+    merged = {}
+    for event in events:
+        key = (event.entity, event.kind)
+        if key in merged:
+            ids = merged[key]
+            ids.extend(i for i in event.ids if i not in ids)
+        else:
+            merged[key] = list(event.ids)
+    return [ChangeEvent(entity, tuple(ids), kind) for (entity, kind), ids in merged.items()]
+
+
+def _dispatch(events: List[ChangeEvent]):
+    for event in events:
+        with _lock:
+            callbacks = list(_subscribers.get(event.entity, ())) + list(_subscribers.get(ALL, ()))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                pass  # Um assinante com erro não pode interromper a escrita
+
+
+@contextmanager
+def batch():
+    """
+    Acumula os eventos publicados dentro do bloco e os entrega uma única vez,
+    agrupados, ao final (ex.: importação em massa).
+    """
+    global _batch_depth
+    with _lock:
+        _batch_depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _batch_depth -= 1
+            events = []
+            if _batch_depth == 0:
+                events = _coalesce(_pending)
+                _pending.clear()
+        if events:
+            _dispatch(events)
+
+
+class DirtyFlag:
+    """
+    Marca "sujo" para views: assina as entidades exibidas e é consultada no
+    on_show() para decidir se é preciso reconsultar o banco.
+    A assinatura usa referência fraca: quando a view (e a marca) é destruída,
+    o callback é removido do barramento no próximo evento.
+    """
+
+    def __init__(self, entities, dirty: bool = False):
+        self.dirty = dirty
+        self.changed = set()
+        ref = weakref.ref(self)
+        unsubscribe = None
+
+        def on_change(event: ChangeEvent):
+            flag = ref()
+            if flag is None:
+                unsubscribe()
+                return
+            flag.dirty = True
+            flag.changed.add(event.entity)
+
+        unsubscribe = subscribe(entities, on_change)
+        self._unsubscribe = unsubscribe
+
+    def consume(self) -> bool:
+        """Retorna se estava sujo e limpa a marca."""
+        was_dirty = self.dirty
+        self.dirty = False
+        self.changed = set()
+        return was_dirty
+
+    def close(self):
+        self._unsubscribe()
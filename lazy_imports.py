@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Importações Preguiçosas
+Acesso centralizado aos módulos pesados (matplotlib, fpdf2, Pillow, tkcolorpicker, NumPy,
+pypdfium2, openpyxl).
+Nenhum deles é importado na inicialização; cada acessor importa sob demanda.
+"""
+
+import importlib
+import sys
+
+
+# Módulos que NÃO devem ser carregados antes da primeira pintura da janela
+HEAVY_MODULES = ("matplotlib", "fpdf", "PIL", "tkcolorpicker", "numpy", "pypdfium2", "openpyxl")
+
+
+def get_pyplot():
+    """Retorna matplotlib.pyplot configurado com o backend Agg."""
+    import matplotlib
+    matplotlib.use('Agg')  # Backend não-interativo para gerar imagens
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def get_tk_figure():
+    """Retorna (Figure, FigureCanvasTkAgg) para gráficos embutidos na interface."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return Figure, FigureCanvasTkAgg
+
+
+def get_fpdf_class():
+    """Retorna a classe FPDF (fpdf2)."""
+    # Garantir que unittest.mock esteja disponível antes de importar fpdf
+    # (fpdf.sign importa 'from unittest.mock import patch')
+    import unittest.mock  # noqa: F401
+    from fpdf import FPDF  # type: ignore[import-untyped]
+    return FPDF
+
+
+def get_pil_image():
+    """Retorna o módulo PIL.Image."""
+    from PIL import Image
+    return Image
+
+
+def get_pil_imagetk():
+    """Retorna o módulo PIL.ImageTk."""
+    from PIL import ImageTk
+    return ImageTk
+
+
+def get_numpy():
+    """Retorna o módulo numpy (motor colunar de analytics)."""
+    import numpy
+    return numpy
+
+
+def get_askcolor():
+    """Retorna tkcolorpicker.askcolor ou None se o pacote não estiver instalado."""
+    try:
+        from tkcolorpicker import askcolor
+        return askcolor
+    except ImportError:
+        return None
+
+
+def get_pdfium():
+    """Retorna o módulo pypdfium2 ou None se não estiver instalado (pré-visualização de PDF)."""
+    try:
+        import pypdfium2
+        return pypdfium2
+    except ImportError:
+        return None
+
+
+def get_openpyxl():
+    """Retorna o módulo openpyxl ou None se não estiver instalado (importação de XLSX)."""
+    try:
+        import openpyxl
+        return openpyxl
+    except ImportError:
+        return None
+
+
+def is_loaded(module_name: str) -> bool:
+    """Indica se um módulo já foi importado neste processo."""
+    return module_name in sys.modules
+
+
+def loaded_heavy_modules() -> list:
+    """Lista os módulos pesados já carregados (usado pelo benchmark de inicialização)."""
+    return [name for name in HEAVY_MODULES if is_loaded(name)]
+
+
+def prewarm_module(module_name: str) -> bool:
+    """
+    Importa um módulo antecipadamente (chamado em callbacks ociosos do Tk).
+    Retorna False se o módulo não estiver disponível.
+    """
+    if is_loaded(module_name):
+        return True
+    try:
+        if module_name == "matplotlib":
+            get_pyplot()
+        elif module_name == "fpdf":
+            get_fpdf_class()
+        else:
+            importlib.import_module(module_name)
+        return True
+    except ImportError:
+        return False
@@ -4,8 +4,14 @@ CalhaGest - Sistema de Gestão de Calhas
 Interface gráfica usando CustomTkinter (renderização CPU, sem problemas com GPU).
 """
 
+import time
+
+# Marco zero para medir o tempo até a primeira pintura (ver benchmarks/startup_benchmark.py)
+_STARTUP_T0 = time.perf_counter()
+
 import customtkinter as ctk
 from pathlib import Path
+import json
 import sys
 import os
 
@@ -15,6 +21,21 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from database import db
 from theme import ThemeManager, get_color, get_colors
+from components.resources import get_font
+
+
+# Views prováveis de serem abertas logo após o dashboard, construídas em
+# callbacks ociosos depois que a janela já foi pintada
+PREWARM_VIEWS = ("quotes", "products", "installations")
+
+# Módulos pesados aquecidos em segundo plano (um por callback ocioso)
+PREWARM_MODULES = ("fpdf", "matplotlib")
+
+# Com esta variável de ambiente o app mede a inicialização, imprime o resultado e fecha
+STARTUP_PROBE_ENV = "CALHAGEST_STARTUP_PROBE"
+
+# Com esta variável de ambiente o footprint das views é impresso a cada navegação
+VIEW_STATS_ENV = "CALHAGEST_VIEW_STATS"
 
 
 class CalhaGestApp(ctk.CTk):
@@ -28,9 +49,6 @@ class CalhaGestApp(ctk.CTk):
         self.geometry("1280x720")
         self.minsize(1024, 600)
 
-        # Ícone
-        self._set_icon()
-
         # Tema
         self.current_theme = "light"
         ThemeManager.set_theme("light")
@@ -45,11 +63,9 @@ class CalhaGestApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        # Sidebar
+        # Sidebar (nome da empresa é carregado após a primeira pintura)
         from components.navigation import Sidebar
-        settings = db.get_settings()
-        company_name = settings.get("company_name", "CalhaGest")
-        self.sidebar = Sidebar(self, self.show_view, company_name=company_name)
+        self.sidebar = Sidebar(self, self.show_view, company_name="CalhaGest")
         self.sidebar.grid(row=0, column=0, sticky="nsw")
 
         # Área de conteúdo
@@ -61,18 +77,73 @@ class CalhaGestApp(ctk.CTk):
         # Toast container
         self._toast_label = None
 
-        # Cache de views instanciadas (evita reconstrução a cada navegação)
-        self._views = {}
+        # Cache LRU de views instanciadas (evita reconstrução a cada navegação,
+        # limitado por quantidade e por memória estimada)
+        from components.view_cache import ViewCache
+        self._views = ViewCache()
 
-        # Exibir dashboard
+        # Tempos de inicialização (em ms desde o início do processo)
+        self.startup_timings = {"window_built": self._elapsed_ms()}
+
+        # Pipeline de inicialização: janela e sidebar pintam primeiro; banco,
+        # ícone, dashboard e pré-aquecimento rodam depois, fora do caminho crítico
+        self.after_idle(self._on_first_paint)
+
+    @staticmethod
+    def _elapsed_ms():
+        return round((time.perf_counter() - _STARTUP_T0) * 1000, 1)
+
+    def _on_first_paint(self):
+        """Etapa 2 da inicialização: executada quando a janela já foi pintada."""
+        self.startup_timings["first_paint"] = self._elapsed_ms()
+
+        db.ensure_database()
+        self.refresh_sidebar_company()
         self.show_view("dashboard")
+        self.startup_timings["dashboard_ready"] = self._elapsed_ms()
+
+        if os.environ.get(STARTUP_PROBE_ENV):
+            self._report_startup_and_quit()
+            return
+
+        # Ícone usa Pillow: carregado apenas quando a interface já responde
+        self.after_idle(self._set_icon)
+        self._schedule_prewarm(list(PREWARM_VIEWS), list(PREWARM_MODULES))
+
+    def _schedule_prewarm(self, views, modules):
+        """Constrói uma view (ou importa um módulo) por callback ocioso."""
+        def step():
+            # Não competir com a interação do usuário: uma tarefa por vez
+            if views:
+                name = views.pop(0)
+                if name not in self._views:
+                    view = self._create_view(name)
+                    if view:
+                        self._views.put(name, view, recent=False)
+            elif modules:
+                from lazy_imports import prewarm_module
+                prewarm_module(modules.pop(0))
+            if views or modules:
+                self.after(50, lambda: self.after_idle(step))
+
+        self.after(200, lambda: self.after_idle(step))
+
+    def _report_startup_and_quit(self):
+        """Imprime os tempos de inicialização em JSON (modo benchmark) e fecha o app."""
+        from lazy_imports import loaded_heavy_modules
+        report = dict(self.startup_timings)
+        report["heavy_modules_loaded"] = loaded_heavy_modules()
+        print(json.dumps(report), flush=True)
+        self.after(10, self.destroy)
 
     def _set_icon(self):
         """Define o ícone da janela."""
         try:
             icon_path = ROOT_DIR / "icon" / "CaLHAS.png"
             if icon_path.exists():
-                from PIL import Image, ImageTk
+                from lazy_imports import get_pil_image, get_pil_imagetk
+                Image = get_pil_image()
+                ImageTk = get_pil_imagetk()
                 img = Image.open(str(icon_path))
                 photo = ImageTk.PhotoImage(img.resize((32, 32)))
                 self.iconphoto(True, photo)
@@ -85,9 +156,9 @@ class CalhaGestApp(ctk.CTk):
         if view_name == self.current_view_name:
             return
 
-        # Ocultar view atual sem destruir os widgets
+        # Ocultar view atual sem destruir os widgets (on_hide salva o estado leve)
         if self.current_view_name and self.current_view_name in self._views:
-            self._views[self.current_view_name].pack_forget()
+            self._views.hide(self.current_view_name)
 
         # Criar view apenas se ainda não estiver em cache
         if view_name not in self._views:
@@ -98,14 +169,25 @@ class CalhaGestApp(ctk.CTk):
         # Exibir view (nova ou cacheada)
         if view_name in self._views:
             view = self._views[view_name]
+            self._views.touch(view_name)
             view.pack(fill="both", expand=True, padx=15, pady=15)
-            # Chamar on_show() se a view suportar (para atualizar dados sem reconstruir widgets)
+            # Chamar on_show() se a view suportar (atualiza dados ou reconstrói
+            # o que foi liberado por release_heavy_resources)
             if hasattr(view, "on_show"):
                 view.on_show()
 
         self.current_view_name = view_name
         self.sidebar.set_active(view_name)
 
+        # Aplicar limites do cache (libera/destrói views ocultas menos usadas)
+        self._views.enforce(active_name=view_name)
+        if os.environ.get(VIEW_STATS_ENV):
+            print(self._views.format_report(), flush=True)
+
+    def get_view_footprints(self):
+        """Retorna o footprint estimado de cada view em cache."""
+        return self._views.report()
+
     def _create_view(self, view_name):
         """Cria e retorna uma nova instância de view (chamado apenas uma vez por view)."""
         if view_name == "dashboard":
@@ -156,7 +238,7 @@ class CalhaGestApp(ctk.CTk):
             self.show_toast("Tema claro ativado ☀️", "info")
         
         # Recarregar view atual para atualizar cores
-        # Ao trocar de tema é necessário recriar os widgets — limpar o cache
+        # Ao trocar de tema é necessário recriar os widgets — destruir as views em cache
         current = self.current_view_name
         self.current_view_name = None
         self._views.clear()
@@ -183,7 +265,7 @@ class CalhaGestApp(ctk.CTk):
             text_color="white",
             corner_radius=8,
             height=36,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
         )
         self._toast_label.place(relx=0.5, y=10, anchor="n")
         self._toast_label.lift()
@@ -204,5 +286,8 @@ class CalhaGestApp(ctk.CTk):
 
 
 if __name__ == "__main__":
+    # Necessário no executável do PyInstaller: os workers de gráficos usam spawn
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = CalhaGestApp()
     app.mainloop()
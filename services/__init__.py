@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """
 CalhaGest - Services Package
-Módulos de funcionalidades principais: backup automático e geração de PDF.
+Módulos de funcionalidades principais: backup automático, geração de PDF,
+exportação de PDFs em lote e relatório financeiro do período.
 """
 
 # Backup automático
@@ -17,8 +18,20 @@ from services.backup import (
     restore_from_backup,
 )
 
-# Gerador de PDF
-from services.pdf_generator import generate_quote_pdf
+# Gerador de PDF: importado sob demanda (fpdf2 é pesado e não deve ser
+# carregado quando apenas o backup é usado, ex.: após cada escrita no banco)
+def __getattr__(name):
+    if name == 'generate_quote_pdf':
+        from services.pdf_generator import generate_quote_pdf
+        return generate_quote_pdf
+    if name == 'export_quotes':
+        from services.pdf_batch import export_quotes
+        return export_quotes
+    if name == 'build_period_report':
+        from services.report_generator import build_period_report
+        return build_period_report
+    raise AttributeError(f"module 'services' has no attribute {name!r}")
+
 
 __all__ = [
     # Backup
@@ -33,4 +46,6 @@ __all__ = [
     'restore_from_backup',
     # PDF
     'generate_quote_pdf',
+    'export_quotes',
+    'build_period_report',
 ]
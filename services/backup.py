@@ -81,7 +81,9 @@ def export_all_data() -> Dict[str, Any]:
         "quotes": [],
         "quote_items": [],
         "inventory": [],
+        "stock_deductions": [],
         "installations": [],
+        "crews": [],
         "payments": [],
         "expenses": [],
         "expense_categories": [],
@@ -122,10 +124,18 @@ def export_all_data() -> Dict[str, Any]:
     cursor.execute("SELECT * FROM inventory ORDER BY id")
     data["inventory"] = [dict(r) for r in cursor.fetchall()]
 
+    # Stock deductions
+    cursor.execute("SELECT * FROM stock_deductions ORDER BY quote_id, inventory_id")
+    data["stock_deductions"] = [dict(r) for r in cursor.fetchall()]
+
     # Installations
     cursor.execute("SELECT * FROM installations ORDER BY id")
     data["installations"] = [dict(r) for r in cursor.fetchall()]
 
+    # Crews
+    cursor.execute("SELECT * FROM crews ORDER BY id")
+    data["crews"] = [dict(r) for r in cursor.fetchall()]
+
     # Payments
     cursor.execute("SELECT * FROM payments ORDER BY id")
     data["payments"] = [dict(r) for r in cursor.fetchall()]
@@ -235,6 +245,8 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
             fields_to_restore = [
                 "company_name", "company_phone", "company_email",
                 "company_address", "company_cnpj", "dobra_value",
+                # Opções do PDF (toda nova configuração pdf_* entra aqui)
+                "pdf_group_items",
             ]
             sets = []
             vals = []
@@ -252,9 +264,11 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
 
         # 2. Limpar tabelas dependentes na ordem correta
         cursor.execute("DELETE FROM product_materials")
+        cursor.execute("DELETE FROM stock_deductions")
         cursor.execute("DELETE FROM quote_items")
         cursor.execute("DELETE FROM payments")
         cursor.execute("DELETE FROM installations")
+        cursor.execute("DELETE FROM crews")
         cursor.execute("DELETE FROM quotes")
         cursor.execute("DELETE FROM products")
         cursor.execute("DELETE FROM inventory")
@@ -267,8 +281,10 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
         # 3. Restaurar product_types
         for pt in data.get("product_types", []):
             cursor.execute(
-                "INSERT INTO product_types (id, key, label, created_at) VALUES (?, ?, ?, ?)",
-                (pt["id"], pt["key"], pt["label"], pt.get("created_at")),
+                """INSERT INTO product_types (id, key, label, install_hours_per_meter, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (pt["id"], pt["key"], pt["label"],
+                 pt.get("install_hours_per_meter", 0.25), pt.get("created_at")),
             )
         summary["product_types"] = len(data.get("product_types", []))
 
@@ -323,9 +339,9 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
                 """INSERT INTO quotes (id, client_name, client_phone, client_address,
                    total, cost_total, profit, profitability, status,
                    technical_notes, contract_terms, payment_methods,
-                   quote_type, discount_total, discount_type,
+                   quote_type, discount_total, discount_type, stock_deducted,
                    scheduled_date, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (
                     q["id"], q["client_name"], q.get("client_phone", ""),
                     q.get("client_address", ""), q.get("total", 0),
@@ -335,6 +351,9 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
                     q.get("payment_methods", ""),
                     q.get("quote_type", "instalado"),
                     q.get("discount_total", 0), q.get("discount_type", "percentage"),
+                    # Backups antigos: aprovados/concluídos já tinham baixado o estoque
+                    q.get("stock_deducted",
+                          1 if q.get("status") in ("approved", "completed") else 0),
                     q.get("scheduled_date"),
                     q.get("created_at"), q.get("updated_at"),
                 ),
@@ -361,16 +380,41 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
             )
         summary["quote_items"] = len(data.get("quote_items", []))
 
-        # 9. Restaurar installations
+        # Baixas de estoque dos orçamentos aprovados (usadas pelo MRP)
+        for sd in data.get("stock_deductions", []):
+            cursor.execute(
+                """INSERT INTO stock_deductions (quote_id, inventory_id, quantity)
+                   VALUES (?, ?, ?)""",
+                (sd["quote_id"], sd["inventory_id"], sd.get("quantity", 0)),
+            )
+        summary["stock_deductions"] = len(data.get("stock_deductions", []))
+
+        # 9. Restaurar crews e installations
+        for crew in data.get("crews", []):
+            cursor.execute(
+                """INSERT INTO crews (id, name, daily_capacity, capacity_unit,
+                   active, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    crew["id"], crew["name"], crew.get("daily_capacity", 40),
+                    crew.get("capacity_unit", "metros"), crew.get("active", 1),
+                    crew.get("created_at"), crew.get("updated_at"),
+                ),
+            )
+        summary["crews"] = len(data.get("crews", []))
+
         for inst in data.get("installations", []):
             cursor.execute(
                 """INSERT INTO installations (id, quote_id, client_name, address,
-                   scheduled_date, status, notes, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                   scheduled_date, status, notes, crew_id, load_meters, load_hours,
+                   created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (
                     inst["id"], inst["quote_id"], inst["client_name"],
                     inst.get("address", ""), inst["scheduled_date"],
                     inst.get("status", "pending"), inst.get("notes", ""),
+                    inst.get("crew_id"), inst.get("load_meters", 0),
+                    inst.get("load_hours", 0),
                     inst.get("created_at"), inst.get("updated_at"),
                 ),
             )
@@ -456,4 +500,7 @@ def restore_from_backup(filepath: Optional[str] = None) -> Dict[str, Any]:
     # Salvar backup atualizado após restauração
     trigger_backup()
 
+    # Views e caches devem recarregar tudo
+    db.notify_data_reset()
+
     return summary
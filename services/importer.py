@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Importação em Massa de Estoque e Produtos
+Lê planilhas CSV (ou XLSX, se o openpyxl estiver instalado) de fornecedores
+em blocos de linhas, valida e normaliza cada valor (decimais no formato
+brasileiro pelas regras de parse_decimal) e compara com o banco antes de
+gravar.
+
+Fluxo:
+- preview_import(): lê o arquivo em blocos e devolve um ImportPreview com
+  os registros novos, os alterados (campo a campo), os sem mudança e as
+  linhas com erro, sem tocar no banco;
+- apply_import(): grava o preview em uma única transação (executemany),
+  com um backup e um lote de eventos ao final.
+
+O registro existente é localizado pelo nome (estoque) ou pelo nome e tipo
+(produtos), sem diferenciar maiúsculas e acentos. Células vazias em um
+registro existente mantêm o valor atual.
+"""
+
+import csv
+import math
+import os
+import unicodedata
+from itertools import chain, islice
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from database import db
+from lazy_imports import get_openpyxl
+from utils import parse_decimal
+
+
+CHUNK_SIZE = 1000                # linhas validadas por bloco
+_SAMPLE_BYTES = 64 * 1024        # amostra para detectar codificação e separador
+_CSV_DELIMITERS = ";,\t|"
+
+_TRUE = {"1", "s", "sim", "x", "true", "yes", "y", "verdadeiro"}
+_FALSE = {"0", "n", "nao", "false", "no", "falso"}
+
+
+class Field(NamedTuple):
+    """Coluna aceita na planilha: nome no banco, cabeçalhos reconhecidos e conversão."""
+    name: str
+    aliases: Tuple[str, ...]
+    parse: Callable
+    default: object = None
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+class RowChange(NamedTuple):
+    """Linha válida: record_id é None para registro novo; before traz os valores alterados."""
+    line: int
+    record_id: Optional[int]
+    values: Dict
+    before: Dict
+
+
+class ImportPreview(NamedTuple):
+    """Resultado da leitura: o que será criado/alterado e o que foi rejeitado."""
+    target: str
+    path: str
+    columns: Tuple[str, ...]
+    inserts: List[RowChange]
+    updates: List[RowChange]
+    unchanged: int
+    errors: List[RowError]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.inserts or self.updates)
+
+
+def _normalize(text) -> str:
+    """Minúsculas, sem acentos e espaços extras (cabeçalhos e chaves)."""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode()
+    return " ".join(text.lower().replace("_", " ").split())
+
+
+# ===== Conversores de valores =====
+
+def _text(value):
+    value = str(value).strip()
+    return value or None
+
+
+def _decimal(value):
+    text = str(value).strip()
+    if not text:
+        return None
+    number = parse_decimal(text, strict=True)
+    # "nan"/"inf" passam pelo float(); o SQLite grava NaN como NULL
+    if not math.isfinite(number):
+        raise ValueError(f"valor não numérico: {text}")
+    if number < 0:
+        raise ValueError(f"valor negativo: {text}")
+    return number
+
+
+def _flag(value):
+    if isinstance(value, (bool, int, float)):
+        return int(bool(value))  # Célula numérica/lógica do XLSX
+    text = _normalize(value)
+    if not text:
+        return None
+    if text in _TRUE:
+        return 1
+    if text in _FALSE:
+        return 0
+    raise ValueError(f"esperado sim/não: {value!r}")
+
+
+def _pricing_unit(value):
+    text = _normalize(value)
+    if not text:
+        return None
+    if text in ("metro", "metros", "m", "ml"):
+        return "metro"
+    if text in ("unidade", "unidades", "un", "und", "peca", "pecas"):
+        return "unidade"
+    raise ValueError(f"unidade de cobrança inválida: {value!r}")
+
+
+# ===== Definição dos destinos =====
+
+INVENTORY_FIELDS = (
+    Field("name", ("nome", "material", "descricao", "name"), _text),
+    Field("type", ("tipo", "categoria", "type"), _text, "geral"),
+    Field("quantity", ("quantidade", "qtd", "qtde", "saldo", "estoque", "quantity"), _decimal, 0.0),
+    Field("unit", ("unidade", "un", "und", "unit"), _text, "unidades"),
+    Field("min_stock", ("estoque minimo", "minimo", "min", "min stock"), _decimal, 0.0),
+)
+
+PRODUCT_FIELDS = (
+    Field("name", ("nome", "produto", "name"), _text),
+    Field("type", ("tipo", "type"), _text, "calha"),
+    Field("width", ("largura", "medida", "width", "measure"), _decimal),
+    Field("price_per_meter", ("preco", "preco por metro", "preco metro", "preco m", "valor",
+                              "price", "price per meter"), _decimal),
+    Field("cost", ("custo", "cost"), _decimal, 0.0),
+    Field("has_dobra", ("dobra", "tem dobra", "has dobra"), _flag, 0),
+    Field("description", ("descricao", "observacao", "description"), _text, ""),
+    Field("is_installed", ("instalado", "instalacao", "is installed"), _flag, 1),
+    Field("pricing_unit", ("cobranca", "unidade de cobranca", "unidade", "pricing unit"),
+          _pricing_unit, "metro"),
+)
+
+TARGETS = {"inventory": INVENTORY_FIELDS, "products": PRODUCT_FIELDS}
+
+FIELD_LABELS = {
+    "name": "Nome", "type": "Tipo", "quantity": "Quantidade", "unit": "Unidade",
+    "min_stock": "Estoque mínimo", "width": "Largura", "measure": "Medida",
+    "price_per_meter": "Preço", "cost": "Custo", "has_dobra": "Dobra",
+    "description": "Descrição", "is_installed": "Instalado", "pricing_unit": "Cobrança",
+}
+
+
+def _map_header(header, fields) -> Dict[int, Field]:
+    """Posição de cada coluna reconhecida; colunas desconhecidas são ignoradas."""
+    by_alias = {_normalize(alias): field for field in fields for alias in field.aliases}
+    mapping, seen = {}, set()
+    for index, title in enumerate(header):
+        field = by_alias.get(_normalize(title))
+        if field and field.name not in seen:
+            mapping[index] = field
+            seen.add(field.name)
+    if "name" not in seen:
+        raise ValueError("A planilha precisa de uma coluna 'Nome'.")
+    return mapping
+
+
+# ===== Leitura em blocos =====
+
+def _sniff_csv(path: str) -> Tuple[str, str]:
+    """Codificação (UTF-8 ou a do Excel brasileiro) e separador do CSV."""
+    with open(path, "rb") as f:
+        sample = f.read(_SAMPLE_BYTES)
+    encoding = "utf-8-sig"
+    try:
+        text = sample.decode(encoding)
+    except UnicodeDecodeError as e:
+        if len(sample) == _SAMPLE_BYTES and e.start >= len(sample) - 3:
+            text = sample[:e.start].decode(encoding)  # Caractere cortado no fim da amostra
+        else:
+            encoding = "cp1252"
+            text = sample.decode(encoding, errors="replace")
+    try:
+        delimiter = csv.Sniffer().sniff(text.split("\n", 1)[0], _CSV_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ";" if ";" in text else ","
+    return encoding, delimiter
+
+
+def _iter_csv(path: str) -> Iterator[list]:
+    encoding, delimiter = _sniff_csv(path)
+    with open(path, "r", encoding=encoding, newline="") as f:
+        yield from csv.reader(f, delimiter=delimiter)
+
+
+def _iter_xlsx(path: str) -> Iterator[list]:
+    openpyxl = get_openpyxl()
+    if openpyxl is None:
+        raise ValueError("Para importar XLSX instale o openpyxl (ou salve a planilha como CSV).")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ["" if cell is None else cell for cell in row]
+    finally:
+        workbook.close()
+
+
+def iter_rows(path: str) -> Iterator[list]:
+    """Linhas da planilha (a primeira é o cabeçalho) sem carregar o arquivo inteiro."""
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        return _iter_xlsx(path)
+    return _iter_csv(path)
+
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, list]]]:
+    """Blocos de (nº da linha, valores); o primeiro começa pelo cabeçalho (linha 1)."""
+    rows = enumerate(iter_rows(path), start=1)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ===== Validação e diff =====
+
+def _record_key(target: str, values: Dict) -> tuple:
+    if target == "products":
+        return _normalize(values.get("name")), _normalize(values.get("type") or PRODUCT_FIELDS[1].default)
+    return (_normalize(values.get("name")),)
+
+
+def _parse_row(cells: list, mapping: Dict[int, Field]) -> Dict:
+    """Valores informados na linha (células vazias ficam de fora)."""
+    values = {}
+    for index, field in mapping.items():
+        raw = cells[index] if index < len(cells) else ""
+        try:
+            value = field.parse(raw)
+        except ValueError as e:
+            raise ValueError(f"{FIELD_LABELS.get(field.name, field.name)}: {e}")
+        if value is not None:
+            values[field.name] = value
+    if "name" not in values:
+        raise ValueError("nome vazio")
+    return values
+
+
+def _resolve_type(values: Dict, types: Dict[str, str]):
+    """Tipo de produto pela chave ou pelo rótulo cadastrado."""
+    if "type" not in values:
+        return
+    key = types.get(_normalize(values["type"]))
+    if key is None:
+        raise ValueError(f"tipo de produto não cadastrado: {values['type']!r}")
+    values["type"] = key
+
+
+def _product_columns(values: Dict) -> Dict:
+    """Colunas do produto como o cadastro grava: medida = largura, comprimento zerado."""
+    if "width" in values:
+        values["measure"] = values["width"]
+        values["length"] = 0.0
+    return values
+
+
+def _new_record(target: str, values: Dict, fields) -> Dict:
+    record = {field.name: values.get(field.name, field.default) for field in fields}
+    if target == "products":
+        if not record["width"] or not record["price_per_meter"]:
+            raise ValueError("Preço e largura devem ser maiores que zero")
+        _product_columns(record)
+    return record
+
+
+def _validate_product_update(values: Dict):
+    for column in ("width", "price_per_meter"):
+        if column in values and not values[column]:
+            raise ValueError("Preço e largura devem ser maiores que zero")
+
+
+def _changed(values: Dict, current: Dict) -> Dict:
+    """Colunas cujo valor importado difere do atual."""
+    diff = {}
+    for column, value in values.items():
+        old = current.get(column)
+        if column in ("name", "type") and _normalize(old) == _normalize(value):
+            continue  # Mesma chave: mantém a grafia cadastrada
+        if isinstance(value, float) and old is not None:
+            try:
+                if abs(float(old) - value) < 1e-9:
+                    continue
+            except (TypeError, ValueError):
+                pass
+        elif old == value:
+            continue
+        diff[column] = value
+    return diff
+
+
+def preview_import(path: str, target: str, chunk_size: int = CHUNK_SIZE) -> ImportPreview:
+    """
+    Lê e valida a planilha em blocos e compara com o banco (uma leitura do
+    destino). Nada é gravado; linhas com erro ficam de fora da importação.
+    """
+    fields = TARGETS[target]
+    chunks = iter_chunks(path, chunk_size)
+    first = next(chunks, [])
+    if not first:
+        raise ValueError("Planilha vazia.")
+    mapping = _map_header(first[0][1], fields)
+    columns = tuple(field.name for field in mapping.values())
+
+    existing = {}
+    for record in db.get_import_snapshot(target):
+        existing.setdefault(_record_key(target, record), record)
+    types = {}
+    if target == "products":
+        for t in db.get_all_product_types():
+            types[_normalize(t["key"])] = t["key"]
+            types.setdefault(_normalize(t["label"]), t["key"])
+
+    inserts, updates, errors = [], [], []
+    unchanged = 0
+    seen: Dict[tuple, int] = {}
+    for chunk in chain([first[1:]], chunks):
+        for line, cells in chunk:
+            if not any(str(cell).strip() for cell in cells):
+                continue  # Linha em branco
+            try:
+                values = _parse_row(cells, mapping)
+                if target == "products":
+                    _resolve_type(values, types)
+                key = _record_key(target, values)
+                if key in seen:
+                    raise ValueError(f"repetida (mesmo registro da linha {seen[key]})")
+                seen[key] = line
+                current = existing.get(key)
+                if current is None:
+                    inserts.append(RowChange(line, None, _new_record(target, values, fields), {}))
+                    continue
+                if target == "products":
+                    _validate_product_update(values)
+                    _product_columns(values)
+                diff = _changed(values, current)
+                if diff:
+                    updates.append(RowChange(line, current["id"], diff,
+                                             {column: current.get(column) for column in diff}))
+                else:
+                    unchanged += 1
+            except ValueError as e:
+                errors.append(RowError(line, str(e)))
+    return ImportPreview(target, path, columns, inserts, updates, unchanged, errors)
+
+
+def apply_import(preview: ImportPreview) -> Dict[str, int]:
+    """Grava o preview (uma transação, um backup). Retorna quantos foram criados e alterados."""
+    result = db.import_records(
+        preview.target,
+        [change.values for change in preview.inserts],
+        [(change.record_id, change.values) for change in preview.updates],
+    )
+    return {"created": len(result["created"]), "updated": len(result["updated"])}
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Planejamento de Necessidades de Materiais (MRP)
+Explode todos os orçamentos aprovados ainda não concluídos em
+product_materials (metro/cm/unidade) e projeta o estoque de cada material
+dia a dia pela agenda de instalações.
+
+O banco entrega, numa única consulta agregada (db.get_material_demand), o
+consumo por (material, dia); o resto é NumPy sobre colunas, sem laço por
+orçamento ou por material:
+- saldo físico = quantidade no estoque + o que os orçamentos aprovados
+  realmente baixaram na aprovação (ainda está na prateleira até a
+  instalação; a baixa para em zero, então não é o consumo calculado);
+- saldo projetado após cada dia = físico - consumo acumulado do material;
+- data de reposição: primeiro dia abaixo do estoque mínimo;
+- data de ruptura: primeiro dia com saldo negativo.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from database import db
+from lazy_imports import get_numpy
+
+
+class ReorderItem(NamedTuple):
+    """Material com necessidade de compra no backlog aprovado."""
+    inventory_id: int
+    name: str
+    unit: str
+    quantity: float            # saldo no estoque (já descontadas as aprovações)
+    on_hand: float             # saldo físico (quantidade + reservado)
+    demand: float              # consumo total do backlog
+    projected: float           # saldo físico após todo o backlog
+    min_stock: float
+    reorder_date: Optional[date]
+    stockout_date: Optional[date]
+    suggested_order: float     # quanto comprar para terminar o backlog no mínimo
+
+
+class MaterialPlan(NamedTuple):
+    """Linha do tempo (colunas NumPy por material e dia) e a lista de reposição."""
+    inventory_id: object       # np.ndarray[int64]
+    day: object                # np.ndarray[datetime64[D]]
+    consumption: object        # np.ndarray[float64]
+    projected: object          # saldo físico após o consumo do dia
+    reorder: List[ReorderItem]
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _first_per_group(mask, starts, size):
+    """Índice da primeira posição verdadeira de cada grupo (size se nenhuma)."""
+    np = get_numpy()
+    positions = np.where(mask, np.arange(size), size)
+    return np.minimum.reduceat(positions, starts)
+
+
+def build_material_plan(today=None, inventory: Optional[List[Dict]] = None) -> MaterialPlan:
+    """
+    Projeta o estoque de todos os materiais com consumo no backlog aprovado.
+    `inventory` (lista de db.get_all_inventory) pode ser passado para evitar
+    uma segunda leitura quando a tela já tem os itens.
+    """
+    np = get_numpy()
+    today = _as_date(today) if today else date.today()
+    rows = db.get_material_demand(today)
+    if inventory is None:
+        inventory = db.get_all_inventory()
+
+    if not rows:
+        empty = np.empty(0)
+        return MaterialPlan(empty.astype("int64"), empty.astype("datetime64[D]"), empty, empty, [])
+
+    inv_ids = np.fromiter((r[0] for r in rows), dtype="int64", count=len(rows))
+    days = np.array([r[1] for r in rows], dtype="datetime64[D]")
+    consumption = np.fromiter((r[2] or 0.0 for r in rows), dtype=float, count=len(rows))
+    reserved = np.fromiter((r[3] or 0.0 for r in rows), dtype=float, count=len(rows))
+
+    # Grupos contíguos por material (a consulta já ordena por material e dia)
+    size = len(rows)
+    starts = np.flatnonzero(np.r_[True, inv_ids[1:] != inv_ids[:-1]])
+    counts = np.diff(np.r_[starts, size])
+    group_ids = inv_ids[starts]
+
+    # Saldo do estoque, mínimo e físico de cada grupo (materiais removidos ficam com zero)
+    by_id = {item["id"]: item for item in inventory}
+    stock = np.array([by_id.get(int(i), {}).get("quantity") or 0.0 for i in group_ids])
+    min_stock = np.array([by_id.get(int(i), {}).get("min_stock") or 0.0 for i in group_ids])
+    on_hand = stock + np.add.reduceat(reserved, starts)
+
+    # Consumo acumulado dentro de cada material e saldo projetado linha a linha
+    cumulative = np.cumsum(consumption)
+    before_group = np.r_[0.0, cumulative][starts]
+    cumulative -= np.repeat(before_group, counts)
+    projected = np.repeat(on_hand, counts) - cumulative
+
+    demand = cumulative[starts + counts - 1]
+    reorder_at = _first_per_group(projected < np.repeat(min_stock, counts), starts, size)
+    stockout_at = _first_per_group(projected < 0, starts, size)
+    final = on_hand - demand
+    suggested = np.maximum(min_stock - final, 0.0)
+
+    reorder = []
+    for g in np.flatnonzero(reorder_at < size):
+        item = by_id.get(int(group_ids[g]), {})
+        reorder.append(ReorderItem(
+            inventory_id=int(group_ids[g]),
+            name=item.get("name", f"Material #{int(group_ids[g])}"),
+            unit=item.get("unit", ""),
+            quantity=float(stock[g]),
+            on_hand=float(on_hand[g]),
+            demand=float(demand[g]),
+            projected=float(final[g]),
+            min_stock=float(min_stock[g]),
+            reorder_date=days[reorder_at[g]].item(),
+            stockout_date=days[stockout_at[g]].item() if stockout_at[g] < size else None,
+            suggested_order=float(suggested[g]),
+        ))
+    # Rupturas primeiro, pela data; depois as reposições pela data
+    reorder.sort(key=lambda r: (r.stockout_date is None, r.stockout_date or r.reorder_date, r.name))
+    return MaterialPlan(inv_ids, days, consumption, projected, reorder)
+
+
+def get_reorder_list(today=None) -> List[ReorderItem]:
+    """Materiais que ficam abaixo do mínimo (ou em falta) com o backlog aprovado."""
+    return build_material_plan(today).reorder
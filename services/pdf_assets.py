@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Recursos Gráficos do PDF
+Prepara uma única vez as variantes prontas para o PDF do logo e dos ícones
+de pagamento, em vez de refazer o trabalho a cada orçamento gerado:
+
+- Logo: redimensionado para 256×256 (LANCZOS), sem alfa, gravado como JPEG
+  no diretório temporário. O nome do arquivo vem do hash do original; o hash
+  só é recalculado quando a data de modificação ou o tamanho mudam.
+- O JPEG já decodificado pelo fpdf2 (RasterImageInfo) fica em memória no
+  processo e é inserido no image_cache de cada documento (sem ler o disco).
+- Ícones SVG: continuam vetoriais; o SVGObject é montado uma vez por processo
+  e apenas desenhado na posição pedida.
+
+Qualquer falha volta para o caminho antigo (pdf.image com o arquivo original).
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from lazy_imports import get_pil_image
+
+
+# Incrementar quando o preparo das variantes mudar (invalida o cache em disco)
+ASSETS_VERSION = 1
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "icon")
+LOGO_PATH = os.path.join(ICON_DIR, "Quality.jpeg")
+PAYMENT_ICONS_DIR = os.path.join(ICON_DIR, "payment")
+ASSETS_DIR = os.path.join(tempfile.gettempdir(), "calhagest_pdf_assets")
+
+LOGO_PIXELS = 256
+LOGO_QUALITY = 90
+
+
+class _Stamp(NamedTuple):
+    """Assinatura do arquivo de origem: o hash só é refeito se mtime/tamanho mudarem."""
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+_lock = threading.Lock()
+_svg_lock = threading.Lock()      # transform_to_rect_viewport altera o SVGObject
+_stamps: Dict[str, _Stamp] = {}   # caminho de origem -> assinatura
+_rasters: Dict[str, tuple] = {}   # caminho de origem -> (digest, variante, RasterImageInfo)
+_vectors: Dict[str, tuple] = {}   # caminho de origem -> (digest, SVGObject)
+_stats = {"prepared": 0, "decoded": 0, "parsed": 0}
+
+
+def _stamp(path: str) -> Optional[_Stamp]:
+    """Assinatura atual do arquivo (None se não existir)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    cached = _stamps.get(path)
+    if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+        return cached
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    stamp = _Stamp(st.st_mtime_ns, st.st_size, digest)
+    _stamps[path] = stamp
+    return stamp
+
+
+def _variant_path(digest: str, suffix: str) -> str:
+    return os.path.join(ASSETS_DIR, f"{digest[:20]}-v{ASSETS_VERSION}{suffix}")
+
+
+def _prepare_logo(source: str, target: str):
+    """Gera o JPEG 256×256 sem alfa (gravação atômica: tmp + replace)."""
+    Image = get_pil_image()
+    with Image.open(source) as img:
+        img = img.resize((LOGO_PIXELS, LOGO_PIXELS), Image.LANCZOS)
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            bg = Image.new("RGB", img.size, (255, 255, 255))
+            bg.paste(img, mask=img.split()[3])
+            img = bg
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp_path, "JPEG", quality=LOGO_QUALITY)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    _stats["prepared"] += 1
+
+
+def logo_variant(source: str = LOGO_PATH) -> Optional[str]:
+    """Caminho do logo pronto para o PDF (gerado só quando o original muda)."""
+    with _lock:
+        stamp = _stamp(source)
+        if stamp is None:
+            return None
+        target = _variant_path(stamp.digest, ".jpg")
+        if not os.path.exists(target):
+            _prepare_logo(source, target)
+        return target
+
+
+def _raster_info(source: str):
+    """(variante, RasterImageInfo) decodificados uma vez por processo."""
+    variant = logo_variant(source)
+    if variant is None:
+        return None
+    with _lock:
+        digest = _stamps[source].digest
+        cached = _rasters.get(source)
+        if cached is not None and cached[0] == digest:
+            return cached[1], cached[2]
+        from fpdf.image_parsing import get_img_info  # type: ignore[import-untyped]
+        info = get_img_info(variant)
+        _rasters[source] = (digest, variant, info)
+        _stats["decoded"] += 1
+        return variant, info
+
+
+def place_logo(pdf, x: float, y: float, w: float, h: float, source: str = LOGO_PATH) -> bool:
+    """
+    Desenha o logo no documento reaproveitando a imagem já decodificada.
+    Retorna False se o logo não existir.
+    """
+    prepared = _raster_info(source)
+    if prepared is None:
+        return False
+    variant, info = prepared
+    images = pdf.image_cache.images
+    if variant not in images:
+        # Cópia por documento: o fpdf2 grava índice, usos e obj_id no dicionário
+        seeded = type(info)(info)
+        seeded["i"] = len(images) + 1
+        seeded["usages"] = 0
+        seeded["iccp_i"] = None
+        images[variant] = seeded
+    pdf.image(variant, x, y, w, h)
+    return True
+
+
+def _svg_object(path: str):
+    """SVGObject do ícone, montado uma vez por processo (None se não existir)."""
+    with _lock:
+        stamp = _stamp(path)
+        if stamp is None:
+            return None
+        cached = _vectors.get(path)
+        if cached is not None and cached[0] == stamp.digest:
+            return cached[1]
+        from fpdf.svg import SVGObject  # type: ignore[import-untyped]
+        with open(path, "rb") as f:
+            svg = SVGObject(f.read())
+        _vectors[path] = (stamp.digest, svg)
+        _stats["parsed"] += 1
+        return svg
+
+
+def place_icon(pdf, path: str, x: float, y: float, size: float) -> bool:
+    """
+    Desenha um ícone SVG (quadrado de lado `size`) sem reler nem reinterpretar
+    o arquivo. Retorna False se o ícone não existir.
+    """
+    svg = _svg_object(path)
+    if svg is None:
+        return False
+    try:
+        from fpdf.drawing import Transform  # type: ignore[import-untyped]
+        with _svg_lock:
+            _, _, group = svg.transform_to_rect_viewport(
+                scale=1, width=size, height=size, ignore_svg_top_attrs=True)
+            group.transform = group.transform @ Transform.translation(x, y)
+            old_x, old_y = pdf.x, pdf.y
+            try:
+                pdf.set_xy(0, 0)
+                pdf.draw_path(group)
+            finally:
+                pdf.set_xy(old_x, old_y)
+    except (TypeError, AttributeError):
+        # fpdf2 sem a API de viewport: caminho antigo
+        pdf.image(path, x=x, y=y, w=size, h=size)
+    return True
+
+
+def payment_icon_path(filename: str) -> str:
+    return os.path.join(PAYMENT_ICONS_DIR, filename)
+
+
+def preload_assets():
+    """Prepara logo e ícones antecipadamente (ex.: ao iniciar um lote de PDFs)."""
+    _raster_info(LOGO_PATH)
+    try:
+        names = sorted(os.listdir(PAYMENT_ICONS_DIR))
+    except OSError:
+        names = []
+    for name in names:
+        if name.endswith(".svg"):
+            _svg_object(payment_icon_path(name))
+
+
+def asset_hashes() -> Dict[str, str]:
+    """Hash de cada recurso usado no PDF (para compor impressões digitais)."""
+    paths = [LOGO_PATH]
+    try:
+        paths += [payment_icon_path(n) for n in sorted(os.listdir(PAYMENT_ICONS_DIR)) if n.endswith(".svg")]
+    except OSError:
+        pass
+    with _lock:
+        stamps = {os.path.relpath(p, ICON_DIR): _stamp(p) for p in paths}
+    return {name: f"{ASSETS_VERSION}:{s.digest}" for name, s in stamps.items() if s is not None}
+
+
+def clear_asset_cache(disk: bool = False):
+    """Descarta as variantes em memória (e, opcionalmente, as gravadas em disco)."""
+    with _lock:
+        _stamps.clear()
+        _rasters.clear()
+        _vectors.clear()
+    if disk:
+        try:
+            for entry in os.scandir(ASSETS_DIR):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+
+def asset_cache_stats() -> dict:
+    """Contadores de preparo/decodificação (usado pelo benchmark)."""
+    return dict(_stats, in_memory=len(_rasters) + len(_vectors))
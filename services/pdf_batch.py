@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Exportação de PDFs em Lote
+Gera os PDFs de vários orçamentos (ex.: todos os aprovados do mês ou todos
+de um cliente) em uma pasta escolhida. Orçamentos, itens e pagamentos vêm de
+uma única consulta (db.get_quotes_for_export); a geração é distribuída em um
+pool de processos — o fpdf2 é Python puro e segura o GIL, então threads não
+escalam. Os workers não acessam o banco: recebem dicionários prontos.
+
+O modo "documento único" junta todos os orçamentos em um só PDF, com um
+marcador por orçamento, gerado em um worker (um documento não pode ser
+dividido entre processos).
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class BatchResult(NamedTuple):
+    """Resultado da exportação: arquivos gerados, PDF único e falhas (id, mensagem)."""
+    files: List[str]
+    merged_path: Optional[str]
+    errors: List[Tuple[int, str]]
+    elapsed: float
+
+
+def _default_workers() -> int:
+    # Um núcleo fica livre para a interface
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def quote_filename(quote: Dict) -> str:
+    """Nome do arquivo de um orçamento no lote (único por orçamento)."""
+    from services.pdf_generator import safe_filename
+    return f"Orcamento_{quote.get('id', 0):05d}_{safe_filename(quote.get('client_name'))}.pdf"
+
+
+def _worker_init():
+    """Pré-importa fpdf2 e prepara logo/ícones (pago uma vez por processo)."""
+    from services import pdf_assets
+    import services.pdf_generator  # noqa: F401
+    try:
+        pdf_assets.preload_assets()
+    except Exception:
+        pass
+
+
+def _render_one(quote: Dict, settings: Dict, output_path: str) -> str:
+    """Executado no worker."""
+    from services.pdf_generator import generate_quote_pdf
+    return generate_quote_pdf(quote, settings, output_path)
+
+
+def _render_merged(quotes: List[Dict], settings: Dict, output_path: str) -> str:
+    """Executado no worker."""
+    from services.pdf_generator import generate_merged_pdf
+    return generate_merged_pdf(quotes, settings, output_path)
+
+
+def _create_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    try:
+        # spawn em todas as plataformas: fork de um processo com Tk e threads não é seguro
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+        )
+    except (OSError, ValueError, NotImplementedError):
+        return None
+
+
+def _export_local(quotes, settings, output_dir, merged_path, on_progress, cancel_event):
+    """Geração serializada no próprio processo (sem pool disponível)."""
+    from services.pdf_generator import generate_merged_pdf, generate_quote_pdf
+    total = len(quotes)
+    if merged_path:
+        return [], generate_merged_pdf(quotes, settings, merged_path, on_progress), []
+
+    files, errors = [], []
+    for done, quote in enumerate(quotes, start=1):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        try:
+            files.append(generate_quote_pdf(quote, settings, os.path.join(output_dir, quote_filename(quote))))
+        except Exception as e:
+            errors.append((quote.get('id', 0), str(e)))
+        if on_progress:
+            on_progress(done, total)
+    return files, None, errors
+
+
+def export_quotes(output_dir: str, status_filter: str = "", client_name: str = "",
+                  quote_ids: Optional[List[int]] = None, merged: bool = False,
+                  on_progress: Optional[ProgressCallback] = None,
+                  max_workers: Optional[int] = None,
+                  cancel_event: Optional[threading.Event] = None) -> BatchResult:
+    """
+    Exporta para output_dir os orçamentos que atendem aos filtros (status,
+    trecho do nome do cliente e/ou lista de ids). Bloqueia a thread
+    chamadora — chamar de uma thread de trabalho; on_progress(concluídos,
+    total) também roda nessa thread. cancel_event interrompe o lote (PDFs
+    já gerados são mantidos).
+    """
+    started = time.perf_counter()
+    from database import db
+    quotes = db.get_quotes_for_export(status_filter=status_filter, client_name=client_name,
+                                      quote_ids=quote_ids)
+    settings = db.get_settings()
+
+    total = len(quotes)
+    if on_progress:
+        on_progress(0, total)
+    if not quotes:
+        return BatchResult([], None, [], time.perf_counter() - started)
+
+    os.makedirs(output_dir, exist_ok=True)
+    merged_path = None
+    if merged:
+        merged_path = os.path.join(output_dir, f"Orcamentos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+
+    workers = min(total if not merged else 1, max_workers or _default_workers())
+    pool = _create_pool(workers) if total > 1 or merged else None
+    if pool is None:
+        files, merged_path, errors = _export_local(quotes, settings, output_dir, merged_path,
+                                                   on_progress, cancel_event)
+        return BatchResult(files, merged_path, errors, time.perf_counter() - started)
+
+    files, errors = [], []
+    try:
+        if merged:
+            merged_path = pool.submit(_render_merged, quotes, settings, merged_path).result()
+            if on_progress:
+                on_progress(total, total)
+        else:
+            pending = {
+                pool.submit(_render_one, quote, settings,
+                            os.path.join(output_dir, quote_filename(quote))): quote.get('id', 0)
+                for quote in quotes
+            }
+            for done, future in enumerate(as_completed(pending), start=1):
+                try:
+                    files.append(future.result())
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    errors.append((pending[future], str(e)))
+                if on_progress:
+                    on_progress(done, total)
+                if cancel_event is not None and cancel_event.is_set():
+                    for other in pending:
+                        other.cancel()
+                    break
+    except BrokenProcessPool:
+        # Pool indisponível (ex.: worker morto): termina no próprio processo
+        exported = {os.path.basename(path) for path in files}
+        remaining = [q for q in quotes if quote_filename(q) not in exported]
+        more, merged_path, more_errors = _export_local(remaining, settings, output_dir,
+                                                       merged_path, None, cancel_event)
+        files += more
+        errors += more_errors
+        if on_progress:
+            on_progress(total, total)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    files.sort()
+    return BatchResult(files, merged_path, errors, time.perf_counter() - started)
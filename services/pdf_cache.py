@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Cache de PDFs de Orçamento
+PDFs identificados por uma impressão digital de tudo o que é desenhado:
+orçamento, itens, resumo de pagamentos, dados da empresa, opções do PDF
+(pdf_*), versão do layout (pdf_generator.TEMPLATE_VERSION) e hash do
+logo/ícones. Se nada mudou desde a última geração, os bytes já prontos são
+devolvidos na hora (LRU em memória); qualquer alteração gera um novo PDF.
+
+Abrir um orçamento não grava nem lê arquivos: salvar em disco é uma ação
+explícita (save_pdf) na pasta pdfs/ ou onde o usuário escolher.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from services import pdf_assets
+
+
+# Pasta sugerida ao salvar
+PDF_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pdfs")
+MAX_MEMORY_PDFS = 8
+
+# Campos que não aparecem no PDF (editar só isso não invalida o PDF em memória)
+_IGNORED_QUOTE_FIELDS = ("updated_at",)
+
+_lock = threading.Lock()
+_memory = OrderedDict()  # impressão digital -> bytes do PDF
+
+
+class PdfBytes(NamedTuple):
+    """PDF em memória, nome sugerido para salvar e se veio do cache."""
+    data: bytes
+    filename: str
+    hit: bool
+    fingerprint: str
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return hashlib.sha1(bytes(value)).hexdigest()  # ex.: settings.company_logo
+    return str(value)
+
+
+def quote_fingerprint(quote: Dict, settings: Optional[Dict]) -> str:
+    """Impressão digital das entradas do PDF (quote precisa trazer 'payment_summary')."""
+    from services.pdf_generator import TEMPLATE_VERSION
+    payload = json.dumps(
+        [
+            TEMPLATE_VERSION,
+            {k: v for k, v in quote.items() if k not in _IGNORED_QUOTE_FIELDS},
+            {k: v for k, v in (settings or {}).items() if k.startswith(("company_", "pdf_"))},
+            pdf_assets.asset_hashes(),
+        ],
+        sort_keys=True, default=_json_default, separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_pdf_bytes(quote: Dict, settings: Optional[Dict] = None) -> PdfBytes:
+    """PDF do orçamento em memória (LRU por impressão digital; sem arquivos)."""
+    if quote.get("payment_summary") is None:
+        from database import db
+        quote = dict(quote, payment_summary=db.get_payment_summary(quote.get("id", 0)))
+    fingerprint = quote_fingerprint(quote, settings)
+    from services.pdf_batch import quote_filename
+    filename = quote_filename(quote)
+
+    with _lock:
+        data = _memory.get(fingerprint)
+        if data is not None:
+            _memory.move_to_end(fingerprint)
+            return PdfBytes(data, filename, True, fingerprint)
+
+    from services.pdf_generator import build_quote_pdf
+    data = build_quote_pdf(quote, settings)
+    with _lock:
+        _memory[fingerprint] = data
+        while len(_memory) > MAX_MEMORY_PDFS:
+            _memory.popitem(last=False)
+    return PdfBytes(data, filename, False, fingerprint)
+
+
+def get_quote_pdf_bytes(quote_id: int) -> Optional[PdfBytes]:
+    """Busca o orçamento e devolve o PDF em memória (para a pré-visualização)."""
+    from database import db
+    quotes = db.get_quotes_for_export(quote_ids=[quote_id])
+    if not quotes:
+        return None
+    return get_pdf_bytes(quotes[0], db.get_settings())
+
+
+def save_pdf(pdf: PdfBytes, path: str) -> str:
+    """Grava o PDF em memória no caminho escolhido (gravação atômica)."""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(pdf.data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
@@ -4,17 +4,39 @@
 CalhaGest - Gerador de PDF Profissional
 Gera documentos PDF com layout inspirado no fazerorcamento.com.
 Layout: Header azul com logo -> Titulo -> Descricao -> Precos -> Pagamento -> Contrato -> Assinaturas -> Rodape.
+As partes fixas vem de um modelo pre-compilado por versao das configuracoes
+(QuoteTemplate); so a tabela de itens e os totais sao desenhados por orcamento.
 """
 
-# Garantir que unittest.mock esteja disponível antes de importar fpdf
-# (fpdf.sign importa 'from unittest.mock import patch')
-import unittest.mock  # noqa: F401
-
-from fpdf import FPDF  # type: ignore[import-untyped]
+from collections import OrderedDict
 from datetime import datetime
 import os
-from utils import format_measure, format_dimensions
-from typing import Any, Optional
+import re
+import threading
+from typing import Any, Callable, NamedTuple, Optional
+
+from lazy_imports import get_fpdf_class
+from services.pdf_assets import asset_hashes, payment_icon_path, place_icon, place_logo
+
+# fpdf2 só é carregado quando este módulo é importado (sob demanda)
+FPDF = get_fpdf_class()
+try:
+    from fpdf.enums import PDFResourceType
+except ImportError:  # fpdf2 antigo: o modelo e desenhado direto (ver _replay_supported)
+    PDFResourceType = None
+
+
+# Incrementar quando o layout do PDF mudar (invalida os PDFs em services/pdf_cache)
+TEMPLATE_VERSION = 3
+
+
+# Layout A4 (mm)
+MARGIN = 15
+PAGE_LIMIT = 297 - 25  # altura A4 menos a margem de quebra automatica
+
+# Modelos pre-compilados mantidos em memoria (um por versao das configuracoes)
+MAX_TEMPLATES = 4
+MAX_TERMS_FRAGMENTS = 16
 
 
 # Meses em portugues
@@ -70,6 +92,10 @@ class QuotePDF(FPDF):
         self.company_name = company_name
         self.company_info: dict[str, Any] = company_info or {}
         self.set_auto_page_break(auto=True, margin=25)
+        # Mesma numeracao de fontes em todo documento (F1 negrito, F2 regular):
+        # os fragmentos do modelo sao reaproveitados entre documentos
+        for style in ('B', ''):
+            self.set_font('Helvetica', style, 10)
 
     def header(self):
         pass
@@ -78,89 +104,516 @@ class QuotePDF(FPDF):
         pass
 
 
+def safe_filename(text: str) -> str:
+    """Remove caracteres invalidos em nomes de arquivo (espacos viram '_')."""
+    cleaned = "".join(c for c in str(text or "") if c not in '<>:"/\\|?*' and ord(c) >= 32)
+    return cleaned.strip().replace(' ', '_') or 'Cliente'
+
+
 def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[str, Any]] = None, output_path: Optional[str] = None) -> str:
     """
     Gera um PDF profissional do orcamento no estilo fazerorcamento.com.
     """
     settings = company_settings or {}
-    company_name = settings.get('company_name', 'CalhaGest')
+    pdf = QuotePDF(settings.get('company_name', 'CalhaGest'), settings)
+    render_quote(pdf, quote, settings)
 
-    pdf = QuotePDF(company_name, settings)
-    pdf.add_page()
+    # ==============================
+    # SALVAR PDF
+    # ==============================
+    if not output_path:
+        pdf_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pdfs")
+        os.makedirs(pdf_dir, exist_ok=True)
+
+        client_name_safe = quote.get('client_name', 'Cliente').replace(' ', '_')
+        date_str = datetime.now().strftime('%Y%m%d')
+        output_path = os.path.join(pdf_dir, f"Orcamento_{client_name_safe}_{date_str}.pdf")
+
+    pdf.output(output_path)
+    return output_path
+
+
+def build_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[str, Any]] = None) -> bytes:
+    """Gera o PDF do orcamento em memoria (nenhum arquivo e gravado)."""
+    settings = company_settings or {}
+    pdf = QuotePDF(settings.get('company_name', 'CalhaGest'), settings)
+    render_quote(pdf, quote, settings)
+    return bytes(pdf.output())
+
+
+def generate_merged_pdf(quotes: list[dict[str, Any]], company_settings: Optional[dict[str, Any]], output_path: str,
+                        on_progress: Optional[Callable[[int, int], None]] = None) -> str:
+    """
+    Gera um unico PDF com varios orcamentos (um marcador por orcamento).
+    on_progress(concluidos, total) e chamado apos cada orcamento.
+    """
+    settings = company_settings or {}
+    pdf = QuotePDF(settings.get('company_name', 'CalhaGest'), settings)
+    template = get_template(settings)
+    for done, quote in enumerate(quotes, start=1):
+        bookmark = f"OR.{quote.get('id', 0):04d} - {quote.get('client_name', '') or 'Cliente'}"
+        render_quote(pdf, quote, settings, bookmark=bookmark, template=template)
+        if on_progress:
+            on_progress(done, len(quotes))
+    pdf.output(output_path)
+    return output_path
 
+
+# ==============================
+# MODELO PRE-COMPILADO
+# ==============================
+# As partes do orcamento que so dependem das configuracoes (faixa azul e
+# dados da empresa, titulos de secao, selos de pagamento, condicoes de
+# contrato e assinaturas) sao desenhadas uma vez numa pagina de rascunho e
+# guardadas como operadores PDF. Cada orcamento apenas reproduz esses
+# fragmentos na posicao certa; so a tabela de itens e os totais sao
+# calculados por orcamento.
+#
+# Gravar e reproduzir depende de partes internas do fpdf2 (catalogo de
+# recursos da pagina e _out), testadas na serie 2.8. Se a versao instalada
+# nao as tiver, cada fragmento e desenhado direto no orcamento (mais lento,
+# mesmo resultado).
+
+_text_widths: dict[tuple[str, str, float, str], float] = {}
+
+# Nome de estilo grafico (/GSn gs) nos operadores gravados
+_GS_NAME = re.compile(r"(?<=/)(GS\d+)(?= gs)")
+
+_TEMPLATE_SETTINGS = ('company_name', 'company_cnpj', 'company_address', 'company_phone')
+
+# Bootstrap Icons SVG mapping
+PAYMENT_ICONS = {
+    'pix': 'x-diamond-fill.svg',
+    'debito': 'credit-card.svg',
+    'credito': 'credit-card.svg',
+    'dinheiro': 'cash-stack.svg',
+    'transferencia': 'arrow-left-right.svg',
+    'boleto': 'file-earmark-break.svg',
+}
+
+PAYMENT_LABELS = {
+    'pix': 'pix',
+    'debito': 'debito',
+    'credito': 'credito',
+    'dinheiro': 'dinheiro',
+    'transferencia': 'transferencia',
+    'boleto': 'boleto',
+}
+
+PAYMENT_COLUMNS = 4  # selos por linha
+PAYMENT_BADGE_H = 7
+
+
+def text_width(pdf: QuotePDF, text: str) -> float:
+    """
+    get_string_width memorizado por (fonte, estilo, tamanho, texto). Vale
+    para as fontes padrao (Helvetica), cujas metricas nao mudam entre documentos.
+    """
+    key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, text)
+    width = _text_widths.get(key)
+    if width is None:
+        width = _text_widths[key] = pdf.get_string_width(text)
+    return width
+
+
+def _table_columns(content_width: float) -> tuple[float, float, float, float]:
+    """Larguras das colunas: produto, quantidade, valor unitario e subtotal."""
+    return content_width * 0.35, content_width * 0.15, content_width * 0.22, content_width * 0.28
+
+
+def _draw_header(pdf: QuotePDF, settings: dict[str, Any]) -> float:
+    """Faixa azul e dados da empresa no topo da pagina; devolve o y seguinte."""
     page_width = pdf.w
-    margin = 15
-    content_width = page_width - 2 * margin
+    content_width = page_width - 2 * MARGIN
 
-    # ==============================
-    # 1. FAIXA AZUL NO TOPO
-    # ==============================
     pdf.set_fill_color(*BLUE_PRIMARY)
     pdf.rect(0, 0, page_width, 28, 'F')
 
-    # ==============================
-    # 2. LOGO DA EMPRESA (quadrado)
-    # ==============================
-    logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "icon", "Quality.jpeg")
-
-    if os.path.exists(logo_path):
-        try:
-            logo_size = 25
-            logo_x = (page_width - logo_size) / 2
-            logo_y_top = 14
-
-            # Redimensionar logo para economizar tamanho do PDF
-            from PIL import Image
-            import tempfile
-            img = Image.open(logo_path)
-            img = img.resize((256, 256), Image.LANCZOS)
-            if img.mode == 'RGBA':
-                bg = Image.new('RGB', img.size, (255, 255, 255))
-                bg.paste(img, mask=img.split()[3])
-                img = bg
-            temp_logo = os.path.join(tempfile.gettempdir(), 'calhagest_logo_small.jpg')
-            img.save(temp_logo, 'JPEG', quality=90)
-
-            pdf.image(temp_logo, logo_x, logo_y_top, logo_size, logo_size)
-        except Exception:
-            pass
-
-    # ==============================
-    # 3. INFORMACOES DA EMPRESA
-    # ==============================
     y_pos = 48
 
     pdf.set_font('Helvetica', 'B', 14)
     pdf.set_text_color(*TEXT_DARK)
-    pdf.set_xy(margin, y_pos)
-    pdf.cell(content_width, 7, company_name, align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.set_xy(MARGIN, y_pos)
+    pdf.cell(content_width, 7, settings.get('company_name', 'CalhaGest'), align='C', new_x='LMARGIN', new_y='NEXT')
     y_pos += 7
 
     cnpj = settings.get('company_cnpj', '')
     if cnpj:
         pdf.set_font('Helvetica', '', 9)
         pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
+        pdf.set_xy(MARGIN, y_pos)
         pdf.cell(content_width, 5, f"CNPJ/CPF: {cnpj}", align='C', new_x='LMARGIN', new_y='NEXT')
         y_pos += 5
 
-    address = settings.get('company_address', '')
-    if address:
+    for line in (settings.get('company_address', ''), settings.get('company_phone', '')):
+        if line:
+            pdf.set_font('Helvetica', '', 8)
+            pdf.set_text_color(*TEXT_DARK)
+            pdf.set_xy(MARGIN, y_pos)
+            pdf.cell(content_width, 5, line, align='C', new_x='LMARGIN', new_y='NEXT')
+            y_pos += 5
+
+    return y_pos + 3
+
+
+def _draw_section_title(pdf: QuotePDF, y_pos: float, title: str, size: int = 12,
+                        height: float = 7, gap: float = 5, advance: float = 8) -> float:
+    """Linha divisoria seguida do titulo da secao; devolve o y seguinte."""
+    pdf.set_draw_color(*BORDER_COLOR)
+    pdf.line(MARGIN, y_pos, pdf.w - MARGIN, y_pos)
+    y_pos += gap
+
+    pdf.set_font('Helvetica', 'B', size)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN, y_pos)
+    pdf.cell(pdf.w - 2 * MARGIN, height, title, new_x='LMARGIN', new_y='NEXT')
+    return y_pos + advance
+
+
+def _draw_table_header(pdf: QuotePDF, y_pos: float) -> float:
+    """Cabecalho das colunas da tabela de precos."""
+    col_product, col_qty, col_unit_price, _ = _table_columns(pdf.w - 2 * MARGIN)
+    pdf.set_font('Helvetica', '', 8)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN + col_product, y_pos)
+    pdf.cell(col_qty, 5, "Qtde.", align='C')
+    pdf.set_xy(MARGIN + col_product + col_qty, y_pos)
+    pdf.cell(col_unit_price, 5, "Valor unitario", align='C')
+    return y_pos + 7
+
+
+def _draw_continuation_header(pdf: QuotePDF, y_pos: float) -> float:
+    """Titulo e cabecalho repetidos quando a tabela continua em outra pagina."""
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN, y_pos)
+    pdf.cell(pdf.w - 2 * MARGIN, 7, "Precos (continuacao)", new_x='LMARGIN', new_y='NEXT')
+    return _draw_table_header(pdf, y_pos + 9)
+
+
+def _draw_dashed_rule(pdf: QuotePDF, y_pos: float) -> float:
+    """Linha pontilhada entre os itens e os totais."""
+    pdf.set_draw_color(*BORDER_COLOR)
+    dash_x = MARGIN
+    while dash_x < pdf.w - MARGIN:
+        end_x = min(dash_x + 3, pdf.w - MARGIN)
+        pdf.line(dash_x, y_pos, end_x, y_pos)
+        dash_x += 6
+    return y_pos + 5
+
+
+def _draw_payment_badge(pdf: QuotePDF, method: str, x: float, y_pos: float):
+    """Selo de um metodo de pagamento (icone SVG + nome)."""
+    label = PAYMENT_LABELS.get(method, method)
+    svg_file = PAYMENT_ICONS.get(method, '')
+    svg_path = payment_icon_path(svg_file) if svg_file else ''
+    has_icon = svg_path and os.path.exists(svg_path)
+    icon_size = 4  # mm for SVG icon
+    badge_h = PAYMENT_BADGE_H
+
+    pdf.set_font('Helvetica', '', 8)
+    label_w = text_width(pdf, f" {label}") + 3
+    badge_total_w = (icon_size + 5) + label_w + 4 if has_icon else label_w + 8
+
+    # Borda externa do badge
+    pdf.set_draw_color(*BORDER_COLOR)
+    pdf.set_fill_color(*WHITE)
+    pdf.rect(x, y_pos, badge_total_w, badge_h, 'FD')
+
+    if has_icon:
+        # Icon box background
+        icon_box_x = x + 1.5
+        icon_box_w = icon_size + 3
+        pdf.set_fill_color(*BG_LIGHT)
+        pdf.set_draw_color(*BORDER_COLOR)
+        pdf.rect(icon_box_x, y_pos + 1, icon_box_w, badge_h - 2, 'FD')
+
+        # Render SVG icon
+        icon_x = icon_box_x + (icon_box_w - icon_size) / 2
+        icon_y = y_pos + (badge_h - icon_size) / 2
+        try:
+            place_icon(pdf, svg_path, icon_x, icon_y, icon_size)
+        except Exception:
+            pass
+
+        # Label after icon
         pdf.set_font('Helvetica', '', 8)
         pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 5, address, align='C', new_x='LMARGIN', new_y='NEXT')
-        y_pos += 5
-
-    phone = settings.get('company_phone', '')
-    if phone:
+        pdf.set_xy(icon_box_x + icon_box_w + 1, y_pos)
+        pdf.cell(label_w, badge_h, label or '')
+    else:
         pdf.set_font('Helvetica', '', 8)
         pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 5, phone, align='C', new_x='LMARGIN', new_y='NEXT')
-        y_pos += 5
+        pdf.set_xy(x + 3, y_pos)
+        pdf.cell(badge_total_w - 6, badge_h, label or '')
+
+
+def _draw_contract(pdf: QuotePDF, y_pos: float, contract: str) -> float:
+    """Titulo e texto das condicoes de contrato; devolve o y apos o texto."""
+    y_pos = _draw_section_title(pdf, y_pos, "Condicoes de contrato")
+    pdf.set_font('Helvetica', '', 9)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN, y_pos)
+    pdf.multi_cell(pdf.w - 2 * MARGIN, 5, contract)
+    return pdf.get_y()
+
+
+def _draw_signature(pdf: QuotePDF, line_y: float, company_name: str):
+    """Linhas de assinatura (empresa e cliente) e o link 'Assinar documento'."""
+    content_width = pdf.w - 2 * MARGIN
+    half_width = (content_width - 30) / 2
+
+    # Linha assinatura empresa
+    pdf.set_draw_color(*BLUE_PRIMARY)
+    pdf.set_line_width(0.5)
+    pdf.line(MARGIN, line_y, MARGIN + half_width, line_y)
+
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN, line_y + 2)
+    pdf.cell(half_width, 6, company_name, align='C')
+
+    # Linha assinatura cliente
+    client_line_x = MARGIN + half_width + 30
+    pdf.line(client_line_x, line_y, client_line_x + half_width, line_y)
+
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(client_line_x, line_y + 2)
+    pdf.cell(half_width, 6, "Cliente", align='C')
+
+    pdf.set_line_width(0.2)
+
+    # Link assinar documento (abaixo da data, desenhada por orcamento)
+    sign_y = line_y + 18
+    pdf.set_font('Helvetica', 'B', 10)
+    pdf.set_text_color(*BLUE_PRIMARY)
+    sign_text = 'Assinar documento'
+    sign_url = 'https://assinador.iti.br/assinatura/index.xhtml'
+    text_w = text_width(pdf, sign_text)
+    sign_x = MARGIN + (content_width - text_w) / 2
+    pdf.set_xy(sign_x, sign_y)
+    pdf.cell(text_w, 6, sign_text, link=sign_url)
+    # Sublinhado decorativo
+    pdf.set_draw_color(*BLUE_PRIMARY)
+    pdf.set_line_width(0.3)
+    pdf.line(sign_x, sign_y + 6, sign_x + text_w, sign_y + 6)
+    pdf.set_line_width(0.2)
+
+
+def _replay_supported() -> bool:
+    """Indica se o fpdf2 instalado expoe as partes internas usadas por _record/_replay."""
+    if PDFResourceType is None or not all(
+            hasattr(PDFResourceType, attr) for attr in ('FONT', 'EXT_G_STATE')):
+        return False
+    catalog = getattr(FPDF(), '_resource_catalog', None)
+    return (all(callable(getattr(catalog, attr, None))
+                for attr in ('add', 'get_resources_per_page', 'register_graphics_style'))
+            and all(callable(getattr(FPDF, attr, None)) for attr in ('_out', '_set_min_pdf_version')))
+
+
+REPLAY_SUPPORTED = _replay_supported()
+
+_Draw = Callable[[QuotePDF, float, float], Optional[float]]
+
+
+class _Fragment(NamedTuple):
+    """Trecho de pagina ja desenhado, reproduzivel em qualquer posicao."""
+    pieces: tuple[str, ...]   # operadores PDF intercalados com os nomes /GSn do rascunho (vazio: desenho direto)
+    styles: dict[str, Any]    # nome /GSn do rascunho -> estilo grafico (GraphicsStyle)
+    fonts: frozenset[int]     # fontes usadas (numeracao fixa de QuotePDF)
+    height: float             # altura ocupada a partir da origem (mm)
+    links: tuple[tuple[float, float, float, float, str], ...]  # relativos a origem
+    draw: _Draw               # draw(pdf, x, y): desenho original do fragmento
+
 
-    y_pos += 3
+def _record(draw: _Draw, replay: bool = True) -> _Fragment:
+    """
+    Executa draw(pdf, 0, 0) numa pagina de rascunho e guarda os operadores
+    gerados. Cores e fonte comecam indefinidas, entao o fragmento emite tudo
+    o que usa e nao depende do estado da pagina onde for reproduzido. Sem
+    imagens raster: o logo continua sendo colocado por orcamento. Com
+    replay=False so a altura e medida e _replay chama draw direto.
+    """
+    pdf = QuotePDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=False)
+    if not replay:
+        height = draw(pdf, 0.0, 0.0)
+        return _Fragment((), {}, frozenset(), height or 0.0, (), draw)
+
+    pdf.fill_color = pdf.draw_color = pdf.text_color = None
+    pdf.current_font_is_set_on_page = False
+
+    links: list[tuple[float, float, float, float, str]] = []
+    pdf.link = lambda x, y, w, h, link, **kwargs: links.append((x, y, w, h, link))
+
+    # Estilos graficos registrados no rascunho, para registrar de novo no destino
+    catalog = pdf._resource_catalog
+    styles: dict[str, Any] = {}
+    register_style = catalog.register_graphics_style
+
+    def keep_style(style):
+        name = register_style(style)
+        if name is not None:
+            styles[str(name)] = style
+        return name
+
+    catalog.register_graphics_style = keep_style
+
+    contents = pdf.pages[pdf.page].contents
+    start = len(contents)
+    height = draw(pdf, 0.0, 0.0)
+    stream = bytes(contents[start:]).decode('latin-1')
+
+    fonts = frozenset(catalog.get_resources_per_page(pdf.page, PDFResourceType.FONT))
+    return _Fragment(tuple(_GS_NAME.split(stream)), styles, fonts, height or 0.0, tuple(links), draw)
+
+
+def _replay(pdf: QuotePDF, fragment: _Fragment, x: float = 0.0, y: float = 0.0):
+    """Reproduz o fragmento na pagina atual, deslocado (x, y) mm da origem."""
+    if not fragment.pieces:
+        fragment.draw(pdf, x, y)
+        return
+
+    catalog = pdf._resource_catalog
+    page = pdf.page
+    pieces = list(fragment.pieces)
+    for i in range(1, len(pieces), 2):
+        name = catalog.register_graphics_style(fragment.styles[pieces[i]])
+        catalog.add(PDFResourceType.EXT_G_STATE, name, page)
+        pieces[i] = str(name)
+    if fragment.styles:
+        pdf._set_min_pdf_version("1.4")
+    for font in fragment.fonts:
+        catalog.add(PDFResourceType.FONT, font, page)
+
+    # q/Q: o estado grafico da pagina volta ao que o fpdf espera
+    pdf._out(f"q 1 0 0 1 {x * pdf.k:.2f} {-y * pdf.k:.2f} cm\n{''.join(pieces)}\nQ")
+    for link_x, link_y, link_w, link_h, url in fragment.links:
+        pdf.link(link_x + x, link_y + y, link_w, link_h, url)
+
+
+class QuoteTemplate:
+    """
+    Fragmentos fixos de um conjunto de configuracoes. Os selos de pagamento
+    e o texto do contrato sao gravados na primeira vez que aparecem. Com
+    replay=False (ou fpdf2 sem as partes internas) nada e gravado: cada
+    fragmento e desenhado direto na posicao pedida.
+    """
+
+    def __init__(self, settings: dict[str, Any], replay: bool = REPLAY_SUPPORTED):
+        self.company_name = settings.get('company_name', 'CalhaGest')
+        self.replay = replay
+        self._lock = threading.Lock()
+        self._badges: dict[str, _Fragment] = {}
+        self._terms: "OrderedDict[str, _Fragment]" = OrderedDict()
+
+        self.header = self._record(lambda pdf, x, y: _draw_header(pdf, settings))
+        self.prices_title = self._record(
+            lambda pdf, x, y: _draw_section_title(pdf, y, "Precos", gap=4, advance=7) - y)
+        self.table_header = self._record(lambda pdf, x, y: _draw_table_header(pdf, y) - y)
+        self.continuation = self._record(lambda pdf, x, y: _draw_continuation_header(pdf, y) - y)
+        self.dashed_rule = self._record(lambda pdf, x, y: _draw_dashed_rule(pdf, y) - y)
+        self.finance_title = self._record(
+            lambda pdf, x, y: _draw_section_title(pdf, y, "Situacao Financeira", size=11) - y)
+        self.payment_title = self._record(
+            lambda pdf, x, y: _draw_section_title(pdf, y, "Metodos de pagamento", advance=9) - y)
+        self.signature = self._record(lambda pdf, x, y: _draw_signature(pdf, y, self.company_name))
+
+    def _record(self, draw: _Draw) -> _Fragment:
+        return _record(draw, self.replay)
+
+    def badge(self, method: str) -> _Fragment:
+        with self._lock:
+            fragment = self._badges.get(method)
+            if fragment is None:
+                fragment = self._badges[method] = self._record(
+                    lambda pdf, x, y: _draw_payment_badge(pdf, method, x, y))
+            return fragment
+
+    def terms(self, contract: str) -> _Fragment:
+        with self._lock:
+            fragment = self._terms.get(contract)
+            if fragment is None:
+                fragment = self._terms[contract] = self._record(
+                    lambda pdf, x, y: _draw_contract(pdf, y, contract) - y)
+                while len(self._terms) > MAX_TERMS_FRAGMENTS:
+                    self._terms.popitem(last=False)
+            else:
+                self._terms.move_to_end(contract)
+            return fragment
+
+
+_templates: "OrderedDict[tuple, QuoteTemplate]" = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+def get_template(company_settings: Optional[dict[str, Any]] = None) -> QuoteTemplate:
+    """
+    Modelo das configuracoes atuais. A chave inclui os dados da empresa, o
+    hash dos icones e TEMPLATE_VERSION: mudar qualquer um gera outro modelo.
+    """
+    settings = company_settings or {}
+    key = (
+        TEMPLATE_VERSION,
+        tuple((name, str(settings.get(name, ''))) for name in _TEMPLATE_SETTINGS),
+        tuple(sorted(asset_hashes().items())),
+    )
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+            return template
+
+    template = QuoteTemplate(settings)
+    with _templates_lock:
+        template = _templates.setdefault(key, template)
+        while len(_templates) > MAX_TEMPLATES:
+            _templates.popitem(last=False)
+    return template
+
+
+def clear_templates():
+    """Descarta os modelos e as larguras de texto memorizadas."""
+    with _templates_lock:
+        _templates.clear()
+    _text_widths.clear()
+
+
+def render_quote(pdf: QuotePDF, quote: dict[str, Any], settings: dict[str, Any], bookmark: Optional[str] = None,
+                 template: Optional[QuoteTemplate] = None):
+    """
+    Desenha o orcamento em novas paginas do documento. Se o dicionario ja
+    trouxer 'payment_summary' (exportacao em lote), o banco nao e consultado.
+    As partes fixas vem do modelo das configuracoes (get_template).
+    """
+    template = template or get_template(settings)
+
+    pdf.add_page()
+    if bookmark:
+        pdf.start_section(bookmark)
+
+    page_width = pdf.w
+    margin = MARGIN
+    content_width = page_width - 2 * margin
+
+    # ==============================
+    # 1. FAIXA AZUL + INFORMACOES DA EMPRESA
+    # ==============================
+    _replay(pdf, template.header)
+    y_pos = template.header.height
+
+    # ==============================
+    # 2. LOGO DA EMPRESA (quadrado)
+    # ==============================
+    # Variante 256×256 preparada uma vez (services/pdf_assets), já decodificada em memória
+    try:
+        logo_size = 25
+        logo_x = (page_width - logo_size) / 2
+        logo_y_top = 14
+        place_logo(pdf, logo_x, logo_y_top, logo_size, logo_size)
+    except Exception:
+        pass
 
     # ==============================
     # 4. TITULO DO ORCAMENTO
@@ -168,30 +621,7 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     qt = quote.get('quote_type', 'instalado') or 'instalado'
     items = quote.get('items', [])
     if items:
-        product_types: list[str] = []
-        seen: set[str] = set()
-        for item in items:
-            name = item.get('product_name', '').lower()
-            if 'calha' in name and 'calhas' not in seen:
-                product_types.append('calhas')
-                seen.add('calhas')
-            elif 'rufo' in name and 'rufos' not in seen:
-                product_types.append('rufos')
-                seen.add('rufos')
-            elif 'pingadeira' in name and 'pingadeiras' not in seen:
-                product_types.append('pingadeiras')
-                seen.add('pingadeiras')
-            elif name not in seen:
-                product_types.append(item.get('product_name', ''))
-                seen.add(name)
-
-        if product_types:
-            if qt == 'instalado':
-                service_title = f"Instalacao"
-            else:
-                service_title = f"Orcamento"
-        else:
-            service_title = "Instalacao" if qt == 'instalado' else "Orcamento"
+        service_title = "Instalacao" if qt == 'instalado' else "Orcamento"
     else:
         service_title = "Instalacao" if qt == 'instalado' else "Orcamento de Servicos"
 
@@ -217,15 +647,7 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     # 5. DESCRICAO DAS ATIVIDADES
     # ==============================
     if notes and len(notes) > 60:
-        pdf.set_draw_color(*BORDER_COLOR)
-        pdf.line(margin, y_pos, page_width - margin, y_pos)
-        y_pos += 5
-
-        pdf.set_font('Helvetica', 'B', 14)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 8, "Descricao das atividades", new_x='LMARGIN', new_y='NEXT')
-        y_pos += 9
+        y_pos = _draw_section_title(pdf, y_pos, "Descricao das atividades", size=14, height=8, advance=9)
 
         pdf.set_font('Helvetica', '', 10)
         pdf.set_text_color(*TEXT_SECONDARY)
@@ -236,126 +658,42 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     # ==============================
     # 6. TABELA DE PRECOS
     # ==============================
-    pdf.set_draw_color(*BORDER_COLOR)
-    pdf.line(margin, y_pos, page_width - margin, y_pos)
-    y_pos += 4
-
-    pdf.set_font('Helvetica', 'B', 12)
-    pdf.set_text_color(*TEXT_DARK)
-    pdf.set_xy(margin, y_pos)
-    pdf.cell(content_width, 7, "Precos", new_x='LMARGIN', new_y='NEXT')
-    y_pos += 7
+    _replay(pdf, template.prices_title, 0, y_pos)
+    y_pos += template.prices_title.height
 
     if items:
-        col_product = content_width * 0.35
-        col_qty = content_width * 0.15
-        col_unit_price = content_width * 0.22
-        col_subtotal = content_width * 0.28
+        from services.pdf_table import render_item_table
 
         # Cabecalho das colunas
-        pdf.set_font('Helvetica', '', 8)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin + col_product, y_pos)
-        pdf.cell(col_qty, 5, "Qtde.", align='C')
-        pdf.set_xy(margin + col_product + col_qty, y_pos)
-        pdf.cell(col_unit_price, 5, "Valor unitario", align='C')
-        y_pos += 7
+        _replay(pdf, template.table_header, 0, y_pos)
+        y_pos += template.table_header.height
 
         def _check_page_break(current_y, needed_height=12):
             """Verifica se precisa de nova pagina e adiciona se necessario."""
-            page_bottom_limit = 297 - 25  # A4 height minus margin
-            if current_y + needed_height > page_bottom_limit:
-                pdf.add_page()
-                current_y = 20
-                # Repetir cabeçalho da tabela na nova página
-                pdf.set_font('Helvetica', 'B', 12)
-                pdf.set_text_color(*TEXT_DARK)
-                pdf.set_xy(margin, current_y)
-                pdf.cell(content_width, 7, "Precos (continuacao)", new_x='LMARGIN', new_y='NEXT')
-                current_y += 9
-                pdf.set_font('Helvetica', '', 8)
-                pdf.set_text_color(*TEXT_DARK)
-                pdf.set_xy(margin + col_product, current_y)
-                pdf.cell(col_qty, 5, "Qtde.", align='C')
-                pdf.set_xy(margin + col_product + col_qty, current_y)
-                pdf.cell(col_unit_price, 5, "Valor unitario", align='C')
-                current_y += 7
+            if current_y + needed_height > PAGE_LIMIT:
+                current_y = _continuation_page()
             return current_y
 
-        for item in items:
-            # Verificar se precisa de nova pagina antes de cada item
-            y_pos = _check_page_break(y_pos, 12)
-
-            product_name = item.get('product_name', '-')
-            meters = item.get('meters', 0)
-            price_per_meter = item.get('price_per_meter', 0)
-            item_total = item.get('total', 0)
-            measure = item.get('measure', 0)
-            item_discount = item.get('discount', 0)
-            item_width = item.get('width', 0)
-            item_length = item.get('length', 0)
-            item_pricing_unit = item.get('pricing_unit', 'metro') or 'metro'
-            if item_pricing_unit == 'unidade':
-                unit_suffix = 'Un'
-            elif item_pricing_unit == 'm²':
-                unit_suffix = 'm²'
-            else:
-                unit_suffix = 'm'
-
-            row_y = y_pos
-
-            # Nome do produto
-            pdf.set_font('Helvetica', '', 10)
-            pdf.set_text_color(*TEXT_DARK)
-            pdf.set_xy(margin, row_y)
-            product_display = f"{product_name}"
-            if item_width or item_length:
-                product_display += f" ({format_dimensions(item_width, item_length)})"
-            elif measure:
-                product_display += f" ({format_measure(measure)})"
-            if item_discount > 0:
-                product_display += f" [-{_fmt_currency(item_discount)}]"
-            pdf.cell(col_product, 7, product_display)
-
-            # Quantidade
-            pdf.set_font('Helvetica', '', 9)
-            pdf.set_text_color(*TEXT_DARK)
-            pdf.set_xy(margin + col_product, row_y)
-            pdf.cell(col_qty, 7, f"{meters:.2f}{unit_suffix}", align='C')
-
-            # Valor unitario
-            pdf.set_xy(margin + col_product + col_qty, row_y)
-            pdf.cell(col_unit_price, 7, _fmt_currency(price_per_meter), align='C')
-
-            # Subtotal (badge verde)
-            badge_x = margin + col_product + col_qty + col_unit_price + 2
-            badge_w = col_subtotal - 7
-            badge_h = 7
-
-            pdf.set_fill_color(*GREEN_BADGE)
-            pdf.rect(badge_x, row_y, badge_w, badge_h, 'F')
-
-            pdf.set_font('Helvetica', 'B', 9)
-            pdf.set_text_color(*WHITE)
-            pdf.set_xy(badge_x, row_y)
-            pdf.cell(badge_w, badge_h, _fmt_currency(item_total), align='C')
+        def _continuation_page():
+            """Nova pagina com o cabecalho da tabela repetido."""
+            pdf.add_page()
+            _replay(pdf, template.continuation, 0, 20)
+            return 20 + template.continuation.height
 
-            y_pos += 10
+        # Linhas dos itens em uma passada (subtotal calculado no mesmo passo)
+        table = render_item_table(pdf, items, y_pos, _continuation_page,
+                                  group_by_type=bool(settings.get('pdf_group_items')))
+        y_pos = table.y
 
         # Linha pontilhada
         y_pos += 2
         # Verificar quebra de pagina antes dos totais
         y_pos = _check_page_break(y_pos, 30)
-        pdf.set_draw_color(*BORDER_COLOR)
-        dash_x = margin
-        while dash_x < page_width - margin:
-            end_x = min(dash_x + 3, page_width - margin)
-            pdf.line(dash_x, y_pos, end_x, y_pos)
-            dash_x += 6
-        y_pos += 5
+        _replay(pdf, template.dashed_rule, 0, y_pos)
+        y_pos += template.dashed_rule.height
 
         # Calcular subtotal (soma dos itens) e desconto total
-        subtotal = sum(item.get('total', 0) for item in items)
+        subtotal = table.subtotal
         discount_total_value = quote.get('discount_total', 0)
         discount_type = quote.get('discount_type', 'percentage')
         
@@ -402,27 +740,22 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     # ==============================
     # 6.5 SALDO DEVEDOR / PAGO
     # ==============================
-    from database import db as _db
-    pay_summary = _db.get_payment_summary(quote.get('id', 0))
+    pay_summary = quote.get('payment_summary')
+    if pay_summary is None:
+        from database import db as _db
+        pay_summary = _db.get_payment_summary(quote.get('id', 0))
 
     def _ensure_space(current_y, needed=20):
         """Garante espaco na pagina, adiciona nova pagina se necessario."""
-        if current_y + needed > 297 - 25:
+        if current_y + needed > PAGE_LIMIT:
             pdf.add_page()
             return 20
         return current_y
 
     if pay_summary and pay_summary['total_paid'] > 0:
         y_pos = _ensure_space(y_pos, 30)
-        pdf.set_draw_color(*BORDER_COLOR)
-        pdf.line(margin, y_pos, page_width - margin, y_pos)
-        y_pos += 5
-
-        pdf.set_font('Helvetica', 'B', 11)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 7, "Situacao Financeira")
-        y_pos += 8
+        _replay(pdf, template.finance_title, 0, y_pos)
+        y_pos += template.finance_title.height
 
         # Valor Pago
         pdf.set_font('Helvetica', '', 10)
@@ -449,125 +782,37 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     # ==============================
     # 7. METODOS DE PAGAMENTO
     # ==============================
-    page_bottom = 297 - 25  # A4 height minus auto-break margin  # noqa
-
     payment_methods_str = quote.get('payment_methods', '')
     if payment_methods_str:
         methods = [m.strip() for m in payment_methods_str.split(',') if m.strip()]
 
         y_pos = _ensure_space(y_pos, 25)
-        pdf.set_draw_color(*BORDER_COLOR)
-        pdf.line(margin, y_pos, page_width - margin, y_pos)
-        y_pos += 5
-
-        pdf.set_font('Helvetica', 'B', 12)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 7, "Metodos de pagamento", new_x='LMARGIN', new_y='NEXT')
-        y_pos += 9
-
-        # Bootstrap Icons SVG mapping
-        icons_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "icon", "payment")
-        method_svg_icons = {
-            'pix': 'x-diamond-fill.svg',
-            'debito': 'credit-card.svg',
-            'credito': 'credit-card.svg',
-            'dinheiro': 'cash-stack.svg',
-            'transferencia': 'arrow-left-right.svg',
-            'boleto': 'file-earmark-break.svg',
-        }
-
-        method_labels = {
-            'pix': 'pix',
-            'debito': 'debito',
-            'credito': 'credito',
-            'dinheiro': 'dinheiro',
-            'transferencia': 'transferencia',
-            'boleto': 'boleto',
-        }
-
-        icon_size = 4  # mm for SVG icon
-        cols = 4  # 4 badges per row
-        col_width = content_width / cols
-        badge_h = 7
+        _replay(pdf, template.payment_title, 0, y_pos)
+        y_pos += template.payment_title.height
 
+        col_width = content_width / PAYMENT_COLUMNS
         for idx, method in enumerate(methods):
-            label = method_labels.get(method, method)
-            svg_file = method_svg_icons.get(method, '')
-            svg_path = os.path.join(icons_dir, svg_file) if svg_file else ''
-            has_icon = svg_path and os.path.exists(svg_path)
-
-            col = idx % cols
+            col = idx % PAYMENT_COLUMNS
             if col == 0 and idx > 0:
-                y_pos += badge_h + 2
-
-            badge_x = margin + col * col_width
+                y_pos += PAYMENT_BADGE_H + 2
+            _replay(pdf, template.badge(method), margin + col * col_width, y_pos)
 
-            pdf.set_font('Helvetica', '', 8)
-            label_w = pdf.get_string_width(f" {label}") + 3
-            badge_total_w = (icon_size + 5) + label_w + 4 if has_icon else label_w + 8
-
-            # Borda externa do badge
-            pdf.set_draw_color(*BORDER_COLOR)
-            pdf.set_fill_color(*WHITE)
-            pdf.rect(badge_x, y_pos, badge_total_w, badge_h, 'FD')
-
-            if has_icon:
-                # Icon box background
-                icon_box_x = badge_x + 1.5
-                icon_box_w = icon_size + 3
-                pdf.set_fill_color(*BG_LIGHT)
-                pdf.set_draw_color(*BORDER_COLOR)
-                pdf.rect(icon_box_x, y_pos + 1, icon_box_w, badge_h - 2, 'FD')
-
-                # Render SVG icon
-                icon_x = icon_box_x + (icon_box_w - icon_size) / 2
-                icon_y = y_pos + (badge_h - icon_size) / 2
-                try:
-                    pdf.image(svg_path, x=icon_x, y=icon_y, w=icon_size, h=icon_size)
-                except Exception:
-                    pass
-
-                # Label after icon
-                pdf.set_font('Helvetica', '', 8)
-                pdf.set_text_color(*TEXT_DARK)
-                pdf.set_xy(icon_box_x + icon_box_w + 1, y_pos)
-                pdf.cell(label_w, badge_h, label or '')
-            else:
-                pdf.set_font('Helvetica', '', 8)
-                pdf.set_text_color(*TEXT_DARK)
-                pdf.set_xy(badge_x + 3, y_pos)
-                pdf.cell(badge_total_w - 6, badge_h, label or '')
-
-        y_pos += badge_h + 5
+        y_pos += PAYMENT_BADGE_H + 5
 
     # ==============================
     # 8. CONDICOES DE CONTRATO
     # ==============================
     contract = quote.get('contract_terms', '')
     if contract:
-        # Estimar espaco: titulo(18) + texto + assinaturas(45)
-        contract_lines = max(1, len(contract) // 80 + 1)
-        contract_text_h = contract_lines * 5 + 5
-        _ = 18 + contract_text_h + 45  # total_needed estimate
-
         y_pos = _ensure_space(y_pos, 30)
-        pdf.set_draw_color(*BORDER_COLOR)
-        pdf.line(margin, y_pos, page_width - margin, y_pos)
-        y_pos += 5
-
-        pdf.set_font('Helvetica', 'B', 12)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.cell(content_width, 7, "Condicoes de contrato", new_x='LMARGIN', new_y='NEXT')
-        y_pos += 8
-
-        pdf.set_font('Helvetica', '', 9)
-        pdf.set_text_color(*TEXT_DARK)
-        pdf.set_xy(margin, y_pos)
-        pdf.multi_cell(content_width, 5, contract)
-        y_pos = pdf.get_y() + 3
-        # Atualizar y_pos apos multi_cell (pode ter quebrado pagina internamente)
+        terms = template.terms(contract)
+        if y_pos + terms.height <= PAGE_LIMIT:
+            _replay(pdf, terms, 0, y_pos)
+            y_pos += terms.height
+        else:
+            # Texto nao cabe na pagina: desenhado aqui, com quebra automatica
+            y_pos = _draw_contract(pdf, y_pos, contract)
+        y_pos += 3
         y_pos = _ensure_space(y_pos, 10)
 
     # ==============================
@@ -586,29 +831,8 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     pdf.set_auto_page_break(auto=False)
 
     # Posicionar assinaturas com espaco reduzido
-    sig_y = y_pos + 10
-    half_width = (content_width - 30) / 2
-
-    # Linha assinatura empresa
-    line_y = sig_y
-    pdf.set_draw_color(*BLUE_PRIMARY)
-    pdf.set_line_width(0.5)
-    pdf.line(margin, line_y, margin + half_width, line_y)
-
-    pdf.set_font('Helvetica', '', 10)
-    pdf.set_text_color(*TEXT_DARK)
-    pdf.set_xy(margin, line_y + 2)
-    pdf.cell(half_width, 6, company_name, align='C')
-
-    # Linha assinatura cliente
-    client_line_x = margin + half_width + 30
-    pdf.line(client_line_x, line_y, client_line_x + half_width, line_y)
-
-    pdf.set_text_color(*TEXT_DARK)
-    pdf.set_xy(client_line_x, line_y + 2)
-    pdf.cell(half_width, 6, "Cliente", align='C')
-
-    pdf.set_line_width(0.2)
+    line_y = y_pos + 10
+    _replay(pdf, template.signature, 0, line_y)
 
     # ==============================
     # 10. DATA POR EXTENSO
@@ -622,37 +846,5 @@ def generate_quote_pdf(quote: dict[str, Any], company_settings: Optional[dict[st
     pdf.set_xy(margin, date_y)
     pdf.cell(content_width, 6, date_text, align='C')
 
-    # ==============================
-    # 11. LINK ASSINAR DOCUMENTO
-    # ==============================
-    sign_y = date_y + 6
-    pdf.set_font('Helvetica', 'B', 10)
-    pdf.set_text_color(*BLUE_PRIMARY)
-    sign_text = 'Assinar documento'
-    sign_url = 'https://assinador.iti.br/assinatura/index.xhtml'
-    text_w = pdf.get_string_width(sign_text)
-    sign_x = margin + (content_width - text_w) / 2
-    pdf.set_xy(sign_x, sign_y)
-    pdf.cell(text_w, 6, sign_text, link=sign_url)
-    # Sublinhado decorativo
-    pdf.set_draw_color(*BLUE_PRIMARY)
-    pdf.set_line_width(0.3)
-    pdf.line(sign_x, sign_y + 6, sign_x + text_w, sign_y + 6)
-    pdf.set_line_width(0.2)
-
     # Restaurar auto page break
     pdf.set_auto_page_break(auto=True, margin=25)
-
-    # ==============================
-    # SALVAR PDF
-    # ==============================
-    if not output_path:
-        pdf_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pdfs")
-        os.makedirs(pdf_dir, exist_ok=True)
-
-        client_name_safe = quote.get('client_name', 'Cliente').replace(' ', '_')
-        date_str = datetime.now().strftime('%Y%m%d')
-        output_path = os.path.join(pdf_dir, f"Orcamento_{client_name_safe}_{date_str}.pdf")
-
-    pdf.output(output_path)
-    return output_path
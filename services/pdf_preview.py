@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Rasterização de PDF para Pré-visualização
+Converte páginas de um PDF em memória (bytes) em imagens PIL com pypdfium2,
+uma página por vez e só quando pedida. pypdfium2 é opcional: sem ele,
+available() retorna False e a pré-visualização mostra apenas as ações.
+
+O PDFium não é thread-safe: todas as chamadas passam por um único lock.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+from lazy_imports import get_pdfium
+
+
+_pdfium_lock = threading.Lock()
+
+
+def preview_available() -> bool:
+    """Indica se o pypdfium2 está instalado."""
+    return get_pdfium() is not None
+
+
+class PdfPages:
+    """Páginas de um PDF em memória, rasterizadas sob demanda."""
+
+    def __init__(self, data: bytes):
+        pdfium = get_pdfium()
+        if pdfium is None:
+            raise ImportError("pypdfium2 não está instalado")
+        with _pdfium_lock:
+            self._doc = pdfium.PdfDocument(data)
+            # Tamanho de cada página em pontos (usado para os placeholders)
+            self.sizes: List[Tuple[float, float]] = [
+                tuple(self._doc.get_page_size(i)) for i in range(len(self._doc))
+            ]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.sizes)
+
+    def render(self, index: int, width_px: int):
+        """Imagem PIL da página `index` com `width_px` pixels de largura."""
+        page_width, _ = self.sizes[index]
+        with _pdfium_lock:
+            if self._doc is None:
+                return None
+            page = self._doc[index]
+            try:
+                bitmap = page.render(scale=width_px / page_width)
+                try:
+                    return bitmap.to_pil()
+                finally:
+                    bitmap.close()
+            finally:
+                page.close()
+
+    def close(self):
+        with _pdfium_lock:
+            doc, self._doc = self._doc, None
+            if doc is not None:
+                doc.close()
+
+
+def open_pages(data: bytes) -> Optional[PdfPages]:
+    """PdfPages para os bytes, ou None se a pré-visualização não estiver disponível."""
+    if not preview_available():
+        return None
+    return PdfPages(data)
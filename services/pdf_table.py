@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Tabela de Itens do PDF
+Desenha a tabela de preços do orçamento em uma única passada pelos itens.
+Os itens são consumidos em lotes: para cada lote, textos, quebra do nome do
+produto e altura das linhas são calculados de uma vez com as métricas da
+Helvetica, e as linhas vão direto para o conteúdo da página (sem um
+fpdf.cell por célula). O subtotal geral sai do mesmo passo.
+
+Quebra de página automática com o cabeçalho repetido (callback do
+chamador), subtotal por página quando a tabela ocupa mais de uma e
+agrupamento opcional por tipo de produto (com subtotal por grupo).
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fpdf.enums import PDFResourceType
+from fpdf.util import escape_parens
+
+from services.pdf_generator import (
+    BG_LIGHT, GREEN_BADGE, MARGIN, PAGE_LIMIT, TEXT_DARK, TEXT_SECONDARY, WHITE,
+    _fmt_currency, _table_columns,
+)
+from utils import format_dimensions, format_measure
+
+
+BATCH_SIZE = 256        # itens medidos por vez
+ROW_HEIGHT = 7          # altura de uma linha de item (uma linha de texto)
+ROW_GAP = 3             # espaço entre itens
+LINE_HEIGHT = 5         # linhas extras do nome do produto quebrado
+ROW_MARGIN = 5          # folga exigida abaixo de um item antes de quebrar a página
+GROUP_HEADER_PITCH = 9
+GROUP_SUBTOTAL_PITCH = 8
+PAGE_SUBTOTAL_HEIGHT = 8
+
+OTHER_TYPE = 'outros'
+_KNOWN_TYPES = ('calha', 'rufo', 'pingadeira')
+
+
+class TableResult(NamedTuple):
+    """Posição após a tabela, soma dos itens e páginas ocupadas."""
+    y: float
+    subtotal: float
+    pages: int
+
+
+class _Row(NamedTuple):
+    lines: Tuple[str, ...]   # nome do produto já quebrado na largura da coluna
+    quantity: str
+    unit_price: str
+    total: str
+    value: float
+    height: float
+
+
+class _Metrics:
+    """Larguras (mm) de uma fonte padrão, direto da tabela de métricas do fpdf2."""
+
+    def __init__(self, pdf, style: str, size: float):
+        self.font = _core_font(pdf, style)
+        self.size = size
+        self.size_mm = size / pdf.k
+        self._widths = self.font.cw
+        self._fallback = self._widths.get('?', 556)
+        self._scale = size * 0.001 / pdf.k
+
+    def width(self, text: str) -> float:
+        try:
+            return sum(map(self._widths.__getitem__, text)) * self._scale
+        except KeyError:
+            widths = self._widths
+            return sum(widths.get(c, self._fallback) for c in text) * self._scale
+
+
+def _core_font(pdf, style: str):
+    """Fonte Helvetica do documento (registrada se ainda não foi usada)."""
+    key = 'helvetica' + style
+    font = pdf.fonts.get(key)
+    if font is None:
+        family, current_style, size = pdf.font_family, pdf.font_style, pdf.font_size_pt
+        pdf.set_font('Helvetica', style)
+        font = pdf.fonts[key]
+        if family:
+            pdf.set_font(family, current_style, size)
+    return font
+
+
+def _plain(pdf, text: Any) -> str:
+    """Texto restrito à codificação das fontes padrão (como o fpdf2 exige)."""
+    encoding = pdf.core_fonts_encoding
+    return str(text).encode(encoding, 'replace').decode(encoding)
+
+
+def _wrap(text: str, metrics: _Metrics, max_width: float) -> Tuple[str, ...]:
+    """Quebra gulosa por palavras; palavras maiores que a coluna são cortadas."""
+    if metrics.width(text) <= max_width:
+        return (text,)
+    lines: List[str] = []
+    current = ''
+    for word in text.split(' '):
+        candidate = f"{current} {word}" if current else word
+        if metrics.width(candidate) <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        while len(word) > 1 and metrics.width(word) > max_width:
+            cut = len(word) - 1
+            while cut > 1 and metrics.width(word[:cut]) > max_width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        lines.append(current)
+    return tuple(lines)
+
+
+def item_type(item: Dict) -> str:
+    """Tipo do produto do item (products.type ou deduzido do nome)."""
+    key = item.get('product_type')
+    if key:
+        return key
+    name = (item.get('product_name') or '').lower()
+    for known in _KNOWN_TYPES:
+        if known in name:
+            return known
+    return OTHER_TYPE
+
+
+def _measure_rows(pdf, items: List[Dict], name_metrics: _Metrics, name_width: float) -> List[_Row]:
+    """Textos e alturas de um lote de itens."""
+    rows = []
+    for item in items:
+        product_display = str(item.get('product_name', '-'))
+        item_width = item.get('width', 0)
+        item_length = item.get('length', 0)
+        measure = item.get('measure', 0)
+        item_discount = item.get('discount', 0) or 0
+        if item_width or item_length:
+            product_display += f" ({format_dimensions(item_width, item_length)})"
+        elif measure:
+            product_display += f" ({format_measure(measure)})"
+        if item_discount > 0:
+            product_display += f" [-{_fmt_currency(item_discount)}]"
+
+        pricing_unit = item.get('pricing_unit', 'metro') or 'metro'
+        if pricing_unit == 'unidade':
+            unit_suffix = 'Un'
+        elif pricing_unit == 'm²':
+            unit_suffix = 'm²'
+        else:
+            unit_suffix = 'm'
+
+        lines = _wrap(_plain(pdf, product_display), name_metrics, name_width)
+        value = item.get('total', 0) or 0
+        rows.append(_Row(
+            lines,
+            _plain(pdf, f"{item.get('meters', 0) or 0:.2f}{unit_suffix}"),
+            _fmt_currency(item.get('price_per_meter', 0)),
+            _fmt_currency(value),
+            value,
+            ROW_HEIGHT + (len(lines) - 1) * LINE_HEIGHT,
+        ))
+    return rows
+
+
+def _batches(items: Iterable[Dict]) -> Iterator[List[Dict]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+@lru_cache(maxsize=64)
+def _color(rgb) -> str:
+    r, g, b = rgb
+    return f"{r / 255:.3f} {g / 255:.3f} {b / 255:.3f} rg"
+
+
+class _PageWriter:
+    """Acumula os operadores da página atual e os envia de uma vez."""
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+        self.k = pdf.k
+        self.h = pdf.h
+        self.ops: List[str] = []
+        self.fonts = set()
+        self._prefixes = {}  # (fonte, cor) -> "cor BT /Fn tam Tf"
+
+    def text(self, metrics: _Metrics, color, x: float, y: float, h: float, text: str,
+             width: Optional[float] = None, align: str = 'L', text_width: Optional[float] = None):
+        """
+        Texto posicionado como fpdf.cell(width, h, text, align=align) em (x, y).
+        text_width: largura do texto, se o chamador já a mediu.
+        """
+        if align == 'C':
+            x += (width - (metrics.width(text) if text_width is None else text_width)) / 2
+        elif align == 'R':
+            x += width - self.pdf.c_margin - (metrics.width(text) if text_width is None else text_width)
+        else:
+            x += self.pdf.c_margin
+        baseline = y + 0.5 * h + 0.3 * metrics.size_mm
+        prefix = self._prefixes.get((metrics, color))
+        if prefix is None:
+            self.fonts.add(metrics.font.i)
+            prefix = self._prefixes[metrics, color] = f"{_color(color)} BT /F{metrics.font.i} {metrics.size:.2f} Tf"
+        if '(' in text or ')' in text or '\\' in text or '\r' in text:
+            text = escape_parens(text)
+        self.ops.append(f"{prefix} {x * self.k:.2f} {(self.h - baseline) * self.k:.2f} Td ({text}) Tj ET")
+
+    def rect(self, color, x: float, y: float, w: float, h: float):
+        self.ops.append(
+            f"{_color(color)} {x * self.k:.2f} {(self.h - y) * self.k:.2f} "
+            f"{w * self.k:.2f} {-h * self.k:.2f} re f"
+        )
+
+    def flush(self):
+        if not self.ops:
+            return
+        catalog = self.pdf._resource_catalog
+        for font in self.fonts:
+            catalog.add(PDFResourceType.FONT, font, self.pdf.page)
+        # q/Q: cores e fonte da página voltam ao estado que o fpdf2 conhece
+        self.pdf._out("q\n" + "\n".join(self.ops) + "\nQ")
+        self.ops = []
+        self.fonts = set()
+        self._prefixes.clear()
+
+
+def _stream(items: Iterable[Dict], group_by_type: bool) -> Iterator[Tuple[str, Any]]:
+    """Eventos da tabela: ('items', lote), ('group', (chave, rótulo)) e ('group_end', rótulo)."""
+    if not group_by_type:
+        for batch in _batches(items):
+            yield 'items', batch
+        return
+
+    # Agrupar exige conhecer todos os itens: baldes na ordem da primeira aparição
+    groups: Dict[str, List[Dict]] = {}
+    labels: Dict[str, str] = {}
+    for item in items:
+        key = item_type(item)
+        groups.setdefault(key, []).append(item)
+        if key not in labels or item.get('product_type_label'):
+            labels[key] = item.get('product_type_label') or ('Outros' if key == OTHER_TYPE else key.capitalize())
+    for key, group_items in groups.items():
+        yield 'group', labels[key]
+        for batch in _batches(group_items):
+            yield 'items', batch
+        yield 'group_end', labels[key]
+
+
+def render_item_table(pdf, items: Iterable[Dict], y_pos: float, new_page: Callable[[], float],
+                      group_by_type: bool = False, page_subtotals: bool = True) -> TableResult:
+    """
+    Desenha as linhas de itens a partir de y_pos (o cabeçalho da primeira
+    página é do chamador). new_page() adiciona a página, desenha o cabeçalho
+    de continuação e devolve o y onde a tabela continua.
+    """
+    content_width = pdf.w - 2 * MARGIN
+    col_product, col_qty, col_unit_price, col_subtotal = _table_columns(content_width)
+    qty_x = MARGIN + col_product
+    price_x = qty_x + col_qty
+    badge_x = price_x + col_unit_price + 2
+    badge_w = col_subtotal - 7
+    right_w = content_width - 1
+
+    name_font = _Metrics(pdf, '', 10)
+    small = _Metrics(pdf, '', 9)
+    small_bold = _Metrics(pdf, 'B', 9)
+    group_font = _Metrics(pdf, 'B', 10)
+    name_width = col_product - 2 * pdf.c_margin
+
+    writer = _PageWriter(pdf)
+    reserve = PAGE_SUBTOTAL_HEIGHT if page_subtotals else 0
+    state = {'y': y_pos, 'page_total': 0.0, 'pages': 1}
+    subtotal = 0.0
+    group_total = 0.0
+
+    def page_subtotal():
+        writer.text(small, TEXT_SECONDARY, MARGIN, state['y'] + 1, 6,
+                    f"Subtotal da pagina: {_fmt_currency(state['page_total'])}", right_w, 'R')
+
+    def ensure(needed: float):
+        if state['y'] + needed + reserve <= PAGE_LIMIT:
+            return
+        if page_subtotals:
+            page_subtotal()
+        writer.flush()
+        state['y'] = new_page()
+        state['page_total'] = 0.0
+        state['pages'] += 1
+
+    for kind, payload in _stream(items, group_by_type):
+        if kind == 'group':
+            # Cabeçalho do grupo não fica sozinho no fim da página
+            ensure(GROUP_HEADER_PITCH + ROW_HEIGHT + ROW_MARGIN)
+            y = state['y']
+            writer.rect(BG_LIGHT, MARGIN, y, content_width, ROW_HEIGHT)
+            writer.text(group_font, TEXT_DARK, MARGIN, y, ROW_HEIGHT, _plain(pdf, payload))
+            state['y'] += GROUP_HEADER_PITCH
+            group_total = 0.0
+            continue
+        if kind == 'group_end':
+            ensure(GROUP_SUBTOTAL_PITCH)
+            writer.text(small_bold, TEXT_SECONDARY, MARGIN, state['y'], 6,
+                        _plain(pdf, f"Subtotal {payload}: {_fmt_currency(group_total)}"), right_w, 'R')
+            state['y'] += GROUP_SUBTOTAL_PITCH
+            continue
+
+        for row in _measure_rows(pdf, payload, name_font, name_width):
+            ensure(row.height + ROW_MARGIN)
+            y = state['y']
+            for index, line in enumerate(row.lines):
+                writer.text(name_font, TEXT_DARK, MARGIN, y + index * LINE_HEIGHT, ROW_HEIGHT, line)
+            writer.text(small, TEXT_DARK, qty_x, y, ROW_HEIGHT, row.quantity, col_qty, 'C')
+            writer.text(small, TEXT_DARK, price_x, y, ROW_HEIGHT, row.unit_price, col_unit_price, 'C')
+            writer.rect(GREEN_BADGE, badge_x, y, badge_w, ROW_HEIGHT)
+            writer.text(small_bold, WHITE, badge_x, y, ROW_HEIGHT, row.total, badge_w, 'C')
+
+            state['y'] += row.height + ROW_GAP
+            state['page_total'] += row.value
+            group_total += row.value
+            subtotal += row.value
+
+    if page_subtotals and state['pages'] > 1:
+        page_subtotal()
+        state['y'] += PAGE_SUBTOTAL_HEIGHT
+    writer.flush()
+    return TableResult(state['y'], subtotal, state['pages'])
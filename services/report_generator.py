@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Relatório Financeiro do Período
+PDF de várias páginas para o contador: indicadores do período, resumo por
+mês (ou dia/semana/ano), orçamentos por status, despesas por categoria,
+contas a receber na data final, lançamentos de despesas e gráficos.
+
+Tudo sai de consultas agregadas do banco (get_period_overview,
+get_analytics_series, get_period_expenses_by_category). As listagens longas
+(contas a receber e despesas) são lidas do cursor em lotes e escritas direto
+no conteúdo da página, como a tabela de itens do orçamento
+(services/pdf_table): nenhuma lista com todas as linhas é montada.
+
+Os gráficos são pedidos ao pool de gráficos (analytics.chart_service) em uma
+thread própria assim que a série do período é lida, e ficam prontos enquanto
+as tabelas são escritas; entram no fim do documento. Sem matplotlib o
+relatório sai sem a seção de gráficos.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from database import db
+from services.pdf_assets import place_logo
+from services.pdf_generator import (
+    BG_LIGHT, BLUE_LIGHT, BLUE_PRIMARY, BORDER_COLOR, GREEN_BADGE, MARGIN, PAGE_LIMIT,
+    TEXT_DARK, TEXT_LIGHT, TEXT_SECONDARY, QuotePDF, _draw_section_title, _fmt_currency,
+    _replay, get_template,
+)
+from services.pdf_table import _Metrics, _PageWriter, _plain
+
+
+ROW_HEIGHT = 6          # linha das tabelas
+HEADER_HEIGHT = 7       # cabeçalho das colunas
+SECTION_SPACE = 30      # espaço mínimo para iniciar uma seção na página atual
+KPI_COLUMNS = 4
+KPI_HEIGHT = 17
+KPI_GAP = 3
+CHART_WIDTH = 180       # largura dos gráficos na página (mm)
+
+RED = (239, 68, 68)
+AMBER = (245, 158, 11)
+
+STATUS_LABELS = {
+    'draft': 'Rascunho',
+    'sent': 'Enviado',
+    'approved': 'Aprovado',
+    'completed': 'Concluido',
+}
+
+
+class ReportColumn(NamedTuple):
+    """Coluna de tabela: título, chave da linha, fração da largura, alinhamento e formato."""
+    title: str
+    key: str
+    width: float
+    align: str = 'L'
+    fmt: Callable[[Any], str] = str
+    total: bool = False   # somada na linha de total
+
+
+class PeriodReport(NamedTuple):
+    """PDF do relatório em memória e nome sugerido para salvar."""
+    data: bytes
+    filename: str
+    pages: int
+
+
+class ReportPDF(QuotePDF):
+    """Documento do relatório: rodapé com empresa, período e número da página."""
+
+    def __init__(self, company_name: str, period: str):
+        super().__init__(company_name)
+        self.period = period
+
+    def footer(self):
+        # Operadores diretos: o rodapé se repete em centenas de páginas
+        writer = _PageWriter(self)
+        y_pos = self.h - 15
+        writer.rect(BORDER_COLOR, MARGIN, y_pos, self.w - 2 * MARGIN, 0.2)
+        metrics = _Metrics(self, '', 8)
+        writer.text(metrics, TEXT_LIGHT, MARGIN, y_pos, 8,
+                    _plain(self, f"{self.company_name} - Relatorio financeiro {self.period}"))
+        writer.text(metrics, TEXT_LIGHT, MARGIN, y_pos, 8, f"Pagina {self.page_no()}",
+                    self.w - 2 * MARGIN, 'R')
+        writer.flush()
+
+
+# ==============================
+# Período
+# ==============================
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _fmt_date(value) -> str:
+    """AAAA-MM-DD[...] -> DD/MM/AAAA."""
+    text = str(value or '')
+    if len(text) < 10:
+        return text
+    return f"{text[8:10]}/{text[5:7]}/{text[0:4]}"
+
+
+def _fmt_int(value) -> str:
+    return str(int(value or 0))
+
+
+def period_label(start, end) -> str:
+    return f"{_fmt_date(_as_date(start).isoformat())} a {_fmt_date(_as_date(end).isoformat())}"
+
+
+def report_filename(start, end) -> str:
+    return f"Relatorio_Financeiro_{_as_date(start).isoformat()}_a_{_as_date(end).isoformat()}.pdf"
+
+
+def _granularity(start: date, end: date) -> str:
+    """Agrupamento do resumo: dia até um mês, semana até um trimestre, mês até 3 anos."""
+    days = (end - start).days + 1
+    if days <= 31:
+        return "day"
+    if days <= 92:
+        return "week"
+    if days <= 3 * 366:
+        return "month"
+    return "year"
+
+
+def _series_label(entry: Dict, granularity: str) -> str:
+    if granularity == "day":
+        return _fmt_date(entry["start"])
+    if granularity == "month":
+        return f"{entry['start'][5:7]}/{entry['start'][0:4]}"
+    if granularity == "week":
+        return f"Semana de {_fmt_date(entry['start'])}"
+    return entry["period"]
+
+
+# ==============================
+# Gráficos (fora da thread do PDF)
+# ==============================
+
+def _chart_specs(series: List[Dict], overview: Dict, categories: List[Dict]) -> List[Tuple[str, Any]]:
+    """(título, ChartSpec) dos gráficos com dados no período."""
+    from analytics.chart_service import ChartSpec
+
+    specs = []
+    if any(entry["quote_count"] or entry["received"] or entry["expenses"] for entry in series):
+        specs.append(("Faturamento vs custo", ChartSpec("profit_vs_cost", series)))
+        specs.append(("Evolucao financeira", ChartSpec("profit_evolution", series)))
+    if overview["quotes_by_status"]:
+        specs.append(("Orcamentos por status", ChartSpec("quotes_by_status", overview["quotes_by_status"])))
+    if categories:
+        specs.append(("Despesas por categoria", ChartSpec("pie", {
+            "labels": [row["label"] for row in categories],
+            "values": [row["total"] for row in categories],
+            "title": "Despesas por Categoria",
+        })))
+    return specs
+
+
+def _render_charts(specs: Sequence) -> List[Optional[Any]]:
+    """Gráficos (chart_cache.RenderedChart) na ordem das specs; None nos que falharem."""
+    charts: List[Optional[Any]] = [None] * len(specs)
+    if not specs:
+        return charts
+    try:
+        from analytics.chart_service import get_chart_service
+        for index, chart in get_chart_service().render_many(specs):
+            charts[index] = chart
+    except Exception:
+        pass  # sem matplotlib (ou erro de desenho): o relatório sai sem os gráficos restantes
+    return charts
+
+
+# ==============================
+# Tabelas em fluxo
+# ==============================
+
+def _fit(text: str, metrics: _Metrics, width: float) -> Tuple[str, float]:
+    """Corta o texto com '...' para caber na coluna; devolve o texto e sua largura."""
+    measured = metrics.width(text)
+    if measured <= width:
+        return text, measured
+    while text:
+        text = text[:-1]
+        measured = metrics.width(text + '...')
+        if measured <= width:
+            break
+    return text + '...', measured
+
+
+class _Layout:
+    """Posição vertical e quebra de página do relatório."""
+
+    def __init__(self, pdf: ReportPDF):
+        self.pdf = pdf
+        self.y = MARGIN
+
+    def new_page(self):
+        self.pdf.add_page()
+        self.y = MARGIN
+
+    def section(self, title: str, needed: float = SECTION_SPACE):
+        """Título de seção; vai para a próxima página se não couber `needed` abaixo dele."""
+        if self.y + needed > PAGE_LIMIT:
+            self.new_page()
+        self.y = _draw_section_title(self.pdf, self.y, title, gap=4, advance=9)
+
+
+def _draw_table(layout: _Layout, title: str, columns: Sequence[ReportColumn], rows: Iterable,
+                total_label: str = "Total") -> int:
+    """
+    Escreve as linhas (sqlite3.Row ou dicionários) a partir de layout.y, com o
+    cabeçalho repetido em cada página e a linha de total das colunas marcadas.
+    As linhas são consumidas uma a uma; devolve quantas foram escritas.
+    """
+    pdf = layout.pdf
+    content_width = pdf.w - 2 * MARGIN
+    widths = [content_width * column.width for column in columns]
+    xs = [MARGIN + sum(widths[:index]) for index in range(len(columns))]
+    text_widths = [width - 2 * pdf.c_margin for width in widths]
+    body = _Metrics(pdf, '', 8)
+    bold = _Metrics(pdf, 'B', 8)
+    title_font = _Metrics(pdf, 'B', 10)
+    continued = _plain(pdf, f"{title} (continuacao)")
+    writer = _PageWriter(pdf)
+    totals = [0.0] * len(columns)
+    summed = [index for index, column in enumerate(columns) if column.total]
+
+    def header():
+        writer.rect(BLUE_LIGHT, MARGIN, layout.y, content_width, HEADER_HEIGHT)
+        for column, x, width, text_width in zip(columns, xs, widths, text_widths):
+            title_text, title_width = _fit(_plain(pdf, column.title), bold, text_width)
+            writer.text(bold, TEXT_DARK, x, layout.y, HEADER_HEIGHT, title_text, width, column.align, title_width)
+        layout.y += HEADER_HEIGHT
+
+    def continuation():
+        writer.flush()
+        layout.new_page()
+        writer.rect(BORDER_COLOR, MARGIN, layout.y, content_width, 0.2)
+        writer.text(title_font, TEXT_DARK, MARGIN, layout.y + 4, HEADER_HEIGHT, continued)
+        layout.y += 12
+        header()
+
+    header()
+    count = 0
+    try:
+        for row in rows:
+            if layout.y + ROW_HEIGHT > PAGE_LIMIT:
+                continuation()
+            if count % 2:
+                writer.rect(BG_LIGHT, MARGIN, layout.y, content_width, ROW_HEIGHT)
+            for column, x, width, text_width in zip(columns, xs, widths, text_widths):
+                text = column.fmt(row[column.key])
+                if not text.isascii():
+                    text = _plain(pdf, text)
+                text, measured = _fit(text, body, text_width)
+                writer.text(body, TEXT_DARK, x, layout.y, ROW_HEIGHT, text, width, column.align, measured)
+            for index in summed:
+                totals[index] += row[columns[index].key] or 0
+            layout.y += ROW_HEIGHT
+            count += 1
+    finally:
+        close = getattr(rows, 'close', None)
+        if close is not None:
+            close()  # devolve a conexão do cursor mesmo se a escrita falhar
+
+    if not count:
+        writer.text(body, TEXT_SECONDARY, MARGIN, layout.y, ROW_HEIGHT, "Nenhum registro no periodo")
+        layout.y += ROW_HEIGHT
+    elif summed:
+        if layout.y + ROW_HEIGHT > PAGE_LIMIT:
+            continuation()
+        writer.rect(BORDER_COLOR, MARGIN, layout.y, content_width, ROW_HEIGHT)
+        writer.text(bold, TEXT_DARK, xs[0], layout.y, ROW_HEIGHT, f"{total_label} ({count})")
+        for index in summed:
+            writer.text(bold, TEXT_DARK, xs[index], layout.y, ROW_HEIGHT,
+                        columns[index].fmt(totals[index]), widths[index], columns[index].align)
+        layout.y += ROW_HEIGHT
+    writer.flush()
+    layout.y += 6
+    return count
+
+
+# ==============================
+# Seções
+# ==============================
+
+def _draw_title(layout: _Layout, settings: Dict, period: str):
+    pdf = layout.pdf
+    template = get_template(settings)
+    _replay(pdf, template.header)
+    try:
+        place_logo(pdf, (pdf.w - 25) / 2, 14, 25, 25)
+    except Exception:
+        pass
+    y_pos = template.header.height
+
+    pdf.set_font('Helvetica', 'B', 18)
+    pdf.set_text_color(*TEXT_DARK)
+    pdf.set_xy(MARGIN, y_pos)
+    pdf.cell(pdf.w - 2 * MARGIN, 8, "Relatorio Financeiro", align='C')
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(*TEXT_SECONDARY)
+    pdf.set_xy(MARGIN, y_pos + 8)
+    pdf.cell(pdf.w - 2 * MARGIN, 5, f"Periodo: {period}", align='C')
+    pdf.set_xy(MARGIN, y_pos + 13)
+    pdf.cell(pdf.w - 2 * MARGIN, 5, f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}", align='C')
+    layout.y = y_pos + 22
+
+
+def _draw_kpis(layout: _Layout, overview: Dict, end: date):
+    """Cartões de indicadores (quatro por linha)."""
+    pdf = layout.pdf
+    revenue = overview['revenue']
+    margin_pct = overview['profit'] / revenue * 100 if revenue else 0.0
+    cards = [
+        ("Faturamento (aprovados)", _fmt_currency(revenue), BLUE_PRIMARY),
+        ("Custo", _fmt_currency(overview['cost']), RED),
+        ("Lucro", _fmt_currency(overview['profit']), GREEN_BADGE),
+        ("Margem", f"{margin_pct:.1f}%".replace('.', ','), GREEN_BADGE),
+        ("Recebido", _fmt_currency(overview['received']), GREEN_BADGE),
+        ("Despesas", _fmt_currency(overview['expenses']), RED),
+        ("Folha de pagamento", _fmt_currency(overview['payroll']), AMBER),
+        ("Saldo de caixa", _fmt_currency(overview['balance']),
+         GREEN_BADGE if overview['balance'] >= 0 else RED),
+        ("Orcamentos criados", str(overview['quote_count']), BLUE_PRIMARY),
+        ("Aprovados/concluidos", str(overview['approved_count']), BLUE_PRIMARY),
+        (f"A receber em {_fmt_date(end.isoformat())}", _fmt_currency(overview['receivables']), AMBER),
+        ("Orcamentos com saldo", str(overview['receivable_count']), AMBER),
+    ]
+    layout.section("Indicadores do periodo")
+    width = (pdf.w - 2 * MARGIN - (KPI_COLUMNS - 1) * KPI_GAP) / KPI_COLUMNS
+    for index, (label, value, color) in enumerate(cards):
+        column = index % KPI_COLUMNS
+        if index and not column:
+            layout.y += KPI_HEIGHT + KPI_GAP
+        x = MARGIN + column * (width + KPI_GAP)
+        pdf.set_fill_color(*BG_LIGHT)
+        pdf.rect(x, layout.y, width, KPI_HEIGHT, 'F')
+        pdf.set_fill_color(*color)
+        pdf.rect(x, layout.y, width, 1, 'F')
+        pdf.set_font('Helvetica', '', 8)
+        pdf.set_text_color(*TEXT_SECONDARY)
+        pdf.set_xy(x, layout.y + 3)
+        pdf.cell(width, 5, label, align='C')
+        pdf.set_font('Helvetica', 'B', 11)
+        pdf.set_text_color(*TEXT_DARK)
+        pdf.set_xy(x, layout.y + 9)
+        pdf.cell(width, 6, value, align='C')
+    layout.y += KPI_HEIGHT + 8
+
+
+def _draw_charts(layout: _Layout, specs: Sequence[Tuple[str, Any]], charts: Sequence):
+    """Gráficos prontos, um abaixo do outro (nova página quando não cabem)."""
+    available = [(title, chart) for (title, _), chart in zip(specs, charts) if chart is not None]
+    if not available:
+        return
+    pdf = layout.pdf
+    layout.new_page()
+    layout.y = _draw_section_title(pdf, layout.y, "Graficos", gap=4, advance=9)
+    for title, chart in available:
+        image_w, image_h = chart.image.size
+        height = CHART_WIDTH * image_h / image_w
+        if layout.y + height > PAGE_LIMIT:
+            layout.new_page()
+        pdf.image(chart.path or chart.image, x=(pdf.w - CHART_WIDTH) / 2, y=layout.y, w=CHART_WIDTH, h=height)
+        layout.y += height + 6
+
+
+# ==============================
+# Relatório
+# ==============================
+
+def build_period_report(start, end, company_settings: Optional[Dict] = None) -> PeriodReport:
+    """
+    Gera o relatório financeiro de [start, end] (datas inclusivas) em memória.
+    Chamar de uma thread de trabalho: consulta o banco e espera os gráficos.
+    """
+    start, end = _as_date(start), _as_date(end)
+    if start > end:
+        raise ValueError("A data inicial deve ser anterior à data final")
+    settings = company_settings if company_settings is not None else db.get_settings()
+    period = period_label(start, end)
+    granularity = _granularity(start, end)
+
+    # Agregados pequenos primeiro: os gráficos dependem deles
+    series = db.get_analytics_series(granularity, start, end)
+    overview = db.get_period_overview(start, end)
+    categories = db.get_period_expenses_by_category(start, end)
+    specs = _chart_specs(series, overview, categories)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="calhagest-report") as chart_thread:
+        charts = chart_thread.submit(_render_charts, [spec for _, spec in specs])
+
+        pdf = ReportPDF(settings.get('company_name', 'CalhaGest'), period)
+        pdf.set_title(f"Relatorio Financeiro {period}")
+        pdf.add_page()
+        layout = _Layout(pdf)
+        _draw_title(layout, settings, period)
+        _draw_kpis(layout, overview, end)
+
+        layout.section("Resumo por periodo")
+        _draw_table(layout, "Resumo por periodo", (
+            ReportColumn("Periodo", "label", 0.19),
+            ReportColumn("Orc.", "quote_count", 0.08, 'C', _fmt_int, True),
+            ReportColumn("Faturamento", "revenue", 0.15, 'R', _fmt_currency, True),
+            ReportColumn("Custo", "cost", 0.145, 'R', _fmt_currency, True),
+            ReportColumn("Lucro", "profit", 0.145, 'R', _fmt_currency, True),
+            ReportColumn("Recebido", "received", 0.145, 'R', _fmt_currency, True),
+            ReportColumn("Despesas", "expenses", 0.145, 'R', _fmt_currency, True),
+        ), (dict(entry, label=_series_label(entry, granularity)) for entry in series))
+
+        layout.section("Orcamentos por status")
+        _draw_table(layout, "Orcamentos por status", (
+            ReportColumn("Status", "label", 0.7),
+            ReportColumn("Quantidade", "count", 0.3, 'C', _fmt_int, True),
+        ), ({"label": STATUS_LABELS.get(status, status), "count": count}
+            for status, count in overview["quotes_by_status"].items()))
+
+        layout.section("Despesas por categoria")
+        expenses_total = overview["expenses"] or 1
+        _draw_table(layout, "Despesas por categoria", (
+            ReportColumn("Categoria", "label", 0.45),
+            ReportColumn("Lancamentos", "count", 0.15, 'C', _fmt_int, True),
+            ReportColumn("Total", "total", 0.25, 'R', _fmt_currency, True),
+            ReportColumn("% das despesas", "share", 0.15, 'R', lambda v: f"{v:.1f}%".replace('.', ',')),
+        ), (dict(row, share=row["total"] / expenses_total * 100) for row in categories))
+
+        layout.section(f"Contas a receber em {_fmt_date(end.isoformat())}")
+        _draw_table(layout, "Contas a receber", (
+            ReportColumn("Orc.", "id", 0.09, 'C', lambda v: f"{v:05d}"),
+            ReportColumn("Cliente", "client_name", 0.31, fmt=lambda v: str(v or '-')),
+            ReportColumn("Data", "created_at", 0.12, 'C', _fmt_date),
+            ReportColumn("Total", "total", 0.16, 'R', _fmt_currency, True),
+            ReportColumn("Pago", "total_paid", 0.16, 'R', _fmt_currency, True),
+            ReportColumn("Saldo", "balance", 0.16, 'R', _fmt_currency, True),
+        ), db.iter_receivables(end))
+
+        layout.section("Lancamentos de despesas")
+        _draw_table(layout, "Lancamentos de despesas", (
+            ReportColumn("Data", "date", 0.13, 'C', _fmt_date),
+            ReportColumn("Descricao", "description", 0.45, fmt=lambda v: str(v or '-')),
+            ReportColumn("Categoria", "label", 0.24, fmt=lambda v: str(v or '-')),
+            ReportColumn("Valor", "amount", 0.18, 'R', _fmt_currency, True),
+        ), db.iter_period_expenses(start, end))
+
+        _draw_charts(layout, specs, charts.result())
+
+    data = bytes(pdf.output())
+    return PeriodReport(data, report_filename(start, end), pdf.pages_count)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Agenda de Capacidade das Equipes
+Cada equipe tem uma capacidade diária em metros ou horas; a carga de uma
+instalação vem dos itens do orçamento (quote_items.meters e horas por metro
+do tipo do produto) e é gravada no agendamento.
+
+CrewSchedule carrega a ocupação de todas as equipes em um horizonte (padrão:
+6 meses) para uma matriz NumPy equipes x dias com uma única consulta
+agrupada. A partir dela:
+- free()/conflicts(): folga de um dia e dias acima da capacidade;
+- find_next_free_slot(): primeiro dia útil com folga para a carga, em
+  todas as equipes de uma vez (operações vetoriais, sem laço por dia);
+- plan(): planejador guloso que distribui os orçamentos aprovados ainda
+  sem instalação, em ordem de chegada, reservando cada vaga na matriz.
+
+Uma instalação maior que a capacidade diária da equipe ocupa um dia inteiro
+vazio (sinalizada como 'oversized'). Instalações sem equipe não consomem
+capacidade.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from database import db
+from lazy_imports import get_numpy
+
+
+HORIZON_DAYS = 183           # ~6 meses
+WORKDAYS = (0, 1, 2, 3, 4)   # segunda a sexta (date.weekday())
+DEFAULT_TIME = "08:00"       # horário gravado pelo planejador em lote
+_EPS = 1e-9
+
+UNIT_LABELS = {"metros": "m", "horas": "h"}
+
+
+class Crew(NamedTuple):
+    """Equipe com capacidade diária na unidade 'metros' ou 'horas'."""
+    id: int
+    name: str
+    capacity: float
+    unit: str
+
+    def load_of(self, job: "Job") -> float:
+        return job.hours if self.unit == "horas" else job.meters
+
+
+class Job(NamedTuple):
+    """Orçamento a instalar e sua carga nas duas unidades."""
+    quote_id: int
+    client_name: str
+    meters: float
+    hours: float
+
+
+class Slot(NamedTuple):
+    """Vaga encontrada: equipe, dia, carga na unidade da equipe e folga antes da reserva."""
+    crew: Crew
+    day: date
+    load: float
+    free: float
+
+    @property
+    def oversized(self) -> bool:
+        return self.load > self.crew.capacity + _EPS
+
+
+class Conflict(NamedTuple):
+    """Dia em que uma equipe está acima da capacidade."""
+    crew: Crew
+    day: date
+    used: float
+
+
+class Assignment(NamedTuple):
+    job: Job
+    slot: Slot
+
+
+class Plan(NamedTuple):
+    """Resultado do planejador: vagas atribuídas e orçamentos sem vaga no horizonte."""
+    assignments: List[Assignment]
+    unplaced: List[Job]
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def job_from_row(row: Dict) -> Job:
+    """Job a partir de get_unscheduled_quote_loads()."""
+    return Job(row["id"], row.get("client_name") or "", row.get("load_meters") or 0.0,
+               row.get("load_hours") or 0.0)
+
+
+def quote_job(quote_id: int, client_name: str = "") -> Job:
+    """Job de um orçamento (carga calculada no banco)."""
+    load = db.get_quote_load(quote_id)
+    return Job(quote_id, client_name, load["meters"], load["hours"])
+
+
+class CrewSchedule:
+    """Ocupação das equipes dia a dia em [start, start + days)."""
+
+    def __init__(self, crews: Iterable[Crew], start: date, days: int = HORIZON_DAYS,
+                 workdays: Iterable[int] = WORKDAYS):
+        np = get_numpy()
+        self.crews = list(crews)
+        self.start = start
+        self.days = days
+        self._row = {crew.id: i for i, crew in enumerate(self.crews)}
+        self.capacity = np.array([crew.capacity for crew in self.crews], dtype=float)
+        self.used = np.zeros((len(self.crews), days))
+        self.jobs = np.zeros((len(self.crews), days), dtype=int)
+        weekdays = (start.weekday() + np.arange(days)) % 7
+        self.workday = np.isin(weekdays, list(workdays))
+
+    @classmethod
+    def load(cls, start=None, days: int = HORIZON_DAYS,
+             workdays: Iterable[int] = WORKDAYS) -> "CrewSchedule":
+        """Monta a agenda das equipes ativas a partir do banco (uma consulta agrupada)."""
+        start = _as_date(start) if start else date.today()
+        crews = [Crew(c["id"], c["name"], float(c["daily_capacity"] or 0), c["capacity_unit"])
+                 for c in db.get_all_crews()]
+        schedule = cls(crews, start, days, workdays)
+        if crews:
+            for row in db.get_crew_daily_loads(start, start + timedelta(days=days - 1)):
+                i = schedule._row.get(row["crew_id"])
+                if i is None:
+                    continue  # Equipe inativa
+                d = (date.fromisoformat(row["day"]) - start).days
+                if 0 <= d < days:
+                    crew = schedule.crews[i]
+                    schedule.used[i, d] += row["hours"] if crew.unit == "horas" else row["meters"]
+                    schedule.jobs[i, d] += row["jobs"]
+        return schedule
+
+    def crew(self, crew_id: int) -> Optional[Crew]:
+        i = self._row.get(crew_id)
+        return None if i is None else self.crews[i]
+
+    def _offset(self, day) -> int:
+        return (_as_date(day) - self.start).days
+
+    def free(self, crew_id: int, day) -> float:
+        """Capacidade livre da equipe no dia (0 fora do horizonte ou em dia não útil)."""
+        i, d = self._row.get(crew_id), self._offset(day)
+        if i is None or not 0 <= d < self.days or not self.workday[d]:
+            return 0.0
+        return max(float(self.capacity[i] - self.used[i, d]), 0.0)
+
+    def day_load(self, day) -> List[Dict]:
+        """Ocupação de cada equipe no dia: crew, used, jobs."""
+        d = self._offset(day)
+        if not 0 <= d < self.days:
+            return []
+        return [{"crew": crew, "used": float(self.used[i, d]), "jobs": int(self.jobs[i, d])}
+                for i, crew in enumerate(self.crews)]
+
+    def conflicts(self) -> List[Conflict]:
+        """Dias do horizonte em que alguma equipe passou da capacidade."""
+        np = get_numpy()
+        over = self.used > self.capacity[:, None] + _EPS
+        # Um único serviço maior que a capacidade ocupa o dia, mas não é conflito
+        over &= self.jobs > 1
+        return [Conflict(self.crews[i], self.start + timedelta(days=int(d)), float(self.used[i, d]))
+                for i, d in zip(*np.nonzero(over))]
+
+    def find_next_free_slot(self, job: Job, earliest=None, crew_id: Optional[int] = None) -> Optional[Slot]:
+        """
+        Primeiro dia útil a partir de `earliest` em que alguma equipe (ou a
+        equipe pedida) comporta a carga. Empate no dia: a equipe que fica com
+        menos folga (melhor encaixe). None se não houver vaga no horizonte.
+        """
+        np = get_numpy()
+        first = max(self._offset(earliest), 0) if earliest else 0
+        if crew_id is None:
+            rows = list(range(len(self.crews)))
+        else:
+            rows = [self._row[crew_id]] if crew_id in self._row else []
+        if not rows or first >= self.days:
+            return None
+
+        loads = np.array([self.crews[i].load_of(job) for i in rows])
+        capacity = self.capacity[rows]
+        free = capacity[:, None] - self.used[rows, first:]
+        # Carga acima da capacidade só cabe em um dia vazio da equipe
+        need = np.minimum(loads, capacity)[:, None]
+        fits = (free >= need - _EPS) & (free > _EPS) & self.workday[first:]
+
+        any_fit = fits.any(axis=1)
+        if not any_fit.any():
+            return None
+        first_day = np.where(any_fit, fits.argmax(axis=1), self.days)
+        day = first_day.min()
+        candidates = np.flatnonzero(first_day == day)
+        leftover = free[candidates, day] - need[candidates, 0]
+        k = candidates[leftover.argmin()]
+        i = rows[k]
+        return Slot(self.crews[i], self.start + timedelta(days=first + int(day)),
+                    float(loads[k]), float(free[k, day]))
+
+    def book(self, slot: Slot):
+        """Reserva a vaga na matriz (não grava no banco)."""
+        i, d = self._row[slot.crew.id], self._offset(slot.day)
+        if 0 <= d < self.days:
+            self.used[i, d] += slot.load
+            self.jobs[i, d] += 1
+
+    def plan(self, jobs: Iterable[Job], earliest=None) -> Plan:
+        """Planejador guloso: cada orçamento, em ordem, vai para a primeira vaga livre."""
+        assignments, unplaced = [], []
+        for job in jobs:
+            slot = self.find_next_free_slot(job, earliest)
+            if slot is None:
+                unplaced.append(job)
+                continue
+            self.book(slot)
+            assignments.append(Assignment(job, slot))
+        return Plan(assignments, unplaced)
+
+
+def plan_pending(start=None, days: int = HORIZON_DAYS) -> Plan:
+    """Planeja todos os orçamentos aprovados sem instalação a partir de `start` (padrão: amanhã)."""
+    start = _as_date(start) if start else date.today() + timedelta(days=1)
+    schedule = CrewSchedule.load(start, days)
+    return schedule.plan(job_from_row(row) for row in db.get_unscheduled_quote_loads())
+
+
+def apply_plan(plan: Plan, time_of_day: str = DEFAULT_TIME) -> List[int]:
+    """Grava as instalações do plano em uma única transação; retorna os ids criados."""
+    return db.create_installations_bulk([
+        {
+            "quote_id": a.job.quote_id,
+            "scheduled_date": f"{a.slot.day.isoformat()} {time_of_day}",
+            "crew_id": a.slot.crew.id,
+        }
+        for a in plan.assignments
+    ])
+
+
+def format_load(value: float, unit: str) -> str:
+    """Carga com a unidade curta da equipe (ex.: '12.5 m', '3.0 h')."""
+    return f"{value:.1f} {UNIT_LABELS.get(unit, unit)}"
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+CalhaGest - Configuração dos testes
+Banco SQLite temporário por teste, com o schema real (init_database).
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from database import db  # noqa: E402
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Aponta o módulo db para um banco novo em tmp_path e devolve o módulo."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "calhagest_test.db"))
+    monkeypatch.setattr(db, "_db_initialized", False)
+    db.ensure_database()
+    return db
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Testes de db.get_analytics_series: buckets por dia, semana ISO, mês e ano,
+virada de ano e preenchimento com zero dos períodos sem movimento.
+"""
+
+from datetime import date
+
+import pytest
+
+
+def _add_quote(db, created_at, total=100.0, cost=40.0, status="approved"):
+    conn = db.get_connection()
+    conn.execute(
+        "INSERT INTO quotes (client_name, status, total, cost_total, profit, created_at)"
+        " VALUES ('Cliente', ?, ?, ?, ?, ?)",
+        (status, total, cost, total - cost, created_at),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _add_payment(db, payment_date, amount):
+    conn = db.get_connection()
+    quote_id = conn.execute("INSERT INTO quotes (client_name) VALUES ('Pagador')").lastrowid
+    conn.execute(
+        "INSERT INTO payments (quote_id, amount, payment_method, payment_date) VALUES (?, ?, 'pix', ?)",
+        (quote_id, amount, payment_date),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _add_expense(db, expense_date, amount):
+    conn = db.get_connection()
+    conn.execute(
+        "INSERT INTO expenses (description, amount, expense_date) VALUES ('Despesa', ?, ?)",
+        (amount, expense_date),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _by_start(series):
+    return {entry["start"]: entry for entry in series}
+
+
+def test_day_buckets_and_zero_fill(temp_db):
+    _add_quote(temp_db, "2025-03-05 10:30:00", total=250.0, cost=100.0)
+    _add_expense(temp_db, "2025-03-07", 30.0)
+
+    series = temp_db.get_analytics_series("day", date(2025, 3, 1), date(2025, 3, 10))
+
+    assert len(series) == 10
+    assert [e["start"] for e in series] == [f"2025-03-{d:02d}" for d in range(1, 11)]
+    assert series[0]["period"] == "2025-03-01"
+    by_start = _by_start(series)
+    assert by_start["2025-03-05"]["revenue"] == 250.0
+    assert by_start["2025-03-05"]["profit"] == 150.0
+    assert by_start["2025-03-07"]["expenses"] == 30.0
+    empty = by_start["2025-03-02"]
+    assert all(empty[key] == 0 for key in
+               ("revenue", "cost", "profit", "received", "expenses", "quote_count"))
+
+
+def test_week_buckets_start_on_monday(temp_db):
+    # 2025-03-16 é domingo (fim da semana ISO 11); 2025-03-17 é segunda (semana 12)
+    _add_quote(temp_db, "2025-03-16 23:30:00", total=100.0)
+    _add_quote(temp_db, "2025-03-17 00:00:00", total=200.0)
+
+    series = temp_db.get_analytics_series("week", date(2025, 3, 12), date(2025, 3, 30))
+
+    assert [e["start"] for e in series] == ["2025-03-10", "2025-03-17", "2025-03-24"]
+    assert all(date.fromisoformat(e["start"]).weekday() == 0 for e in series)
+    assert [e["period"] for e in series] == ["2025-W11", "2025-W12", "2025-W13"]
+    assert [e["revenue"] for e in series] == [100.0, 200.0, 0]
+
+
+def test_week_crossing_year_uses_iso_year(temp_db):
+    # 2024-12-30 (segunda) abre a semana ISO 2025-W01
+    _add_quote(temp_db, "2025-01-02 09:00:00", total=80.0)
+    _add_quote(temp_db, "2024-12-29 18:00:00", total=20.0)
+
+    series = temp_db.get_analytics_series("week", date(2024, 12, 20), date(2025, 1, 10))
+
+    assert [e["start"] for e in series] == ["2024-12-16", "2024-12-23", "2024-12-30", "2025-01-06"]
+    assert [e["period"] for e in series] == ["2024-W51", "2024-W52", "2025-W01", "2025-W02"]
+    by_start = _by_start(series)
+    assert by_start["2024-12-23"]["revenue"] == 20.0
+    assert by_start["2024-12-30"]["revenue"] == 80.0
+    assert by_start["2025-01-06"]["revenue"] == 0
+
+
+def test_month_buckets_cross_year_with_gaps(temp_db):
+    _add_quote(temp_db, "2024-11-20 12:00:00", total=500.0)
+    _add_payment(temp_db, "2025-02-01 08:00:00", 120.0)
+
+    series = temp_db.get_analytics_series("month", date(2024, 11, 15), date(2025, 2, 3))
+
+    assert [e["period"] for e in series] == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    assert [e["start"] for e in series] == ["2024-11-01", "2024-12-01", "2025-01-01", "2025-02-01"]
+    assert [e["revenue"] for e in series] == [500.0, 0, 0, 0]
+    assert [e["received"] for e in series] == [0, 0, 0, 120.0]
+
+
+def test_year_buckets(temp_db):
+    _add_quote(temp_db, "2021-06-01 10:00:00", total=10.0)
+    _add_quote(temp_db, "2024-12-31 23:59:59", total=30.0)
+    _add_quote(temp_db, "2025-01-01 00:00:00", total=40.0)
+
+    series = temp_db.get_analytics_series("year", date(2021, 3, 1), date(2025, 6, 30))
+
+    assert [e["period"] for e in series] == ["2021", "2022", "2023", "2024", "2025"]
+    assert [e["revenue"] for e in series] == [10.0, 0, 0, 30.0, 40.0]
+
+
+def test_revenue_only_counts_approved_but_all_quotes_are_counted(temp_db):
+    _add_quote(temp_db, "2025-05-10 10:00:00", total=100.0, status="approved")
+    _add_quote(temp_db, "2025-05-11 10:00:00", total=300.0, status="completed")
+    _add_quote(temp_db, "2025-05-12 10:00:00", total=999.0, status="draft")
+
+    (entry,) = temp_db.get_analytics_series("month", date(2025, 5, 1), date(2025, 5, 31))
+
+    assert entry["revenue"] == 400.0
+    assert entry["quote_count"] == 3
+
+
+def test_end_of_range_is_inclusive(temp_db):
+    _add_quote(temp_db, "2025-03-10 23:59:59", total=70.0)
+    _add_quote(temp_db, "2025-03-11 00:00:00", total=5.0)
+
+    series = temp_db.get_analytics_series("day", date(2025, 3, 9), date(2025, 3, 10))
+
+    assert [e["revenue"] for e in series] == [0, 70.0]
+
+
+@pytest.mark.parametrize("granularity, count", [("day", 30), ("week", 12), ("month", 12), ("year", 5)])
+def test_default_window_bucket_counts(temp_db, granularity, count):
+    series = temp_db.get_analytics_series(granularity, end=date(2025, 3, 12))
+
+    assert len(series) == count
+    assert series[-1]["start"] <= "2025-03-12"
+    assert all(e["quote_count"] == 0 for e in series)
+
+
+def test_start_after_end_returns_empty(temp_db):
+    assert temp_db.get_analytics_series("day", date(2025, 3, 10), date(2025, 3, 1)) == []
+
+
+def test_invalid_granularity(temp_db):
+    with pytest.raises(ValueError):
+        temp_db.get_analytics_series("quarter")
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do MRP (services.mrp): o saldo físico soma de volta só o que a
+aprovação realmente baixou do estoque (a baixa para em zero).
+"""
+
+from datetime import date
+
+import pytest
+
+TODAY = date(2026, 3, 2)
+
+
+@pytest.fixture
+def plan_db(temp_db, monkeypatch):
+    # A baixa de estoque dispara o backup automático; fora do escopo aqui
+    monkeypatch.setattr(temp_db, "_auto_backup", lambda: None)
+    return temp_db
+
+
+def _setup(db, stock, meters, stock_deducted=0):
+    """Um material (1 m por metro de produto) e um orçamento aprovado."""
+    conn = db.get_connection()
+    inv_id = conn.execute(
+        "INSERT INTO inventory (name, type, quantity, unit) VALUES ('Chapa', 'chapa', ?, 'm')",
+        (stock,),
+    ).lastrowid
+    product_id = conn.execute(
+        "INSERT INTO products (name, type, measure, price_per_meter) VALUES ('Calha', 'calha', 0.3, 50)"
+    ).lastrowid
+    conn.execute(
+        "INSERT INTO product_materials (product_id, inventory_id, quantity_per_unit, unit_type)"
+        " VALUES (?, ?, 1, 'metro')",
+        (product_id, inv_id),
+    )
+    quote_id = conn.execute(
+        "INSERT INTO quotes (client_name, status, stock_deducted) VALUES ('Cliente', 'approved', ?)",
+        (stock_deducted,),
+    ).lastrowid
+    conn.execute(
+        "INSERT INTO quote_items (quote_id, product_id, product_name, measure, meters,"
+        " price_per_meter, total) VALUES (?, ?, 'Calha', 0.3, ?, 50, 0)",
+        (quote_id, product_id, meters),
+    )
+    conn.commit()
+    conn.close()
+    return inv_id, quote_id
+
+
+def test_full_deduction_is_added_back(plan_db):
+    from services.mrp import build_material_plan
+
+    inv_id, quote_id = _setup(plan_db, stock=30, meters=10)
+    assert plan_db.deduct_stock_for_quote(quote_id) == []
+
+    plan = build_material_plan(TODAY)
+    assert list(plan.projected) == [pytest.approx(20.0)]
+    assert plan.reorder == []
+
+
+def test_clamped_deduction_reports_shortage(plan_db):
+    from services.mrp import build_material_plan
+
+    inv_id, quote_id = _setup(plan_db, stock=4, meters=10)
+    warnings = plan_db.deduct_stock_for_quote(quote_id)
+    assert warnings and "Estoque insuficiente" in warnings[0]
+
+    conn = plan_db.get_connection()
+    deducted = conn.execute(
+        "SELECT quantity FROM stock_deductions WHERE quote_id = ? AND inventory_id = ?",
+        (quote_id, inv_id),
+    ).fetchone()[0]
+    conn.close()
+    assert deducted == pytest.approx(4.0)
+
+    # Físico = 0 no estoque + 4 realmente baixados; o consumo é 10
+    (item,) = build_material_plan(TODAY).reorder
+    assert item.on_hand == pytest.approx(4.0)
+    assert item.projected == pytest.approx(-6.0)
+    assert item.stockout_date == TODAY
+
+
+def test_repeated_material_uses_running_balance(plan_db):
+    from services.mrp import build_material_plan
+
+    inv_id, quote_id = _setup(plan_db, stock=15, meters=10)
+    conn = plan_db.get_connection()
+    conn.execute(
+        "INSERT INTO quote_items (quote_id, product_id, product_name, measure, meters,"
+        " price_per_meter, total) SELECT quote_id, product_id, product_name, measure, meters,"
+        " price_per_meter, total FROM quote_items WHERE quote_id = ?",
+        (quote_id,),
+    )
+    conn.commit()
+    conn.close()
+
+    plan_db.deduct_stock_for_quote(quote_id)
+    (item,) = build_material_plan(TODAY).reorder
+    assert item.on_hand == pytest.approx(15.0)
+    assert item.projected == pytest.approx(-5.0)
+
+
+def test_legacy_deducted_quote_falls_back_to_consumption(plan_db):
+    from services.mrp import build_material_plan
+
+    # Baixado antes do registro em stock_deductions: reservado = consumo
+    _setup(plan_db, stock=5, meters=10, stock_deducted=1)
+    plan = build_material_plan(TODAY)
+    assert list(plan.projected) == [pytest.approx(5.0)]
+
+
+def test_material_linked_after_approval_has_no_reserve(plan_db):
+    from services.mrp import build_material_plan
+
+    inv_id, quote_id = _setup(plan_db, stock=30, meters=10)
+    plan_db.deduct_stock_for_quote(quote_id)
+
+    # Novo material vinculado ao produto depois da baixa: nada dele saiu do estoque
+    conn = plan_db.get_connection()
+    new_id = conn.execute(
+        "INSERT INTO inventory (name, type, quantity, unit) VALUES ('Rebite', 'fixacao', 3, 'un')"
+    ).lastrowid
+    conn.execute(
+        "INSERT INTO product_materials (product_id, inventory_id, quantity_per_unit, unit_type)"
+        " SELECT product_id, ?, 1, 'metro' FROM product_materials WHERE inventory_id = ?",
+        (new_id, inv_id),
+    )
+    conn.commit()
+    conn.close()
+
+    (item,) = build_material_plan(TODAY).reorder
+    assert item.inventory_id == new_id
+    assert item.on_hand == pytest.approx(3.0)
+    assert item.projected == pytest.approx(-7.0)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do modelo pré-compilado do PDF (services.pdf_generator): reproduzir
+os fragmentos gravados gera o mesmo texto e o mesmo número de páginas que
+desenhá-los direto (caminho usado quando o fpdf2 não tem as partes internas).
+"""
+
+import pytest
+
+pdfium = pytest.importorskip("pypdfium2")
+
+from services import pdf_generator  # noqa: E402
+
+SETTINGS = {
+    "company_name": "Calhas Teste",
+    "company_cnpj": "12.345.678/0001-90",
+    "company_address": "Rua das Calhas, 100",
+    "company_phone": "(11) 99999-0000",
+}
+
+
+def _quote(items=40):
+    return {
+        "id": 7,
+        "client_name": "Cliente Teste",
+        "quote_type": "instalado",
+        "created_at": "2026-03-10 09:00:00",
+        "technical_notes": "",
+        "items": [
+            {
+                "product_name": f"Calha {i}", "product_type": "calha", "meters": 2 + i,
+                "price_per_meter": 50.0, "total": 50.0 * (2 + i), "width": 0.3, "measure": 0.3,
+            }
+            for i in range(items)
+        ],
+        "discount_total": 5,
+        "discount_type": "percentage",
+        "total": 1234.5,
+        "payment_summary": {"total_paid": 200.0, "balance": 1034.5},
+        "payment_methods": "pix,credito,boleto,dinheiro,transferencia",
+        "contract_terms": "Garantia de 12 meses.\nPagamento na entrega.",
+    }
+
+
+def _render(quote, replay):
+    pdf = pdf_generator.QuotePDF(SETTINGS["company_name"], SETTINGS)
+    template = pdf_generator.QuoteTemplate(SETTINGS, replay=replay)
+    pdf_generator.render_quote(pdf, quote, SETTINGS, template=template)
+    document = pdfium.PdfDocument(bytes(pdf.output()))
+    try:
+        return [document[i].get_textpage().get_text_range() for i in range(len(document))]
+    finally:
+        document.close()
+
+
+@pytest.mark.parametrize("items", [0, 3, 40])
+def test_replay_matches_direct_drawing(items):
+    quote = _quote(items)
+    direct = _render(quote, replay=False)
+    replayed = _render(quote, replay=True)
+
+    assert len(replayed) == len(direct)
+    assert replayed == direct
+    assert "Calhas Teste" in replayed[0]
+    assert "Assinar documento" in replayed[-1]
+
+
+def test_long_quote_spans_pages():
+    assert len(_render(_quote(40), replay=True)) > 1
+
+
+@pytest.mark.skipif(not pdf_generator.REPLAY_SUPPORTED, reason="fpdf2 sem o catálogo de recursos")
+def test_default_template_uses_replay():
+    pdf_generator.clear_templates()
+    template = pdf_generator.get_template(SETTINGS)
+    assert template.replay
+    assert template.header.pieces
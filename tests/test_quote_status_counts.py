@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Testes das contagens por status usadas pela tela de análises: o GROUP BY do
+banco e o agrupamento do motor colunar dão o mesmo resultado.
+"""
+
+import pytest
+
+STATUSES = ["draft", "sent", "approved", "approved", "completed", None, "draft", "approved"]
+
+
+@pytest.fixture
+def quotes_db(temp_db):
+    conn = temp_db.get_connection()
+    conn.executemany(
+        "INSERT INTO quotes (client_name, status, total, created_at) VALUES (?, ?, ?, ?)",
+        [(f"Cliente {i}", status, 100.0 + i, f"2026-03-{i + 1:02d} 10:00:00")
+         for i, status in enumerate(STATUSES)],
+    )
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+def test_status_counts(quotes_db):
+    assert quotes_db.get_quote_status_counts() == {
+        "draft": 3, "sent": 1, "approved": 3, "completed": 1,
+    }
+
+
+def test_engine_matches_group_by(quotes_db):
+    pytest.importorskip("numpy")
+    from analytics.engine import AnalyticsEngine
+
+    engine = AnalyticsEngine()
+    try:
+        rows = engine.group_by("quotes", by="status", value="count")
+    finally:
+        engine.close()
+    assert {row["key"]: int(row["value"]) for row in rows} == quotes_db.get_quote_status_counts()
+
+
+def test_billable_quotes(quotes_db):
+    quotes = quotes_db.get_billable_quotes()
+    assert [q["status"] for q in quotes] == ["approved", "completed", "approved", "approved"]
+    assert [q["client_name"] for q in quotes] == ["Cliente 7", "Cliente 4", "Cliente 3", "Cliente 2"]
+    assert set(quotes[0]) == {"id", "client_name", "total", "status"}
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do filtro por nome de db.reprice_products: só '*' é curinga; '_' e
+'%' digitados pelo usuário são literais.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def products_db(temp_db):
+    conn = temp_db.get_connection()
+    conn.executemany(
+        "INSERT INTO products (name, type, measure, price_per_meter) VALUES (?, 'calha', 0.3, 50)",
+        [("calha_1",), ("calhax1",), ("Calha_10",), ("rufo 10%",), ("rufo 100",), ("dir\\calha",)],
+    )
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+def _names(db, pattern):
+    report = db.reprice_products("percent", 10, name_pattern=pattern, dry_run=True)
+    return sorted(p["name"] for p in report["sample"])
+
+
+def test_underscore_is_literal(products_db):
+    assert _names(products_db, "calha_1") == ["Calha_10", "calha_1"]
+
+
+def test_percent_is_literal(products_db):
+    assert _names(products_db, "10%") == ["rufo 10%"]
+
+
+def test_backslash_is_literal(products_db):
+    assert _names(products_db, "dir\\") == ["dir\\calha"]
+
+
+def test_star_is_wildcard(products_db):
+    assert _names(products_db, "calha*1") == ["calha_1", "calhax1"]
+    assert _names(products_db, "calha_*") == ["Calha_10", "calha_1"]
+
+
+def test_dry_run_keeps_prices(products_db):
+    products_db.reprice_products("percent", 10, name_pattern="calha_1", dry_run=True)
+    conn = products_db.get_connection()
+    prices = {r[0] for r in conn.execute("SELECT price_per_meter FROM products")}
+    conn.close()
+    assert prices == {50.0}
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do orçamento de inicialização (mesmas verificações de
+benchmarks/startup_benchmark.py): 'import main' não carrega os módulos
+pesados e a primeira pintura fica dentro do orçamento.
+"""
+
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("customtkinter")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_PAINT_BUDGET_MS = 1500.0
+
+
+def _load_benchmark():
+    path = os.path.join(ROOT_DIR, "benchmarks", "startup_benchmark.py")
+    spec = importlib.util.spec_from_file_location("startup_benchmark", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_import_main_skips_heavy_modules():
+    # Processo novo: o sys.modules deste pytest já tem numpy/fpdf de outros testes
+    code = (
+        "import json, sys, main\n"
+        "from lazy_imports import HEAVY_MODULES\n"
+        "print(json.dumps([m for m in HEAVY_MODULES if m in sys.modules]))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+@pytest.mark.skipif(sys.platform.startswith("linux") and not os.environ.get("DISPLAY"),
+                    reason="sem display para abrir a janela")
+def test_first_paint_within_budget():
+    reports = _load_benchmark().measure_first_paint(runs=3)
+    assert statistics.median(r["first_paint"] for r in reports) <= FIRST_PAINT_BUDGET_MS
+    assert not any(r.get("heavy_modules_loaded") for r in reports)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-Funções utilitárias para formatação de dados
+Funções utilitárias para formatação e conversão de dados
 """
 
 
@@ -39,3 +39,44 @@ def format_dimensions(width, length):
         return f"{width:.2f}m"
     
     return f"{width:.2f} x {length:.2f}m"
+
+
+def parse_decimal(value, strict=False):
+    """
+    Converte string para float, aceitando vírgula ou ponto como separador decimal.
+    Remove pontos de milhar (formato brasileiro).
+    Exemplos: "1.250,50" -> 1250.50 | "1250.50" -> 1250.50 | "1250,50" -> 1250.50
+
+    Args:
+        value: Texto ou número
+        strict: Se True, lança ValueError para textos inválidos em vez de
+                retornar 0.0 (validação de importação)
+    """
+    if not value:
+        return 0.0
+    try:
+        # Converter para string se não for
+        value_str = str(value).strip()
+        if not value_str:
+            return 0.0
+        
+        # Contar quantidade de pontos e vírgulas
+        dot_count = value_str.count('.')
+        comma_count = value_str.count(',')
+        
+        # Se tem vírgula e ponto, assumir formato brasileiro (1.250,50)
+        if dot_count > 0 and comma_count > 0:
+            # Remover pontos (separadores de milhar) e trocar vírgula por ponto
+            value_str = value_str.replace('.', '').replace(',', '.')
+        # Se tem apenas vírgula, pode ser decimal brasileiro (1250,50)
+        elif comma_count > 0:
+            value_str = value_str.replace(',', '.')
+        # Se tem múltiplos pontos, são separadores de milhar
+        elif dot_count > 1:
+            value_str = value_str.replace('.', '')
+        
+        return float(value_str)
+    except (ValueError, TypeError, AttributeError):
+        if strict:
+            raise ValueError(f"número inválido: {value!r}")
+        return 0.0
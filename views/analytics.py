@@ -4,106 +4,159 @@ CalhaGest - Relatórios e Analytics
 Gráficos financeiros com abas de seleção e visuais melhorados.
 """
 
+from datetime import date, timedelta
+
 import customtkinter as ctk
-import os
-import tempfile
-from database import db
+from database import db, events
 from components.cards import create_header
 from theme import get_color, COLORS
 from components.dialogs import format_currency
+from components.resources import get_font
+from components.progressive import ProgressiveLoader, Skeleton
+from analytics.live_charts import (
+    ProfitEvolutionLiveChart,
+    ProfitVsCostLiveChart,
+    QuotesByStatusLiveChart,
+    live_charts_available,
+)
+from analytics.chart_service import ChartSpec, get_chart_service
+from analytics.charts import FIGURE_ASPECT
+from analytics.engine import engine_available, get_analytics_engine
+from components.pdf_preview import PdfPreviewDialog
+
+
+# Largura de exibição dos gráficos nas abas (faz parte da chave do cache)
+CHART_WIDTH = 750
+
+# Gráficos de série temporal embutidos (FigureCanvasTkAgg, atualizados no lugar).
+# Com False, ou sem o backend TkAgg, as abas usam PNGs do pool/cache de gráficos.
+EMBEDDED_CHARTS = True
+
+# Botão do seletor de período -> granularidade de db.get_analytics_series
+PERIOD_GRANULARITY = {
+    "Diário": "day",
+    "Semanal": "week",
+    "Mensal": "month",
+    "Anual": "year",
+}
+
+# Períodos do relatório financeiro em PDF (services/report_generator)
+REPORT_PERIODS = ("Mês atual", "Mês anterior", "Ano atual", "Ano anterior", "Últimos 12 meses")
+
+
+def report_period(label: str, today: date = None):
+    """(início, fim) de um dos REPORT_PERIODS."""
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    if label == "Mês anterior":
+        last_month_end = month_start - timedelta(days=1)
+        return last_month_end.replace(day=1), last_month_end
+    if label == "Ano atual":
+        return today.replace(month=1, day=1), today
+    if label == "Ano anterior":
+        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+    if label == "Últimos 12 meses":  # mês atual e os 11 anteriores
+        year, month = divmod(today.year * 12 + today.month - 12, 12)
+        return date(year, month + 1, 1), today
+    return month_start, today
+
+
+LIVE_CHART_CLASSES = {
+    "profit_vs_cost": ProfitVsCostLiveChart,
+    "profit_evolution": ProfitEvolutionLiveChart,
+    "quotes_by_status": QuotesByStatusLiveChart,
+}
 
 
 class AnalyticsView(ctk.CTkFrame):
     """View de relatórios com abas para cada tipo de gráfico."""
 
+    TAB_NAMES = [
+        "💰 Faturamento vs Custo", "📈 Evolução Financeira",
+        "📋 Orçamentos por Status", "🥧 Visão Financeira",
+        "💵 Pagamentos", "📊 Visão Geral", "🧮 Indicadores",
+    ]
+
     def __init__(self, parent, app):
         super().__init__(parent, fg_color="transparent")
         self.app = app
         self._chart_images = []
-        self._temp_dir = tempfile.mkdtemp()
+        # Consultas e gráficos rodam em segundo plano; a view aparece com skeletons
+        self._loader = ProgressiveLoader(self)
+        # Relatório em PDF: carga própria (trocar de período não a cancela)
+        self._report_loader = ProgressiveLoader(self)
+        self._tabs = {}
+        # Abas materializadas sob demanda: construtor por aba e abas desatualizadas
+        self._tab_builders = {}
+        self._stale_tabs = set()
+        self._data = None
+        self._live_charts = {}   # tipo do gráfico -> {"chart": LiveChart, "extras": frame, "tab": nome}
+        self._live_mode = False
+        self._needs_reload = False
+        self._period_toast = None
+        # Sobe os processos de renderização enquanto o banco é consultado, só
+        # quando todos os gráficos passam pelo pool. Com os gráficos embutidos
+        # (LiveChart) o pool só é criado na primeira renderização que o usa
+        # (pizza, ampliar)
+        if not EMBEDDED_CHARTS:
+            get_chart_service().warm_up()
+        # Estado leve preservado quando os recursos pesados são liberados
+        self._period = "Mensal"
+        self._selected_tab = None
+        self._released = False
+        self._changes = events.DirtyFlag([
+            events.QUOTE, events.QUOTE_ITEM, events.PAYMENT, events.EXPENSE,
+            events.EXPENSE_CATEGORY, events.EMPLOYEE, events.PAYROLL,
+        ])
         self._build()
 
+    def on_show(self):
+        """Reconstrói se foi liberada; recarrega os dados se mudaram ou ficaram pela metade."""
+        dirty = self._changes.consume()
+        if self._released:
+            self._released = False
+            self._build()
+            if self._selected_tab:
+                try:
+                    self.tabview.set(self._selected_tab)
+                except Exception:
+                    pass
+        elif dirty or self._needs_reload:
+            self._reload()
+
+    def on_hide(self):
+        """Salva período e aba selecionados e descarta cargas em andamento."""
+        try:
+            self._period = self.period_var.get()
+            self._selected_tab = self.tabview.get()
+        except Exception:
+            pass
+        if self._loader.busy:
+            self._needs_reload = True
+        self._loader.cancel()
+
+    def release_heavy_resources(self):
+        """Libera imagens dos gráficos e widgets das abas (os PNGs ficam no cache de gráficos)."""
+        self._loader.cancel()
+        self._drop_live_charts()
+        for w in self.winfo_children():
+            w.destroy()
+        self._tabs = {}
+        self._chart_images = []
+        self._released = True
+
     def _build(self):
+        self._changes.consume()
+
         # Cabeçalho
         header = create_header(self, "Relatórios", "Análise financeira e métricas")
         header.pack(fill="x", pady=(0, 15))
 
-        # Estatísticas resumidas
-        stats = db.get_dashboard_stats()
-
-        # Cards resumo
-        summary = ctk.CTkFrame(self, fg_color=COLORS["card"], corner_radius=12,
-                                border_width=1, border_color=COLORS["border"])
-        summary.pack(fill="x", pady=(0, 15))
-
-        stats_grid = ctk.CTkFrame(summary, fg_color="transparent")
-        stats_grid.pack(fill="x", padx=15, pady=15)
-        stats_grid.grid_columnconfigure((0, 1, 2, 3), weight=1)
-
-        stat_items = [
-            ("📋 Orçamentos", str(stats.get("total_quotes", 0)), COLORS["primary"]),
-            ("✅ Aprovados", str(stats.get("approved_quotes", 0)), COLORS["success"]),
-            ("💰 Faturamento", format_currency(stats.get("total_revenue", 0)), COLORS["warning"]),
-            ("📈 Lucro", format_currency(stats.get("total_profit", 0)), COLORS["success"]),
-        ]
-
-        for col, (label, value, color) in enumerate(stat_items):
-            cell = ctk.CTkFrame(stats_grid, fg_color="transparent")
-            cell.grid(row=0, column=col, padx=8, sticky="nsew")
-
-            # Barra de cor no topo
-            ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-
-            ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
-                         text_color=COLORS["text_secondary"]).pack()
-            ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=18, weight="bold"),
-                         text_color=color).pack(pady=(2, 0))
-
-        # Cards de pagamentos (segunda linha)
-        pay_grid = ctk.CTkFrame(summary, fg_color="transparent")
-        pay_grid.pack(fill="x", padx=15, pady=(0, 15))
-        pay_grid.grid_columnconfigure((0, 1, 2), weight=1)
-
-        pay_items = [
-            ("💵 Recebido", format_currency(stats.get("total_received", 0)), COLORS["success"]),
-            ("📛 Saldo Devedor", format_currency(stats.get("total_pending", 0)), COLORS["error"]),
-            ("🏷️ Quitados", str(stats.get("paid_quotes", 0)), COLORS["primary"]),
-        ]
-
-        for col, (label, value, color) in enumerate(pay_items):
-            cell = ctk.CTkFrame(pay_grid, fg_color="transparent")
-            cell.grid(row=0, column=col, padx=8, sticky="nsew")
-
-            ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-            ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
-                         text_color=COLORS["text_secondary"]).pack()
-            ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=16, weight="bold"),
-                         text_color=color).pack(pady=(2, 0))
-
-        # Cards financeiros (terceira linha)
-        try:
-            fin = db.get_financial_overview()
-            fin_grid = ctk.CTkFrame(summary, fg_color="transparent")
-            fin_grid.pack(fill="x", padx=15, pady=(0, 15))
-            fin_grid.grid_columnconfigure((0, 1, 2, 3), weight=1)
-
-            fin_items = [
-                ("💸 Despesas", format_currency(fin.get("total_expenses", 0)), COLORS["error"]),
-                ("👥 Folha Pgto", format_currency(fin.get("total_payroll", 0)), COLORS["warning"]),
-                ("📊 Balanço", format_currency(fin.get("balance", 0)),
-                 COLORS["success"] if fin.get("balance", 0) >= 0 else COLORS["error"]),
-                ("📛 Pendentes", format_currency(fin.get("pending_receivables", 0)), COLORS["primary"]),
-            ]
-            for col, (label, value, color) in enumerate(fin_items):
-                cell = ctk.CTkFrame(fin_grid, fg_color="transparent")
-                cell.grid(row=0, column=col, padx=8, sticky="nsew")
-                ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-                ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
-                             text_color=COLORS["text_secondary"]).pack()
-                ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=16, weight="bold"),
-                             text_color=color).pack(pady=(2, 0))
-        except Exception:
-            pass
+        # Cards resumo (preenchidos quando a consulta terminar)
+        self.summary_frame = ctk.CTkFrame(self, fg_color=COLORS["card"], corner_radius=12,
+                                          border_width=1, border_color=COLORS["border"])
+        self.summary_frame.pack(fill="x", pady=(0, 15))
+        Skeleton(self.summary_frame, lines=3, card=False).pack(fill="x")
 
         # Filtro de período
         filter_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -111,20 +164,33 @@ class AnalyticsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             filter_frame, text="Período:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left", padx=(0, 8))
 
-        self.period_var = ctk.StringVar(value="Mensal")
+        self.period_var = ctk.StringVar(value=self._period)
         ctk.CTkSegmentedButton(
             filter_frame,
-            values=["Diário", "Semanal", "Mensal", "Anual"],
+            values=list(PERIOD_GRANULARITY),
             variable=self.period_var,
             command=self._on_period_change,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             height=32,
         ).pack(side="left")
 
+        # Relatório do período para o contador (indicadores, tabelas e gráficos)
+        self.report_btn = ctk.CTkButton(
+            filter_frame, text="📄 Relatório PDF", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            height=32, width=140, command=self._export_report,
+        )
+        self.report_btn.pack(side="right")
+        self.report_period_var = ctk.StringVar(value="Ano atual")
+        ctk.CTkOptionMenu(
+            filter_frame, values=list(REPORT_PERIODS), variable=self.report_period_var,
+            font=get_font(size=12), height=32, width=160,
+        ).pack(side="right", padx=(0, 8))
+
         # Tabview com abas de gráficos
         self.tabview = ctk.CTkTabview(
             self,
@@ -139,6 +205,7 @@ class AnalyticsView(ctk.CTkFrame):
             segmented_button_unselected_hover_color=get_color("border_hover"),
             text_color=COLORS["text"],
             text_color_disabled=COLORS["text_secondary"],
+            command=self._on_tab_selected,
         )
         self.tabview.pack(fill="both", expand=True)
         
@@ -148,116 +215,335 @@ class AnalyticsView(ctk.CTkFrame):
             text_color_disabled=COLORS["text_secondary"]
         )
 
-        # Criar abas
-        tab_revenue = self.tabview.add("💰 Faturamento vs Custo")
-        tab_evolution = self.tabview.add("📈 Evolução Financeira")
-        tab_status = self.tabview.add("📋 Orçamentos por Status")
-        tab_financial = self.tabview.add("🥧 Visão Financeira")
-        tab_payments = self.tabview.add("💵 Pagamentos")
-        tab_overview = self.tabview.add("📊 Visão Geral")
-
-        # Carregar dados
-        analytics = db.get_monthly_analytics()
-        quotes_by_status = self._get_quotes_by_status()
-
-        # Preencher abas
-        if analytics:
-            self._fill_revenue_tab(tab_revenue, analytics)
-            self._fill_evolution_tab(tab_evolution, analytics)
+        # Criar abas com skeletons; cada uma só é construída quando visível
+        self._tabs = {}
+        self._tab_builders = {}
+        self._stale_tabs = set()
+        self._data = None
+        for name, builder in zip(self.TAB_NAMES, (
+            self._build_revenue_tab, self._build_evolution_tab, self._build_status_tab,
+            self._build_financial_tab, self._build_payments_tab, self._build_overview_tab,
+            self._build_indicators_tab,
+        )):
+            self._register_tab(name, builder)
+
+        self._load_data()
+
+    def _register_tab(self, name, builder):
+        """Adiciona a aba com um skeleton; builder(aba, dados) a constrói quando visível."""
+        tab = self.tabview.add(name)
+        self._tabs[name] = tab
+        self._tab_builders[name] = builder
+        self._stale_tabs.add(name)
+        self._show_tab_skeleton(name)
+
+    def _show_tab_skeleton(self, name):
+        """Troca por placeholder o conteúdo da aba (gráficos embutidos são mantidos)."""
+        if any(entry["tab"] == name and entry["chart"].alive for entry in self._live_charts.values()):
+            return
+        tab = self._tabs[name]
+        self._clear_tab(tab)
+        Skeleton(tab, lines=2, height=260, card=False).pack(fill="x", padx=10, pady=10)
+
+    def _on_tab_selected(self, name=None):
+        """Constrói a aba selecionada se estiver desatualizada."""
+        name = name or self.tabview.get()
+        if name not in self._stale_tabs:
+            return
+        if self._data is None:
+            self._show_tab_skeleton(name)  # Dados ainda carregando
+            return
+        self._stale_tabs.discard(name)
+        self._tab_builders[name](self._tabs[name], self._data)
+
+    def _mark_tabs_stale(self):
+        """Filtros ou dados mudaram: todas as abas serão refeitas ao serem exibidas."""
+        self._stale_tabs = set(self._tabs)
+
+    @staticmethod
+    def _clear_tab(tab):
+        for w in tab.winfo_children():
+            w.destroy()
+
+    def _drop_live_charts(self, chart_type=None):
+        """Destrói gráficos embutidos (todos ou de um tipo) e libera as figuras."""
+        for key in [chart_type] if chart_type else list(self._live_charts):
+            entry = self._live_charts.pop(key, None)
+            if entry is not None:
+                entry["chart"].destroy()
+
+    def _reload(self):
+        """Volta aos skeletons e busca os dados de novo (mantém a aba selecionada)."""
+        self._needs_reload = False
+        self._chart_images = []
+        for w in self.summary_frame.winfo_children():
+            w.destroy()
+        Skeleton(self.summary_frame, lines=3, card=False).pack(fill="x")
+        self._data = None
+        self._mark_tabs_stale()
+        self._on_tab_selected()
+        self._load_data()
+
+    def _load_data(self):
+        """Agenda a consulta ao banco em segundo plano."""
+        self._changes.consume()
+        self._needs_reload = False
+        self._loader.cancel()
+        self._loader.submit(self._fetch_data, self._on_data_loaded, self._period,
+                            on_error=self._on_load_error)
+
+    @staticmethod
+    def _fetch_data(period):
+        """Executa todas as consultas da view (thread de trabalho, sem widgets)."""
+        # Importa o matplotlib/TkAgg fora da thread do Tk
+        live = EMBEDDED_CHARTS and live_charts_available()
+        try:
+            fin = db.get_financial_overview()
+        except Exception:
+            fin = None
+        series = db.get_analytics_series(PERIOD_GRANULARITY[period])
+        # Contagem por status agregada (motor colunar ou GROUP BY), sem carregar os orçamentos
+        if engine_available():
+            status_count = {row["key"]: int(row["value"]) for row in
+                            get_analytics_engine().group_by("quotes", by="status", value="count")}
         else:
-            self._show_no_data(tab_revenue)
-            self._show_no_data(tab_evolution)
+            status_count = db.get_quote_status_counts()
+        return {
+            "stats": db.get_dashboard_stats(),
+            "fin": fin,
+            "analytics": series if any(d["quote_count"] or d["received"] or d["expenses"]
+                                       for d in series) else [],
+            "quotes_by_status": status_count or None,
+            "billable_quotes": db.get_billable_quotes(),
+            "summaries": db.get_all_payment_summaries(),
+            "live": live,
+        }
+
+    def _on_data_loaded(self, data):
+        """Substitui os skeletons pelo conteúdo real."""
+        for w in self.summary_frame.winfo_children():
+            w.destroy()
+        self._fill_summary(self.summary_frame, data["stats"], data["fin"])
+
+        self._live_mode = data["live"]
+        self._data = data
+        self._mark_tabs_stale()
+        self._on_tab_selected()
+
+        if self._period_toast:
+            self.app.show_toast(f"📊 Relatório atualizado: {self._period_toast}", "success")
+            self._period_toast = None
+
+    # ========== Construtores das abas ==========
+
+    def _build_revenue_tab(self, tab, data):
+        if data["analytics"]:
+            self._fill_revenue_tab(tab, data["analytics"])
+        else:
+            self._show_no_chart_data(tab, "profit_vs_cost")
+
+    def _build_evolution_tab(self, tab, data):
+        if data["analytics"]:
+            self._fill_evolution_tab(tab, data["analytics"])
+        else:
+            self._show_no_chart_data(tab, "profit_evolution")
 
-        if quotes_by_status:
-            self._fill_status_tab(tab_status, quotes_by_status)
+    def _build_status_tab(self, tab, data):
+        if data["quotes_by_status"]:
+            self._fill_status_tab(tab, data["quotes_by_status"])
         else:
-            self._show_no_data(tab_status)
+            self._show_no_chart_data(tab, "quotes_by_status")
+
+    def _build_financial_tab(self, tab, data):
+        self._clear_tab(tab)
+        self._fill_financial_tab(tab, data["fin"] or {}, data["quotes_by_status"])
+
+    def _build_payments_tab(self, tab, data):
+        self._clear_tab(tab)
+        self._fill_payments_tab(tab, data["stats"], data["billable_quotes"], data["summaries"])
+
+    def _build_overview_tab(self, tab, data):
+        self._clear_tab(tab)
+        self._fill_overview_tab(tab, data["analytics"], data["quotes_by_status"],
+                                data["stats"], data["fin"])
+
+    def _build_indicators_tab(self, tab, data):
+        """Relatórios do motor colunar, calculados em segundo plano."""
+        self._clear_tab(tab)
+        if not engine_available():
+            ctk.CTkLabel(
+                tab, text="Instale o NumPy para ver os indicadores (pip install numpy).",
+                font=get_font(size=13), text_color=COLORS["text_secondary"],
+            ).pack(padx=10, pady=20)
+            return
+        Skeleton(tab, lines=3, height=260, card=False).pack(fill="x", padx=10, pady=10)
+        self._loader.submit(self._fetch_indicators, lambda reports: self._fill_indicators_tab(tab, reports),
+                            on_error=lambda e: self._show_tab_error(tab, e))
+
+    def _show_tab_error(self, tab, error):
+        if not tab.winfo_exists():
+            return
+        self._clear_tab(tab)
+        ctk.CTkLabel(tab, text=f"Erro ao calcular indicadores: {error}",
+                     text_color=COLORS["error"]).pack(pady=15)
+
+    @staticmethod
+    def _fetch_indicators():
+        """Executa os relatórios do motor (thread de trabalho)."""
+        engine = get_analytics_engine()
+        return {
+            "margin": engine.product_type_margin(),
+            "aging": engine.receivables_aging(),
+            "cohorts": engine.client_cohort_revenue(bin="year"),
+        }
+
+    def _show_no_chart_data(self, tab, chart_type):
+        self._drop_live_charts(chart_type)
+        self._clear_tab(tab)
+        self._show_no_data(tab)
+
+    def _on_load_error(self, error):
+        self._stale_tabs = set()
+        for w in self.summary_frame.winfo_children():
+            w.destroy()
+        ctk.CTkLabel(self.summary_frame, text=f"Erro ao carregar relatórios: {error}",
+                     text_color=COLORS["error"]).pack(pady=15)
+        for tab in self._tabs.values():
+            for w in tab.winfo_children():
+                w.destroy()
+
+    def _fill_summary(self, summary, stats, fin):
+        """Cards resumo do topo da view."""
+        stats_grid = ctk.CTkFrame(summary, fg_color="transparent")
+        stats_grid.pack(fill="x", padx=15, pady=15)
+        stats_grid.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
-        self._fill_financial_tab(tab_financial)
-        self._fill_payments_tab(tab_payments, stats)
-        self._fill_overview_tab(tab_overview, analytics, quotes_by_status, stats)
+        stat_items = [
+            ("📋 Orçamentos", str(stats.get("total_quotes", 0)), COLORS["primary"]),
+            ("✅ Aprovados", str(stats.get("approved_quotes", 0)), COLORS["success"]),
+            ("💰 Faturamento", format_currency(stats.get("total_revenue", 0)), COLORS["warning"]),
+            ("📈 Lucro", format_currency(stats.get("total_profit", 0)), COLORS["success"]),
+        ]
+
+        for col, (label, value, color) in enumerate(stat_items):
+            cell = ctk.CTkFrame(stats_grid, fg_color="transparent")
+            cell.grid(row=0, column=col, padx=8, sticky="nsew")
+
+            # Barra de cor no topo
+            ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
+
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
+                         text_color=COLORS["text_secondary"]).pack()
+            ctk.CTkLabel(cell, text=value, font=get_font(size=18, weight="bold"),
+                         text_color=color).pack(pady=(2, 0))
 
-    def _on_period_change(self, value):
+        # Cards de pagamentos (segunda linha)
+        pay_grid = ctk.CTkFrame(summary, fg_color="transparent")
+        pay_grid.pack(fill="x", padx=15, pady=(0, 15))
+        pay_grid.grid_columnconfigure((0, 1, 2), weight=1)
+
+        pay_items = [
+            ("💵 Recebido", format_currency(stats.get("total_received", 0)), COLORS["success"]),
+            ("📛 Saldo Devedor", format_currency(stats.get("total_pending", 0)), COLORS["error"]),
+            ("🏷️ Quitados", str(stats.get("paid_quotes", 0)), COLORS["primary"]),
+        ]
+
+        for col, (label, value, color) in enumerate(pay_items):
+            cell = ctk.CTkFrame(pay_grid, fg_color="transparent")
+            cell.grid(row=0, column=col, padx=8, sticky="nsew")
+
+            ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
+                         text_color=COLORS["text_secondary"]).pack()
+            ctk.CTkLabel(cell, text=value, font=get_font(size=16, weight="bold"),
+                         text_color=color).pack(pady=(2, 0))
+
+        # Cards financeiros (terceira linha)
+        if fin is None:
+            return
+        fin_grid = ctk.CTkFrame(summary, fg_color="transparent")
+        fin_grid.pack(fill="x", padx=15, pady=(0, 15))
+        fin_grid.grid_columnconfigure((0, 1, 2, 3), weight=1)
+
+        fin_items = [
+            ("💸 Despesas", format_currency(fin.get("total_expenses", 0)), COLORS["error"]),
+            ("👥 Folha Pgto", format_currency(fin.get("total_payroll", 0)), COLORS["warning"]),
+            ("📊 Balanço", format_currency(fin.get("balance", 0)),
+             COLORS["success"] if fin.get("balance", 0) >= 0 else COLORS["error"]),
+            ("📛 Pendentes", format_currency(fin.get("pending_receivables", 0)), COLORS["primary"]),
+        ]
+        for col, (label, value, color) in enumerate(fin_items):
+            cell = ctk.CTkFrame(fin_grid, fg_color="transparent")
+            cell.grid(row=0, column=col, padx=8, sticky="nsew")
+            ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
+                         text_color=COLORS["text_secondary"]).pack()
+            ctk.CTkLabel(cell, text=value, font=get_font(size=16, weight="bold"),
+                         text_color=color).pack(pady=(2, 0))
+
+    def _on_period_change(self, value, notify=True):
         """Atualiza os gráficos quando o período muda."""
-        from datetime import datetime, timedelta
-        
-        # Calcular intervalo de datas baseado no período
-        today = datetime.now()
-        
-        if value == "Diário":
-            start_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
-            date_format = "%Y-%m-%d"
-            months_back = 0
-        elif value == "Semanal":
-            start_date = today - timedelta(days=7)
-            date_format = "%Y-%m"
-            months_back = 0
-        elif value == "Mensal":
-            start_date = today - timedelta(days=30)
-            date_format = "%Y-%m"
-            months_back = 0
-        else:  # Anual
-            start_date = today - timedelta(days=365)
-            date_format = "%Y-%m"
-            months_back = 12
-        
-        # Recarregar dados
-        analytics = db.get_monthly_analytics()
-        quotes_by_status = self._get_quotes_by_status()
-        
-        # Filtrar analytics por período
-        if value != "Mensal":  # Mensal já carrega últimos 12 meses por padrão
-            filtered_analytics = []
-            for item in analytics:
-                try:
-                    item_date = datetime.strptime(item["month"], "%Y-%m")
-                    if item_date >= start_date:
-                        filtered_analytics.append(item)
-                except:
-                    continue
-            analytics = filtered_analytics
-        
-        # Limpar e reconstruir abas
-        self._rebuild_tabs(analytics, quotes_by_status)
-        self.app.show_toast(f"📊 Relatório atualizado: {value}", "success")
-
-    def _rebuild_tabs(self, analytics, quotes_by_status):
-        """Reconstrói todas as abas com novos dados."""
-        stats = db.get_dashboard_stats()
-
-        # Remover todas as abas existentes
-        for tab_name in ["💰 Faturamento vs Custo", "📈 Evolução Financeira", 
-                         "📋 Orçamentos por Status", "🥧 Visão Financeira",
-                         "💵 Pagamentos", "📊 Visão Geral"]:
-            try:
-                self.tabview.delete(tab_name)
-            except:
-                pass
-        
-        # Recriar abas
-        tab_revenue = self.tabview.add("💰 Faturamento vs Custo")
-        tab_evolution = self.tabview.add("📈 Evolução Financeira")
-        tab_status = self.tabview.add("📋 Orçamentos por Status")
-        tab_financial = self.tabview.add("🥧 Visão Financeira")
-        tab_payments = self.tabview.add("💵 Pagamentos")
-        tab_overview = self.tabview.add("📊 Visão Geral")
-        
-        # Preencher com novos dados
-        if analytics:
-            self._fill_revenue_tab(tab_revenue, analytics)
-            self._fill_evolution_tab(tab_evolution, analytics)
-        else:
-            self._show_no_data(tab_revenue)
-            self._show_no_data(tab_evolution)
-        
-        if quotes_by_status:
-            self._fill_status_tab(tab_status, quotes_by_status)
-        else:
-            self._show_no_data(tab_status)
-        
-        self._fill_financial_tab(tab_financial)
-        self._fill_payments_tab(tab_payments, stats)
-        self._fill_overview_tab(tab_overview, analytics, quotes_by_status, stats)
+        self._period = value
+        self._period_toast = value if notify else None
+        self._reload()
+
+    def _export_report(self):
+        """Gera o relatório financeiro do período escolhido e abre a pré-visualização."""
+        from services.report_generator import build_period_report
+
+        label = self.report_period_var.get()
+        start, end = report_period(label)
+        self.report_btn.configure(state="disabled", text="⏳ Gerando...")
+
+        def restore_button():
+            if self.report_btn.winfo_exists():
+                self.report_btn.configure(state="normal", text="📄 Relatório PDF")
+
+        def on_done(report):
+            restore_button()
+            PdfPreviewDialog(self.app, report, title=f"Relatório Financeiro - {label}")
+
+        def on_error(e):
+            restore_button()
+            self.app.show_toast(f"Erro ao gerar relatório: {e}", "error")
+
+        self._report_loader.submit(build_period_report, on_done, start, end,
+                                   on_error=on_error, executor="export")
+
+    def _add_chart(self, parent, chart_type, data):
+        """
+        Reserva o espaço do gráfico com um skeleton e o obtém do cache de gráficos
+        ou do pool de renderização; cada gráfico aparece assim que fica pronto.
+        """
+        slot = ctk.CTkFrame(parent, fg_color="transparent")
+        slot.pack(fill="x")
+        skeleton = Skeleton(slot, lines=0, height=320)
+        skeleton.pack(fill="x", padx=10, pady=5)
+
+        # Desenhado direto no tamanho de exibição × escala do monitor
+        spec = ChartSpec(chart_type, data, CHART_WIDTH, self._scaling())
+
+        def on_done(chart):
+            if not slot.winfo_exists():
+                return
+            skeleton.destroy()
+            if chart is not None:
+                self._display_chart_image(slot, chart.image, spec)
+
+        def on_error(e):
+            if slot.winfo_exists():
+                skeleton.destroy()
+                ctk.CTkLabel(slot, text=f"Erro: {e}", text_color=COLORS["error"]).pack(pady=10)
+
+        self._loader.submit(get_chart_service().render, on_done, spec,
+                            on_error=on_error, executor="charts")
+
+    def _scaling(self) -> float:
+        """Pixels físicos por pixel lógico (escala do customtkinter × DPI da janela)."""
+        try:
+            return float(ctk.ScalingTracker.get_widget_scaling(self))
+        except Exception:
+            return 1.0
 
     def _show_no_data(self, parent):
         """Mostra mensagem de dados insuficientes."""
@@ -266,80 +552,98 @@ class AnalyticsView(ctk.CTkFrame):
         ctk.CTkLabel(
             wrapper,
             text="📈 Dados insuficientes para este gráfico.\nCrie alguns orçamentos para ver os relatórios.",
-            font=ctk.CTkFont(size=14),
+            font=get_font(size=14),
             text_color=COLORS["text_secondary"],
             justify="center",
         ).pack(expand=True)
 
-    def _fill_revenue_tab(self, parent, analytics_data):
-        """Aba de Faturamento vs Custo."""
-        try:
-            from analytics.charts import create_profit_vs_cost_chart
+    def _chart_tab(self, parent, chart_type, data, description):
+        """
+        Monta a aba com descrição e gráfico, ou só atualiza o gráfico embutido já
+        existente (sem reconstruir a figura). Retorna o frame para o conteúdo
+        complementar da aba (tabelas, cards), que é sempre refeito.
+        """
+        tab_name = next(name for name, tab in self._tabs.items() if tab is parent)
+        entry = self._live_charts.get(chart_type)
+        if entry is not None and entry["chart"].alive:
+            entry["chart"].update(data)
+            extras = entry["extras"]
+            for w in extras.winfo_children():
+                w.destroy()
+            return extras
+
+        self._clear_tab(parent)
+        scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
+        scroll.pack(fill="both", expand=True)
 
-            scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
-            scroll.pack(fill="both", expand=True)
+        ctk.CTkLabel(
+            scroll,
+            text=description,
+            font=get_font(size=12),
+            text_color=COLORS["text_secondary"],
+        ).pack(anchor="w", padx=10, pady=(10, 8))
 
-            # Descrição
-            ctk.CTkLabel(
-                scroll,
-                text="Comparação mensal entre faturamento e custos",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_secondary"],
-            ).pack(anchor="w", padx=10, pady=(10, 8))
+        if self._live_mode:
+            chart = self._add_live_chart(scroll, chart_type, data)
+        else:
+            chart = None
+            self._add_chart(scroll, chart_type, data)
+
+        extras = ctk.CTkFrame(scroll, fg_color="transparent")
+        extras.pack(fill="x")
+        if chart is not None:
+            self._live_charts[chart_type] = {"chart": chart, "extras": extras, "tab": tab_name}
+        return extras
+
+    def _add_live_chart(self, parent, chart_type, data):
+        """Cria o gráfico embutido (uma vez por aba) dentro de um card."""
+        chart_class = LIVE_CHART_CLASSES[chart_type]
+        container = ctk.CTkFrame(parent, fg_color=COLORS["card"], corner_radius=10,
+                                 border_width=1, border_color=COLORS["border"])
+        container.pack(padx=10, pady=5)
+
+        header_frame = ctk.CTkFrame(container, fg_color="transparent")
+        header_frame.pack(fill="x", padx=10, pady=(10, 5))
+
+        chart = chart_class(container)
+        ctk.CTkButton(
+            header_frame, text="🔍 Expandir Gráfico",
+            font=get_font(size=11, weight="bold"),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            height=28, width=140, corner_radius=6,
+            command=lambda: self._expand_live_chart(chart),
+        ).pack(side="right")
+
+        chart.widget.pack(padx=10, pady=(5, 10))
+        chart.update(data)
+        return chart
 
-            path = os.path.join(self._temp_dir, "profit_vs_cost.png")
-            create_profit_vs_cost_chart(analytics_data, path)
-            if os.path.exists(path):
-                self._display_chart_image(scroll, path)
+    def _fill_revenue_tab(self, parent, analytics_data):
+        """Aba de Faturamento vs Custo."""
+        try:
+            extras = self._chart_tab(parent, "profit_vs_cost", analytics_data,
+                                     "Comparação entre faturamento e custos por período")
 
             # Tabela de dados
-            self._add_data_table(scroll, analytics_data, ["month", "revenue", "cost", "profit"],
-                                 ["Mês", "Faturamento", "Custo", "Lucro"])
+            # Períodos mais recentes primeiro
+            self._add_data_table(extras, analytics_data[::-1], ["period", "revenue", "cost", "profit"],
+                                 ["Período", "Faturamento", "Custo", "Lucro"])
         except Exception as e:
             ctk.CTkLabel(parent, text=f"Erro: {e}", text_color=COLORS["error"]).pack(pady=10)
 
     def _fill_evolution_tab(self, parent, analytics_data):
         """Aba de Evolução Financeira."""
         try:
-            from analytics.charts import create_profit_evolution_chart
-
-            scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
-            scroll.pack(fill="both", expand=True)
-
-            ctk.CTkLabel(
-                scroll,
-                text="Evolução do faturamento e lucro ao longo dos meses",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_secondary"],
-            ).pack(anchor="w", padx=10, pady=(10, 8))
-
-            path = os.path.join(self._temp_dir, "profit_evolution.png")
-            create_profit_evolution_chart(analytics_data, path)
-            if os.path.exists(path):
-                self._display_chart_image(scroll, path)
-
+            self._chart_tab(parent, "profit_evolution", analytics_data,
+                            "Evolução do faturamento e lucro ao longo do período")
         except Exception as e:
             ctk.CTkLabel(parent, text=f"Erro: {e}", text_color=COLORS["error"]).pack(pady=10)
 
     def _fill_status_tab(self, parent, quotes_data):
         """Aba de Orçamentos por Status."""
         try:
-            from analytics.charts import create_quotes_by_status_chart
-
-            scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
-            scroll.pack(fill="both", expand=True)
-
-            ctk.CTkLabel(
-                scroll,
-                text="Distribuição dos orçamentos por status atual",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_secondary"],
-            ).pack(anchor="w", padx=10, pady=(10, 8))
-
-            path = os.path.join(self._temp_dir, "quotes_status.png")
-            create_quotes_by_status_chart(quotes_data, path)
-            if os.path.exists(path):
-                self._display_chart_image(scroll, path)
+            extras = self._chart_tab(parent, "quotes_by_status", quotes_data,
+                                     "Distribuição dos orçamentos por status atual")
 
             # Status cards
             status_labels = {
@@ -349,7 +653,7 @@ class AnalyticsView(ctk.CTkFrame):
                 'completed': ('Concluído', '#a855f7'),
             }
 
-            cards_frame = ctk.CTkFrame(scroll, fg_color="transparent")
+            cards_frame = ctk.CTkFrame(extras, fg_color="transparent")
             cards_frame.pack(fill="x", padx=10, pady=(15, 10))
             cards_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
@@ -360,24 +664,20 @@ class AnalyticsView(ctk.CTkFrame):
                 cell.grid(row=0, column=col, padx=4, sticky="nsew")
 
                 ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", padx=8, pady=(8, 4))
-                ctk.CTkLabel(cell, text=str(count), font=ctk.CTkFont(size=22, weight="bold"),
+                ctk.CTkLabel(cell, text=str(count), font=get_font(size=22, weight="bold"),
                              text_color=color).pack(pady=(4, 0))
-                ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
+                ctk.CTkLabel(cell, text=label, font=get_font(size=11),
                              text_color=COLORS["text_secondary"]).pack(pady=(0, 8))
 
         except Exception as e:
             ctk.CTkLabel(parent, text=f"Erro: {e}", text_color=COLORS["error"]).pack(pady=10)
 
-    def _fill_financial_tab(self, parent):
+    def _fill_financial_tab(self, parent, overview, quotes_by_status):
         """Aba de visão financeira com painel de seleção de gráficos."""
         try:
-            from analytics.charts import create_pie_chart
-
             scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
             scroll.pack(fill="both", expand=True)
 
-            overview = db.get_financial_overview()
-
             # Cards resumo financeiro
             summary_frame = ctk.CTkFrame(scroll, fg_color=COLORS["card"], corner_radius=10,
                                           border_width=1, border_color=COLORS["border"])
@@ -399,20 +699,20 @@ class AnalyticsView(ctk.CTkFrame):
                 cell = ctk.CTkFrame(sgrid, fg_color="transparent")
                 cell.grid(row=0, column=col, padx=6, sticky="nsew")
                 ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 6))
-                ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=10),
+                ctk.CTkLabel(cell, text=label, font=get_font(size=10),
                              text_color=COLORS["text_secondary"]).pack()
-                ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=15, weight="bold"),
+                ctk.CTkLabel(cell, text=value, font=get_font(size=15, weight="bold"),
                              text_color=color).pack(pady=(2, 0))
 
             # Painel de seleção de gráficos
             ctk.CTkLabel(
                 scroll, text="📊 Galeria de Gráficos",
-                font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
             ).pack(anchor="w", padx=10, pady=(20, 10))
 
             ctk.CTkLabel(
                 scroll, text="Clique em um card para visualizar o gráfico em tela cheia",
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
             ).pack(anchor="w", padx=10, pady=(0, 15))
 
             # Grid de cards de gráficos
@@ -427,18 +727,13 @@ class AnalyticsView(ctk.CTkFrame):
             total_expenses = overview.get("total_expenses", 0)
             total_payroll = overview.get("total_payroll", 0)
             if total_expenses > 0 or total_payroll > 0:
-                path_outflow = os.path.join(self._temp_dir, "outflow_pie.png")
-                create_pie_chart(
-                    ["Despesas", "Folha de Pagamento"],
-                    [total_expenses, total_payroll],
-                    title="Saídas: Despesas vs Folha",
-                    output_path=path_outflow,
-                )
                 available_charts.append({
+                    "pie": {"labels": ["Despesas", "Folha de Pagamento"],
+                            "values": [total_expenses, total_payroll],
+                            "title": "Saídas: Despesas vs Folha"},
                     "title": "Distribuição de Saídas",
                     "description": "Despesas vs Folha de Pagamento",
                     "icon": "💸",
-                    "path": path_outflow,
                     "color": COLORS["error"],
                 })
 
@@ -446,18 +741,13 @@ class AnalyticsView(ctk.CTkFrame):
             total_income = overview.get("total_income", 0)
             total_outflow = overview.get("total_outflow", 0)
             if total_income > 0 or total_outflow > 0:
-                path_balance = os.path.join(self._temp_dir, "balance_pie.png")
-                create_pie_chart(
-                    ["Receita Recebida", "Despesas + Folha"],
-                    [total_income, total_outflow],
-                    title="Receita vs Total de Saídas",
-                    output_path=path_balance,
-                )
                 available_charts.append({
+                    "pie": {"labels": ["Receita Recebida", "Despesas + Folha"],
+                            "values": [total_income, total_outflow],
+                            "title": "Receita vs Total de Saídas"},
                     "title": "Receita vs Saídas",
                     "description": "Balanço geral do negócio",
                     "icon": "💰",
-                    "path": path_balance,
                     "color": COLORS["success"],
                 })
 
@@ -472,22 +762,16 @@ class AnalyticsView(ctk.CTkFrame):
                 cat_labels = [cat_labels_map.get(k, k) for k in expenses_by_cat.keys()]
                 cat_values = list(expenses_by_cat.values())
 
-                path_cat = os.path.join(self._temp_dir, "expenses_category_pie.png")
-                create_pie_chart(
-                    cat_labels, cat_values,
-                    title="Despesas por Categoria",
-                    output_path=path_cat,
-                )
                 available_charts.append({
+                    "pie": {"labels": cat_labels, "values": cat_values,
+                            "title": "Despesas por Categoria"},
                     "title": "Despesas por Categoria",
                     "description": f"{len(expenses_by_cat)} categorias diferentes",
                     "icon": "📂",
-                    "path": path_cat,
                     "color": COLORS["warning"],
                 })
 
             # Gráfico: Orçamentos por status
-            quotes_by_status = self._get_quotes_by_status()
             if quotes_by_status:
                 status_labels_map = {
                     'draft': 'Rascunho', 'sent': 'Enviado',
@@ -496,79 +780,29 @@ class AnalyticsView(ctk.CTkFrame):
                 s_labels = [status_labels_map.get(k, k) for k in quotes_by_status.keys()]
                 s_values = list(quotes_by_status.values())
 
-                path_status = os.path.join(self._temp_dir, "status_pie.png")
-                create_pie_chart(
-                    s_labels, s_values,
-                    title="Orçamentos por Status",
-                    output_path=path_status,
-                )
                 available_charts.append({
+                    "pie": {"labels": s_labels, "values": s_values,
+                            "title": "Orçamentos por Status"},
                     "title": "Orçamentos por Status",
                     "description": f"{sum(s_values)} orçamentos no total",
                     "icon": "📋",
-                    "path": path_status,
                     "color": COLORS["primary"],
                 })
 
-            # Criar cards clicáveis para cada gráfico
-            for idx, chart in enumerate(available_charts):
-                row = idx // 2
-                col = idx % 2
-
-                card = ctk.CTkButton(
-                    charts_grid,
-                    text="",
-                    fg_color=COLORS["card"],
-                    hover_color=COLORS["border_hover"],
-                    corner_radius=10,
-                    border_width=1,
-                    border_color=chart["color"],
-                    height=95,
-                    command=lambda p=chart["path"], t=chart["title"]: self._expand_chart(p, t),
-                )
-                card.grid(row=row, column=col, padx=6, pady=6, sticky="nsew")
-
-                # Conteúdo do card
-                card_content = ctk.CTkFrame(card, fg_color="transparent")
-                card_content.place(relx=0.5, rely=0.5, anchor="center")
-
-                # Ícone
-                ctk.CTkLabel(
-                    card_content, text=chart["icon"],
-                    font=ctk.CTkFont(size=28),
-                ).pack(pady=(0, 4))
-
-                # Título
-                ctk.CTkLabel(
-                    card_content, text=chart["title"],
-                    font=ctk.CTkFont(size=12, weight="bold"),
-                    text_color=COLORS["text"],
-                ).pack()
-
-                # Descrição
-                ctk.CTkLabel(
-                    card_content, text=chart["description"],
-                    font=ctk.CTkFont(size=9),
-                    text_color=COLORS["text_secondary"],
-                ).pack(pady=(1, 0))
-
-                # Indicador de clique
-                ctk.CTkLabel(
-                    card_content, text="🔍 Clique para ampliar",
-                    font=ctk.CTkFont(size=8),
-                    text_color=chart["color"],
-                ).pack(pady=(4, 0))
+            # As pizzas só são desenhadas quando o card é aberto (no tamanho da janela)
+            if available_charts:
+                self._create_chart_cards(charts_grid, available_charts)
 
             if not available_charts:
                 ctk.CTkLabel(
                     scroll, text="Nenhum gráfico disponível. Registre despesas, folha e orçamentos.",
-                    font=ctk.CTkFont(size=13), text_color=COLORS["text_secondary"],
+                    font=get_font(size=13), text_color=COLORS["text_secondary"],
                 ).pack(pady=30)
 
             # Resumo mensal: Este mês
             ctk.CTkLabel(
                 scroll, text="Resumo do Mês Atual",
-                font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
             ).pack(anchor="w", padx=10, pady=(15, 5))
 
             month_metrics = [
@@ -583,15 +817,66 @@ class AnalyticsView(ctk.CTkFrame):
                 ri.pack(fill="x", padx=15, pady=8)
                 ctk.CTkFrame(ri, width=4, height=25, corner_radius=2,
                              fg_color=color).pack(side="left", padx=(0, 10))
-                ctk.CTkLabel(ri, text=label, font=ctk.CTkFont(size=13),
+                ctk.CTkLabel(ri, text=label, font=get_font(size=13),
                              text_color=COLORS["text"]).pack(side="left")
-                ctk.CTkLabel(ri, text=value, font=ctk.CTkFont(size=14, weight="bold"),
+                ctk.CTkLabel(ri, text=value, font=get_font(size=14, weight="bold"),
                              text_color=color).pack(side="right")
 
         except Exception as e:
             ctk.CTkLabel(parent, text=f"Erro: {e}", text_color=COLORS["error"]).pack(pady=10)
 
-    def _fill_overview_tab(self, parent, analytics_data, quotes_data, stats=None):
+    def _create_chart_cards(self, charts_grid, available_charts):
+        """Cria cards clicáveis para cada gráfico da galeria."""
+        for idx, chart in enumerate(available_charts):
+            row = idx // 2
+            col = idx % 2
+
+            card = ctk.CTkButton(
+                charts_grid,
+                text="",
+                fg_color=COLORS["card"],
+                hover_color=COLORS["border_hover"],
+                corner_radius=10,
+                border_width=1,
+                border_color=chart["color"],
+                height=95,
+                command=lambda spec=ChartSpec("pie", chart["pie"]), t=chart["title"]:
+                    self._expand_chart(spec, t),
+            )
+            card.grid(row=row, column=col, padx=6, pady=6, sticky="nsew")
+
+            # Conteúdo do card
+            card_content = ctk.CTkFrame(card, fg_color="transparent")
+            card_content.place(relx=0.5, rely=0.5, anchor="center")
+
+            # Ícone
+            ctk.CTkLabel(
+                card_content, text=chart["icon"],
+                font=get_font(size=28),
+            ).pack(pady=(0, 4))
+
+            # Título
+            ctk.CTkLabel(
+                card_content, text=chart["title"],
+                font=get_font(size=12, weight="bold"),
+                text_color=COLORS["text"],
+            ).pack()
+
+            # Descrição
+            ctk.CTkLabel(
+                card_content, text=chart["description"],
+                font=get_font(size=9),
+                text_color=COLORS["text_secondary"],
+            ).pack(pady=(1, 0))
+
+            # Indicador de clique
+            ctk.CTkLabel(
+                card_content, text="🔍 Clique para ampliar",
+                font=get_font(size=8),
+                text_color=chart["color"],
+            ).pack(pady=(4, 0))
+
+    def _fill_overview_tab(self, parent, analytics_data, quotes_data, stats, fin=None):
         """Aba de visão geral com todos os dados resumidos."""
         scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
         scroll.pack(fill="both", expand=True)
@@ -599,7 +884,7 @@ class AnalyticsView(ctk.CTkFrame):
         ctk.CTkLabel(
             scroll,
             text="Resumo completo do período",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(anchor="w", padx=10, pady=(10, 12))
 
@@ -609,6 +894,8 @@ class AnalyticsView(ctk.CTkFrame):
             total_revenue = sum(d.get("revenue", 0) for d in analytics_data)
             total_cost = sum(d.get("cost", 0) for d in analytics_data)
             total_profit = sum(d.get("profit", 0) for d in analytics_data)
+            received = sum(d.get("received", 0) for d in analytics_data)
+            expenses = sum(d.get("expenses", 0) for d in analytics_data)
             margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
 
             metrics += [
@@ -616,13 +903,12 @@ class AnalyticsView(ctk.CTkFrame):
                 ("Custo Total", format_currency(total_cost), COLORS["error"]),
                 ("Lucro Total", format_currency(total_profit), COLORS["success"]),
                 ("Margem Média", f"{margin:.1f}%", COLORS["warning"]),
-                ("Meses Analisados", str(len(analytics_data)), COLORS["primary"]),
+                ("Recebido no Período", format_currency(received), COLORS["success"]),
+                ("Despesas no Período", format_currency(expenses), COLORS["error"]),
+                ("Períodos Analisados", str(len(analytics_data)), COLORS["primary"]),
             ]
 
         # Adicionar métricas de pagamento
-        if stats is None:
-            stats = db.get_dashboard_stats()
-
         metrics += [
             ("💵 Total Recebido", format_currency(stats.get("total_received", 0)), COLORS["success"]),
             ("📛 Saldo Devedor Total", format_currency(stats.get("total_pending", 0)), COLORS["error"]),
@@ -630,16 +916,13 @@ class AnalyticsView(ctk.CTkFrame):
         ]
 
         # Adicionar métricas financeiras (despesas e folha)
-        try:
-            fin = db.get_financial_overview()
+        if fin is not None:
             metrics += [
                 ("💸 Total Despesas", format_currency(fin.get("total_expenses", 0)), COLORS["error"]),
                 ("👥 Total Folha", format_currency(fin.get("total_payroll", 0)), COLORS["warning"]),
                 ("📊 Balanço Geral", format_currency(fin.get("balance", 0)),
                  COLORS["success"] if fin.get("balance", 0) >= 0 else COLORS["error"]),
             ]
-        except Exception:
-            pass
 
         if metrics:
             for label, value, color in metrics:
@@ -651,17 +934,17 @@ class AnalyticsView(ctk.CTkFrame):
 
                 ctk.CTkFrame(inner, width=4, height=30, corner_radius=2,
                              fg_color=color).pack(side="left", padx=(0, 12))
-                ctk.CTkLabel(inner, text=label, font=ctk.CTkFont(size=13),
+                ctk.CTkLabel(inner, text=label, font=get_font(size=13),
                              text_color=COLORS["text"]).pack(side="left")
-                ctk.CTkLabel(inner, text=value, font=ctk.CTkFont(size=15, weight="bold"),
+                ctk.CTkLabel(inner, text=value, font=get_font(size=15, weight="bold"),
                              text_color=color).pack(side="right")
         else:
             ctk.CTkLabel(
                 scroll, text="Sem dados financeiros disponíveis.",
-                font=ctk.CTkFont(size=13), text_color=COLORS["text_secondary"],
+                font=get_font(size=13), text_color=COLORS["text_secondary"],
             ).pack(padx=10, pady=20)
 
-    def _fill_payments_tab(self, parent, stats):
+    def _fill_payments_tab(self, parent, stats, billable_quotes, summaries):
         """Aba de pagamentos com detalhes de recebimentos e devedores."""
         scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
         scroll.pack(fill="both", expand=True)
@@ -669,7 +952,7 @@ class AnalyticsView(ctk.CTkFrame):
         ctk.CTkLabel(
             scroll,
             text="Detalhamento de pagamentos por orçamento",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(anchor="w", padx=10, pady=(10, 12))
 
@@ -696,64 +979,52 @@ class AnalyticsView(ctk.CTkFrame):
             cell = ctk.CTkFrame(summary_grid, fg_color="transparent")
             cell.grid(row=0, column=col, padx=8, sticky="nsew")
             ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-            ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
                          text_color=COLORS["text_secondary"]).pack()
-            ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=18, weight="bold"),
+            ctk.CTkLabel(cell, text=value, font=get_font(size=18, weight="bold"),
                          text_color=color).pack(pady=(2, 0))
 
-        # Lista de orçamentos com saldo
-        all_quotes = db.get_all_quotes()
-        summaries = db.get_all_payment_summaries()
+        # Separar devedores e quitados em uma única passada
+        pending_quotes = []
+        paid_quotes = []
+        for q in billable_quotes:
+            summary = summaries.get(q.get("id"), {})
+            balance = summary.get("balance", q.get("total", 0))
+            if balance > 0:
+                pending_quotes.append((q, summary))
+            elif summary.get("total_paid", 0) > 0:
+                paid_quotes.append((q, summary))
 
         # Seção: Orçamentos com saldo devedor
         ctk.CTkLabel(
             scroll, text="📛 Orçamentos com Saldo Devedor",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["error"],
         ).pack(anchor="w", padx=10, pady=(10, 5))
 
-        pending_found = False
-        for q in all_quotes:
-            qid = q.get("id")
-            if q.get("status") not in ("approved", "completed"):
-                continue
-            summary = summaries.get(qid, {})
-            balance = summary.get("balance", q.get("total", 0))
-            if balance <= 0:
-                continue
-            pending_found = True
+        for q, summary in pending_quotes:
             self._create_payment_quote_row(scroll, q, summary)
 
-        if not pending_found:
+        if not pending_quotes:
             ctk.CTkLabel(
                 scroll, text="Nenhum orçamento com saldo devedor.",
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
             ).pack(anchor="w", padx=20, pady=5)
 
         # Seção: Orçamentos quitados
         ctk.CTkLabel(
             scroll, text="✅ Orçamentos Quitados",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["success"],
         ).pack(anchor="w", padx=10, pady=(15, 5))
 
-        paid_found = False
-        for q in all_quotes:
-            qid = q.get("id")
-            if q.get("status") not in ("approved", "completed"):
-                continue
-            summary = summaries.get(qid, {})
-            balance = summary.get("balance", q.get("total", 0))
-            total_paid = summary.get("total_paid", 0)
-            if balance > 0 or total_paid <= 0:
-                continue
-            paid_found = True
+        for q, summary in paid_quotes:
             self._create_payment_quote_row(scroll, q, summary)
 
-        if not paid_found:
+        if not paid_quotes:
             ctk.CTkLabel(
                 scroll, text="Nenhum orçamento quitado ainda.",
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
             ).pack(anchor="w", padx=20, pady=5)
 
     def _create_payment_quote_row(self, parent, quote, summary):
@@ -772,7 +1043,7 @@ class AnalyticsView(ctk.CTkFrame):
         client = quote.get("client_name", "Sem nome")
         qid = quote.get("id", "")
         ctk.CTkLabel(left, text=f"#{qid} — {client}",
-                     font=ctk.CTkFont(size=13, weight="bold"),
+                     font=get_font(size=13, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
 
         total = summary.get("total", quote.get("total", 0))
@@ -781,19 +1052,131 @@ class AnalyticsView(ctk.CTkFrame):
         is_paid = balance <= 0 and paid > 0
 
         detail_text = f"Total: {format_currency(total)}  |  Pago: {format_currency(paid)}  |  Saldo: {format_currency(max(balance, 0))}"
-        ctk.CTkLabel(left, text=detail_text, font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(left, text=detail_text, font=get_font(size=11),
                      text_color=COLORS["text_secondary"]).pack(anchor="w", pady=(2, 0))
 
         # Badge de status
         badge_color = COLORS["success"] if is_paid else COLORS["error"]
         badge_text = "QUITADO" if is_paid else "DEVEDOR"
         badge = ctk.CTkLabel(inner, text=badge_text,
-                             font=ctk.CTkFont(size=10, weight="bold"),
+                             font=get_font(size=10, weight="bold"),
                              text_color="#FFFFFF",
                              fg_color=badge_color,
                              corner_radius=6, width=70, height=24)
         badge.pack(side="right", padx=(10, 0))
 
+    def _fill_indicators_tab(self, parent, reports):
+        """Margem por tipo, contas a receber, coortes e simulação de preços."""
+        if not parent.winfo_exists():
+            return
+        self._clear_tab(parent)
+        scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
+        scroll.pack(fill="both", expand=True)
+
+        ctk.CTkLabel(
+            scroll,
+            text="Indicadores sobre todo o histórico de orçamentos aprovados e concluídos",
+            font=get_font(size=12),
+            text_color=COLORS["text_secondary"],
+        ).pack(anchor="w", padx=10, pady=(10, 4))
+
+        self._add_section_title(scroll, "🏷️ Margem por Tipo de Produto")
+        self._add_text_table(scroll, ["Tipo", "Itens", "Faturamento", "Custo", "Margem"], [
+            [r["type"], str(r["items"]), format_currency(r["revenue"]),
+             format_currency(r["cost"]), f"{r['margin']:.1f}%"]
+            for r in reports["margin"]
+        ])
+
+        self._add_section_title(scroll, "⏳ Contas a Receber por Idade")
+        self._add_text_table(scroll, ["Idade do orçamento", "Orçamentos", "Saldo"], [
+            [r["bucket"], str(r["count"]), format_currency(r["amount"])]
+            for r in reports["aging"]
+        ])
+
+        cohorts = reports["cohorts"]
+        self._add_section_title(scroll, "👥 Receita por Coorte de Clientes (ano do 1º orçamento)")
+        self._add_text_table(scroll, ["Coorte", "Clientes", "Receita total", "Receita por cliente"], [
+            [label, str(clients), format_currency(total),
+             format_currency(total / clients if clients else 0)]
+            for label, clients, total in zip(cohorts["cohorts"], cohorts["clients"], cohorts["totals"])
+        ])
+
+        self._add_section_title(scroll, "🧪 Simulação de Preços")
+        self._build_what_if(scroll)
+
+    def _add_section_title(self, parent, text):
+        ctk.CTkLabel(parent, text=text, font=get_font(size=14, weight="bold"),
+                     text_color=COLORS["text"]).pack(anchor="w", padx=10, pady=(15, 0))
+
+    def _add_text_table(self, parent, headers, rows):
+        """Tabela com valores já formatados (todas as linhas)."""
+        table_frame = ctk.CTkFrame(parent, fg_color=COLORS["card"], corner_radius=10,
+                                    border_width=1, border_color=COLORS["border"])
+        table_frame.pack(fill="x", padx=10, pady=(8, 4))
+        table_frame.grid_columnconfigure(tuple(range(len(headers))), weight=1, uniform="col")
+
+        for col, h in enumerate(headers):
+            ctk.CTkLabel(table_frame, text=h, font=get_font(size=11, weight="bold"),
+                         text_color=COLORS["primary"], fg_color=COLORS["primary_lighter"],
+                         corner_radius=6).grid(row=0, column=col, sticky="ew", padx=2, pady=(8, 4))
+        for r, values in enumerate(rows, start=1):
+            for col, text in enumerate(values):
+                ctk.CTkLabel(table_frame, text=text, font=get_font(size=11),
+                             text_color=COLORS["text"]).grid(row=r, column=col, sticky="ew", padx=2, pady=2)
+        if not rows:
+            ctk.CTkLabel(table_frame, text="Sem dados.", font=get_font(size=11),
+                         text_color=COLORS["text_secondary"]).grid(row=1, column=0, columnspan=len(headers),
+                                                                   pady=6)
+
+    def _build_what_if(self, parent):
+        """Campos da simulação: variação da dobra e do desconto aplicados ao histórico."""
+        card = ctk.CTkFrame(parent, fg_color=COLORS["card"], corner_radius=10,
+                             border_width=1, border_color=COLORS["border"])
+        card.pack(fill="x", padx=10, pady=(8, 15))
+        form = ctk.CTkFrame(card, fg_color="transparent")
+        form.pack(fill="x", padx=15, pady=(12, 6))
+
+        fields = {}
+        for label, key, default in (("Variação da dobra (R$/m)", "dobra_delta", "0"),
+                                    ("Desconto × (fator)", "discount_factor", "1")):
+            ctk.CTkLabel(form, text=label, font=get_font(size=11),
+                         text_color=COLORS["text_secondary"]).pack(side="left", padx=(0, 6))
+            entry = ctk.CTkEntry(form, width=80, font=get_font(size=12))
+            entry.insert(0, default)
+            entry.pack(side="left", padx=(0, 16))
+            fields[key] = entry
+
+        result = ctk.CTkLabel(card, text="", font=get_font(size=12), justify="left",
+                              text_color=COLORS["text"])
+        result.pack(anchor="w", padx=15, pady=(0, 12))
+
+        def show(report):
+            if not result.winfo_exists():
+                return
+            base, scen, delta = report["baseline"], report["scenario"], report["delta"]
+            result.configure(text=(
+                f"Faturamento: {format_currency(base['revenue'])} → {format_currency(scen['revenue'])}"
+                f"  ({'+' if delta['revenue'] >= 0 else ''}{format_currency(delta['revenue'])})\n"
+                f"Lucro: {format_currency(base['profit'])} → {format_currency(scen['profit'])}"
+                f"  |  Margem: {base['margin']:.1f}% → {scen['margin']:.1f}%"
+                f"  |  {report['quotes']} orçamentos"
+            ))
+
+        def simulate():
+            try:
+                params = {key: float(entry.get().replace(",", ".")) for key, entry in fields.items()}
+            except ValueError:
+                self.app.show_toast("Informe valores numéricos para a simulação.", "error")
+                return
+            result.configure(text="Calculando...")
+            self._loader.submit(lambda: get_analytics_engine().what_if_repricing(**params), show,
+                                on_error=lambda e: result.configure(text=f"Erro na simulação: {e}"))
+
+        ctk.CTkButton(form, text="Simular", width=90, height=30, font=get_font(size=12, weight="bold"),
+                      fg_color=COLORS["primary"], hover_color=COLORS["primary_hover"],
+                      command=simulate).pack(side="left")
+        simulate()
+
     def _add_data_table(self, parent, data, keys, headers):
         """Adiciona tabela resumida de dados."""
         table_frame = ctk.CTkFrame(parent, fg_color=COLORS["card"], corner_radius=10,
@@ -805,7 +1188,7 @@ class AnalyticsView(ctk.CTkFrame):
         header_row.pack(fill="x", padx=8, pady=(8, 2))
 
         for h in headers:
-            ctk.CTkLabel(header_row, text=h, font=ctk.CTkFont(size=11, weight="bold"),
+            ctk.CTkLabel(header_row, text=h, font=get_font(size=11, weight="bold"),
                          text_color=COLORS["primary"]).pack(side="left", expand=True, padx=4, pady=6)
 
         # Linhas de dados (últimas 6)
@@ -815,11 +1198,11 @@ class AnalyticsView(ctk.CTkFrame):
 
             for key in keys:
                 val = item.get(key, 0)
-                if isinstance(val, (int, float)) and key != "month":
+                if isinstance(val, (int, float)) and key != "period":
                     text = format_currency(val)
                 else:
                     text = str(val)
-                ctk.CTkLabel(row, text=text, font=ctk.CTkFont(size=11),
+                ctk.CTkLabel(row, text=text, font=get_font(size=11),
                              text_color=COLORS["text"]).pack(side="left", expand=True, padx=4, pady=4)
 
             sep = ctk.CTkFrame(table_frame, height=1, fg_color=COLORS["border"])
@@ -827,17 +1210,11 @@ class AnalyticsView(ctk.CTkFrame):
 
         ctk.CTkFrame(table_frame, height=6, fg_color="transparent").pack()
 
-    def _display_chart_image(self, parent, image_path):
-        """Exibe uma imagem de gráfico com CTkImage."""
+    def _display_chart_image(self, parent, image, spec):
+        """Exibe o gráfico desenhado em memória (imagem PIL em pixels físicos)."""
         try:
-            from PIL import Image
-            img = Image.open(image_path)
-
-            max_width = 750
-            ratio = max_width / img.width
-            new_height = int(img.height * ratio)
-
-            ctk_img = ctk.CTkImage(img, size=(max_width, new_height))
+            width, height = image.size
+            ctk_img = ctk.CTkImage(image, size=(round(width / spec.dpr), round(height / spec.dpr)))
             self._chart_images.append(ctk_img)
 
             chart_container = ctk.CTkFrame(parent, fg_color=COLORS["card"], corner_radius=10,
@@ -850,10 +1227,10 @@ class AnalyticsView(ctk.CTkFrame):
 
             ctk.CTkButton(
                 header_frame, text="🔍 Expandir Gráfico",
-                font=ctk.CTkFont(size=11, weight="bold"),
+                font=get_font(size=11, weight="bold"),
                 fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
                 height=28, width=140, corner_radius=6,
-                command=lambda path=image_path: self._expand_chart(path),
+                command=lambda: self._expand_chart(spec),
             ).pack(side="right")
 
             label = ctk.CTkLabel(chart_container, image=ctk_img, text="")
@@ -861,11 +1238,67 @@ class AnalyticsView(ctk.CTkFrame):
         except Exception:
             pass
 
-    def _expand_chart(self, image_path, chart_title=None):
-        """Abre o gráfico em uma janela maximizada."""
+    def _expand_live_chart(self, chart):
+        """Mostra a mesma figura do gráfico embutido em uma janela maximizada."""
+        try:
+            dialog = ctk.CTkToplevel(self.app)
+            dialog.title("Visualização de Gráfico")
+            dialog.attributes('-topmost', True)
+
+            screen_width = dialog.winfo_screenwidth()
+            screen_height = dialog.winfo_screenheight()
+            window_width = int(screen_width * 0.9)
+            window_height = int(screen_height * 0.9)
+            x = (screen_width - window_width) // 2
+            y = (screen_height - window_height) // 2
+            dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+
+            main_frame = ctk.CTkFrame(dialog, fg_color=COLORS["bg"])
+            main_frame.pack(fill="both", expand=True)
+
+            def close():
+                # Devolve a figura ao canvas da aba antes de destruir a janela
+                chart.restore()
+                dialog.destroy()
+
+            header = ctk.CTkFrame(main_frame, fg_color=COLORS["card"], height=50)
+            header.pack(fill="x", padx=10, pady=(10, 5))
+            header.pack_propagate(False)
+
+            ctk.CTkLabel(
+                header, text="📊 Visualização em Tela Cheia",
+                font=get_font(size=16, weight="bold"),
+                text_color=COLORS["text"],
+            ).pack(side="left", padx=15)
+
+            ctk.CTkButton(
+                header, text="✕ Fechar",
+                font=get_font(size=12, weight="bold"),
+                fg_color=COLORS["error"], hover_color=COLORS["error_hover"],
+                height=32, width=100, corner_radius=6,
+                command=close,
+            ).pack(side="right", padx=15)
+
+            container = ctk.CTkFrame(main_frame, fg_color=COLORS["card"], corner_radius=12,
+                                     border_width=1, border_color=COLORS["border"])
+            container.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+
+            # O canvas redimensiona a figura para o tamanho da janela
+            chart.expand(container).pack(fill="both", expand=True, padx=20, pady=20)
+
+            dialog.protocol("WM_DELETE_WINDOW", close)
+            dialog.bind('<Escape>', lambda e: close())
+
+        except Exception as e:
+            chart.restore()
+            self.app.show_toast(f"Erro ao expandir gráfico: {e}", "error")
+
+    def _expand_chart(self, spec, chart_title=None):
+        """
+        Abre o gráfico em uma janela maximizada. A imagem de alta resolução é
+        desenhada só agora, no tamanho disponível da janela.
+        """
         try:
-            from PIL import Image
-            
             dialog = ctk.CTkToplevel(self.app)
             dialog.title(chart_title or "Visualização de Gráfico")
             dialog.attributes('-topmost', True)
@@ -896,13 +1329,13 @@ class AnalyticsView(ctk.CTkFrame):
             title_text = f"📊 {chart_title}" if chart_title else "📊 Visualização em Tela Cheia"
             ctk.CTkLabel(
                 header, text=title_text,
-                font=ctk.CTkFont(size=16, weight="bold"),
+                font=get_font(size=16, weight="bold"),
                 text_color=COLORS["text"],
             ).pack(side="left", padx=15)
             
             ctk.CTkButton(
                 header, text="✕ Fechar", 
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=get_font(size=12, weight="bold"),
                 fg_color=COLORS["error"], hover_color=COLORS["error_hover"],
                 height=32, width=100, corner_radius=6,
                 command=dialog.destroy,
@@ -912,46 +1345,48 @@ class AnalyticsView(ctk.CTkFrame):
             scroll_frame = ctk.CTkScrollableFrame(main_frame, fg_color="transparent")
             scroll_frame.pack(fill="both", expand=True, padx=10, pady=(5, 10))
             
-            # Carregar e exibir imagem em alta resolução
-            img = Image.open(image_path)
-            
-            # Calcular tamanho máximo mantendo aspect ratio
-            available_width = window_width - 60
-            available_height = window_height - 150
-            
-            ratio = min(available_width / img.width, available_height / img.height)
-            new_width = int(img.width * ratio)
-            new_height = int(img.height * ratio)
-            
-            # Criar imagem CTk em alta resolução
-            ctk_img_large = ctk.CTkImage(img, size=(new_width, new_height))
+            # Maior tamanho que cabe na janela mantendo a proporção da figura
+            available_width = window_width - 100
+            available_height = window_height - 190
+            width = int(min(available_width, available_height * FIGURE_ASPECT.get(spec.chart_type, 2.0)))
+            large_spec = spec._replace(size=width, dpr=self._scaling())
             
             # Container centralizado para a imagem
             img_container = ctk.CTkFrame(scroll_frame, fg_color=COLORS["card"],
                                           corner_radius=12, border_width=1,
                                           border_color=COLORS["border"])
             img_container.pack(expand=True, padx=20, pady=20)
+            skeleton = Skeleton(img_container, lines=0, height=int(width / FIGURE_ASPECT.get(spec.chart_type, 2.0)))
+            skeleton.pack(padx=20, pady=20)
+            
+            def on_done(chart):
+                if not img_container.winfo_exists():
+                    return
+                skeleton.destroy()
+                if chart is None:
+                    return
+                img_w, img_h = chart.image.size
+                ctk_img_large = ctk.CTkImage(chart.image, size=(round(img_w / large_spec.dpr),
+                                                                round(img_h / large_spec.dpr)))
+                label = ctk.CTkLabel(img_container, image=ctk_img_large, text="")
+                label.pack(padx=20, pady=20)
+                # Manter referência da imagem
+                label._img_ref = ctk_img_large
             
-            label = ctk.CTkLabel(img_container, image=ctk_img_large, text="")
-            label.pack(padx=20, pady=20)
+            def on_error(e):
+                if img_container.winfo_exists():
+                    skeleton.destroy()
+                    ctk.CTkLabel(img_container, text=f"Erro: {e}",
+                                 text_color=COLORS["error"]).pack(padx=20, pady=20)
             
-            # Manter referência da imagem
-            label._img_ref = ctk_img_large
+            # Carga própria da janela: trocar de período ou sair da view
+            # (self._loader.cancel()) não pode deixar o skeleton sem resposta
+            dialog._loader = ProgressiveLoader(dialog)
+            dialog._loader.submit(get_chart_service().render, on_done, large_spec,
+                                  on_error=on_error, executor="charts")
             
             # Atalho ESC para fechar
             dialog.bind('<Escape>', lambda e: dialog.destroy())
             
         except Exception as e:
             self.app.show_toast(f"Erro ao expandir gráfico: {e}", "error")
-
-    def _get_quotes_by_status(self):
-        """Obtém contagem de orçamentos por status."""
-        try:
-            all_quotes = db.get_all_quotes()
-            status_count = {}
-            for q in all_quotes:
-                s = q.get("status", "draft")
-                status_count[s] = status_count.get(s, 0) + 1
-            return status_count if status_count else None
-        except Exception:
-            return None
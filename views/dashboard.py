@@ -5,10 +5,11 @@ Painel principal com estatísticas, orçamentos recentes e alertas.
 """
 
 import customtkinter as ctk
-from database import db
+from database import db, events
 from components.cards import StatCard, StatusBadge, create_header
 from theme import COLORS, get_color
 from components.dialogs import format_currency, format_date
+from components.resources import get_font
 
 
 class DashboardView(ctk.CTkScrollableFrame):
@@ -21,10 +22,17 @@ class DashboardView(ctk.CTkScrollableFrame):
         self._cards_frame = None
         self._recent_frame = None
         self._alerts_frame = None
+        # Marcado como sujo quando algum dado exibido muda no banco
+        self._changes = events.DirtyFlag([
+            events.QUOTE, events.QUOTE_ITEM, events.PAYMENT,
+            events.INVENTORY, events.INSTALLATION, events.SETTINGS,
+        ])
         self._build()
 
     def on_show(self):
-        """Chamado toda vez que o dashboard fica visível — atualiza apenas os dados."""
+        """Chamado toda vez que o dashboard fica visível — atualiza apenas se os dados mudaram."""
+        if not self._changes.consume():
+            return
         if self._cards_frame and self._cards_frame.winfo_exists():
             self._refresh_dynamic()
 
@@ -52,8 +60,8 @@ class DashboardView(ctk.CTkScrollableFrame):
         recent_header = ctk.CTkFrame(self._recent_frame, fg_color="transparent")
         recent_header.pack(fill="x", padx=15, pady=(15, 10))
         ctk.CTkLabel(recent_header, text="📋 Orçamentos Recentes",
-                     font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"]).pack(side="left")
-        ctk.CTkButton(recent_header, text="Ver todos →", font=ctk.CTkFont(size=12),
+                     font=get_font(size=16, weight="bold"), text_color=COLORS["text"]).pack(side="left")
+        ctk.CTkButton(recent_header, text="Ver todos →", font=get_font(size=12),
                       fg_color="transparent", text_color=COLORS["primary"], hover_color=COLORS["border"],
                       height=28, width=90, command=lambda: self.app.show_view("quotes")).pack(side="right")
         recent_quotes = stats.get("recent_quotes", [])
@@ -62,7 +70,7 @@ class DashboardView(ctk.CTkScrollableFrame):
                 self._create_quote_row(self._recent_frame, quote)
         else:
             ctk.CTkLabel(self._recent_frame, text="Nenhum orçamento cadastrado ainda.",
-                         font=ctk.CTkFont(size=13), text_color=COLORS["text_secondary"]).pack(padx=15, pady=20)
+                         font=get_font(size=13), text_color=COLORS["text_secondary"]).pack(padx=15, pady=20)
 
         # Atualizar alertas
         for w in self._alerts_frame.winfo_children():
@@ -81,7 +89,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             header_frame,
             text=f"Bem-vindo ao {company}",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=get_font(size=24, weight="bold"),
             text_color=COLORS["text"],
             anchor="w",
         ).pack(side="left")
@@ -93,7 +101,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkButton(
             actions_frame,
             text="🌙" if self.app.current_theme == "light" else "☀️",
-            font=ctk.CTkFont(size=16),
+            font=get_font(size=16),
             fg_color=COLORS["card"],
             text_color=COLORS["text_secondary"],
             hover_color=COLORS["border"],
@@ -108,7 +116,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkButton(
             actions_frame,
             text="⚙️ Config",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             fg_color=COLORS["card"],
             text_color=COLORS["text_secondary"],
             hover_color=COLORS["border"],
@@ -178,14 +186,14 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             recent_header,
             text="📋 Orçamentos Recentes",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
         ctk.CTkButton(
             recent_header,
             text="Ver todos →",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             fg_color="transparent",
             text_color=COLORS["primary"],
             hover_color=COLORS["border"],
@@ -202,7 +210,7 @@ class DashboardView(ctk.CTkScrollableFrame):
             ctk.CTkLabel(
                 recent_frame,
                 text="Nenhum orçamento cadastrado ainda.",
-                font=ctk.CTkFont(size=13),
+                font=get_font(size=13),
                 text_color=COLORS["text_secondary"],
             ).pack(padx=15, pady=20)
 
@@ -223,7 +231,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             alerts_frame,
             text="🔔 Alertas",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
             anchor="w",
         ).pack(padx=15, pady=(15, 10), anchor="w")
@@ -234,7 +242,7 @@ class DashboardView(ctk.CTkScrollableFrame):
             alert_item = ctk.CTkFrame(alerts_frame, fg_color=COLORS["error_light"], corner_radius=8)
             alert_item.pack(fill="x", padx=12, pady=3)
             ctk.CTkLabel(alert_item, text=f"⚠️ {low_stock} itens com estoque baixo",
-                         font=ctk.CTkFont(size=12), text_color=COLORS["error"], anchor="w",
+                         font=get_font(size=12), text_color=COLORS["error"], anchor="w",
                          ).pack(padx=10, pady=8, anchor="w")
 
         # Instalações pendentes
@@ -243,16 +251,16 @@ class DashboardView(ctk.CTkScrollableFrame):
             alert_item = ctk.CTkFrame(alerts_frame, fg_color=COLORS["warning_light"], corner_radius=8)
             alert_item.pack(fill="x", padx=12, pady=3)
             ctk.CTkLabel(alert_item, text=f"📅 {pending} instalações pendentes",
-                         font=ctk.CTkFont(size=12), text_color=COLORS["warning"], anchor="w",
+                         font=get_font(size=12), text_color=COLORS["warning"], anchor="w",
                          ).pack(padx=10, pady=8, anchor="w")
 
         if low_stock == 0 and pending == 0:
-            ctk.CTkLabel(alerts_frame, text="✅ Tudo em dia!", font=ctk.CTkFont(size=13),
+            ctk.CTkLabel(alerts_frame, text="✅ Tudo em dia!", font=get_font(size=13),
                          text_color=COLORS["success"]).pack(padx=15, pady=10)
 
         # Ações rápidas
         ctk.CTkLabel(alerts_frame, text="⚡ Ações Rápidas",
-                     font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+                     font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
                      anchor="w").pack(padx=15, pady=(20, 10), anchor="w")
 
         actions = [
@@ -263,7 +271,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ]
         for text, view in actions:
             ctk.CTkButton(
-                alerts_frame, text=f"  {text}", font=ctk.CTkFont(size=12),
+                alerts_frame, text=f"  {text}", font=get_font(size=12),
                 fg_color=COLORS["primary_lighter"], text_color=COLORS["primary"],
                 hover_color=COLORS["primary_hover_light"], height=34, corner_radius=8,
                 anchor="w", command=lambda v=view: self.app.show_view(v),
@@ -291,7 +299,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             left,
             text=quote.get("client_name", "—"),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["text"],
             anchor="w",
         ).pack(anchor="w")
@@ -299,7 +307,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             left,
             text=format_date(quote.get("created_at", "")),
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(anchor="w")
@@ -311,7 +319,7 @@ class DashboardView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(
             right,
             text=format_currency(quote.get("total", 0)),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="e")
 
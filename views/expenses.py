@@ -5,10 +5,12 @@ Registrar e gerenciar despesas da empresa.
 """
 
 import customtkinter as ctk
-from database import db
+from database import db, events
 from components.cards import create_header, create_search_bar
 from theme import get_color, COLORS
 from components.dialogs import ConfirmDialog, format_currency, format_date, DateEntry, parse_decimal
+from lazy_imports import get_askcolor
+from components.resources import get_font
 
 
 class ExpensesView(ctk.CTkFrame):
@@ -19,9 +21,21 @@ class ExpensesView(ctk.CTkFrame):
         self.app = app
         self.search_text = ""
         self.category_filter = ""
+        self._changes = events.DirtyFlag([events.EXPENSE, events.EXPENSE_CATEGORY])
         self._load_categories()
         self._build_list()
 
+    def on_show(self):
+        """Recarrega apenas o que mudou: categorias reconstroem a tela, despesas só a lista."""
+        changed = set(self._changes.changed)
+        if not self._changes.consume():
+            return
+        if events.EXPENSE_CATEGORY in changed:
+            self._load_categories()
+            self._build_list()
+        else:
+            self._load_expenses()
+
     def _load_categories(self):
         """Carrega categorias do banco de dados."""
         categories = db.get_all_expense_categories()
@@ -45,7 +59,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             action_frame, text="  ⚙️ Categorias  ",
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             fg_color=get_color("border"), hover_color=get_color("border_hover"),
             text_color=get_color("text"),
             height=38, corner_radius=10,
@@ -54,7 +68,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             action_frame, text="  + Nova Despesa  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10,
             command=self._open_expense_form,
@@ -78,9 +92,9 @@ class ExpensesView(ctk.CTkFrame):
             cell = ctk.CTkFrame(grid, fg_color="transparent")
             cell.grid(row=0, column=col, padx=8, sticky="nsew")
             ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-            ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
                          text_color=COLORS["text_secondary"]).pack()
-            ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=18, weight="bold"),
+            ctk.CTkLabel(cell, text=value, font=get_font(size=18, weight="bold"),
                          text_color=color).pack(pady=(2, 0))
 
         # Filtros
@@ -96,7 +110,7 @@ class ExpensesView(ctk.CTkFrame):
         self.cat_var = ctk.StringVar(value="Todas")
         ctk.CTkOptionMenu(
             filter_frame, values=cat_options, variable=self.cat_var,
-            font=ctk.CTkFont(size=12), height=38, width=150,
+            font=get_font(size=12), height=38, width=150,
             command=self._on_category_filter,
         ).pack(side="right")
 
@@ -119,6 +133,7 @@ class ExpensesView(ctk.CTkFrame):
         self._load_expenses()
 
     def _load_expenses(self):
+        self._changes.consume()
         for w in self.list_frame.winfo_children():
             w.destroy()
 
@@ -127,7 +142,7 @@ class ExpensesView(ctk.CTkFrame):
         ctk.CTkLabel(
             self.list_frame,
             text=f"{len(expenses)} despesa(s)",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"], anchor="w",
         ).pack(fill="x", pady=(0, 8))
 
@@ -135,7 +150,7 @@ class ExpensesView(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.list_frame,
                 text="Nenhuma despesa encontrada.",
-                font=ctk.CTkFont(size=14),
+                font=get_font(size=14),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=40)
             return
@@ -156,7 +171,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             left, text=expense.get("description", "-"),
-            font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w")
 
         cat_key = expense.get("category", "geral")
@@ -168,20 +183,20 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             info_frame, text=f" {cat_label} ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=cat_color, text_color="#FFFFFF", corner_radius=4,
         ).pack(side="left", padx=(0, 8))
 
         ctk.CTkLabel(
             info_frame,
             text=f"📅 {format_date(expense.get('expense_date', ''))}",
-            font=ctk.CTkFont(size=11), text_color=COLORS["text_secondary"],
+            font=get_font(size=11), text_color=COLORS["text_secondary"],
         ).pack(side="left")
 
         if expense.get("notes"):
             ctk.CTkLabel(
                 left, text=expense["notes"],
-                font=ctk.CTkFont(size=11), text_color=COLORS["text_secondary"],
+                font=get_font(size=11), text_color=COLORS["text_secondary"],
                 wraplength=300, justify="left",
             ).pack(anchor="w", pady=(2, 0))
 
@@ -191,7 +206,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             right, text=format_currency(expense.get("amount", 0)),
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["error"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["error"],
         ).pack(pady=(0, 4))
 
         btn_row = ctk.CTkFrame(right, fg_color="transparent")
@@ -227,39 +242,39 @@ class ExpensesView(ctk.CTkFrame):
         scroll.pack(fill="both", expand=True, padx=20, pady=10)
 
         ctk.CTkLabel(scroll, text="💸 Despesa",
-                     font=ctk.CTkFont(size=18, weight="bold"),
+                     font=get_font(size=18, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w", pady=(0, 12))
 
         # Descrição
-        ctk.CTkLabel(scroll, text="Descrição *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Descrição *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        desc_entry = ctk.CTkEntry(scroll, height=35, font=ctk.CTkFont(size=13))
+        desc_entry = ctk.CTkEntry(scroll, height=35, font=get_font(size=13))
         desc_entry.pack(fill="x", pady=(2, 8))
 
         # Categoria
-        ctk.CTkLabel(scroll, text="Categoria *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Categoria *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
         cat_labels = [v for _, v in self.expense_categories]
         cat_var = ctk.StringVar(value=cat_labels[0] if cat_labels else "Geral")
         ctk.CTkOptionMenu(scroll, values=cat_labels, variable=cat_var,
-                          font=ctk.CTkFont(size=12), height=35).pack(fill="x", pady=(2, 8))
+                          font=get_font(size=12), height=35).pack(fill="x", pady=(2, 8))
 
         # Valor
-        ctk.CTkLabel(scroll, text="Valor (R$) *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Valor (R$) *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        amount_entry = ctk.CTkEntry(scroll, height=35, font=ctk.CTkFont(size=13))
+        amount_entry = ctk.CTkEntry(scroll, height=35, font=get_font(size=13))
         amount_entry.pack(fill="x", pady=(2, 8))
 
         # Data
-        ctk.CTkLabel(scroll, text="Data (DD/MM/AAAA)", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Data (DD/MM/AAAA)", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
         date_entry = DateEntry(scroll)
         date_entry.pack(fill="x", pady=(2, 8))
 
         # Observações
-        ctk.CTkLabel(scroll, text="Observações", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Observações", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        notes_text = ctk.CTkTextbox(scroll, height=60, font=ctk.CTkFont(size=12))
+        notes_text = ctk.CTkTextbox(scroll, height=60, font=get_font(size=12))
         notes_text.pack(fill="x", pady=(2, 12))
 
         # Preencher se edição
@@ -277,7 +292,7 @@ class ExpensesView(ctk.CTkFrame):
         btn_frame.pack(fill="x", padx=20, pady=15)
 
         ctk.CTkButton(
-            btn_frame, text="Cancelar", font=ctk.CTkFont(size=13),
+            btn_frame, text="Cancelar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), width=100, height=38,
             command=dialog.destroy,
@@ -329,7 +344,7 @@ class ExpensesView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            btn_frame, text="💾 Salvar", font=ctk.CTkFont(size=13, weight="bold"),
+            btn_frame, text="💾 Salvar", font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             width=150, height=38, corner_radius=10,
             command=save,
@@ -368,13 +383,13 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             header, text="⚙️ Categorias de Despesas",
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=get_font(size=18, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left", padx=20)
 
         ctk.CTkButton(
             header, text="+ Nova Categoria",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=32, corner_radius=8,
             command=lambda: self._open_category_form(dialog),
@@ -392,7 +407,7 @@ class ExpensesView(ctk.CTkFrame):
 
             ctk.CTkLabel(
                 list_frame, text=f"{len(categories)} categoria(s)",
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
             ).pack(anchor="w", pady=(0, 10))
 
             for cat in categories:
@@ -415,13 +430,13 @@ class ExpensesView(ctk.CTkFrame):
 
                 ctk.CTkLabel(
                     info, text=cat['label'],
-                    font=ctk.CTkFont(size=14, weight="bold"),
+                    font=get_font(size=14, weight="bold"),
                     text_color=COLORS["text"],
                 ).pack(anchor="w")
 
                 ctk.CTkLabel(
                     info, text=f"Chave: {cat['key']}",
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     text_color=COLORS["text_secondary"],
                 ).pack(anchor="w")
 
@@ -463,7 +478,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             content, text="📂 Categoria de Despesa",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="w", pady=(0, 15))
 
@@ -471,27 +486,27 @@ class ExpensesView(ctk.CTkFrame):
         if not existing:
             ctk.CTkLabel(
                 content, text="Chave (identificador único) *",
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=get_font(size=12, weight="bold"),
                 text_color=COLORS["text"],
             ).pack(anchor="w")
-            key_entry = ctk.CTkEntry(content, height=35, font=ctk.CTkFont(size=13),
+            key_entry = ctk.CTkEntry(content, height=35, font=get_font(size=13),
                                      placeholder_text="Ex: material_construcao")
             key_entry.pack(fill="x", pady=(2, 8))
 
         # Label
         ctk.CTkLabel(
             content, text="Nome *",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="w")
-        label_entry = ctk.CTkEntry(content, height=35, font=ctk.CTkFont(size=13),
+        label_entry = ctk.CTkEntry(content, height=35, font=get_font(size=13),
                                    placeholder_text="Ex: Material de Construção")
         label_entry.pack(fill="x", pady=(2, 8))
 
         # Color
         ctk.CTkLabel(
             content, text="Cor *",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="w", pady=(8, 5))
 
@@ -523,31 +538,31 @@ class ExpensesView(ctk.CTkFrame):
 
         color_label = ctk.CTkLabel(color_info_frame,
                                    text=selected_color.get(),
-                                   font=ctk.CTkFont(size=16, weight="bold"),
+                                   font=get_font(size=16, weight="bold"),
                                    text_color=COLORS["text"])
         color_label.pack(anchor="w")
 
         ctk.CTkLabel(color_info_frame,
                     text="Clique no botão abaixo para escolher uma cor",
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     text_color=COLORS["text_secondary"]).pack(anchor="w", pady=(2, 0))
 
         def open_color_picker():
-            try:
-                from tkcolorpicker import askcolor
-                color_result = askcolor(selected_color.get(), form, title="Escolher Cor")
-                if color_result and color_result[1]:
-                    new_color = color_result[1]
-                    selected_color.set(new_color)
-                    color_preview.configure(fg_color=new_color)
-                    color_label.configure(text=new_color)
-            except ImportError:
+            askcolor = get_askcolor()
+            if askcolor is None:
                 # Fallback para palleta de cores simples se tkcolorpicker não estiver disponível
                 self._show_color_palette(form, selected_color, color_preview, color_label)
+                return
+            color_result = askcolor(selected_color.get(), form, title="Escolher Cor")
+            if color_result and color_result[1]:
+                new_color = color_result[1]
+                selected_color.set(new_color)
+                color_preview.configure(fg_color=new_color)
+                color_label.configure(text=new_color)
 
         ctk.CTkButton(
             color_preview_frame, text="🎨 Escolher Cor",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=35, width=150, corner_radius=8,
             command=open_color_picker,
@@ -563,7 +578,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="Cancelar",
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"),
             width=100, height=38,
@@ -604,7 +619,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="💾 Salvar",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             width=150, height=38, corner_radius=10,
             command=save,
@@ -628,7 +643,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             main_frame, text="🎨 Selecione uma Cor",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="w", pady=(0, 15))
 
@@ -679,12 +694,12 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             manual_content, text="Ou digite uma cor hexadecimal:",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(side="left", padx=(0, 10))
 
         hex_entry = ctk.CTkEntry(manual_content, height=32, width=120,
-                                 font=ctk.CTkFont(size=12),
+                                 font=get_font(size=12),
                                  placeholder_text="#000000")
         hex_entry.pack(side="left", padx=(0, 8))
         hex_entry.insert(0, color_var.get())
@@ -698,7 +713,7 @@ class ExpensesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             manual_content, text="Aplicar",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             width=80, height=32, corner_radius=6,
             command=apply_custom,
@@ -2,18 +2,21 @@
 """
 CalhaGest - Gestão de Instalações
 Agendamento e acompanhamento de instalações vinculadas a orçamentos.
-Com calendário interativo, campo de horário e formatação DD/MM/AAAA.
+Com calendário interativo, campo de horário e formatação DD/MM/AAAA,
+equipes com capacidade diária e planejamento automático da agenda.
 """
 
 import customtkinter as ctk
 import calendar
-from datetime import datetime, date
-from database import db
+from datetime import datetime, date, timedelta
+from database import db, events
+from services import scheduler
 from components.cards import StatusBadge, create_header
 from theme import get_color, COLORS
 from components.dialogs import (
-    ConfirmDialog, format_currency, format_date, DateEntry, TimeEntry
+    ConfirmDialog, format_currency, format_date, DateEntry, TimeEntry, parse_decimal
 )
+from components.resources import get_font
 
 
 STATUS_OPTIONS = ["Todos", "Pendente", "Em Progresso", "Concluída", "Cancelada"]
@@ -40,6 +43,35 @@ CAL_COLORS = {
     "other_month_fg": "#cbd5e1",
 }
 
+MONTH_NAMES = [
+    "", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+
+# Grade fixa do calendário: 6 semanas cobrem qualquer mês
+CAL_WEEKS = 6
+CAL_MAX_DOTS = 3
+
+
+class _DayCell:
+    """Widgets persistentes de uma célula do calendário e o último estado desenhado."""
+    __slots__ = ("frame", "label", "dots", "more", "state")
+
+    def __init__(self, frame, label, dots, more):
+        self.frame = frame
+        self.label = label
+        self.dots = dots
+        self.more = more
+        self.state = ()  # Nunca igual a um estado real: a primeira atualização sempre desenha
+
+
+def _dot_color(status: str) -> str:
+    if status == "completed":
+        return CAL_COLORS["completed_dot"]
+    if status == "in-progress":
+        return CAL_COLORS["inprogress_dot"]
+    return CAL_COLORS["pending_dot"]
+
 
 class InstallationsView(ctk.CTkFrame):
     """View de gestão de instalações com calendário."""
@@ -51,8 +83,14 @@ class InstallationsView(ctk.CTkFrame):
         self.cal_year = datetime.now().year
         self.cal_month = datetime.now().month
         self._installations_cache = []
+        self._changes = events.DirtyFlag([events.INSTALLATION, events.QUOTE, events.CREW])
         self._build()
 
+    def on_show(self):
+        """Recarrega calendário e lista apenas se instalações/orçamentos mudaram."""
+        if self._changes.consume():
+            self._refresh_all()
+
     def _build(self):
         # Cabeçalho
         header = create_header(
@@ -60,6 +98,12 @@ class InstallationsView(ctk.CTkFrame):
             action_text="Nova Instalação", action_command=self._open_create_dialog
         )
         header.pack(fill="x", pady=(0, 12))
+        ctk.CTkButton(
+            header, text="👷 Equipes e Agenda", font=get_font(size=13, weight="bold"),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), height=38, corner_radius=10,
+            command=self._open_planner_dialog,
+        ).pack(side="right", padx=(0, 8))
 
         # Corpo principal: Calendário (esquerda) + Lista (direita)
         body = ctk.CTkFrame(self, fg_color="transparent")
@@ -91,7 +135,7 @@ class InstallationsView(ctk.CTkFrame):
             values=STATUS_OPTIONS,
             variable=self.filter_var,
             command=self._on_filter,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             height=32,
         ).pack(fill="x")
 
@@ -99,12 +143,14 @@ class InstallationsView(ctk.CTkFrame):
         self.list_frame = ctk.CTkScrollableFrame(list_card, fg_color="transparent")
         self.list_frame.pack(fill="both", expand=True, padx=8, pady=(0, 8))
 
+        self._build_calendar()
         self._refresh_all()
 
     def _refresh_all(self):
         """Recarrega calendário e lista."""
+        self._changes.consume()
         self._installations_cache = db.get_all_installations(status_filter=self.status_filter)
-        self._build_calendar()
+        self._update_calendar()
         self._load_installations()
 
     def _on_filter(self, value):
@@ -114,11 +160,11 @@ class InstallationsView(ctk.CTkFrame):
     # ==================== CALENDÁRIO ====================
 
     def _build_calendar(self):
-        for w in self.cal_container.winfo_children():
-            w.destroy()
-
-        now = datetime.now()
-
+        """
+        Cria o calendário uma única vez: navegação, cabeçalho e uma grade fixa
+        de 6x7 células. Trocar de mês só reconfigura textos e cores
+        (_update_calendar); nenhum widget é destruído ou recriado.
+        """
         # Navegação do mês
         nav = ctk.CTkFrame(self.cal_container, fg_color=CAL_COLORS["header_bg"],
                             corner_radius=10)
@@ -128,25 +174,22 @@ class InstallationsView(ctk.CTkFrame):
             nav, text="◀", width=36, height=36, corner_radius=8,
             fg_color="transparent", hover_color=get_color("sidebar_hover"),
             text_color=CAL_COLORS["header_fg"],
-            font=ctk.CTkFont(size=16),
+            font=get_font(size=16),
             command=self._prev_month,
         ).pack(side="left", padx=6, pady=6)
 
-        month_names = [
-            "", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-            "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-        ]
-        ctk.CTkLabel(
-            nav, text=f"{month_names[self.cal_month]} {self.cal_year}",
-            font=ctk.CTkFont(size=15, weight="bold"),
+        self._month_label = ctk.CTkLabel(
+            nav, text="",
+            font=get_font(size=15, weight="bold"),
             text_color=CAL_COLORS["header_fg"],
-        ).pack(side="left", expand=True)
+        )
+        self._month_label.pack(side="left", expand=True)
 
         ctk.CTkButton(
             nav, text="▶", width=36, height=36, corner_radius=8,
             fg_color="transparent", hover_color=get_color("sidebar_hover"),
             text_color=CAL_COLORS["header_fg"],
-            font=ctk.CTkFont(size=16),
+            font=get_font(size=16),
             command=self._next_month,
         ).pack(side="right", padx=6, pady=6)
 
@@ -157,111 +200,44 @@ class InstallationsView(ctk.CTkFrame):
             color = CAL_COLORS["weekend_fg"] if i >= 5 else COLORS["text_secondary"]
             ctk.CTkLabel(
                 days_header, text=day_name,
-                font=ctk.CTkFont(size=11, weight="bold"),
+                font=get_font(size=11, weight="bold"),
                 text_color=color, width=40,
             ).pack(side="left", expand=True)
 
-        # Grade de dias
+        # Grade de dias (sempre 6 semanas: cobre qualquer mês)
         grid = ctk.CTkFrame(self.cal_container, fg_color="transparent")
         grid.pack(fill="both", expand=True, pady=(4, 0))
         for c in range(7):
             grid.grid_columnconfigure(c, weight=1)
+        for r in range(CAL_WEEKS):
+            grid.grid_rowconfigure(r, weight=1)
+
+        self._cells = []
+        for index in range(CAL_WEEKS * 7):
+            cell = ctk.CTkFrame(grid, corner_radius=6, fg_color="transparent")
+            cell.grid(row=index // 7, column=index % 7, padx=1, pady=1, sticky="nsew")
+
+            day_label = ctk.CTkLabel(cell, text="", font=get_font(size=13),
+                                     text_color=CAL_COLORS["day_fg"])
+            day_label.pack(pady=(4, 0))
+
+            # Indicadores de instalações: 3 pontos e "+N", exibidos conforme o dia
+            dots_frame = ctk.CTkFrame(cell, fg_color="transparent", height=8)
+            dots_frame.pack(pady=(0, 2))
+            dots = [
+                ctk.CTkFrame(dots_frame, width=8, height=8, corner_radius=4,
+                             fg_color=CAL_COLORS["pending_dot"])
+                for _ in range(CAL_MAX_DOTS)
+            ]
+            more = ctk.CTkLabel(dots_frame, text="", font=get_font(size=8),
+                                text_color=COLORS["text_secondary"])
 
-        # Mapear instalações por dia
-        inst_by_day = {}
-        for inst in self._installations_cache:
-            sd = inst.get("scheduled_date", "")
-            if sd:
-                try:
-                    d = str(sd)[:10]
-                    parts = d.split("-")
-                    if len(parts) == 3:
-                        idate = date(int(parts[0]), int(parts[1]), int(parts[2]))
-                        if idate.year == self.cal_year and idate.month == self.cal_month:
-                            inst_by_day.setdefault(idate.day, []).append(inst)
-                except (ValueError, IndexError):
-                    pass
-
-        cal_obj = calendar.Calendar(firstweekday=0)
-        weeks = cal_obj.monthdayscalendar(self.cal_year, self.cal_month)
-
-        for row_idx, week in enumerate(weeks):
-            grid.grid_rowconfigure(row_idx, weight=1)
-            for col_idx, day_num in enumerate(week):
-                cell = ctk.CTkFrame(grid, corner_radius=6, fg_color="transparent")
-                cell.grid(row=row_idx, column=col_idx, padx=1, pady=1, sticky="nsew")
-
-                if day_num == 0:
-                    # Dia fora do mês
-                    continue
-
-                is_today = (
-                    day_num == now.day
-                    and self.cal_month == now.month
-                    and self.cal_year == now.year
-                )
-
-                day_insts = inst_by_day.get(day_num, [])
-                has_pending = any(
-                    i.get("status") in ("pending", "in-progress") for i in day_insts
-                )
-                has_completed = any(
-                    i.get("status") == "completed" for i in day_insts
-                )
+            # Click para ver detalhes do dia (instalações + orçamentos)
+            for widget in (cell, day_label, dots_frame):
+                widget.bind("<Button-1>", lambda e, i=index: self._on_cell_click(i))
 
-                # Cor de fundo
-                if is_today:
-                    bg = CAL_COLORS["today_bg"]
-                    fg = CAL_COLORS["today_fg"]
-                elif has_pending:
-                    bg = CAL_COLORS["pending_bg"]
-                    fg = CAL_COLORS["day_fg"]
-                elif has_completed:
-                    bg = CAL_COLORS["completed_bg"]
-                    fg = CAL_COLORS["day_fg"]
-                else:
-                    bg = CAL_COLORS["day_normal"]
-                    fg = CAL_COLORS["day_fg"]
-
-                cell.configure(fg_color=bg)
-
-                # Número do dia
-                day_label = ctk.CTkLabel(
-                    cell, text=str(day_num),
-                    font=ctk.CTkFont(size=13, weight="bold" if is_today or day_insts else "normal"),
-                    text_color=fg,
-                )
-                day_label.pack(pady=(4, 0))
-
-                # Indicadores de instalações
-                if day_insts:
-                    dots_frame = ctk.CTkFrame(cell, fg_color="transparent", height=8)
-                    dots_frame.pack(pady=(0, 2))
-                    count = min(len(day_insts), 3)
-                    for inst in day_insts[:count]:
-                        st = inst.get("status", "pending")
-                        if st == "completed":
-                            dot_color = CAL_COLORS["completed_dot"]
-                        elif st == "in-progress":
-                            dot_color = CAL_COLORS["inprogress_dot"]
-                        else:
-                            dot_color = CAL_COLORS["pending_dot"]
-                        ctk.CTkFrame(
-                            dots_frame, width=8, height=8,
-                            corner_radius=4, fg_color=dot_color,
-                        ).pack(side="left", padx=1)
-                    if len(day_insts) > 3:
-                        ctk.CTkLabel(
-                            dots_frame, text=f"+{len(day_insts)-3}",
-                            font=ctk.CTkFont(size=8),
-                            text_color=COLORS["text_secondary"],
-                        ).pack(side="left", padx=1)
-
-                # Click para ver detalhes do dia (instalações + orçamentos)
-                cell.configure(cursor="hand2")
-                cell.bind("<Button-1>", lambda e, d=day_num: self._show_day_history(d))
-                for child in cell.winfo_children():
-                    child.bind("<Button-1>", lambda e, d=day_num: self._show_day_history(d))
+            self._cells.append(_DayCell(cell, day_label, dots, more))
+        self._cell_days = [0] * len(self._cells)
 
         # Legenda
         legend = ctk.CTkFrame(self.cal_container, fg_color="transparent")
@@ -278,16 +254,86 @@ class InstallationsView(ctk.CTkFrame):
             item.pack(side="left", padx=6)
             ctk.CTkFrame(item, width=10, height=10, corner_radius=5,
                          fg_color=color).pack(side="left", padx=(0, 4))
-            ctk.CTkLabel(item, text=text, font=ctk.CTkFont(size=10),
+            ctk.CTkLabel(item, text=text, font=get_font(size=10),
                          text_color=COLORS["text_secondary"]).pack(side="left")
 
+    def _update_calendar(self):
+        """Preenche a grade com o mês atual usando o índice por dia do banco."""
+        today = date.today()
+        self._month_label.configure(text=f"{MONTH_NAMES[self.cal_month]} {self.cal_year}")
+        inst_by_day = db.get_installations_by_day(self.cal_year, self.cal_month, self.status_filter)
+
+        offset, days_in_month = calendar.monthrange(self.cal_year, self.cal_month)
+        current_month = (self.cal_year, self.cal_month) == (today.year, today.month)
+
+        for index, cell in enumerate(self._cells):
+            day_num = index - offset + 1
+            if not 1 <= day_num <= days_in_month:
+                # Dia fora do mês
+                day_num = 0
+            self._cell_days[index] = day_num
+            self._update_cell(cell, day_num, current_month and day_num == today.day,
+                              inst_by_day.get(day_num, ()) if day_num else ())
+
+    def _update_cell(self, cell, day_num, is_today, day_insts):
+        """Reconfigura uma célula; só chama configure/pack quando o estado muda."""
+        if not day_num:
+            state = None
+        else:
+            has_pending = any(i.get("status") in ("pending", "in-progress") for i in day_insts)
+            has_completed = any(i.get("status") == "completed" for i in day_insts)
+
+            # Cor de fundo
+            if is_today:
+                bg, fg = CAL_COLORS["today_bg"], CAL_COLORS["today_fg"]
+            elif has_pending:
+                bg, fg = CAL_COLORS["pending_bg"], CAL_COLORS["day_fg"]
+            elif has_completed:
+                bg, fg = CAL_COLORS["completed_bg"], CAL_COLORS["day_fg"]
+            else:
+                bg, fg = CAL_COLORS["day_normal"], CAL_COLORS["day_fg"]
+
+            dot_colors = tuple(_dot_color(i.get("status", "pending")) for i in day_insts[:CAL_MAX_DOTS])
+            extra = len(day_insts) - CAL_MAX_DOTS
+            state = (day_num, bg, fg, is_today or bool(day_insts), dot_colors, extra)
+
+        if state == cell.state:
+            return
+        cell.state = state
+
+        if state is None:
+            cell.frame.configure(fg_color="transparent", cursor="")
+            cell.label.configure(text="")
+            dot_colors, extra = (), 0
+        else:
+            day_num, bg, fg, bold, dot_colors, extra = state
+            cell.frame.configure(fg_color=bg, cursor="hand2")
+            cell.label.configure(text=str(day_num), text_color=fg,
+                                 font=get_font(size=13, weight="bold" if bold else "normal"))
+
+        # Pontos reempacotados em ordem (pack_forget + pack preserva a sequência)
+        for dot in cell.dots:
+            dot.pack_forget()
+        cell.more.pack_forget()
+        for dot, color in zip(cell.dots, dot_colors):
+            dot.configure(fg_color=color)
+            dot.pack(side="left", padx=1)
+        if extra > 0:
+            cell.more.configure(text=f"+{extra}")
+            cell.more.pack(side="left", padx=1)
+
+    def _on_cell_click(self, index):
+        day_num = self._cell_days[index]
+        if day_num:
+            self._show_day_history(day_num)
+
     def _prev_month(self):
         if self.cal_month == 1:
             self.cal_month = 12
             self.cal_year -= 1
         else:
             self.cal_month -= 1
-        self._refresh_all()
+        self._update_calendar()
 
     def _next_month(self):
         if self.cal_month == 12:
@@ -295,7 +341,13 @@ class InstallationsView(ctk.CTkFrame):
             self.cal_year += 1
         else:
             self.cal_month += 1
-        self._refresh_all()
+        self._update_calendar()
+
+    def _day_installations(self, day_num):
+        """Instalações do dia no mês exibido (índice por mês do banco)."""
+        return db.get_installations_by_day(
+            self.cal_year, self.cal_month, self.status_filter
+        ).get(day_num, [])
 
     def _show_day_detail(self, day_num):
         """Mostra instalações do dia clicado na lista."""
@@ -304,13 +356,8 @@ class InstallationsView(ctk.CTkFrame):
 
     def _show_day_history(self, day_num):
         """Mostra instalações do dia com detalhes expandíveis."""
-        target_date = f"{self.cal_year}-{self.cal_month:02d}-{day_num:02d}"
-        
         # Buscar instalações
-        day_installations = [
-            i for i in self._installations_cache
-            if str(i.get("scheduled_date", ""))[:10] == target_date
-        ]
+        day_installations = self._day_installations(day_num)
         
         # Criar dialog
         dialog = ctk.CTkToplevel(self.app)
@@ -331,18 +378,14 @@ class InstallationsView(ctk.CTkFrame):
         ctk.CTkLabel(
             scroll,
             text=f"📅 Instalações de {day_num:02d}/{self.cal_month:02d}/{self.cal_year}",
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=get_font(size=18, weight="bold"),
             text_color=COLORS["text"],
         ).pack(pady=(0, 15))
         
         def refresh_dialog():
             """Recarrega o conteúdo do dialog."""
-            # Atualizar cache e buscar novamente
-            self._installations_cache = db.get_all_installations(status_filter=self.status_filter)
-            updated_installations = [
-                i for i in self._installations_cache
-                if str(i.get("scheduled_date", ""))[:10] == target_date
-            ]
+            # As escritas já invalidaram o mês no índice: a busca reflete o banco
+            updated_installations = self._day_installations(day_num)
             
             # Limpar conteúdo (exceto título)
             children = scroll.winfo_children()
@@ -356,7 +399,7 @@ class InstallationsView(ctk.CTkFrame):
                 ctk.CTkLabel(
                     scroll,
                     text="Nenhuma instalação neste dia.",
-                    font=ctk.CTkFont(size=13),
+                    font=get_font(size=13),
                     text_color=COLORS["text_secondary"],
                 ).pack(pady=40)
             
@@ -375,7 +418,7 @@ class InstallationsView(ctk.CTkFrame):
             ctk.CTkLabel(
                 scroll,
                 text="Nenhuma instalação neste dia.",
-                font=ctk.CTkFont(size=13),
+                font=get_font(size=13),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=40)
         
@@ -403,7 +446,7 @@ class InstallationsView(ctk.CTkFrame):
         
         ctk.CTkLabel(
             left, text=inst.get("client_name", "-"),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["text"], anchor="w",
         ).pack(side="left")
         
@@ -424,7 +467,7 @@ class InstallationsView(ctk.CTkFrame):
         if time_str:
             ctk.CTkLabel(
                 details_frame, text=f"🕐 Horário: {time_str}",
-                font=ctk.CTkFont(size=12, weight="bold"),
+                font=get_font(size=12, weight="bold"),
                 text_color=COLORS["primary"], anchor="w",
             ).pack(anchor="w", pady=(0, 2))
         
@@ -433,7 +476,7 @@ class InstallationsView(ctk.CTkFrame):
         if addr:
             ctk.CTkLabel(
                 details_frame, text=f"📍 {addr}",
-                font=ctk.CTkFont(size=11),
+                font=get_font(size=11),
                 text_color=COLORS["text_secondary"], anchor="w",
             ).pack(anchor="w", pady=(0, 2))
         
@@ -442,7 +485,7 @@ class InstallationsView(ctk.CTkFrame):
         if notes:
             ctk.CTkLabel(
                 details_frame, text=f"📝 {notes}",
-                font=ctk.CTkFont(size=11),
+                font=get_font(size=11),
                 text_color=COLORS["text_secondary"], anchor="w",
                 wraplength=450, justify="left",
             ).pack(anchor="w", pady=(0, 2))
@@ -452,7 +495,7 @@ class InstallationsView(ctk.CTkFrame):
         if total:
             ctk.CTkLabel(
                 details_frame, text=f"💰 {format_currency(total)}",
-                font=ctk.CTkFont(size=11),
+                font=get_font(size=11),
                 text_color=COLORS["text_secondary"], anchor="w",
             ).pack(anchor="w", pady=(0, 2))
         
@@ -462,7 +505,7 @@ class InstallationsView(ctk.CTkFrame):
         
         if status == "pending":
             ctk.CTkButton(
-                btn_frame, text="▶ Iniciar", font=ctk.CTkFont(size=11),
+                btn_frame, text="▶ Iniciar", font=get_font(size=11),
                 fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
                 width=80, height=30, corner_radius=8,
                 command=lambda: (self._update_status(inst["id"], "in-progress"),
@@ -471,7 +514,7 @@ class InstallationsView(ctk.CTkFrame):
         
         if status == "in-progress":
             ctk.CTkButton(
-                btn_frame, text="✅ Completar", font=ctk.CTkFont(size=11),
+                btn_frame, text="✅ Completar", font=get_font(size=11),
                 fg_color=get_color("success"), hover_color=get_color("success_hover"),
                 width=100, height=30, corner_radius=8,
                 command=lambda: (self._update_status(inst["id"], "completed"),
@@ -485,7 +528,7 @@ class InstallationsView(ctk.CTkFrame):
             refresh_callback()
         
         ctk.CTkButton(
-            btn_frame, text="🗑️ Remover", font=ctk.CTkFont(size=11),
+            btn_frame, text="🗑️ Remover", font=get_font(size=11),
             fg_color=COLORS["error_light"], text_color=COLORS["error"],
             hover_color=COLORS["error_hover_light"],
             width=90, height=30, corner_radius=8,
@@ -520,11 +563,11 @@ class InstallationsView(ctk.CTkFrame):
             reset_frame.pack(fill="x", pady=(0, 6))
             ctk.CTkLabel(
                 reset_frame, text=f"📅 {date_label}",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=get_font(size=13, weight="bold"),
                 text_color=COLORS["primary"],
             ).pack(side="left")
             ctk.CTkButton(
-                reset_frame, text="✕ Limpar filtro", font=ctk.CTkFont(size=11),
+                reset_frame, text="✕ Limpar filtro", font=get_font(size=11),
                 fg_color="transparent", text_color=COLORS["text_secondary"],
                 hover_color=COLORS["border"], height=24, width=90,
                 command=lambda: self._load_installations(),
@@ -533,7 +576,7 @@ class InstallationsView(ctk.CTkFrame):
         ctk.CTkLabel(
             self.list_frame,
             text=f"{len(installations)} instalação(ões)",
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(fill="x", pady=(0, 6))
@@ -542,7 +585,7 @@ class InstallationsView(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.list_frame,
                 text="Nenhuma instalação encontrada.",
-                font=ctk.CTkFont(size=13),
+                font=get_font(size=13),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=30)
             return
@@ -573,7 +616,7 @@ class InstallationsView(ctk.CTkFrame):
         ctk.CTkLabel(
             top_row,
             text=inst.get("client_name", "-"),
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
@@ -595,7 +638,7 @@ class InstallationsView(ctk.CTkFrame):
         ctk.CTkLabel(
             left,
             text=details,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(anchor="w", pady=(3, 0))
@@ -604,7 +647,7 @@ class InstallationsView(ctk.CTkFrame):
             ctk.CTkLabel(
                 left,
                 text=f"📝 {inst['notes']}",
-                font=ctk.CTkFont(size=10),
+                font=get_font(size=10),
                 text_color=COLORS["text_secondary"],
                 anchor="w",
             ).pack(anchor="w", pady=(2, 0))
@@ -617,7 +660,7 @@ class InstallationsView(ctk.CTkFrame):
 
         if status == "pending":
             ctk.CTkButton(
-                right, text="▶ Iniciar", font=ctk.CTkFont(size=10),
+                right, text="▶ Iniciar", font=get_font(size=10),
                 fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
                 width=70, height=28, corner_radius=8,
                 command=lambda i=inst: self._update_status(i["id"], "in-progress"),
@@ -625,7 +668,7 @@ class InstallationsView(ctk.CTkFrame):
 
         if status == "in-progress":
             ctk.CTkButton(
-                right, text="✅ Completar", font=ctk.CTkFont(size=10),
+                right, text="✅ Completar", font=get_font(size=10),
                 fg_color=get_color("success"), hover_color=get_color("success_hover"),
                 width=85, height=28, corner_radius=8,
                 command=lambda i=inst: self._update_status(i["id"], "completed"),
@@ -633,7 +676,7 @@ class InstallationsView(ctk.CTkFrame):
 
         if status in ("pending", "in-progress"):
             ctk.CTkButton(
-                right, text="✕", font=ctk.CTkFont(size=10),
+                right, text="✕", font=get_font(size=10),
                 fg_color=COLORS["error_light"], text_color=COLORS["error"],
                 hover_color=COLORS["error_hover_light"],
                 width=28, height=28, corner_radius=8,
@@ -641,7 +684,7 @@ class InstallationsView(ctk.CTkFrame):
             ).pack(side="left", padx=2)
 
         ctk.CTkButton(
-            right, text="🗑️", font=ctk.CTkFont(size=10),
+            right, text="🗑️", font=get_font(size=10),
             fg_color=COLORS["error_light"], text_color=COLORS["error"],
             hover_color=COLORS["error_hover_light"],
             width=28, height=28, corner_radius=8,
@@ -659,13 +702,13 @@ class InstallationsView(ctk.CTkFrame):
 
         dialog = ctk.CTkToplevel(self.app)
         dialog.title("Nova Instalação")
-        dialog.geometry("520x420")
+        dialog.geometry("520x520")
         dialog.grab_set()
         dialog.transient(self.app)
 
         dialog.update_idletasks()
         x = self.app.winfo_rootx() + (self.app.winfo_width() - 520) // 2
-        y = self.app.winfo_rooty() + (self.app.winfo_height() - 420) // 2
+        y = self.app.winfo_rooty() + (self.app.winfo_height() - 520) // 2
         dialog.geometry(f"+{x}+{y}")
 
         frame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -674,7 +717,7 @@ class InstallationsView(ctk.CTkFrame):
         # Selecionar orçamento
         ctk.CTkLabel(
             frame, text="Orçamento Aprovado *",
-            font=ctk.CTkFont(size=12, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(0, 4))
 
         quote_options = [
@@ -686,7 +729,7 @@ class InstallationsView(ctk.CTkFrame):
 
         ctk.CTkOptionMenu(
             frame, values=quote_options, variable=quote_var,
-            font=ctk.CTkFont(size=12), height=35,
+            font=get_font(size=12), height=35,
         ).pack(fill="x", pady=(0, 10))
 
         # Data e Horário na mesma linha
@@ -697,12 +740,12 @@ class InstallationsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             datetime_frame, text="Data Agendada *",
-            font=ctk.CTkFont(size=12, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
         ).grid(row=0, column=0, sticky="w")
 
         ctk.CTkLabel(
             datetime_frame, text="Horário",
-            font=ctk.CTkFont(size=12, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
         ).grid(row=0, column=1, sticky="w", padx=(10, 0))
 
         date_entry = DateEntry(datetime_frame)
@@ -711,14 +754,81 @@ class InstallationsView(ctk.CTkFrame):
         time_entry = TimeEntry(datetime_frame)
         time_entry.grid(row=1, column=1, sticky="ew", padx=(10, 0), pady=(4, 0))
 
+        # Equipe + próxima data livre
+        crews = db.get_all_crews()
+        crew_options = ["Sem equipe"] + [
+            f"{c['name']} ({scheduler.format_load(c['daily_capacity'], c['capacity_unit'])}/dia)"
+            for c in crews
+        ]
+        crew_map = dict(zip(crew_options[1:], crews))
+        crew_var = ctk.StringVar(value=crew_options[1] if crews else crew_options[0])
+
+        ctk.CTkLabel(
+            frame, text="Equipe",
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
+        ).pack(anchor="w", pady=(0, 4))
+
+        crew_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        crew_frame.pack(fill="x")
+        ctk.CTkOptionMenu(
+            crew_frame, values=crew_options, variable=crew_var,
+            font=get_font(size=12), height=35,
+        ).pack(side="left", fill="x", expand=True)
+
+        slot_label = ctk.CTkLabel(
+            frame, text="", font=get_font(size=11),
+            text_color=COLORS["text_secondary"], anchor="w",
+        )
+        slot_label.pack(fill="x", pady=(2, 0))
+
+        def selected_job():
+            sel = quote_map.get(quote_var.get())
+            return scheduler.quote_job(sel["id"], sel["client_name"]) if sel else None
+
+        def next_free_slot():
+            job = selected_job()
+            if not job or not crews:
+                self.app.show_toast("Cadastre uma equipe em 'Equipes e Agenda'.", "warning")
+                return
+            crew = crew_map.get(crew_var.get())
+            slot = scheduler.CrewSchedule.load(date.today()).find_next_free_slot(
+                job, crew_id=crew["id"] if crew else None,
+            )
+            if slot is None:
+                slot_label.configure(text="Nenhuma data livre nos próximos 6 meses.")
+                return
+            date_entry.set(slot.day.isoformat())
+            crew_var.set(next(opt for opt, c in crew_map.items() if c["id"] == slot.crew.id))
+            slot_label.configure(text=(
+                f"Carga {scheduler.format_load(slot.load, slot.crew.unit)} • "
+                f"livre no dia: {scheduler.format_load(slot.free, slot.crew.unit)}"
+            ))
+
+        ctk.CTkButton(
+            crew_frame, text="⏭ Próxima data livre", font=get_font(size=11),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            width=140, height=35, command=next_free_slot,
+        ).pack(side="left", padx=(8, 0))
+
         # Notas
         ctk.CTkLabel(
             frame, text="Notas Adicionais",
-            font=ctk.CTkFont(size=12, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(8, 4))
-        notes_text = ctk.CTkTextbox(frame, height=70, font=ctk.CTkFont(size=12))
+        notes_text = ctk.CTkTextbox(frame, height=70, font=get_font(size=12))
         notes_text.pack(fill="x", pady=(0, 15))
 
+        def schedule(sel_quote, date_str, crew):
+            try:
+                notes = notes_text.get("1.0", "end-1c").strip()
+                db.create_installation(sel_quote["id"], date_str, notes,
+                                       crew_id=crew["id"] if crew else None)
+                dialog.destroy()
+                self.app.show_toast("Instalação agendada!", "success")
+                self._refresh_all()
+            except Exception as e:
+                self.app.show_toast(f"Erro: {e}", "error")
+
         def save():
             sel_quote = quote_map.get(quote_var.get())
             if not sel_quote:
@@ -728,18 +838,34 @@ class InstallationsView(ctk.CTkFrame):
             if not date_str or len(date_str) < 10:
                 self.app.show_toast("Data é obrigatória (DD/MM/AAAA).", "error")
                 return
+            try:
+                day = date.fromisoformat(date_str[:10])
+            except ValueError:
+                self.app.show_toast("Data inválida (DD/MM/AAAA).", "error")
+                return
             # Combinar data + horário
             time_str = time_entry.get().strip()
             if time_str and len(time_str) == 5:
                 date_str = f"{date_str} {time_str}"
-            try:
-                notes = notes_text.get("1.0", "end-1c").strip()
-                db.create_installation(sel_quote["id"], date_str, notes)
-                dialog.destroy()
-                self.app.show_toast("Instalação agendada!", "success")
-                self._refresh_all()
-            except Exception as e:
-                self.app.show_toast(f"Erro: {e}", "error")
+
+            # Conferir a capacidade da equipe no dia antes de agendar
+            crew = crew_map.get(crew_var.get())
+            if crew:
+                schedule_day = scheduler.CrewSchedule.load(day, days=1, workdays=range(7))
+                crew_entry = schedule_day.crew(crew["id"])
+                load = crew_entry.load_of(selected_job()) if crew_entry else 0.0
+                free = schedule_day.free(crew["id"], day)
+                if load > free + 1e-9:
+                    unit = crew["capacity_unit"]
+                    ConfirmDialog(
+                        dialog, "Agenda Cheia",
+                        f"{crew['name']} tem {scheduler.format_load(free, unit)} livres em "
+                        f"{day.strftime('%d/%m/%Y')} e a instalação ocupa "
+                        f"{scheduler.format_load(load, unit)}. Agendar mesmo assim?",
+                        lambda: schedule(sel_quote, date_str, crew),
+                    )
+                    return
+            schedule(sel_quote, date_str, crew)
 
         btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
         btn_frame.pack(fill="x")
@@ -753,7 +879,7 @@ class InstallationsView(ctk.CTkFrame):
         ctk.CTkButton(
             btn_frame, text="📅 Agendar", fg_color=get_color("primary"),
             hover_color=get_color("primary_hover"), width=120, height=36,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             command=save,
         ).pack(side="right")
 
@@ -780,3 +906,175 @@ class InstallationsView(ctk.CTkFrame):
         db.delete_installation(installation_id)
         self.app.show_toast("Instalação excluída.", "success")
         self._refresh_all()
+
+    # ==================== EQUIPES E AGENDA ====================
+
+    def _open_planner_dialog(self):
+        """Equipes (capacidade diária) e planejamento em lote dos orçamentos aprovados."""
+        dialog = ctk.CTkToplevel(self.app)
+        dialog.title("Equipes e Agenda")
+        dialog.geometry("640x600")
+        dialog.grab_set()
+        dialog.transient(self.app)
+
+        dialog.update_idletasks()
+        x = self.app.winfo_rootx() + (self.app.winfo_width() - 640) // 2
+        y = self.app.winfo_rooty() + (self.app.winfo_height() - 600) // 2
+        dialog.geometry(f"+{x}+{y}")
+
+        scroll = ctk.CTkScrollableFrame(dialog, fg_color="transparent")
+        scroll.pack(fill="both", expand=True, padx=15, pady=15)
+
+        # === Equipes ===
+        ctk.CTkLabel(
+            scroll, text="👷 Equipes", font=get_font(size=16, weight="bold"),
+            text_color=COLORS["text"],
+        ).pack(anchor="w", pady=(0, 6))
+
+        crews_frame = ctk.CTkFrame(scroll, fg_color="transparent")
+        crews_frame.pack(fill="x")
+
+        form = ctk.CTkFrame(scroll, fg_color="transparent")
+        form.pack(fill="x", pady=(6, 0))
+        name_entry = ctk.CTkEntry(form, placeholder_text="Nome da equipe", height=32)
+        name_entry.pack(side="left", fill="x", expand=True)
+        capacity_entry = ctk.CTkEntry(form, placeholder_text="Capacidade/dia", width=110, height=32)
+        capacity_entry.pack(side="left", padx=(6, 0))
+        unit_var = ctk.StringVar(value="metros")
+        ctk.CTkOptionMenu(
+            form, values=["metros", "horas"], variable=unit_var,
+            font=get_font(size=12), width=90, height=32,
+        ).pack(side="left", padx=(6, 0))
+
+        # === Agenda ===
+        ctk.CTkLabel(
+            scroll, text="🗓️ Agenda (próximos 6 meses)", font=get_font(size=16, weight="bold"),
+            text_color=COLORS["text"],
+        ).pack(anchor="w", pady=(18, 6))
+
+        summary_label = ctk.CTkLabel(
+            scroll, text="", font=get_font(size=12),
+            text_color=COLORS["text_secondary"], anchor="w", justify="left",
+        )
+        summary_label.pack(fill="x")
+
+        actions = ctk.CTkFrame(scroll, fg_color="transparent")
+        actions.pack(fill="x", pady=(8, 6))
+        plan_frame = ctk.CTkFrame(scroll, fg_color="transparent")
+        plan_frame.pack(fill="x")
+
+        state = {"plan": None}
+
+        def refresh():
+            for w in crews_frame.winfo_children():
+                w.destroy()
+            crews = db.get_all_crews()
+            if not crews:
+                ctk.CTkLabel(
+                    crews_frame, text="Nenhuma equipe cadastrada.",
+                    font=get_font(size=12), text_color=COLORS["text_secondary"],
+                ).pack(anchor="w")
+            for crew in crews:
+                row = ctk.CTkFrame(crews_frame, fg_color=COLORS["card"], corner_radius=8,
+                                   border_width=1, border_color=COLORS["border"])
+                row.pack(fill="x", pady=2)
+                ctk.CTkLabel(
+                    row, text=f"{crew['name']}  •  "
+                              f"{scheduler.format_load(crew['daily_capacity'], crew['capacity_unit'])}/dia",
+                    font=get_font(size=12), text_color=COLORS["text"], anchor="w",
+                ).pack(side="left", padx=10, pady=6)
+                ctk.CTkButton(
+                    row, text="🗑️", font=get_font(size=10),
+                    fg_color=COLORS["error_light"], text_color=COLORS["error"],
+                    hover_color=COLORS["error_hover_light"],
+                    width=28, height=26, corner_radius=8,
+                    command=lambda c=crew: ConfirmDialog(
+                        dialog, "Excluir Equipe",
+                        f"Excluir a equipe {c['name']}? As instalações ficam sem equipe.",
+                        lambda: (db.delete_crew(c["id"]), refresh()),
+                    ),
+                ).pack(side="right", padx=8)
+
+            schedule = scheduler.CrewSchedule.load(date.today())
+            conflicts = schedule.conflicts()
+            pending = db.get_unscheduled_quote_loads()
+            text = f"{len(pending)} orçamento(s) aprovado(s) sem instalação."
+            if conflicts:
+                days = ", ".join(
+                    f"{c.day.strftime('%d/%m')} ({c.crew.name})" for c in conflicts[:5]
+                )
+                more = f" e mais {len(conflicts) - 5}" if len(conflicts) > 5 else ""
+                text += f"\n⚠️ {len(conflicts)} dia(s) acima da capacidade: {days}{more}"
+            summary_label.configure(text=text)
+            show_plan(None)
+
+        def add_crew():
+            name = name_entry.get().strip()
+            capacity = parse_decimal(capacity_entry.get())
+            if not name or capacity <= 0:
+                self.app.show_toast("Informe o nome e a capacidade diária.", "error")
+                return
+            db.create_crew(name, capacity, unit_var.get())
+            name_entry.delete(0, "end")
+            capacity_entry.delete(0, "end")
+            refresh()
+
+        ctk.CTkButton(
+            form, text="+ Adicionar", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            width=100, height=32, command=add_crew,
+        ).pack(side="left", padx=(6, 0))
+
+        def show_plan(plan):
+            state["plan"] = plan
+            for w in plan_frame.winfo_children():
+                w.destroy()
+            apply_button.configure(state="normal" if plan and plan.assignments else "disabled")
+            if plan is None:
+                return
+            if plan.unplaced:
+                ctk.CTkLabel(
+                    plan_frame, text=f"⚠️ {len(plan.unplaced)} orçamento(s) sem vaga no horizonte.",
+                    font=get_font(size=12), text_color=COLORS["error"], anchor="w",
+                ).pack(fill="x", pady=(0, 4))
+            for assignment in plan.assignments:
+                slot = assignment.slot
+                flag = "  ⚠️ acima da capacidade diária" if slot.oversized else ""
+                ctk.CTkLabel(
+                    plan_frame,
+                    text=f"{slot.day.strftime('%d/%m/%Y')}  •  {assignment.job.client_name}  •  "
+                         f"{slot.crew.name}  •  {scheduler.format_load(slot.load, slot.crew.unit)}{flag}",
+                    font=get_font(size=11), text_color=COLORS["text"], anchor="w",
+                ).pack(fill="x")
+
+        def run_planner():
+            if not db.get_all_crews():
+                self.app.show_toast("Cadastre ao menos uma equipe.", "warning")
+                return
+            plan = scheduler.plan_pending(date.today() + timedelta(days=1))
+            if not plan.assignments and not plan.unplaced:
+                self.app.show_toast("Nenhum orçamento aprovado aguardando agenda.", "info")
+            show_plan(plan)
+
+        def apply():
+            plan = state["plan"]
+            if not plan or not plan.assignments:
+                return
+            created = scheduler.apply_plan(plan)
+            self.app.show_toast(f"{len(created)} instalação(ões) agendada(s)!", "success")
+            self._refresh_all()
+            refresh()
+
+        ctk.CTkButton(
+            actions, text="🧮 Planejar pendentes", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            height=34, command=run_planner,
+        ).pack(side="left")
+        apply_button = ctk.CTkButton(
+            actions, text="✅ Agendar plano", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("success"), hover_color=get_color("success_hover"),
+            height=34, state="disabled", command=apply,
+        )
+        apply_button.pack(side="left", padx=(8, 0))
+
+        refresh()
@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
 """
 CalhaGest - Gestão de Estoque/Inventário
-Controle de materiais com alertas de estoque baixo.
+Controle de materiais com alertas de estoque baixo, importação de planilha
+CSV/XLSX e previsão de compras (MRP) a partir dos orçamentos aprovados e da
+agenda de instalações.
 """
 
 import customtkinter as ctk
-from database import db
+from database import db, events
 from components.cards import create_header, create_search_bar
 from theme import get_color, COLORS
 from components.dialogs import ConfirmDialog, FormDialog, parse_decimal
+from components.resources import get_font
 
 
 class InventoryView(ctk.CTkFrame):
@@ -19,8 +22,14 @@ class InventoryView(ctk.CTkFrame):
         self.app = app
         self.search_text = ""
         self.type_filter = ""
+        self._changes = events.DirtyFlag([events.INVENTORY])
         self._build()
 
+    def on_show(self):
+        """Recarrega os itens apenas se o estoque mudou (ex.: baixa por orçamento aprovado)."""
+        if self._changes.consume():
+            self._load_items()
+
     def _build(self):
         # Cabeçalho
         header = create_header(
@@ -28,6 +37,12 @@ class InventoryView(ctk.CTkFrame):
             action_text="Novo Material", action_command=self._open_add_dialog
         )
         header.pack(fill="x", pady=(0, 15))
+        ctk.CTkButton(
+            header, text="📥 Importar", font=get_font(size=13, weight="bold"),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), height=38, corner_radius=10,
+            command=self._open_import_dialog,
+        ).pack(side="right", padx=(0, 8))
 
         # Pesquisa
         filter_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -38,6 +53,12 @@ class InventoryView(ctk.CTkFrame):
         )
         search_frame.pack(side="left", fill="x", expand=True)
 
+        ctk.CTkButton(
+            filter_frame, text="📦 Previsão de Compras", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
+            height=36, corner_radius=10, command=self._open_reorder_dialog,
+        ).pack(side="right", padx=(10, 0))
+
         # Alerta de estoque baixo
         low_stock = db.get_low_stock_items()
         if low_stock:
@@ -46,7 +67,7 @@ class InventoryView(ctk.CTkFrame):
             ctk.CTkLabel(
                 alert,
                 text=f"⚠️ {len(low_stock)} item(ns) com estoque abaixo do mínimo!",
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=get_font(size=13, weight="bold"),
                 text_color=COLORS["error"],
             ).pack(padx=15, pady=10)
 
@@ -61,6 +82,7 @@ class InventoryView(ctk.CTkFrame):
         self._load_items()
 
     def _load_items(self):
+        self._changes.consume()
         for w in self.list_frame.winfo_children():
             w.destroy()
 
@@ -69,7 +91,7 @@ class InventoryView(ctk.CTkFrame):
         ctk.CTkLabel(
             self.list_frame,
             text=f"{len(items)} material(is)",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(fill="x", pady=(0, 10))
@@ -78,7 +100,7 @@ class InventoryView(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.list_frame,
                 text="Nenhum material cadastrado.",
-                font=ctk.CTkFont(size=14),
+                font=get_font(size=14),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=40)
             return
@@ -112,14 +134,14 @@ class InventoryView(ctk.CTkFrame):
         ctk.CTkLabel(
             name_row,
             text=item["name"],
-            font=ctk.CTkFont(size=15, weight="bold"),
+            font=get_font(size=15, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
         ctk.CTkLabel(
             name_row,
             text=f"  {item['type']}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=COLORS["primary_light"],
             text_color=COLORS["primary"],
             corner_radius=4,
@@ -129,7 +151,7 @@ class InventoryView(ctk.CTkFrame):
             ctk.CTkLabel(
                 name_row,
                 text="  ⚠️ Baixo  ",
-                font=ctk.CTkFont(size=10, weight="bold"),
+                font=get_font(size=10, weight="bold"),
                 fg_color=COLORS["error_light"],
                 text_color=COLORS["error"],
                 corner_radius=4,
@@ -139,7 +161,7 @@ class InventoryView(ctk.CTkFrame):
         ctk.CTkLabel(
             left,
             text=details,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(anchor="w", pady=(4, 0))
@@ -149,7 +171,7 @@ class InventoryView(ctk.CTkFrame):
         right.pack(side="right")
 
         ctk.CTkButton(
-            right, text="+ Entrada", font=ctk.CTkFont(size=11),
+            right, text="+ Entrada", font=get_font(size=11),
             fg_color=COLORS["success_light"], text_color=COLORS["success"],
             hover_color=COLORS["success_hover_light"],
             width=80, height=30, corner_radius=8,
@@ -157,7 +179,7 @@ class InventoryView(ctk.CTkFrame):
         ).pack(side="left", padx=3)
 
         ctk.CTkButton(
-            right, text="- Saída", font=ctk.CTkFont(size=11),
+            right, text="- Saída", font=get_font(size=11),
             fg_color=COLORS["warning_light"], text_color=COLORS["warning"],
             hover_color=COLORS["warning_hover_light"],
             width=80, height=30, corner_radius=8,
@@ -165,7 +187,7 @@ class InventoryView(ctk.CTkFrame):
         ).pack(side="left", padx=3)
 
         ctk.CTkButton(
-            right, text="🗑️", font=ctk.CTkFont(size=11),
+            right, text="🗑️", font=get_font(size=11),
             fg_color=COLORS["error_light"], text_color=COLORS["error"],
             hover_color=COLORS["error_hover_light"],
             width=36, height=30, corner_radius=8,
@@ -203,6 +225,13 @@ class InventoryView(ctk.CTkFrame):
         except Exception as e:
             self.app.show_toast(f"Erro: {e}", "error")
 
+    def _open_import_dialog(self):
+        """Importa materiais de uma planilha, com pré-visualização do diff."""
+        from components.import_dialog import ImportDialog, ask_import_file
+        path = ask_import_file(self.app)
+        if path:
+            ImportDialog(self.app, path, "inventory", on_done=self._load_items)
+
     def _adjust_stock(self, item, operation):
         """Abre diálogo para ajustar estoque."""
         dialog = ctk.CTkToplevel(self.app)
@@ -219,18 +248,18 @@ class InventoryView(ctk.CTkFrame):
         ctk.CTkLabel(
             dialog,
             text=f"{'Adicionar' if operation == 'add' else 'Remover'} de: {item['name']}",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=get_font(size=14, weight="bold"),
             text_color=COLORS["text"],
         ).pack(padx=20, pady=(20, 5))
 
         ctk.CTkLabel(
             dialog,
             text=f"Atual: {item['quantity']:.0f} {item['unit']}",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(padx=20, pady=(0, 10))
 
-        qty_entry = ctk.CTkEntry(dialog, height=35, font=ctk.CTkFont(size=13),
+        qty_entry = ctk.CTkEntry(dialog, height=35, font=get_font(size=13),
                                   placeholder_text="Quantidade")
         qty_entry.pack(padx=20, fill="x")
         qty_entry.focus()
@@ -251,7 +280,7 @@ class InventoryView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            dialog, text="Confirmar", font=ctk.CTkFont(size=13),
+            dialog, text="Confirmar", font=get_font(size=13),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=36, command=confirm,
         ).pack(padx=20, pady=15, fill="x")
@@ -267,3 +296,72 @@ class InventoryView(ctk.CTkFrame):
         db.delete_inventory_item(item_id)
         self.app.show_toast("Material excluído.", "success")
         self._load_items()
+
+    def _open_reorder_dialog(self):
+        """Materiais que ficam abaixo do mínimo com os orçamentos aprovados (MRP)."""
+        from services.mrp import get_reorder_list
+
+        try:
+            reorder = get_reorder_list()
+        except Exception as e:
+            self.app.show_toast(f"Erro na previsão: {e}", "error")
+            return
+
+        dialog = ctk.CTkToplevel(self.app)
+        dialog.title("Previsão de Compras")
+        dialog.geometry("820x480")
+        dialog.grab_set()
+        dialog.transient(self.app)
+
+        dialog.update_idletasks()
+        x = self.app.winfo_rootx() + (self.app.winfo_width() - 820) // 2
+        y = self.app.winfo_rooty() + (self.app.winfo_height() - 480) // 2
+        dialog.geometry(f"+{x}+{y}")
+
+        ctk.CTkLabel(
+            dialog, text="📦 Previsão de Compras",
+            font=get_font(size=18, weight="bold"), text_color=COLORS["text"],
+        ).pack(padx=20, pady=(15, 2), anchor="w")
+        ctk.CTkLabel(
+            dialog,
+            text="Consumo dos orçamentos aprovados na data da instalação agendada "
+                 "(sem agenda: hoje). Saldo físico inclui o que já foi baixado na aprovação.",
+            font=get_font(size=11), text_color=COLORS["text_secondary"],
+            anchor="w", wraplength=780, justify="left",
+        ).pack(padx=20, pady=(0, 8), anchor="w")
+
+        table = ctk.CTkScrollableFrame(dialog, fg_color="transparent")
+        table.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+
+        if not reorder:
+            ctk.CTkLabel(
+                table, text="Nenhum material fica abaixo do mínimo com o backlog atual.",
+                font=get_font(size=13), text_color=COLORS["text_secondary"],
+            ).pack(pady=40)
+            return
+
+        headers = ["Material", "Saldo físico", "Consumo", "Projeção", "Repor em", "Falta em", "Comprar"]
+        for col, text in enumerate(headers):
+            table.grid_columnconfigure(col, weight=3 if col == 0 else 1)
+            ctk.CTkLabel(
+                table, text=text, font=get_font(size=11, weight="bold"),
+                text_color=COLORS["text_secondary"], anchor="w" if col == 0 else "e",
+            ).grid(row=0, column=col, sticky="ew", padx=4, pady=(0, 4))
+
+        for row, item in enumerate(reorder, start=1):
+            unit = f" {item.unit}" if item.unit else ""
+            values = [
+                item.name,
+                f"{item.on_hand:,.1f}{unit}",
+                f"{item.demand:,.1f}{unit}",
+                f"{item.projected:,.1f}{unit}",
+                item.reorder_date.strftime("%d/%m/%Y"),
+                item.stockout_date.strftime("%d/%m/%Y") if item.stockout_date else "-",
+                f"{item.suggested_order:,.1f}{unit}",
+            ]
+            for col, text in enumerate(values):
+                color = COLORS["error"] if col == 5 and item.stockout_date else COLORS["text"]
+                ctk.CTkLabel(
+                    table, text=text, font=get_font(size=12), text_color=color,
+                    anchor="w" if col == 0 else "e",
+                ).grid(row=row, column=col, sticky="ew", padx=4, pady=2)
@@ -6,10 +6,11 @@ Gerenciar funcionários e pagamentos de folha.
 
 import customtkinter as ctk
 from datetime import datetime
-from database import db
+from database import db, events
 from components.cards import create_header
 from theme import get_color, COLORS
 from components.dialogs import ConfirmDialog, format_currency, format_date, parse_decimal
+from components.resources import get_font
 
 
 class PayrollView(ctk.CTkFrame):
@@ -18,9 +19,16 @@ class PayrollView(ctk.CTkFrame):
     def __init__(self, parent, app):
         super().__init__(parent, fg_color="transparent")
         self.app = app
+        self._changes = events.DirtyFlag([events.EMPLOYEE, events.PAYROLL])
         self._build_list()
 
+    def on_show(self):
+        """Recarrega apenas se funcionários ou pagamentos mudaram."""
+        if self._changes.consume():
+            self._build_list()
+
     def _build_list(self):
+        self._changes.consume()
         for w in self.winfo_children():
             w.destroy()
 
@@ -35,7 +43,7 @@ class PayrollView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="  👤 Novo Funcionário  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10,
             command=self._open_employee_form,
@@ -43,7 +51,7 @@ class PayrollView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="  💰 Registrar Pagamento  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             height=38, corner_radius=10,
             command=self._open_payroll_form,
@@ -69,9 +77,9 @@ class PayrollView(ctk.CTkFrame):
             cell = ctk.CTkFrame(grid, fg_color="transparent")
             cell.grid(row=0, column=col, padx=8, sticky="nsew")
             ctk.CTkFrame(cell, height=3, fg_color=color, corner_radius=2).pack(fill="x", pady=(0, 8))
-            ctk.CTkLabel(cell, text=label, font=ctk.CTkFont(size=11),
+            ctk.CTkLabel(cell, text=label, font=get_font(size=11),
                          text_color=COLORS["text_secondary"]).pack()
-            ctk.CTkLabel(cell, text=value, font=ctk.CTkFont(size=16, weight="bold"),
+            ctk.CTkLabel(cell, text=value, font=get_font(size=16, weight="bold"),
                          text_color=color).pack(pady=(2, 0))
 
         # Tabview: Funcionários | Pagamentos
@@ -101,7 +109,7 @@ class PayrollView(ctk.CTkFrame):
 
         if not employees:
             ctk.CTkLabel(scroll, text="Nenhum funcionário cadastrado.",
-                         font=ctk.CTkFont(size=14), text_color=COLORS["text_secondary"]).pack(pady=40)
+                         font=get_font(size=14), text_color=COLORS["text_secondary"]).pack(pady=40)
             return
 
         for emp in employees:
@@ -119,7 +127,7 @@ class PayrollView(ctk.CTkFrame):
             if not active:
                 name_text += " (Inativo)"
             ctk.CTkLabel(left, text=name_text,
-                         font=ctk.CTkFont(size=14, weight="bold"),
+                         font=get_font(size=14, weight="bold"),
                          text_color=COLORS["text"] if active else COLORS["text_secondary"]).pack(anchor="w")
 
             info_parts = []
@@ -129,7 +137,7 @@ class PayrollView(ctk.CTkFrame):
                 info_parts.append(f"📞 {emp['phone']}")
             info_parts.append(f"Salário: {format_currency(emp.get('salary', 0))}")
             ctk.CTkLabel(left, text="  |  ".join(info_parts),
-                         font=ctk.CTkFont(size=11), text_color=COLORS["text_secondary"]).pack(anchor="w")
+                         font=get_font(size=11), text_color=COLORS["text_secondary"]).pack(anchor="w")
 
             # Ações
             right = ctk.CTkFrame(inner, fg_color="transparent")
@@ -173,23 +181,23 @@ class PayrollView(ctk.CTkFrame):
         filter_frame.pack(fill="x", pady=(5, 10), padx=5)
 
         ctk.CTkLabel(filter_frame, text="Filtrar mês (AAAA-MM):",
-                     font=ctk.CTkFont(size=12), text_color=COLORS["text"]).pack(side="left")
+                     font=get_font(size=12), text_color=COLORS["text"]).pack(side="left")
 
         self.month_filter_entry = ctk.CTkEntry(filter_frame, width=120, height=32,
-                                                font=ctk.CTkFont(size=12),
+                                                font=get_font(size=12),
                                                 placeholder_text="Ex: 2025-02")
         self.month_filter_entry.pack(side="left", padx=8)
 
         ctk.CTkButton(
             filter_frame, text="Filtrar", height=32, width=70,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             command=lambda: self._reload_payroll(scroll),
         ).pack(side="left")
 
         ctk.CTkButton(
             filter_frame, text="Todos", height=32, width=60,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"),
             command=lambda: self._show_all_payroll(scroll),
@@ -217,7 +225,7 @@ class PayrollView(ctk.CTkFrame):
 
         if not records:
             ctk.CTkLabel(parent, text="Nenhum pagamento de folha registrado.",
-                         font=ctk.CTkFont(size=14), text_color=COLORS["text_secondary"]).pack(pady=30)
+                         font=get_font(size=14), text_color=COLORS["text_secondary"]).pack(pady=30)
             return
 
         for rec in records:
@@ -231,18 +239,18 @@ class PayrollView(ctk.CTkFrame):
             left.pack(side="left", fill="x", expand=True)
 
             ctk.CTkLabel(left, text=rec.get("employee_name", "-"),
-                         font=ctk.CTkFont(size=13, weight="bold"),
+                         font=get_font(size=13, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w")
             info = f"Ref: {rec.get('reference_month', '-')}  |  Data: {format_date(rec.get('payment_date', ''))}"
             if rec.get("employee_role"):
                 info = f"{rec['employee_role']}  |  " + info
             if rec.get("notes"):
                 info += f"  |  {rec['notes']}"
-            ctk.CTkLabel(left, text=info, font=ctk.CTkFont(size=11),
+            ctk.CTkLabel(left, text=info, font=get_font(size=11),
                          text_color=COLORS["text_secondary"]).pack(anchor="w")
 
             ctk.CTkLabel(inner, text=format_currency(rec.get("amount", 0)),
-                         font=ctk.CTkFont(size=14, weight="bold"),
+                         font=get_font(size=14, weight="bold"),
                          text_color=COLORS["error"]).pack(side="right", padx=(10, 0))
 
             ctk.CTkButton(
@@ -268,19 +276,19 @@ class PayrollView(ctk.CTkFrame):
         frame.pack(fill="both", expand=True, padx=20, pady=15)
 
         ctk.CTkLabel(frame, text="👤 Funcionário",
-                     font=ctk.CTkFont(size=18, weight="bold"),
+                     font=get_font(size=18, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w", pady=(0, 12))
 
         # Nome
-        ctk.CTkLabel(frame, text="Nome *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Nome *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        name_entry = ctk.CTkEntry(frame, height=35, font=ctk.CTkFont(size=13))
+        name_entry = ctk.CTkEntry(frame, height=35, font=get_font(size=13))
         name_entry.pack(fill="x", pady=(2, 8))
 
         # Cargo
-        ctk.CTkLabel(frame, text="Cargo", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Cargo", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        role_entry = ctk.CTkEntry(frame, height=35, font=ctk.CTkFont(size=13))
+        role_entry = ctk.CTkEntry(frame, height=35, font=get_font(size=13))
         role_entry.pack(fill="x", pady=(2, 8))
 
         # Telefone e Salário
@@ -288,14 +296,14 @@ class PayrollView(ctk.CTkFrame):
         row_frame.pack(fill="x", pady=(0, 8))
         row_frame.grid_columnconfigure((0, 1), weight=1)
 
-        ctk.CTkLabel(row_frame, text="Telefone", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(row_frame, text="Telefone", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=0, column=0, sticky="w")
-        phone_entry = ctk.CTkEntry(row_frame, height=35, font=ctk.CTkFont(size=13))
+        phone_entry = ctk.CTkEntry(row_frame, height=35, font=get_font(size=13))
         phone_entry.grid(row=1, column=0, sticky="ew", padx=(0, 5))
 
-        ctk.CTkLabel(row_frame, text="Salário (R$)", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(row_frame, text="Salário (R$)", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=0, column=1, sticky="w", padx=(5, 0))
-        salary_entry = ctk.CTkEntry(row_frame, height=35, font=ctk.CTkFont(size=13))
+        salary_entry = ctk.CTkEntry(row_frame, height=35, font=get_font(size=13))
         salary_entry.grid(row=1, column=1, sticky="ew", padx=(5, 0))
 
         if existing:
@@ -308,7 +316,7 @@ class PayrollView(ctk.CTkFrame):
         btn_frame.pack(fill="x", pady=(10, 0))
 
         ctk.CTkButton(
-            btn_frame, text="Cancelar", font=ctk.CTkFont(size=13),
+            btn_frame, text="Cancelar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), width=100, height=38,
             command=dialog.destroy,
@@ -348,7 +356,7 @@ class PayrollView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            btn_frame, text="💾 Salvar", font=ctk.CTkFont(size=13, weight="bold"),
+            btn_frame, text="💾 Salvar", font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             width=150, height=38, corner_radius=10,
             command=save,
@@ -375,21 +383,21 @@ class PayrollView(ctk.CTkFrame):
         frame.pack(fill="both", expand=True, padx=20, pady=15)
 
         ctk.CTkLabel(frame, text="💰 Pagamento de Folha",
-                     font=ctk.CTkFont(size=18, weight="bold"),
+                     font=get_font(size=18, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w", pady=(0, 12))
 
         # Funcionário
-        ctk.CTkLabel(frame, text="Funcionário *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Funcionário *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
         emp_names = [f"{e['name']} ({e.get('role', '-')})" for e in employees]
         emp_var = ctk.StringVar(value=emp_names[0])
         ctk.CTkOptionMenu(frame, values=emp_names, variable=emp_var,
-                          font=ctk.CTkFont(size=12), height=35).pack(fill="x", pady=(2, 8))
+                          font=get_font(size=12), height=35).pack(fill="x", pady=(2, 8))
 
         # Valor
-        ctk.CTkLabel(frame, text="Valor (R$) *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Valor (R$) *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        amount_entry = ctk.CTkEntry(frame, height=35, font=ctk.CTkFont(size=13))
+        amount_entry = ctk.CTkEntry(frame, height=35, font=get_font(size=13))
         amount_entry.pack(fill="x", pady=(2, 8))
         # Preencher com salário do primeiro funcionário
         amount_entry.insert(0, str(employees[0].get("salary", 0)))
@@ -402,24 +410,24 @@ class PayrollView(ctk.CTkFrame):
         emp_var.trace_add("write", lambda *_: on_emp_change(emp_var.get()))
 
         # Mês de referência
-        ctk.CTkLabel(frame, text="Mês Referência (AAAA-MM) *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Mês Referência (AAAA-MM) *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        month_entry = ctk.CTkEntry(frame, height=35, font=ctk.CTkFont(size=13),
+        month_entry = ctk.CTkEntry(frame, height=35, font=get_font(size=13),
                                     placeholder_text="Ex: 2025-02")
         month_entry.pack(fill="x", pady=(2, 8))
         month_entry.insert(0, datetime.now().strftime("%Y-%m"))
 
         # Observações
-        ctk.CTkLabel(frame, text="Observações", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(frame, text="Observações", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w")
-        notes_entry = ctk.CTkEntry(frame, height=35, font=ctk.CTkFont(size=13))
+        notes_entry = ctk.CTkEntry(frame, height=35, font=get_font(size=13))
         notes_entry.pack(fill="x", pady=(2, 12))
 
         btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
         btn_frame.pack(fill="x", pady=(10, 0))
 
         ctk.CTkButton(
-            btn_frame, text="Cancelar", font=ctk.CTkFont(size=13),
+            btn_frame, text="Cancelar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), width=100, height=38,
             command=dialog.destroy,
@@ -458,7 +466,7 @@ class PayrollView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            btn_frame, text="💾 Registrar", font=ctk.CTkFont(size=13, weight="bold"),
+            btn_frame, text="💾 Registrar", font=get_font(size=13, weight="bold"),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             width=150, height=38, corner_radius=10,
             command=save,
@@ -2,16 +2,21 @@
 """
 CalhaGest - Gestão de Produtos
 CRUD completo de produtos com pesquisa, filtro, tipos dinâmicos e materiais vinculados.
+Importação em massa do catálogo a partir de planilha CSV/XLSX e reajuste de
+preços em massa (com os orçamentos ainda não aprovados).
 """
 
 import customtkinter as ctk
-from database import db
+from database import db, events
 from components.cards import (
     StatusBadge, create_header, create_search_bar
 )
 from theme import COLORS, get_color
 from components.dialogs import ConfirmDialog, FormDialog, format_currency, parse_decimal
 from utils import format_measure, format_dimensions
+from components.view_cache import get_scroll_position, restore_scroll_position
+from components.resources import get_font
+from components.progressive import ProgressiveLoader
 
 
 def _get_product_types_map():
@@ -30,8 +35,34 @@ class ProductsView(ctk.CTkFrame):
         self.type_filter = ""
         self._cached_products = []  # Cache de produtos renderizados
         self._card_widgets = {}     # Controlar widgets já criados
+        self._scroll_position = 0.0
+        self._released = False
+        self._changes = events.DirtyFlag([events.PRODUCT, events.PRODUCT_TYPE, events.PRODUCT_MATERIAL])
         self._build()
 
+    def on_show(self):
+        """Recarrega se os produtos mudaram ou se os cards foram liberados."""
+        dirty = self._changes.consume()
+        released = self._released
+        if not (dirty or released):
+            return
+        self._released = False
+        self._load_products()
+        if released:
+            restore_scroll_position(self.list_frame, self._scroll_position)
+
+    def on_hide(self):
+        """Salva a posição de rolagem da lista."""
+        self._scroll_position = get_scroll_position(self.list_frame)
+
+    def release_heavy_resources(self):
+        """Destrói os cards de produto (busca e filtro de tipo são mantidos)."""
+        for w in self.list_frame.winfo_children():
+            w.destroy()
+        self._card_widgets = {}
+        self._cached_products = []
+        self._released = True
+
     def _build(self):
         # Cabeçalho
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -42,21 +73,35 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             left, text="Produtos",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=get_font(size=24, weight="bold"),
             text_color=COLORS["text"], anchor="w",
         ).pack(anchor="w")
         ctk.CTkLabel(
             left, text="Gerencie seu catálogo de produtos",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"], anchor="w",
         ).pack(anchor="w", pady=(3, 0))
 
         btn_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
         btn_frame.pack(side="right")
 
+        ctk.CTkButton(
+            btn_frame, text="💲 Reajustar", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), height=36, corner_radius=10,
+            command=self._open_reprice_dialog,
+        ).pack(side="left", padx=(0, 8))
+
+        ctk.CTkButton(
+            btn_frame, text="📥 Importar", font=get_font(size=12, weight="bold"),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), height=36, corner_radius=10,
+            command=self._open_import_dialog,
+        ).pack(side="left", padx=(0, 8))
+
         ctk.CTkButton(
             btn_frame, text="  + Novo Tipo  ",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             fg_color=get_color("warning"), hover_color=get_color("warning_hover"),
             height=36, corner_radius=10,
             command=self._open_add_type_dialog,
@@ -64,7 +109,7 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="  + Novo Produto  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10,
             command=self._open_add_dialog,
@@ -102,7 +147,7 @@ class ProductsView(ctk.CTkFrame):
             values=filter_values,
             variable=self.filter_var,
             command=self._on_filter,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             height=38,
         )
         self.type_seg.pack(side="right")
@@ -116,6 +161,7 @@ class ProductsView(ctk.CTkFrame):
         self._load_products()
 
     def _load_products(self):
+        self._changes.consume()
         # Carregar produtos do banco (usa cache depois da 1ª vez)
         products = db.get_all_products(search=self.search_text, type_filter=self.type_filter)
         self._cached_products = products
@@ -131,7 +177,7 @@ class ProductsView(ctk.CTkFrame):
         ctk.CTkLabel(
             self.list_frame,
             text=f"{len(products)} produto(s) encontrado(s)",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"], anchor="w",
         ).pack(fill="x", pady=(0, 10))
 
@@ -139,7 +185,7 @@ class ProductsView(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.list_frame,
                 text="Nenhum produto encontrado.",
-                font=ctk.CTkFont(size=14),
+                font=get_font(size=14),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=40)
             return
@@ -171,7 +217,7 @@ class ProductsView(ctk.CTkFrame):
             load_btn = ctk.CTkButton(
                 self.list_frame,
                 text=f"↓ Carregar {len(products) - 20} produto(s) restante(s)",
-                font=ctk.CTkFont(size=12),
+                font=get_font(size=12),
                 fg_color=get_color("primary_light"), 
                 text_color=get_color("primary"),
                 hover_color=get_color("primary_hover_light"),
@@ -200,14 +246,14 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             name_frame, text=product["name"],
-            font=ctk.CTkFont(size=15, weight="bold"),
+            font=get_font(size=15, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
         type_text = types_map.get(product["type"], product["type"])
         ctk.CTkLabel(
             name_frame, text=f"  {type_text}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=COLORS["primary_light"], text_color=COLORS["primary"],
             corner_radius=4,
         ).pack(side="left", padx=(8, 0))
@@ -217,7 +263,7 @@ class ProductsView(ctk.CTkFrame):
         if materials:
             ctk.CTkLabel(
                 name_frame, text=f"  📦 {len(materials)}  ",
-                font=ctk.CTkFont(size=10, weight="bold"),
+                font=get_font(size=10, weight="bold"),
                 fg_color=COLORS["success_light"], text_color=COLORS["success"],
                 corner_radius=4,
             ).pack(side="left", padx=(5, 0))
@@ -229,7 +275,7 @@ class ProductsView(ctk.CTkFrame):
         inst_tc = COLORS["success"] if is_installed else COLORS["warning"]
         ctk.CTkLabel(
             name_frame, text=f"  {inst_text}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=inst_fg, text_color=inst_tc,
             corner_radius=4,
         ).pack(side="left", padx=(5, 0))
@@ -244,7 +290,7 @@ class ProductsView(ctk.CTkFrame):
             pu_text = "📦 Unidade"
         ctk.CTkLabel(
             name_frame, text=f"  {pu_text}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=COLORS["primary_light"], text_color=COLORS["primary"],
             corner_radius=4,
         ).pack(side="left", padx=(5, 0))
@@ -265,7 +311,7 @@ class ProductsView(ctk.CTkFrame):
             details += f"  •  Dobra: +{format_currency(dobra_val)}/m"
         ctk.CTkLabel(
             left, text=details,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"], anchor="w",
         ).pack(anchor="w", pady=(4, 0))
 
@@ -276,7 +322,7 @@ class ProductsView(ctk.CTkFrame):
             )
             ctk.CTkLabel(
                 left, text=mat_text,
-                font=ctk.CTkFont(size=11),
+                font=get_font(size=11),
                 text_color=COLORS["text_secondary"], anchor="w",
             ).pack(anchor="w", pady=(2, 0))
 
@@ -291,7 +337,7 @@ class ProductsView(ctk.CTkFrame):
         dobra_hover = COLORS.get("success_hover", "#16a34a") if has_dobra else COLORS.get("error_hover", "#dc2626")
 
         ctk.CTkButton(
-            right, text=f"✂ {dobra_text}", font=ctk.CTkFont(size=11, weight="bold"),
+            right, text=f"✂ {dobra_text}", font=get_font(size=11, weight="bold"),
             fg_color=dobra_fg, hover_color=dobra_hover,
             text_color="white",
             width=70, height=32, corner_radius=8,
@@ -299,7 +345,7 @@ class ProductsView(ctk.CTkFrame):
         ).pack(side="left", padx=4)
 
         ctk.CTkButton(
-            right, text="📦 Material", font=ctk.CTkFont(size=11),
+            right, text="📦 Material", font=get_font(size=11),
             fg_color=COLORS["success_light"], text_color=COLORS["success"],
             hover_color=COLORS["success_hover_light"],
             width=90, height=32, corner_radius=8,
@@ -307,7 +353,7 @@ class ProductsView(ctk.CTkFrame):
         ).pack(side="left", padx=4)
 
         ctk.CTkButton(
-            right, text="✏️ Editar", font=ctk.CTkFont(size=12),
+            right, text="✏️ Editar", font=get_font(size=12),
             fg_color=COLORS["primary_light"], text_color=COLORS["primary"],
             hover_color=COLORS["primary_hover_light"],
             width=80, height=32, corner_radius=8,
@@ -315,7 +361,7 @@ class ProductsView(ctk.CTkFrame):
         ).pack(side="left", padx=4)
 
         ctk.CTkButton(
-            right, text="🗑️", font=ctk.CTkFont(size=12),
+            right, text="🗑️", font=get_font(size=12),
             fg_color=COLORS["error_light"], text_color=COLORS["error"],
             hover_color=COLORS["error_hover_light"],
             width=40, height=32, corner_radius=8,
@@ -347,13 +393,13 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             dialog, text="Tipos de Produto",
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=get_font(size=18, weight="bold"),
             text_color=COLORS["text"],
         ).pack(padx=20, pady=(15, 5))
 
         ctk.CTkLabel(
             dialog, text="Adicione ou remova tipos de produto",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(padx=20, pady=(0, 10))
 
@@ -365,13 +411,13 @@ class ProductsView(ctk.CTkFrame):
         add_inner = ctk.CTkFrame(add_frame, fg_color="transparent")
         add_inner.pack(fill="x", padx=12, pady=10)
 
-        ctk.CTkLabel(add_inner, text="Nome do Tipo:", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(add_inner, text="Nome do Tipo:", font=get_font(size=12),
                      text_color=COLORS["text"]).pack(anchor="w")
 
         entry_frame = ctk.CTkFrame(add_inner, fg_color="transparent")
         entry_frame.pack(fill="x", pady=(4, 0))
 
-        type_entry = ctk.CTkEntry(entry_frame, height=35, font=ctk.CTkFont(size=13),
+        type_entry = ctk.CTkEntry(entry_frame, height=35, font=get_font(size=13),
                                    placeholder_text="Ex: Coifa, Calha Americana...")
         type_entry.pack(side="left", fill="x", expand=True, padx=(0, 8))
 
@@ -390,7 +436,7 @@ class ProductsView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            entry_frame, text="+ Adicionar", font=ctk.CTkFont(size=12, weight="bold"),
+            entry_frame, text="+ Adicionar", font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=35, width=100, corner_radius=8,
             command=add_type,
@@ -413,13 +459,13 @@ class ProductsView(ctk.CTkFrame):
 
                 ctk.CTkLabel(
                     inner, text=t["label"],
-                    font=ctk.CTkFont(size=13, weight="bold"),
+                    font=get_font(size=13, weight="bold"),
                     text_color=COLORS["text"],
                 ).pack(side="left")
 
                 ctk.CTkLabel(
                     inner, text=f"({t['key']})",
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     text_color=COLORS["text_secondary"],
                 ).pack(side="left", padx=(8, 0))
 
@@ -438,7 +484,7 @@ class ProductsView(ctk.CTkFrame):
         refresh_types_list()
 
         ctk.CTkButton(
-            dialog, text="Fechar", font=ctk.CTkFont(size=13),
+            dialog, text="Fechar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), height=36,
             command=lambda: self._close_type_dialog(dialog),
@@ -468,14 +514,14 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             dialog, text=f"Materiais de: {product['name']}",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(padx=20, pady=(15, 3))
 
         ctk.CTkLabel(
             dialog,
             text="Vincule materiais do estoque que serão consumidos ao aprovar um orçamento",
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=COLORS["text_secondary"],
             wraplength=500,
         ).pack(padx=20, pady=(0, 10))
@@ -487,7 +533,7 @@ class ProductsView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             add_frame, text="Adicionar Material",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             text_color=COLORS["text"],
         ).pack(padx=12, pady=(10, 5), anchor="w")
 
@@ -505,15 +551,15 @@ class ProductsView(ctk.CTkFrame):
         if inv_names:
             ctk.CTkOptionMenu(
                 add_inner, values=inv_names, variable=inv_var,
-                font=ctk.CTkFont(size=11), height=33,
+                font=get_font(size=11), height=33,
             ).grid(row=0, column=0, sticky="ew", padx=(0, 5))
         else:
             ctk.CTkLabel(
                 add_inner, text="Nenhum material no estoque",
-                font=ctk.CTkFont(size=11), text_color=COLORS["error"],
+                font=get_font(size=11), text_color=COLORS["error"],
             ).grid(row=0, column=0, sticky="ew", padx=(0, 5))
 
-        qty_entry = ctk.CTkEntry(add_inner, width=70, height=33, font=ctk.CTkFont(size=12),
+        qty_entry = ctk.CTkEntry(add_inner, width=70, height=33, font=get_font(size=12),
                                   placeholder_text="Qtd")
         qty_entry.grid(row=0, column=1, padx=(0, 5))
         qty_entry.insert(0, "1")
@@ -521,7 +567,7 @@ class ProductsView(ctk.CTkFrame):
         unit_var = ctk.StringVar(value="metro")
         ctk.CTkOptionMenu(
             add_inner, values=["metro", "cm", "unidade"], variable=unit_var,
-            font=ctk.CTkFont(size=11), height=33, width=90,
+            font=get_font(size=11), height=33, width=90,
         ).grid(row=0, column=2, padx=(0, 5))
 
         def add_material():
@@ -544,7 +590,7 @@ class ProductsView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            add_inner, text="+", font=ctk.CTkFont(size=14, weight="bold"),
+            add_inner, text="+", font=get_font(size=14, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=33, width=40, corner_radius=8,
             command=add_material,
@@ -565,7 +611,7 @@ class ProductsView(ctk.CTkFrame):
                 ctk.CTkLabel(
                     materials_list_frame,
                     text="Nenhum material vinculado.\nAdicione materiais para que o estoque seja atualizado automaticamente.",
-                    font=ctk.CTkFont(size=12),
+                    font=get_font(size=12),
                     text_color=COLORS["text_secondary"],
                     justify="center",
                 ).pack(pady=20)
@@ -580,7 +626,7 @@ class ProductsView(ctk.CTkFrame):
 
                 ctk.CTkLabel(
                     inner, text=mat["inventory_name"],
-                    font=ctk.CTkFont(size=13, weight="bold"),
+                    font=get_font(size=13, weight="bold"),
                     text_color=COLORS["text"],
                 ).pack(side="left")
 
@@ -588,7 +634,7 @@ class ProductsView(ctk.CTkFrame):
                 ctk.CTkLabel(
                     inner,
                     text=f"  {mat['quantity_per_unit']} {unit_label}  ",
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     fg_color=COLORS["primary_light"],
                     text_color=COLORS["primary"],
                     corner_radius=4,
@@ -597,7 +643,7 @@ class ProductsView(ctk.CTkFrame):
                 ctk.CTkLabel(
                     inner,
                     text=f"  Estoque: {mat['inventory_quantity']:.0f} {mat['inventory_unit']}  ",
-                    font=ctk.CTkFont(size=10),
+                    font=get_font(size=10),
                     text_color=COLORS["text_secondary"],
                 ).pack(side="left", padx=(5, 0))
 
@@ -616,7 +662,7 @@ class ProductsView(ctk.CTkFrame):
         refresh_materials_list()
 
         ctk.CTkButton(
-            dialog, text="Fechar", font=ctk.CTkFont(size=13),
+            dialog, text="Fechar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), height=36,
             command=lambda: (dialog.destroy(), self._load_products()),
@@ -686,6 +732,166 @@ class ProductsView(ctk.CTkFrame):
         except Exception as e:
             self.app.show_toast(f"Erro ao criar produto: {e}", "error")
 
+    def _open_import_dialog(self):
+        """Importa produtos de uma planilha, com pré-visualização do diff."""
+        from components.import_dialog import ImportDialog, ask_import_file
+        path = ask_import_file(self.app)
+        if path:
+            ImportDialog(self.app, path, "products", on_done=self._load_products)
+
+    def _open_reprice_dialog(self):
+        """Reajuste de preços em massa: filtros, simulação e aplicação."""
+        dialog = ctk.CTkToplevel(self.app)
+        dialog.title("Reajuste de Preços")
+        dialog.geometry("560x620")
+        dialog.grab_set()
+        dialog.transient(self.app)
+
+        dialog.update_idletasks()
+        x = self.app.winfo_rootx() + (self.app.winfo_width() - 560) // 2
+        y = self.app.winfo_rooty() + (self.app.winfo_height() - 620) // 2
+        dialog.geometry(f"+{x}+{y}")
+
+        ctk.CTkLabel(
+            dialog, text="💲 Reajuste de Preços",
+            font=get_font(size=18, weight="bold"), text_color=COLORS["text"],
+        ).pack(padx=20, pady=(15, 10), anchor="w")
+
+        form = ctk.CTkFrame(dialog, fg_color=COLORS["card"], corner_radius=10,
+                            border_width=1, border_color=COLORS["border"])
+        form.pack(fill="x", padx=20)
+        form.grid_columnconfigure(1, weight=1)
+
+        def row_label(row, text):
+            ctk.CTkLabel(form, text=text, font=get_font(size=12),
+                         text_color=COLORS["text"]).grid(row=row, column=0, sticky="w", padx=12, pady=6)
+
+        types_map = _get_product_types_map()
+        type_keys = {"Todos": "", **{label: key for key, label in types_map.items()}}
+        row_label(0, "Tipo:")
+        type_var = ctk.StringVar(value="Todos")
+        ctk.CTkOptionMenu(form, values=list(type_keys), variable=type_var,
+                          font=get_font(size=12)).grid(row=0, column=1, sticky="ew", padx=12, pady=6)
+
+        row_label(1, "Nome contém:")
+        name_entry = ctk.CTkEntry(form, height=32, font=get_font(size=12),
+                                  placeholder_text="Ex: calha* (vazio = todos)")
+        name_entry.grid(row=1, column=1, sticky="ew", padx=12, pady=6)
+
+        dobra_options = {"Todos": None, "Com dobra": 1, "Sem dobra": 0}
+        row_label(2, "Dobra:")
+        dobra_var = ctk.StringVar(value="Todos")
+        ctk.CTkSegmentedButton(form, values=list(dobra_options), variable=dobra_var,
+                               font=get_font(size=12)).grid(row=2, column=1, sticky="ew", padx=12, pady=6)
+
+        modes = {"Percentual (%)": "percent", "Valor fixo (R$)": "absolute", "Valor da dobra": "dobra"}
+        row_label(3, "Reajuste:")
+        mode_var = ctk.StringVar(value="Percentual (%)")
+        ctk.CTkSegmentedButton(form, values=list(modes), variable=mode_var,
+                               font=get_font(size=12)).grid(row=3, column=1, sticky="ew", padx=12, pady=6)
+
+        row_label(4, "Valor:")
+        value_entry = ctk.CTkEntry(form, height=32, font=get_font(size=12),
+                                   placeholder_text="Ex: 8,5 ou -10 (valor da dobra: novo valor em R$)")
+        value_entry.grid(row=4, column=1, sticky="ew", padx=12, pady=6)
+
+        quotes_var = ctk.IntVar(value=1)
+        ctk.CTkCheckBox(
+            form, text="Atualizar itens dos orçamentos em rascunho/enviados",
+            variable=quotes_var, font=get_font(size=12),
+        ).grid(row=5, column=0, columnspan=2, sticky="w", padx=12, pady=(6, 12))
+
+        report_box = ctk.CTkTextbox(dialog, font=get_font(size=12), height=200, wrap="word")
+        report_box.pack(fill="both", expand=True, padx=20, pady=10)
+        report_box.insert("1.0", "Use 'Simular' para ver o efeito antes de aplicar.\n"
+                                 "Valor da dobra vale para todos os produtos com dobra (filtros ignorados).")
+        report_box.configure(state="disabled")
+
+        # Com muitos produtos o reajuste (e o backup) leva segundos: roda em segundo plano
+        loader = ProgressiveLoader(dialog)
+
+        def set_busy(busy):
+            for button in (simulate_btn, apply_btn):
+                button.configure(state="disabled" if busy else "normal")
+
+        def run(dry_run, on_done):
+            raw = value_entry.get().strip()
+            if not raw:
+                self.app.show_toast("Informe o valor do reajuste.", "error")
+                return
+            try:
+                value = parse_decimal(raw)
+            except Exception as e:
+                self.app.show_toast(f"Erro no reajuste: {e}", "error")
+                return
+
+            def done(report):
+                set_busy(False)
+                on_done(report)
+
+            def failed(error):
+                set_busy(False)
+                self.app.show_toast(f"Erro no reajuste: {error}", "error")
+
+            set_busy(True)
+            loader.submit(
+                db.reprice_products, done,
+                modes[mode_var.get()], value, type_keys.get(type_var.get(), ""),
+                name_entry.get().strip(), dobra_options[dobra_var.get()],
+                bool(quotes_var.get()), dry_run,
+                on_error=failed,
+            )
+
+        def show_report(report):
+            lines = [
+                f"{'Simulação' if report['dry_run'] else 'Aplicado'}: "
+                f"{report['products_changed']} de {report['products']} produtos com novo preço",
+            ]
+            if report["mode"] == "dobra":
+                lines.append(f"Dobra: {format_currency(report['dobra_before'])} → "
+                             f"{format_currency(report['dobra_after'])}")
+            if quotes_var.get():
+                lines.append(f"Orçamentos abertos: {report['quotes']} ({report['items']} itens); "
+                             f"{report['skipped_items']} itens com preço customizado mantidos")
+                lines.append(f"Total dos orçamentos: {format_currency(report['quotes_total_before'])} → "
+                             f"{format_currency(report['quotes_total_after'])}")
+            lines.append("")
+            for p in report["sample"]:
+                lines.append(f"{p['name']}: {format_currency(p['old_price'])} → {format_currency(p['new_price'])}")
+            if report["products"] > len(report["sample"]):
+                lines.append(f"... e mais {report['products'] - len(report['sample'])} produtos.")
+            report_box.configure(state="normal")
+            report_box.delete("1.0", "end")
+            report_box.insert("1.0", "\n".join(lines))
+            report_box.configure(state="disabled")
+
+        def simulate():
+            run(True, show_report)
+
+        def applied(report):
+            show_report(report)
+            self.app.show_toast(f"Preços reajustados: {report['products_changed']} produtos, "
+                                f"{report['quotes']} orçamentos.", "success")
+            self._load_products()
+
+        def apply():
+            run(False, applied)
+
+        btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        btn_frame.pack(fill="x", padx=20, pady=(0, 15))
+        simulate_btn = ctk.CTkButton(
+            btn_frame, text="Simular", fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), width=140, command=simulate,
+        )
+        simulate_btn.pack(side="left")
+        apply_btn = ctk.CTkButton(
+            btn_frame, text="Aplicar", fg_color=get_color("primary"),
+            hover_color=get_color("primary_hover"), width=140,
+            command=lambda: ConfirmDialog(dialog, "Reajuste de Preços",
+                                          "Aplicar o reajuste aos produtos selecionados?", apply),
+        )
+        apply_btn.pack(side="right")
+
     def _open_edit_dialog(self, product):
         FormDialog(
             self.app, "Editar Produto",
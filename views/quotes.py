@@ -7,11 +7,16 @@ Criar, visualizar, editar orçamentos, gerar PDF e gerenciar status.
 import customtkinter as ctk
 import os
 import subprocess
-from database import db
+import threading
+from database import db, events
 from components.cards import StatusBadge, create_header, create_search_bar
 from theme import get_color, COLORS
 from components.dialogs import ConfirmDialog, format_currency, format_date, DateEntry, parse_decimal
 from utils import format_measure, format_dimensions
+from components.view_cache import get_scroll_position, restore_scroll_position
+from components.resources import get_font
+from components.progressive import ProgressiveLoader, Skeleton
+from components.pdf_preview import PdfPreviewDialog
 
 
 STATUS_OPTIONS = ["Todos", "Rascunho", "Enviado", "Aprovado", "Concluído"]
@@ -36,10 +41,50 @@ class QuotesView(ctk.CTkFrame):
         self.search_text = ""
         self.status_filter = ""
         self.payment_filter = ""  # "", "paid", "pending"
+        # Estado leve preservado quando os cards são liberados
+        self._detail_quote_id = None
+        self._scroll_position = 0.0
+        self._released = False
+        self._detail_pending = False
+        self._loader = ProgressiveLoader(self)
+        self._changes = events.DirtyFlag([events.QUOTE, events.QUOTE_ITEM, events.PAYMENT])
         self._build_list()
 
+    def on_show(self):
+        """Recarrega apenas se os dados mudaram ou se os cards foram liberados."""
+        dirty = self._changes.consume()
+        released = self._released
+        if not (dirty or released or self._detail_pending):
+            return
+        self._released = False
+        if self._detail_quote_id is not None:
+            if dirty or self._detail_pending:
+                # Orçamento excluído em outra tela: _render_detail volta para a lista
+                self._show_detail(self._detail_quote_id)
+        elif self.list_frame.winfo_exists():
+            self._load_quotes()
+            if released:
+                restore_scroll_position(self.list_frame, self._scroll_position)
+
+    def on_hide(self):
+        """Salva a posição de rolagem da lista e descarta cargas em andamento."""
+        self._loader.cancel()
+        if self._detail_quote_id is None and self.list_frame.winfo_exists():
+            self._scroll_position = get_scroll_position(self.list_frame)
+
+    def release_heavy_resources(self):
+        """Destrói os cards da lista (filtros e busca são mantidos)."""
+        if self._detail_quote_id is not None or not self.list_frame.winfo_exists():
+            return
+        for w in self.list_frame.winfo_children():
+            w.destroy()
+        self._released = True
+
     def _build_list(self):
         """Constrói a view de listagem."""
+        self._loader.cancel()
+        self._detail_quote_id = None
+        self._detail_pending = False
         # Limpar
         for w in self.winfo_children():
             w.destroy()
@@ -57,7 +102,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame_header, text="  🔧 Orçamento Instalado  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10,
             command=lambda: self._open_create_form(quote_type="instalado"),
@@ -65,12 +110,20 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame_header, text="  📦 Orçamento Não Instalado  ",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("warning"), hover_color=get_color("warning_hover"),
             height=38, corner_radius=10,
             command=lambda: self._open_create_form(quote_type="nao_instalado"),
         ).pack(side="left")
 
+        ctk.CTkButton(
+            btn_frame_header, text="  📑 Exportar PDFs  ",
+            font=get_font(size=13, weight="bold"),
+            fg_color=get_color("success"), hover_color=get_color("success_hover"),
+            height=38, corner_radius=10,
+            command=self._open_batch_export,
+        ).pack(side="left", padx=(8, 0))
+
         # Pesquisa + Filtro
         filter_frame = ctk.CTkFrame(self, fg_color="transparent")
         filter_frame.pack(fill="x", pady=(0, 15))
@@ -86,7 +139,7 @@ class QuotesView(ctk.CTkFrame):
             values=STATUS_OPTIONS,
             variable=self.filter_var,
             command=self._on_filter,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             height=38,
         ).pack(side="right")
 
@@ -101,7 +154,7 @@ class QuotesView(ctk.CTkFrame):
             values=PAYMENT_FILTER_OPTIONS,
             variable=self.pay_filter_var,
             command=self._on_payment_filter,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             height=34,
         ).pack(side="left")
 
@@ -129,6 +182,7 @@ class QuotesView(ctk.CTkFrame):
         self._load_quotes()
 
     def _load_quotes(self):
+        self._changes.consume()
         for w in self.list_frame.winfo_children():
             w.destroy()
 
@@ -160,34 +214,34 @@ class QuotesView(ctk.CTkFrame):
         # Recebido
         recv_box = ctk.CTkFrame(pay_summary_frame, fg_color=COLORS["success_light"], corner_radius=8)
         recv_box.grid(row=0, column=0, sticky="ew", padx=(0, 4))
-        ctk.CTkLabel(recv_box, text="💵 Recebido", font=ctk.CTkFont(size=10),
+        ctk.CTkLabel(recv_box, text="💵 Recebido", font=get_font(size=10),
                      text_color=COLORS["text_secondary"]).pack(padx=8, pady=(6, 0))
         ctk.CTkLabel(recv_box, text=format_currency(total_received_amount),
-                     font=ctk.CTkFont(size=14, weight="bold"),
+                     font=get_font(size=14, weight="bold"),
                      text_color=COLORS["success"]).pack(padx=8, pady=(0, 6))
 
         # Devedor
         debt_box = ctk.CTkFrame(pay_summary_frame, fg_color=COLORS["error_light"], corner_radius=8)
         debt_box.grid(row=0, column=1, sticky="ew", padx=4)
-        ctk.CTkLabel(debt_box, text="📛 Devedor", font=ctk.CTkFont(size=10),
+        ctk.CTkLabel(debt_box, text="📛 Devedor", font=get_font(size=10),
                      text_color=COLORS["text_secondary"]).pack(padx=8, pady=(6, 0))
         ctk.CTkLabel(debt_box, text=format_currency(total_pending_amount),
-                     font=ctk.CTkFont(size=14, weight="bold"),
+                     font=get_font(size=14, weight="bold"),
                      text_color=COLORS["error"]).pack(padx=8, pady=(0, 6))
 
         # Quitados
         paid_box = ctk.CTkFrame(pay_summary_frame, fg_color=COLORS["primary_lighter"], corner_radius=8)
         paid_box.grid(row=0, column=2, sticky="ew", padx=(4, 0))
-        ctk.CTkLabel(paid_box, text="✅ Quitados", font=ctk.CTkFont(size=10),
+        ctk.CTkLabel(paid_box, text="✅ Quitados", font=get_font(size=10),
                      text_color=COLORS["text_secondary"]).pack(padx=8, pady=(6, 0))
         ctk.CTkLabel(paid_box, text=str(total_paid_count),
-                     font=ctk.CTkFont(size=14, weight="bold"),
+                     font=get_font(size=14, weight="bold"),
                      text_color=COLORS["primary"]).pack(padx=8, pady=(0, 6))
 
         ctk.CTkLabel(
             self.list_frame,
             text=f"{len(quotes)} orçamento(s)",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(fill="x", pady=(0, 10))
@@ -196,7 +250,7 @@ class QuotesView(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.list_frame,
                 text="Nenhum orçamento encontrado.",
-                font=ctk.CTkFont(size=14),
+                font=get_font(size=14),
                 text_color=COLORS["text_secondary"],
             ).pack(pady=40)
             return
@@ -227,14 +281,14 @@ class QuotesView(ctk.CTkFrame):
         ctk.CTkLabel(
             top_row,
             text=f"#{quote['id']:05d}",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(side="left")
 
         ctk.CTkLabel(
             top_row,
             text=f"  {quote['client_name']}",
-            font=ctk.CTkFont(size=15, weight="bold"),
+            font=get_font(size=15, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
@@ -246,7 +300,7 @@ class QuotesView(ctk.CTkFrame):
         qt_tc = COLORS["success"] if qt == "instalado" else COLORS["warning"]
         ctk.CTkLabel(
             top_row, text=f"  {qt_text}  ",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=get_font(size=10, weight="bold"),
             fg_color=qt_fg, text_color=qt_tc,
             corner_radius=4,
         ).pack(side="left", padx=(6, 0))
@@ -266,7 +320,7 @@ class QuotesView(ctk.CTkFrame):
         ctk.CTkLabel(
             left,
             text=details,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             anchor="w",
         ).pack(anchor="w", pady=(4, 0))
@@ -276,7 +330,7 @@ class QuotesView(ctk.CTkFrame):
         right.pack(side="right")
 
         ctk.CTkButton(
-            right, text="👁️ Ver", font=ctk.CTkFont(size=12),
+            right, text="👁️ Ver", font=get_font(size=12),
             fg_color=COLORS["primary_light"], text_color=COLORS["primary"],
             hover_color=COLORS["primary_hover_light"],
             width=70, height=32, corner_radius=8,
@@ -286,7 +340,7 @@ class QuotesView(ctk.CTkFrame):
         status = quote.get("status", "draft")
         if status in ("draft", "sent", "approved"):
             ctk.CTkButton(
-                right, text="✏️", font=ctk.CTkFont(size=12),
+                right, text="✏️", font=get_font(size=12),
                 fg_color=COLORS["warning_light"], text_color=COLORS["warning"],
                 hover_color=COLORS["warning_hover_light"],
                 width=36, height=32, corner_radius=8,
@@ -294,7 +348,7 @@ class QuotesView(ctk.CTkFrame):
             ).pack(side="left", padx=3)
 
         ctk.CTkButton(
-            right, text="📄 PDF", font=ctk.CTkFont(size=12),
+            right, text="📄 PDF", font=get_font(size=12),
             fg_color=COLORS["success_light"], text_color=COLORS["success"],
             hover_color=COLORS["success_hover_light"],
             width=70, height=32, corner_radius=8,
@@ -302,7 +356,7 @@ class QuotesView(ctk.CTkFrame):
         ).pack(side="left", padx=3)
 
         ctk.CTkButton(
-            right, text="🗑️", font=ctk.CTkFont(size=12),
+            right, text="🗑️", font=get_font(size=12),
             fg_color=COLORS["error_light"], text_color=COLORS["error"],
             hover_color=COLORS["error_hover_light"],
             width=36, height=32, corner_radius=8,
@@ -312,10 +366,62 @@ class QuotesView(ctk.CTkFrame):
     # ========== Detalhes do Orçamento ==========
 
     def _show_detail(self, quote_id):
+        """Mostra o cabeçalho e skeletons imediatamente e busca o orçamento em segundo plano."""
+        self._detail_quote_id = quote_id
+        self._detail_pending = True
+        self._changes.consume()
+        for w in self.winfo_children():
+            w.destroy()
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", pady=(0, 15))
+
+        ctk.CTkButton(
+            header, text="← Voltar", font=get_font(size=13),
+            fg_color="transparent", text_color=COLORS["primary"],
+            hover_color=COLORS["border"], height=32, width=80,
+            command=self._build_list,
+        ).pack(side="left")
+
+        ctk.CTkLabel(
+            header, text=f"Orçamento #{quote_id:05d}",
+            font=get_font(size=22, weight="bold"),
+            text_color=COLORS["text"],
+        ).pack(side="left", padx=15)
+
+        Skeleton(self, lines=1).pack(fill="x", pady=(0, 15))
+        Skeleton(self, lines=4).pack(fill="x", pady=(0, 15))
+        Skeleton(self, lines=0, height=180).pack(fill="x")
+
+        self._loader.cancel()
+        self._loader.submit(self._fetch_detail, self._render_detail, quote_id,
+                            on_error=self._on_detail_error)
+
+    @staticmethod
+    def _fetch_detail(quote_id):
+        """Consultas da tela de detalhes (thread de trabalho, sem widgets)."""
         quote = db.get_quote_by_id(quote_id)
         if not quote:
+            return None
+        return {
+            "quote": quote,
+            "summary": db.get_payment_summary(quote_id),
+            "payments": db.get_payments_by_quote(quote_id),
+        }
+
+    def _on_detail_error(self, error):
+        self._detail_pending = False
+        self.app.show_toast(f"Erro ao carregar orçamento: {error}", "error")
+        self._build_list()
+
+    def _render_detail(self, data):
+        """Substitui os skeletons pelos detalhes do orçamento."""
+        self._detail_pending = False
+        if data is None:
             self.app.show_toast("Orçamento não encontrado.", "error")
+            self._build_list()
             return
+        quote = data["quote"]
 
         # Limpar e construir view de detalhes
         for w in self.winfo_children():
@@ -326,7 +432,7 @@ class QuotesView(ctk.CTkFrame):
         header.pack(fill="x", pady=(0, 15))
 
         ctk.CTkButton(
-            header, text="← Voltar", font=ctk.CTkFont(size=13),
+            header, text="← Voltar", font=get_font(size=13),
             fg_color="transparent", text_color=COLORS["primary"],
             hover_color=COLORS["border"], height=32, width=80,
             command=self._build_list,
@@ -334,7 +440,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             header, text=f"Orçamento #{quote['id']:05d}",
-            font=ctk.CTkFont(size=22, weight="bold"),
+            font=get_font(size=22, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left", padx=15)
 
@@ -361,14 +467,14 @@ class QuotesView(ctk.CTkFrame):
 
         for label, new_status, color in transitions.get(status, []):
             ctk.CTkButton(
-                action_inner, text=label, font=ctk.CTkFont(size=13, weight="bold"),
+                action_inner, text=label, font=get_font(size=13, weight="bold"),
                 fg_color=color, hover_color=color,
                 height=36, corner_radius=8,
                 command=lambda ns=new_status, qid=quote["id"]: self._change_status(qid, ns),
             ).pack(side="left", padx=5)
 
         ctk.CTkButton(
-            action_inner, text="📄 Gerar PDF", font=ctk.CTkFont(size=13),
+            action_inner, text="📄 Gerar PDF", font=get_font(size=13),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             height=36, corner_radius=8,
             command=lambda: self._generate_pdf(quote["id"]),
@@ -376,14 +482,14 @@ class QuotesView(ctk.CTkFrame):
 
         if status in ("draft", "sent", "approved"):
             ctk.CTkButton(
-                action_inner, text="✏️ Editar", font=ctk.CTkFont(size=13),
+                action_inner, text="✏️ Editar", font=get_font(size=13),
                 fg_color=get_color("warning"), hover_color=get_color("warning_hover"),
                 height=36, corner_radius=8,
                 command=lambda: self._open_edit_form(quote["id"]),
             ).pack(side="left", padx=5)
 
             ctk.CTkButton(
-                action_inner, text="📋 Clonar Orçamento", font=ctk.CTkFont(size=13),
+                action_inner, text="📋 Clonar Orçamento", font=get_font(size=13),
                 fg_color="#8b5cf6", hover_color="#7c3aed",
                 height=36, corner_radius=8,
                 command=lambda: self._clone_quote_dialog(quote),
@@ -396,7 +502,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             client_card, text="👤 Dados do Cliente",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
             anchor="w",
         ).pack(padx=15, pady=(12, 5), anchor="w")
 
@@ -411,7 +517,7 @@ class QuotesView(ctk.CTkFrame):
 
         for line in info_lines:
             ctk.CTkLabel(
-                client_card, text=line, font=ctk.CTkFont(size=13),
+                client_card, text=line, font=get_font(size=13),
                 text_color=COLORS["text_secondary"], anchor="w",
             ).pack(padx=15, pady=1, anchor="w")
 
@@ -424,7 +530,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             items_card, text="📦 Itens do Orçamento",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
             anchor="w",
         ).pack(padx=15, pady=(12, 5), anchor="w")
 
@@ -439,7 +545,7 @@ class QuotesView(ctk.CTkFrame):
             for text, weight in cols:
                 ctk.CTkLabel(
                     table_header, text=text,
-                    font=ctk.CTkFont(size=11, weight="bold"),
+                    font=get_font(size=11, weight="bold"),
                     text_color=COLORS["primary"],
                 ).pack(side="left", expand=(weight > 1), fill="x", padx=5, pady=6)
 
@@ -461,7 +567,7 @@ class QuotesView(ctk.CTkFrame):
                 ]
                 for text, weight in vals:
                     ctk.CTkLabel(
-                        row, text=text, font=ctk.CTkFont(size=12),
+                        row, text=text, font=get_font(size=12),
                         text_color=COLORS["text"],
                     ).pack(side="left", expand=(weight > 1), fill="x", padx=5, pady=4)
 
@@ -470,7 +576,7 @@ class QuotesView(ctk.CTkFrame):
         else:
             ctk.CTkLabel(
                 items_card, text="Nenhum item adicionado.",
-                font=ctk.CTkFont(size=13), text_color=COLORS["text_secondary"],
+                font=get_font(size=13), text_color=COLORS["text_secondary"],
             ).pack(padx=15, pady=10)
 
         # Totais
@@ -508,12 +614,12 @@ class QuotesView(ctk.CTkFrame):
             row.pack(fill="x", padx=10, pady=2)
             ctk.CTkLabel(
                 row, text=label,
-                font=ctk.CTkFont(size=13, weight="bold" if bold else "normal"),
+                font=get_font(size=13, weight="bold" if bold else "normal"),
                 text_color=COLORS["text"],
             ).pack(side="left")
             ctk.CTkLabel(
                 row, text=value,
-                font=ctk.CTkFont(size=13, weight="bold" if bold else "normal"),
+                font=get_font(size=13, weight="bold" if bold else "normal"),
                 text_color=COLORS["primary"] if bold else COLORS["text"],
             ).pack(side="right")
 
@@ -524,12 +630,12 @@ class QuotesView(ctk.CTkFrame):
             notes_card.pack(fill="x", pady=(0, 10))
             ctk.CTkLabel(
                 notes_card, text="📝 Notas Técnicas",
-                font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
                 anchor="w",
             ).pack(padx=15, pady=(12, 5), anchor="w")
             ctk.CTkLabel(
                 notes_card, text=quote["technical_notes"],
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
                 anchor="w", wraplength=600, justify="left",
             ).pack(padx=15, pady=(0, 12), anchor="w")
 
@@ -540,7 +646,7 @@ class QuotesView(ctk.CTkFrame):
             pay_card.pack(fill="x", pady=(0, 10))
             ctk.CTkLabel(
                 pay_card, text="💳 Métodos de Pagamento",
-                font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
                 anchor="w",
             ).pack(padx=15, pady=(12, 5), anchor="w")
 
@@ -557,7 +663,7 @@ class QuotesView(ctk.CTkFrame):
                     label = pay_labels.get(method, method)
                     badge = ctk.CTkLabel(
                         methods_frame, text=f" {label} ",
-                        font=ctk.CTkFont(size=12),
+                        font=get_font(size=12),
                         fg_color=COLORS["primary_light"],
                         text_color=COLORS["primary"],
                         corner_radius=6, height=28,
@@ -571,25 +677,27 @@ class QuotesView(ctk.CTkFrame):
             terms_card.pack(fill="x", pady=(0, 10))
             ctk.CTkLabel(
                 terms_card, text="📋 Condições de Contrato",
-                font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
                 anchor="w",
             ).pack(padx=15, pady=(12, 5), anchor="w")
             ctk.CTkLabel(
                 terms_card, text=quote["contract_terms"],
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
                 anchor="w", wraplength=600, justify="left",
             ).pack(padx=15, pady=(0, 12), anchor="w")
 
         # === SEÇÃO DE PAGAMENTOS (Saldo Devedor / Saldo Pago) ===
-        self._build_payments_section(scroll, quote)
+        self._build_payments_section(scroll, quote, data["summary"], data["payments"])
 
     # ========== Seção de Pagamentos ==========
 
-    def _build_payments_section(self, parent, quote):
+    def _build_payments_section(self, parent, quote, summary=None, payments=None):
         """Constrói a seção de pagamentos com saldo devedor/pago."""
         quote_id = quote["id"]
-        summary = db.get_payment_summary(quote_id)
-        payments = db.get_payments_by_quote(quote_id)
+        if summary is None:
+            summary = db.get_payment_summary(quote_id)
+        if payments is None:
+            payments = db.get_payments_by_quote(quote_id)
 
         PAY_LABELS = {
             'pix': 'Pix', 'debito': 'Débito', 'credito': 'Crédito',
@@ -602,7 +710,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             pay_card, text="💰 Pagamentos",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
             anchor="w",
         ).pack(padx=15, pady=(12, 8), anchor="w")
 
@@ -615,20 +723,20 @@ class QuotesView(ctk.CTkFrame):
         total_box = ctk.CTkFrame(summary_frame, fg_color=COLORS["primary_lighter"],
                                   corner_radius=8)
         total_box.grid(row=0, column=0, sticky="ew", padx=(0, 5))
-        ctk.CTkLabel(total_box, text="Total", font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(total_box, text="Total", font=get_font(size=11),
                      text_color=COLORS["text_secondary"]).pack(padx=10, pady=(8, 0))
         ctk.CTkLabel(total_box, text=format_currency(summary['total']),
-                     font=ctk.CTkFont(size=15, weight="bold"),
+                     font=get_font(size=15, weight="bold"),
                      text_color=COLORS["primary"]).pack(padx=10, pady=(0, 8))
 
         # Valor pago
         paid_box = ctk.CTkFrame(summary_frame, fg_color=COLORS["success_light"],
                                  corner_radius=8)
         paid_box.grid(row=0, column=1, sticky="ew", padx=5)
-        ctk.CTkLabel(paid_box, text="Pago", font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(paid_box, text="Pago", font=get_font(size=11),
                      text_color=COLORS["text_secondary"]).pack(padx=10, pady=(8, 0))
         ctk.CTkLabel(paid_box, text=format_currency(summary['total_paid']),
-                     font=ctk.CTkFont(size=15, weight="bold"),
+                     font=get_font(size=15, weight="bold"),
                      text_color=COLORS["success"]).pack(padx=10, pady=(0, 8))
 
         # Saldo devedor
@@ -639,10 +747,10 @@ class QuotesView(ctk.CTkFrame):
         balance_box = ctk.CTkFrame(summary_frame, fg_color=balance_bg,
                                     corner_radius=8)
         balance_box.grid(row=0, column=2, sticky="ew", padx=(5, 0))
-        ctk.CTkLabel(balance_box, text=balance_text, font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(balance_box, text=balance_text, font=get_font(size=11),
                      text_color=COLORS["text_secondary"]).pack(padx=10, pady=(8, 0))
         ctk.CTkLabel(balance_box, text=format_currency(summary['balance']),
-                     font=ctk.CTkFont(size=15, weight="bold"),
+                     font=get_font(size=15, weight="bold"),
                      text_color=balance_color).pack(padx=10, pady=(0, 8))
 
         # Formulário para registrar pagamento
@@ -651,7 +759,7 @@ class QuotesView(ctk.CTkFrame):
         add_pay_frame.pack(fill="x", padx=15, pady=(0, 10))
 
         ctk.CTkLabel(add_pay_frame, text="Registrar Pagamento",
-                     font=ctk.CTkFont(size=13, weight="bold"),
+                     font=get_font(size=13, weight="bold"),
                      text_color=COLORS["text"]).pack(padx=12, pady=(10, 6), anchor="w")
 
         form_inner = ctk.CTkFrame(add_pay_frame, fg_color="transparent")
@@ -662,10 +770,10 @@ class QuotesView(ctk.CTkFrame):
         form_inner.grid_columnconfigure(3, weight=0)
 
         # Valor
-        ctk.CTkLabel(form_inner, text="Valor (R$):", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(form_inner, text="Valor (R$):", font=get_font(size=12),
                      text_color=COLORS["text"]).grid(row=0, column=0, sticky="w", padx=(0, 5))
         pay_amount_entry = ctk.CTkEntry(form_inner, width=100, height=35,
-                                         font=ctk.CTkFont(size=13),
+                                         font=get_font(size=13),
                                          placeholder_text="0.00")
         pay_amount_entry.grid(row=1, column=0, sticky="ew", padx=(0, 8))
 
@@ -678,16 +786,16 @@ class QuotesView(ctk.CTkFrame):
         pay_method_labels = [PAY_LABELS[m] for m in pay_methods]
         pay_method_var = ctk.StringVar(value=pay_method_labels[0])
 
-        ctk.CTkLabel(form_inner, text="Método:", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(form_inner, text="Método:", font=get_font(size=12),
                      text_color=COLORS["text"]).grid(row=0, column=1, sticky="w", padx=(0, 5))
         ctk.CTkOptionMenu(form_inner, values=pay_method_labels, variable=pay_method_var,
-                          font=ctk.CTkFont(size=12), height=35
+                          font=get_font(size=12), height=35
                           ).grid(row=1, column=1, sticky="ew", padx=(0, 8))
 
         # Observação
-        ctk.CTkLabel(form_inner, text="Observação:", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(form_inner, text="Observação:", font=get_font(size=12),
                      text_color=COLORS["text"]).grid(row=0, column=2, sticky="w", padx=(0, 5))
-        pay_notes_entry = ctk.CTkEntry(form_inner, height=35, font=ctk.CTkFont(size=12),
+        pay_notes_entry = ctk.CTkEntry(form_inner, height=35, font=get_font(size=12),
                                         placeholder_text="Ex: Parcela 1/3")
         pay_notes_entry.grid(row=1, column=2, sticky="ew", padx=(0, 8))
 
@@ -716,7 +824,7 @@ class QuotesView(ctk.CTkFrame):
             self._show_detail(quote_id)
 
         ctk.CTkButton(
-            form_inner, text="💵 Registrar", font=ctk.CTkFont(size=12, weight="bold"),
+            form_inner, text="💵 Registrar", font=get_font(size=12, weight="bold"),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             height=35, width=110, corner_radius=8,
             command=register_payment,
@@ -725,7 +833,7 @@ class QuotesView(ctk.CTkFrame):
         # Lista de pagamentos registrados
         if payments:
             ctk.CTkLabel(pay_card, text="Histórico de Pagamentos",
-                         font=ctk.CTkFont(size=13, weight="bold"),
+                         font=get_font(size=13, weight="bold"),
                          text_color=COLORS["text"]).pack(padx=15, pady=(0, 5), anchor="w")
 
             for pay in payments:
@@ -741,7 +849,7 @@ class QuotesView(ctk.CTkFrame):
                 # Valor
                 ctk.CTkLabel(
                     content, text=format_currency(pay['amount']),
-                    font=ctk.CTkFont(size=13, weight="bold"),
+                    font=get_font(size=13, weight="bold"),
                     text_color=COLORS["success"],
                 ).pack(side="left")
 
@@ -749,7 +857,7 @@ class QuotesView(ctk.CTkFrame):
                 method_display = PAY_LABELS.get(pay.get('payment_method', ''), pay.get('payment_method', ''))
                 ctk.CTkLabel(
                     content, text=f"  via {method_display}  ",
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     fg_color=COLORS["primary_light"],
                     text_color=COLORS["primary"],
                     corner_radius=4,
@@ -759,7 +867,7 @@ class QuotesView(ctk.CTkFrame):
                 pay_date = format_date(pay.get('payment_date', ''))
                 ctk.CTkLabel(
                     content, text=pay_date,
-                    font=ctk.CTkFont(size=11),
+                    font=get_font(size=11),
                     text_color=COLORS["text_secondary"],
                 ).pack(side="left", padx=(8, 0))
 
@@ -767,7 +875,7 @@ class QuotesView(ctk.CTkFrame):
                 if pay.get('notes'):
                     ctk.CTkLabel(
                         content, text=f"({pay['notes']})",
-                        font=ctk.CTkFont(size=10),
+                        font=get_font(size=10),
                         text_color=COLORS["text_secondary"],
                     ).pack(side="left", padx=(8, 0))
 
@@ -828,7 +936,7 @@ class QuotesView(ctk.CTkFrame):
         # --- Dados do cliente ---
         ctk.CTkLabel(
             scroll, text="👤 Dados do Cliente",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(0, 8))
 
         fields_frame = ctk.CTkFrame(scroll, fg_color="transparent")
@@ -836,25 +944,25 @@ class QuotesView(ctk.CTkFrame):
         fields_frame.grid_columnconfigure((0, 1), weight=1)
 
         # Nome
-        ctk.CTkLabel(fields_frame, text="Nome do Cliente *", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(fields_frame, text="Nome do Cliente *", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=0, column=0, sticky="w", padx=(0, 10))
-        name_entry = ctk.CTkEntry(fields_frame, height=35, font=ctk.CTkFont(size=13))
+        name_entry = ctk.CTkEntry(fields_frame, height=35, font=get_font(size=13))
         name_entry.grid(row=1, column=0, sticky="ew", padx=(0, 10), pady=(0, 8))
 
         # Telefone
-        ctk.CTkLabel(fields_frame, text="Telefone", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(fields_frame, text="Telefone", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=0, column=1, sticky="w")
-        phone_entry = ctk.CTkEntry(fields_frame, height=35, font=ctk.CTkFont(size=13))
+        phone_entry = ctk.CTkEntry(fields_frame, height=35, font=get_font(size=13))
         phone_entry.grid(row=1, column=1, sticky="ew", pady=(0, 8))
 
         # Endereço
-        ctk.CTkLabel(fields_frame, text="Endereço", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(fields_frame, text="Endereço", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=2, column=0, columnspan=2, sticky="w")
-        addr_entry = ctk.CTkEntry(fields_frame, height=35, font=ctk.CTkFont(size=13))
+        addr_entry = ctk.CTkEntry(fields_frame, height=35, font=get_font(size=13))
         addr_entry.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(0, 8))
 
         # Data de agendamento
-        ctk.CTkLabel(fields_frame, text="Data Agendamento (DD/MM/AAAA)", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(fields_frame, text="Data Agendamento (DD/MM/AAAA)", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).grid(row=4, column=0, sticky="w")
         sched_entry = DateEntry(fields_frame)
         sched_entry.grid(row=5, column=0, sticky="ew", padx=(0, 10), pady=(0, 8))
@@ -870,7 +978,7 @@ class QuotesView(ctk.CTkFrame):
         # --- Itens ---
         ctk.CTkLabel(
             scroll, text="📦 Itens do Orçamento",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(10, 8))
 
         # Lista de itens existentes
@@ -931,7 +1039,7 @@ class QuotesView(ctk.CTkFrame):
 
                 ctk.CTkLabel(
                     inner, text=item["product_name"],
-                    font=ctk.CTkFont(size=13, weight="bold"), text_color=COLORS["text"],
+                    font=get_font(size=13, weight="bold"), text_color=COLORS["text"],
                 ).pack(side="left")
 
                 item_pu = item.get('pricing_unit', 'metro')
@@ -948,7 +1056,7 @@ class QuotesView(ctk.CTkFrame):
                 
                 ctk.CTkLabel(
                     inner, text=item_info,
-                    font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                    font=get_font(size=12), text_color=COLORS["text_secondary"],
                 ).pack(side="left", padx=8)
 
                 ctk.CTkButton(
@@ -971,7 +1079,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             add_frame, text="Adicionar Item",
-            font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=12, pady=(10, 5), anchor="w")
 
         products = db.get_all_products()
@@ -1008,7 +1116,7 @@ class QuotesView(ctk.CTkFrame):
         search_frame_prod.grid(row=0, column=0, sticky="ew", padx=(0, 8))
 
         prod_search_entry = ctk.CTkEntry(
-            search_frame_prod, height=35, font=ctk.CTkFont(size=12),
+            search_frame_prod, height=35, font=get_font(size=12),
             placeholder_text="Pesquisar produto...",
         )
         prod_search_entry.pack(fill="x")
@@ -1040,7 +1148,7 @@ class QuotesView(ctk.CTkFrame):
             for name in filtered[:8]:  # Max 8 suggestions
                 btn = ctk.CTkButton(
                     suggestions_frame, text=name,
-                    font=ctk.CTkFont(size=11), height=28,
+                    font=get_font(size=11), height=28,
                     fg_color="transparent", text_color=COLORS["text"],
                     hover_color=COLORS["primary_light"],
                     anchor="w", corner_radius=4,
@@ -1069,15 +1177,15 @@ class QuotesView(ctk.CTkFrame):
         prod_search_entry.bind("<KeyRelease>", update_suggestions)
         prod_search_entry.bind("<FocusIn>", update_suggestions)
 
-        ctk.CTkLabel(add_inner, text="Qtd (m/un):", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(add_inner, text="Qtd (m/un):", font=get_font(size=12),
                      text_color=COLORS["text"]).grid(row=0, column=1, sticky="e", padx=(0, 5))
-        meters_entry = ctk.CTkEntry(add_inner, width=70, height=35, font=ctk.CTkFont(size=13))
+        meters_entry = ctk.CTkEntry(add_inner, width=70, height=35, font=get_font(size=13))
         meters_entry.grid(row=0, column=2, sticky="w", padx=(0, 8))
         meters_entry.insert(0, "1")
 
-        ctk.CTkLabel(add_inner, text="Desc R$:", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(add_inner, text="Desc R$:", font=get_font(size=12),
                      text_color=COLORS["text"]).grid(row=0, column=3, sticky="e", padx=(0, 5))
-        discount_entry = ctk.CTkEntry(add_inner, width=70, height=35, font=ctk.CTkFont(size=13))
+        discount_entry = ctk.CTkEntry(add_inner, width=70, height=35, font=get_font(size=13))
         discount_entry.grid(row=0, column=4, sticky="w", padx=(0, 8))
         discount_entry.insert(0, "0")
 
@@ -1109,7 +1217,7 @@ class QuotesView(ctk.CTkFrame):
             ctk.CTkCheckBox(
                 price_row, text=f"Dobrado? (+{format_currency(dobra_value)}/m)",
                 variable=dobrado_var,
-                font=ctk.CTkFont(size=12),
+                font=get_font(size=12),
                 checkbox_height=22, checkbox_width=22,
                 corner_radius=6, border_width=2,
                 fg_color=get_color("primary"),
@@ -1118,14 +1226,14 @@ class QuotesView(ctk.CTkFrame):
                 command=on_dobrado_toggle,
             ).pack(side="left", padx=(0, 15))
 
-        ctk.CTkLabel(price_row, text="Preço R$/m (ou un):", font=ctk.CTkFont(size=12),
+        ctk.CTkLabel(price_row, text="Preço R$/m (ou un):", font=get_font(size=12),
                      text_color=COLORS["text"]).pack(side="left", padx=(0, 5))
-        custom_price_entry = ctk.CTkEntry(price_row, width=100, height=35, font=ctk.CTkFont(size=13),
+        custom_price_entry = ctk.CTkEntry(price_row, width=100, height=35, font=get_font(size=13),
                                            placeholder_text="Auto")
         custom_price_entry.pack(side="left", padx=(0, 10))
 
         ctk.CTkLabel(price_row, text="(deixe vazio para usar o preço padrão do produto)",
-                     font=ctk.CTkFont(size=10), text_color=COLORS["text_secondary"]).pack(side="left")
+                     font=get_font(size=10), text_color=COLORS["text_secondary"]).pack(side="left")
 
         def add_item():
             sel = product_var.get()
@@ -1222,7 +1330,7 @@ class QuotesView(ctk.CTkFrame):
                 dobrado_var.set(False)
 
         ctk.CTkButton(
-            add_inner, text="+ Adicionar", font=ctk.CTkFont(size=12, weight="bold"),
+            add_inner, text="+ Adicionar", font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=35, width=100, corner_radius=8,
             command=add_item,
@@ -1246,28 +1354,28 @@ class QuotesView(ctk.CTkFrame):
             pscroll = ctk.CTkScrollableFrame(prod_dialog, fg_color="transparent")
             pscroll.pack(fill="both", expand=True, padx=20, pady=10)
             
-            ctk.CTkLabel(pscroll, text="Novo Produto", font=ctk.CTkFont(size=18, weight="bold"),
+            ctk.CTkLabel(pscroll, text="Novo Produto", font=get_font(size=18, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w", pady=(0, 12))
             
             # Nome
-            ctk.CTkLabel(pscroll, text="Nome do Produto *", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(pscroll, text="Nome do Produto *", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w")
-            np_name = ctk.CTkEntry(pscroll, height=35, font=ctk.CTkFont(size=13))
+            np_name = ctk.CTkEntry(pscroll, height=35, font=get_font(size=13))
             np_name.pack(fill="x", pady=(2, 8))
             
             # Tipo
             types_map = _get_product_types_map()
             type_keys = list(types_map.keys())
-            ctk.CTkLabel(pscroll, text="Tipo *", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(pscroll, text="Tipo *", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w")
             np_type_var = ctk.StringVar(value=type_keys[0] if type_keys else "calha")
             ctk.CTkOptionMenu(pscroll, values=type_keys, variable=np_type_var,
-                              font=ctk.CTkFont(size=12), height=35).pack(fill="x", pady=(2, 8))
+                              font=get_font(size=12), height=35).pack(fill="x", pady=(2, 8))
             
             # Largura
-            ctk.CTkLabel(pscroll, text="Largura (cm) *", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(pscroll, text="Largura (cm) *", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w")
-            np_width = ctk.CTkEntry(pscroll, height=35, font=ctk.CTkFont(size=13))
+            np_width = ctk.CTkEntry(pscroll, height=35, font=get_font(size=13))
             np_width.pack(fill="x", pady=(2, 8))
             
             # Preço e Custo
@@ -1275,14 +1383,14 @@ class QuotesView(ctk.CTkFrame):
             price_frame.pack(fill="x", pady=(0, 8))
             price_frame.grid_columnconfigure((0, 1), weight=1)
             
-            ctk.CTkLabel(price_frame, text="Preço (R$) *", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(price_frame, text="Preço (R$) *", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).grid(row=0, column=0, sticky="w")
-            np_price = ctk.CTkEntry(price_frame, height=35, font=ctk.CTkFont(size=13))
+            np_price = ctk.CTkEntry(price_frame, height=35, font=get_font(size=13))
             np_price.grid(row=1, column=0, sticky="ew", padx=(0, 5))
             
-            ctk.CTkLabel(price_frame, text="Custo (R$)", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(price_frame, text="Custo (R$)", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).grid(row=0, column=1, sticky="w", padx=(5, 0))
-            np_cost = ctk.CTkEntry(price_frame, height=35, font=ctk.CTkFont(size=13))
+            np_cost = ctk.CTkEntry(price_frame, height=35, font=get_font(size=13))
             np_cost.grid(row=1, column=1, sticky="ew", padx=(5, 0))
 
             # Instalado e Cobrança
@@ -1290,22 +1398,22 @@ class QuotesView(ctk.CTkFrame):
             opt_frame.pack(fill="x", pady=(0, 8))
             opt_frame.grid_columnconfigure((0, 1), weight=1)
 
-            ctk.CTkLabel(opt_frame, text="Instalado?", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(opt_frame, text="Instalado?", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).grid(row=0, column=0, sticky="w")
             np_installed_var = ctk.StringVar(value=str(is_installed_filter))
             ctk.CTkOptionMenu(opt_frame, values=["1", "0"], variable=np_installed_var,
-                              font=ctk.CTkFont(size=12), height=35).grid(row=1, column=0, sticky="ew", padx=(0, 5))
+                              font=get_font(size=12), height=35).grid(row=1, column=0, sticky="ew", padx=(0, 5))
 
-            ctk.CTkLabel(opt_frame, text="Cobrança por", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(opt_frame, text="Cobrança por", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).grid(row=0, column=1, sticky="w", padx=(5, 0))
             np_pricing_var = ctk.StringVar(value="metro")
             ctk.CTkOptionMenu(opt_frame, values=["metro", "m²", "unidade"], variable=np_pricing_var,
-                              font=ctk.CTkFont(size=12), height=35).grid(row=1, column=1, sticky="ew", padx=(5, 0))
+                              font=get_font(size=12), height=35).grid(row=1, column=1, sticky="ew", padx=(5, 0))
             
             # Descrição
-            ctk.CTkLabel(pscroll, text="Descrição", font=ctk.CTkFont(size=12, weight="bold"),
+            ctk.CTkLabel(pscroll, text="Descrição", font=get_font(size=12, weight="bold"),
                          text_color=COLORS["text"]).pack(anchor="w")
-            np_desc = ctk.CTkTextbox(pscroll, height=50, font=ctk.CTkFont(size=12))
+            np_desc = ctk.CTkTextbox(pscroll, height=50, font=get_font(size=12))
             np_desc.pack(fill="x", pady=(2, 12))
             
             def save_new_product():
@@ -1368,27 +1476,27 @@ class QuotesView(ctk.CTkFrame):
                           height=36, command=prod_dialog.destroy).pack(side="left")
             ctk.CTkButton(btn_f, text="💾 Salvar Produto", fg_color=get_color("primary"),
                           hover_color=get_color("primary_hover"), height=36,
-                          font=ctk.CTkFont(size=13, weight="bold"),
+                          font=get_font(size=13, weight="bold"),
                           command=save_new_product).pack(side="right")
 
         ctk.CTkButton(
-            add_inner, text="🆕 Novo Produto", font=ctk.CTkFont(size=11, weight="bold"),
+            add_inner, text="🆕 Novo Produto", font=get_font(size=11, weight="bold"),
             fg_color=get_color("warning"), hover_color=get_color("warning_hover"),
             height=35, width=120, corner_radius=8,
             command=open_new_product_dialog,
         ).grid(row=0, column=6, padx=(5, 0))
 
         # Notas e termos
-        ctk.CTkLabel(scroll, text="Notas Técnicas", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Notas Técnicas", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w", pady=(10, 2))
-        notes_text = ctk.CTkTextbox(scroll, height=60, font=ctk.CTkFont(size=12))
+        notes_text = ctk.CTkTextbox(scroll, height=60, font=get_font(size=12))
         notes_text.pack(fill="x", pady=(0, 8))
         if existing_quote and existing_quote.get("technical_notes"):
             notes_text.insert("1.0", existing_quote["technical_notes"])
 
-        ctk.CTkLabel(scroll, text="Termos do Contrato", font=ctk.CTkFont(size=12, weight="bold"),
+        ctk.CTkLabel(scroll, text="Termos do Contrato", font=get_font(size=12, weight="bold"),
                      text_color=COLORS["text"]).pack(anchor="w", pady=(0, 2))
-        terms_text = ctk.CTkTextbox(scroll, height=60, font=ctk.CTkFont(size=12))
+        terms_text = ctk.CTkTextbox(scroll, height=60, font=get_font(size=12))
         terms_text.pack(fill="x", pady=(0, 8))
         if existing_quote and existing_quote.get("contract_terms"):
             terms_text.insert("1.0", existing_quote["contract_terms"])
@@ -1396,7 +1504,7 @@ class QuotesView(ctk.CTkFrame):
         # --- Métodos de Pagamento ---
         ctk.CTkLabel(
             scroll, text="💳 Métodos de Pagamento",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(10, 8))
 
         payment_frame = ctk.CTkFrame(scroll, fg_color=COLORS["card"], corner_radius=10,
@@ -1426,7 +1534,7 @@ class QuotesView(ctk.CTkFrame):
             ctk.CTkCheckBox(
                 payment_inner, text=label,
                 variable=var,
-                font=ctk.CTkFont(size=13),
+                font=get_font(size=13),
                 checkbox_height=22, checkbox_width=22,
                 corner_radius=6,
                 border_width=2,
@@ -1450,11 +1558,11 @@ class QuotesView(ctk.CTkFrame):
         
         ctk.CTkLabel(
             discount_inner, text="Desconto Total:",
-            font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
         ).pack(side="left")
 
         discount_total_entry = ctk.CTkEntry(
-            discount_inner, width=100, height=35, font=ctk.CTkFont(size=14)
+            discount_inner, width=100, height=35, font=get_font(size=14)
         )
         discount_total_entry.pack(side="left", padx=10)
         discount_total_entry.insert(0, str(existing_quote.get("discount_total", 0) if existing_quote else 0))
@@ -1464,7 +1572,7 @@ class QuotesView(ctk.CTkFrame):
             discount_inner,
             values=["%", "R$"],
             variable=discount_type_var,
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             height=35,
             width=100,
             command=lambda v: update_total_with_discount()
@@ -1498,7 +1606,7 @@ class QuotesView(ctk.CTkFrame):
                 pass
         
         ctk.CTkButton(
-            discount_inner, text="Aplicar", font=ctk.CTkFont(size=12, weight="bold"),
+            discount_inner, text="Aplicar", font=get_font(size=12, weight="bold"),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             height=35, width=80, corner_radius=8,
             command=update_total_with_discount,
@@ -1509,12 +1617,12 @@ class QuotesView(ctk.CTkFrame):
         total_frame.pack(fill="x", pady=(10, 5))
 
         ctk.CTkLabel(
-            total_frame, text="Total:", font=ctk.CTkFont(size=16, weight="bold"),
+            total_frame, text="Total:", font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left", padx=15, pady=10)
         ctk.CTkLabel(
             total_frame, textvariable=total_var,
-            font=ctk.CTkFont(size=18, weight="bold"), text_color=COLORS["primary"],
+            font=get_font(size=18, weight="bold"), text_color=COLORS["primary"],
         ).pack(side="right", padx=15, pady=10)
 
         # Botões de ação
@@ -1522,7 +1630,7 @@ class QuotesView(ctk.CTkFrame):
         btn_frame.pack(fill="x", padx=20, pady=15)
 
         ctk.CTkButton(
-            btn_frame, text="Cancelar", font=ctk.CTkFont(size=13),
+            btn_frame, text="Cancelar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), width=120, height=38,
             command=dialog.destroy,
@@ -1615,7 +1723,7 @@ class QuotesView(ctk.CTkFrame):
                 self.app.show_toast(f"Erro: {e}", "error")
 
         ctk.CTkButton(
-            btn_frame, text="💾 Salvar Orçamento", font=ctk.CTkFont(size=13, weight="bold"),
+            btn_frame, text="💾 Salvar Orçamento", font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             width=180, height=38, corner_radius=10,
             command=save_quote,
@@ -1644,7 +1752,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkLabel(
             scroll, text="📋 Clonar Orçamento",
-            font=ctk.CTkFont(size=18, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=18, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(0, 5))
 
         ctk.CTkLabel(
@@ -1653,7 +1761,7 @@ class QuotesView(ctk.CTkFrame):
                  f"O novo orçamento será criado com os mesmos dados do cliente.\n"
                  f"Selecione os itens que deseja MOVER para o novo orçamento\n"
                  f"(serão removidos do orçamento atual).",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             justify="left", wraplength=480,
         ).pack(anchor="w", pady=(0, 12))
@@ -1663,7 +1771,7 @@ class QuotesView(ctk.CTkFrame):
         if items:
             ctk.CTkLabel(
                 scroll, text="Selecione itens para transferir:",
-                font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+                font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
             ).pack(anchor="w", pady=(0, 8))
 
             for item in items:
@@ -1681,7 +1789,7 @@ class QuotesView(ctk.CTkFrame):
                 )
                 chk = ctk.CTkCheckBox(
                     scroll, text=label_text, variable=var,
-                    font=ctk.CTkFont(size=12),
+                    font=get_font(size=12),
                     checkbox_height=22, checkbox_width=22,
                     corner_radius=6, border_width=2,
                     fg_color=get_color("primary"),
@@ -1692,29 +1800,29 @@ class QuotesView(ctk.CTkFrame):
         else:
             ctk.CTkLabel(
                 scroll, text="Este orçamento não possui itens para transferir.",
-                font=ctk.CTkFont(size=12), text_color=COLORS["text_secondary"],
+                font=get_font(size=12), text_color=COLORS["text_secondary"],
             ).pack(anchor="w", pady=10)
 
         # Tipo do novo orçamento
         ctk.CTkLabel(
             scroll, text="Tipo do novo orçamento:",
-            font=ctk.CTkFont(size=14, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=14, weight="bold"), text_color=COLORS["text"],
         ).pack(anchor="w", pady=(15, 5))
 
         new_type_var = ctk.StringVar(value=quote.get("quote_type", "instalado") or "instalado")
         type_frame = ctk.CTkFrame(scroll, fg_color="transparent")
         type_frame.pack(anchor="w")
         ctk.CTkRadioButton(type_frame, text="Instalado", variable=new_type_var,
-                           value="instalado", font=ctk.CTkFont(size=12)).pack(side="left", padx=(0, 20))
+                           value="instalado", font=get_font(size=12)).pack(side="left", padx=(0, 20))
         ctk.CTkRadioButton(type_frame, text="Não Instalado", variable=new_type_var,
-                           value="nao_instalado", font=ctk.CTkFont(size=12)).pack(side="left")
+                           value="nao_instalado", font=get_font(size=12)).pack(side="left")
 
         # Botões
         btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
         btn_frame.pack(fill="x", padx=20, pady=15)
 
         ctk.CTkButton(
-            btn_frame, text="Cancelar", font=ctk.CTkFont(size=13),
+            btn_frame, text="Cancelar", font=get_font(size=13),
             fg_color=get_color("border"), text_color=get_color("text"),
             hover_color=get_color("border_hover"), width=120, height=38,
             command=dialog.destroy,
@@ -1767,7 +1875,7 @@ class QuotesView(ctk.CTkFrame):
 
         ctk.CTkButton(
             btn_frame, text="📋 Criar Orçamento Clone",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color="#8b5cf6", hover_color="#7c3aed",
             width=200, height=38, corner_radius=10,
             command=do_clone,
@@ -1794,19 +1902,156 @@ class QuotesView(ctk.CTkFrame):
         self._show_detail(quote_id)
 
     def _generate_pdf(self, quote_id):
-        try:
-            from services.pdf_generator import generate_quote_pdf
-            quote = db.get_quote_by_id(quote_id)
-            settings = db.get_settings()
-            if quote:
-                path = generate_quote_pdf(quote, settings)
-                self.app.show_toast(f"PDF gerado: {os.path.basename(path)}", "success")
-                # Abrir o PDF
-                if os.path.exists(path):
-                    os.startfile(path)
-        except Exception as e:
+        """Gera o PDF em memória (ou reaproveita, se nada mudou) e abre a pré-visualização."""
+        from services.pdf_cache import PDF_DIR, get_quote_pdf_bytes
+
+        def on_done(pdf):
+            if pdf is None:
+                return
+            PdfPreviewDialog(self.app, pdf, title=f"Orçamento #{quote_id:05d}", save_dir=PDF_DIR)
+
+        def on_error(e):
             self.app.show_toast(f"Erro ao gerar PDF: {e}", "error")
 
+        self._loader.submit(get_quote_pdf_bytes, on_done, quote_id, on_error=on_error)
+
+    def _open_batch_export(self):
+        """Exporta vários orçamentos (por status e/ou cliente) em segundo plano."""
+        from services.pdf_batch import export_quotes
+
+        dialog = ctk.CTkToplevel(self.app)
+        dialog.title("Exportar PDFs em Lote")
+        dialog.geometry("520x440")
+        dialog.grab_set()
+        dialog.transient(self.app)
+
+        dialog.update_idletasks()
+        x = self.app.winfo_rootx() + (self.app.winfo_width() - 520) // 2
+        y = self.app.winfo_rooty() + (self.app.winfo_height() - 440) // 2
+        dialog.geometry(f"+{x}+{y}")
+
+        body = ctk.CTkFrame(dialog, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=20, pady=10)
+
+        ctk.CTkLabel(
+            body, text="📑 Exportar PDFs em Lote",
+            font=get_font(size=18, weight="bold"), text_color=COLORS["text"],
+        ).pack(anchor="w", pady=(0, 12))
+
+        ctk.CTkLabel(body, text="Status:", font=get_font(size=13, weight="bold"),
+                     text_color=COLORS["text"]).pack(anchor="w")
+        status_var = ctk.StringVar(value="Aprovado")
+        ctk.CTkSegmentedButton(body, values=STATUS_OPTIONS, variable=status_var,
+                               font=get_font(size=12)).pack(anchor="w", pady=(4, 10))
+
+        ctk.CTkLabel(body, text="Cliente (opcional):", font=get_font(size=13, weight="bold"),
+                     text_color=COLORS["text"]).pack(anchor="w")
+        client_entry = ctk.CTkEntry(body, font=get_font(size=13), height=34,
+                                    placeholder_text="Todos os clientes")
+        client_entry.pack(fill="x", pady=(4, 10))
+        if self.search_text:
+            client_entry.insert(0, self.search_text)
+
+        merged_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(body, text="Documento único (um marcador por orçamento)", variable=merged_var,
+                        font=get_font(size=12), fg_color=get_color("primary"),
+                        hover_color=get_color("primary_hover")).pack(anchor="w", pady=(0, 10))
+
+        folder = {"path": os.path.join(os.path.dirname(os.path.dirname(__file__)), "pdfs")}
+        folder_frame = ctk.CTkFrame(body, fg_color="transparent")
+        folder_frame.pack(fill="x", pady=(0, 10))
+        folder_label = ctk.CTkLabel(folder_frame, text=folder["path"], font=get_font(size=11),
+                                    text_color=COLORS["text_secondary"], anchor="w", wraplength=330)
+        folder_label.pack(side="left", fill="x", expand=True)
+
+        def choose_folder():
+            from tkinter import filedialog
+            chosen = filedialog.askdirectory(parent=dialog, initialdir=folder["path"],
+                                             title="Pasta de destino dos PDFs")
+            if chosen:
+                folder["path"] = chosen
+                folder_label.configure(text=chosen)
+
+        ctk.CTkButton(folder_frame, text="📁 Escolher pasta", font=get_font(size=12),
+                      fg_color=get_color("border"), text_color=get_color("text"),
+                      hover_color=get_color("border_hover"), width=130, height=32,
+                      command=choose_folder).pack(side="right")
+
+        progress_bar = ctk.CTkProgressBar(body, height=10)
+        progress_bar.set(0)
+        progress_bar.pack(fill="x", pady=(6, 4))
+        progress_label = ctk.CTkLabel(body, text="", font=get_font(size=12),
+                                      text_color=COLORS["text_secondary"], anchor="w")
+        progress_label.pack(fill="x")
+
+        btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        btn_frame.pack(fill="x", padx=20, pady=15)
+
+        # Estado compartilhado com a thread do lote (lido aqui via after)
+        progress = {"done": 0, "total": 0}
+        cancel_event = threading.Event()
+        loader = ProgressiveLoader(dialog)
+
+        def close():
+            cancel_event.set()
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        ctk.CTkButton(
+            btn_frame, text="Fechar", font=get_font(size=13),
+            fg_color=get_color("border"), text_color=get_color("text"),
+            hover_color=get_color("border_hover"), width=120, height=38,
+            command=close,
+        ).pack(side="left")
+
+        def poll_progress():
+            if not dialog.winfo_exists() or not loader.busy:
+                return
+            done, total = progress["done"], progress["total"]
+            if total:
+                progress_bar.set(done / total)
+                progress_label.configure(text=f"{done} de {total} orçamento(s)...")
+            dialog.after(100, poll_progress)
+
+        def on_progress(done, total):
+            progress["done"], progress["total"] = done, total
+
+        def on_done(result):
+            export_btn.configure(state="normal")
+            progress_bar.set(1)
+            count = len(result.files) or (progress["total"] if result.merged_path else 0)
+            if not count:
+                progress_label.configure(text="Nenhum orçamento encontrado com esses filtros.")
+                return
+            text = f"✅ {count} orçamento(s) exportado(s) em {result.elapsed:.1f}s"
+            if result.errors:
+                text += f" — {len(result.errors)} com erro"
+            progress_label.configure(text=text)
+            self.app.show_toast(f"PDFs exportados para {folder['path']}", "success")
+
+        def on_error(e):
+            export_btn.configure(state="normal")
+            progress_label.configure(text=f"Erro: {e}", text_color=COLORS["error"])
+
+        def start():
+            export_btn.configure(state="disabled")
+            progress.update(done=0, total=0)
+            progress_bar.set(0)
+            progress_label.configure(text="Buscando orçamentos...", text_color=COLORS["text_secondary"])
+            options = dict(status_filter=STATUS_MAP.get(status_var.get(), ""),
+                           client_name=client_entry.get().strip(), merged=merged_var.get(),
+                           on_progress=on_progress, cancel_event=cancel_event)
+            loader.submit(lambda: export_quotes(folder["path"], **options), on_done,
+                          on_error=on_error, executor="export")
+            dialog.after(100, poll_progress)
+
+        export_btn = ctk.CTkButton(
+            btn_frame, text="📑 Exportar", font=get_font(size=13, weight="bold"),
+            fg_color=get_color("success"), hover_color=get_color("success_hover"),
+            width=140, height=38, command=start,
+        )
+        export_btn.pack(side="right")
+
     def _confirm_delete(self, quote):
         ConfirmDialog(
             self.app,
@@ -18,6 +18,7 @@ from services.backup import (
 from components.cards import create_header
 from theme import get_color, COLORS
 from components.dialogs import ConfirmDialog
+from components.resources import get_font
 
 
 class _RestoreFileDialog(ctk.CTkToplevel):
@@ -40,14 +41,14 @@ class _RestoreFileDialog(ctk.CTkToplevel):
 
         # Ícone
         ctk.CTkLabel(
-            self, text="📂", font=ctk.CTkFont(size=32)
+            self, text="📂", font=get_font(size=32)
         ).pack(pady=(20, 5))
 
         # Mensagem
         ctk.CTkLabel(
             self,
             text=message,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             text_color=get_color("text"),
             wraplength=390,
             justify="center",
@@ -104,7 +105,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             company_card, text="🏢 Informações da Empresa",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 10), anchor="w")
 
         form = ctk.CTkFrame(company_card, fg_color="transparent")
@@ -124,12 +125,12 @@ class SettingsView(ctk.CTkScrollableFrame):
         for key, label, row, col in fields:
             colspan = 2 if key == "company_address" else 1
             ctk.CTkLabel(
-                form, text=label, font=ctk.CTkFont(size=12, weight="bold"),
+                form, text=label, font=get_font(size=12, weight="bold"),
                 text_color=COLORS["text"],
             ).grid(row=row * 2, column=col, sticky="w",
                    columnspan=colspan, padx=5, pady=(8, 2))
 
-            entry = ctk.CTkEntry(form, height=35, font=ctk.CTkFont(size=13))
+            entry = ctk.CTkEntry(form, height=35, font=get_font(size=13))
             val = settings.get(key, "") or ""
             if val:
                 entry.insert(0, str(val))
@@ -139,7 +140,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             company_card, text="💾 Salvar Informações",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10,
             command=self._save_company,
@@ -152,13 +153,13 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             dobra_card, text="✂️ Configuração de Dobra",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 5), anchor="w")
 
         ctk.CTkLabel(
             dobra_card,
             text="Valor adicional cobrado por metro quando o produto tem dobra.",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
         ).pack(padx=15, pady=(0, 8), anchor="w")
 
@@ -167,13 +168,13 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             dobra_inner, text="Valor da Dobra (R$/metro):",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             text_color=COLORS["text"],
         ).pack(side="left")
 
         self.dobra_entry = ctk.CTkEntry(
             dobra_inner, width=100, height=35,
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             placeholder_text="5.00",
         )
         dobra_val = settings.get("dobra_value", 5.0) or 5.0
@@ -182,12 +183,39 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             dobra_inner, text="💾 Salvar",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=35, width=100, corner_radius=8,
             command=self._save_dobra,
         ).pack(side="left")
 
+        # === PDF do Orçamento ===
+        pdf_card = ctk.CTkFrame(self, fg_color=COLORS["card"], corner_radius=12,
+                                border_width=1, border_color=COLORS["border"])
+        pdf_card.pack(fill="x", pady=(0, 15))
+
+        ctk.CTkLabel(
+            pdf_card, text="📄 PDF do Orçamento",
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
+        ).pack(padx=15, pady=(15, 5), anchor="w")
+
+        ctk.CTkLabel(
+            pdf_card,
+            text="Em orçamentos grandes, os itens podem ser agrupados por tipo de produto,\n"
+                 "com subtotal de cada grupo.",
+            font=get_font(size=12),
+            text_color=COLORS["text_secondary"],
+            justify="left",
+        ).pack(padx=15, pady=(0, 8), anchor="w")
+
+        self.group_items_var = ctk.BooleanVar(value=bool(settings.get("pdf_group_items")))
+        ctk.CTkSwitch(
+            pdf_card, text="Agrupar itens por tipo de produto",
+            font=get_font(size=12, weight="bold"), text_color=COLORS["text"],
+            variable=self.group_items_var, progress_color=get_color("primary"),
+            command=self._save_pdf_options,
+        ).pack(padx=15, pady=(0, 15), anchor="w")
+
         # === Backup Automático ===
         backup_card = ctk.CTkFrame(self, fg_color=COLORS["card"], corner_radius=12,
                                     border_width=1, border_color=COLORS["border"])
@@ -195,14 +223,14 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             backup_card, text="💾 Backup Automático",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 5), anchor="w")
 
         ctk.CTkLabel(
             backup_card,
             text="O backup é salvo automaticamente em JSON a cada alteração.\n"
                  "Ao atualizar o app, seus dados são preservados neste arquivo.",
-            font=ctk.CTkFont(size=12),
+            font=get_font(size=12),
             text_color=COLORS["text_secondary"],
             justify="left",
         ).pack(padx=15, pady=(0, 10), anchor="w")
@@ -213,7 +241,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             dir_frame, text="Pasta de Backup:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             text_color=COLORS["text"],
         ).pack(anchor="w")
 
@@ -222,7 +250,7 @@ class SettingsView(ctk.CTkScrollableFrame):
         path_row.grid_columnconfigure(0, weight=1)
 
         self.backup_path_entry = ctk.CTkEntry(
-            path_row, height=35, font=ctk.CTkFont(size=12),
+            path_row, height=35, font=get_font(size=12),
         )
         current_backup_dir = get_backup_dir()
         self.backup_path_entry.insert(0, current_backup_dir)
@@ -230,7 +258,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             path_row, text="📂 Alterar",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(size=12, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=35, width=100, corner_radius=8,
             command=self._choose_backup_folder,
@@ -243,7 +271,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         self.backup_status_label = ctk.CTkLabel(
             backup_card, text=status_text,
-            font=ctk.CTkFont(size=11),
+            font=get_font(size=11),
             text_color=get_color("success") if file_exists else get_color("text_secondary"),
             justify="left",
         )
@@ -255,7 +283,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             backup_btn_frame, text="📦 Fazer Backup Agora",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"), hover_color=get_color("primary_hover"),
             height=38, corner_radius=10, width=200,
             command=self._manual_backup,
@@ -263,7 +291,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             backup_btn_frame, text="📥 Restaurar Backup",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("success"), hover_color=get_color("success_hover"),
             height=38, corner_radius=10, width=200,
             command=self._confirm_restore,
@@ -271,7 +299,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             backup_btn_frame, text="📂 Restaurar o Arquivo",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("purple"), hover_color=get_color("purple_hover"),
             height=38, corner_radius=10, width=200,
             command=self._restore_from_file,
@@ -283,7 +311,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             backup_btn_frame2, text="📂 Abrir Pasta do Backup",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("gray"), hover_color=get_color("gray_hover"),
             height=38, corner_radius=10, width=200,
             command=self._open_backup_folder,
@@ -297,7 +325,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             theme_card, text="🎨 Aparência",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(size=16, weight="bold"),
             text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 10), anchor="w")
 
@@ -310,7 +338,7 @@ class SettingsView(ctk.CTkScrollableFrame):
         ctk.CTkButton(
             theme_inner,
             text=f"{current_icon} Alternar para {current_theme_text}",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(size=13, weight="bold"),
             fg_color=get_color("primary"),
             hover_color=get_color("primary_hover"),
             height=38,
@@ -325,7 +353,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             sys_card, text="ℹ️ Informações do Sistema",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 10), anchor="w")
 
         info_items = [
@@ -340,11 +368,11 @@ class SettingsView(ctk.CTkScrollableFrame):
             row_frame = ctk.CTkFrame(sys_card, fg_color="transparent")
             row_frame.pack(fill="x", padx=15, pady=2)
             ctk.CTkLabel(
-                row_frame, text=f"{label}:", font=ctk.CTkFont(size=12, weight="bold"),
+                row_frame, text=f"{label}:", font=get_font(size=12, weight="bold"),
                 text_color=COLORS["text"],
             ).pack(side="left")
             ctk.CTkLabel(
-                row_frame, text=value, font=ctk.CTkFont(size=12),
+                row_frame, text=value, font=get_font(size=12),
                 text_color=COLORS["text_secondary"],
             ).pack(side="left", padx=8)
 
@@ -357,7 +385,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkLabel(
             data_card, text="🗄️ Gestão de Dados",
-            font=ctk.CTkFont(size=16, weight="bold"), text_color=COLORS["text"],
+            font=get_font(size=16, weight="bold"), text_color=COLORS["text"],
         ).pack(padx=15, pady=(15, 10), anchor="w")
 
         btn_frame = ctk.CTkFrame(data_card, fg_color="transparent")
@@ -365,7 +393,7 @@ class SettingsView(ctk.CTkScrollableFrame):
 
         ctk.CTkButton(
             btn_frame, text="�️ Limpar Todos os Dados",
-            font=ctk.CTkFont(size=13),
+            font=get_font(size=13),
             fg_color=get_color("error"), hover_color=get_color("error_hover"),
             height=38, corner_radius=10, width=200,
             command=self._confirm_clear_data,
@@ -395,6 +423,13 @@ class SettingsView(ctk.CTkScrollableFrame):
         except Exception as e:
             self.app.show_toast(f"Erro: {e}", "error")
 
+    def _save_pdf_options(self):
+        try:
+            db.update_settings(pdf_group_items=1 if self.group_items_var.get() else 0)
+            self.app.show_toast("Opções do PDF salvas!", "success")
+        except Exception as e:
+            self.app.show_toast(f"Erro: {e}", "error")
+
     def _choose_backup_folder(self):
         """Abre diálogo para escolher pasta de backup."""
         folder = filedialog.askdirectory(
@@ -514,6 +549,7 @@ class SettingsView(ctk.CTkScrollableFrame):
                 cursor.execute(f"DELETE FROM {table}")
             conn.commit()
             conn.close()
+            db.notify_data_reset()
             self.app.show_toast("Todos os dados foram limpos.", "success")
         except Exception as e:
             self.app.show_toast(f"Erro: {e}", "error")